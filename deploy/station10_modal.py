@@ -88,14 +88,48 @@ image = (
         # Gemini unified SDK (CORRECT package - not google-generativeai)
         "google-genai",
         
-        # HTTP client
-        "httpx",
+        # HTTP client (http2 extra enables HTTP/2 on the shared pool)
+        "httpx[http2]",
     )
 )
 
 # Persistent volume for model caching (download once, reuse forever)
 model_cache = modal.Volume.from_name("station10-models", create_if_missing=True)
 
+# ==============================================================================
+# SHARED HTTP CLIENT
+# ==============================================================================
+
+_http_client = None
+
+
+def _get_http_client():
+    """
+    Container-wide keep-alive httpx client.
+
+    Reused across chunks and calls so Grok requests don't pay DNS/TCP/TLS
+    setup every time. HTTP/2 is used when the h2 package is available.
+    """
+    global _http_client
+    import httpx
+
+    if _http_client is None or _http_client.is_closed:
+        try:
+            import h2  # noqa: F401
+
+            http2 = True
+        except ImportError:
+            http2 = False
+        _http_client = httpx.Client(
+            timeout=120.0,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0
+            ),
+        )
+    return _http_client
+
+
 # ==============================================================================
 # GROK CLIENT WITH NOVEMBER 2025 FEATURES
 # ==============================================================================
@@ -148,8 +182,6 @@ class ModalGrokClient:
         Returns:
             Full API response with usage stats
         """
-        import httpx
-        
         payload = {
             "model": model,
             "messages": messages,
@@ -170,14 +202,14 @@ class ModalGrokClient:
             "Content-Type": "application/json"
         }
         
-        with httpx.Client(timeout=120.0) as client:
-            response = client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            return response.json()
+        client = _get_http_client()
+        response = client.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        return response.json()
     
     def extract_usage_stats(self, response: dict) -> dict:
         """Extract token usage including cached tokens."""
@@ -1515,7 +1547,6 @@ Transcript:
         Returns:
             Tuple of (entities, relationships, topics, key_moments, sentiment)
         """
-        import httpx
         import json
         
         # Create chunks of segments
@@ -1556,42 +1587,42 @@ Chunk {i+1} Transcript:
             
             try:
                 # Call Grok API for this chunk
-                with httpx.Client(timeout=120.0) as client:
-                    response = client.post(
-                        f"{grok_base_url}/chat/completions",
-                        headers=grok_headers,
-                        json={
-                            "model": grok_model,
-                            "messages": [
-                                {
-                                    "role": "system",
-                                    "content": "You are a precise entity extraction system. Return only valid JSON."
-                                },
-                                {"role": "user", "content": prompt}
-                            ],
-                            "temperature": 0.1,
-                            "max_tokens": 4096,
-                            "response_format": {"type": "json_object"}
-                        }
-                    )
+                client = _get_http_client()
+                response = client.post(
+                    f"{grok_base_url}/chat/completions",
+                    headers=grok_headers,
+                    json={
+                        "model": grok_model,
+                        "messages": [
+                            {
+                                "role": "system",
+                                "content": "You are a precise entity extraction system. Return only valid JSON."
+                            },
+                            {"role": "user", "content": prompt}
+                        ],
+                        "temperature": 0.1,
+                        "max_tokens": 4096,
+                        "response_format": {"type": "json_object"}
+                    }
+                )
                     
-                    if response.status_code != 200:
-                        print(f"⚠ Grok API error for chunk {i+1}: {response.status_code}")
-                        continue
+                if response.status_code != 200:
+                    print(f"⚠ Grok API error for chunk {i+1}: {response.status_code}")
+                    continue
                     
-                    response_json = response.json()
-                    content = response_json["choices"][0]["message"]["content"]
+                response_json = response.json()
+                content = response_json["choices"][0]["message"]["content"]
                     
-                    # Parse JSON
-                    result = json.loads(content)
+                # Parse JSON
+                result = json.loads(content)
                     
-                    chunk_entities = result.get("entities", [])
-                    chunk_relationships = result.get("relationships", [])
+                chunk_entities = result.get("entities", [])
+                chunk_relationships = result.get("relationships", [])
                     
-                    all_entities.extend(chunk_entities)
-                    all_relationships.extend(chunk_relationships)
+                all_entities.extend(chunk_entities)
+                all_relationships.extend(chunk_relationships)
                     
-                    print(f"✓ Chunk {i+1}: {len(chunk_entities)} entities, {len(chunk_relationships)} relationships")
+                print(f"✓ Chunk {i+1}: {len(chunk_entities)} entities, {len(chunk_relationships)} relationships")
                     
             except Exception as e:
                 print(f"⚠ Chunk {i+1} failed: {e}")
@@ -1,105 +1,61 @@
 #!/usr/bin/env python3
 """
-Load validated entities from Grok-4 validation into database.
+Load the Grok-4 validation outputs (All-In, The View, MTG) into the database.
 
-Uses the 287 entities from our Oct 29 validation (All-In, The View, MTG).
+Thin wrapper around the shared loader; equivalent to
+``clipscribe db load gs://clipscribe-validation/validation/grok4_results/
+--db-path data/station10.db`` plus the display titles below. Loads entities,
+relationships and topics; re-running updates rows in place.
 """
 
+import logging
 import sys
 from pathlib import Path
-import sqlite3
-import json
-from google.cloud import storage
-import uuid
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root / "src"))
+
+from clipscribe.database.backfill import GCSOutputSource, load_outputs
+from clipscribe.database.db_manager import ClipScribeDatabase
 
 DB_PATH = project_root / "data/station10.db"
+SOURCE = "gs://clipscribe-validation/validation/grok4_results/"
 
-def load_entities_from_gcs():
-    """Load validated entities from GCS transcripts."""
-    
-    client = storage.Client()
-    bucket = client.bucket('clipscribe-validation')
-    
-    videos = [
-        ('P-2', 'All-In Podcast', 'validation/grok4_results/P-2//transcript.json'),
-        ('View-1', 'The View Oct 14', 'validation/grok4_results/View-1//transcript.json'),
-        ('P-1', 'MTG Interview', 'validation/grok4_results/P-1//transcript.json'),
-    ]
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    total_loaded = 0
-    
-    for video_id, video_title, gcs_path in videos:
-        print(f"\nLoading entities from {video_title}...")
-        
-        blob = bucket.blob(gcs_path)
-        if not blob.exists():
-            print(f"  ⚠ Transcript not found: {gcs_path}")
-            continue
-        
-        data = json.loads(blob.download_as_text())
-        entities = data.get('entities', [])
-        
-        print(f"  Found {len(entities)} entities")
-        
-        # Count by type
-        type_counts = {}
-        for entity in entities:
-            entity_type = entity.get('type', 'UNKNOWN')
-            type_counts[entity_type] = type_counts.get(entity_type, 0) + 1
-        
-        print(f"  Types: {dict(sorted(type_counts.items(), key=lambda x: x[1], reverse=True)[:5])}")
-        
-        for entity in entities:
-            entity_id = str(uuid.uuid4())
-            name = entity.get('name', '')
-            entity_type = entity.get('type', 'UNKNOWN')
-            confidence = entity.get('confidence', 1.0)
-            evidence = entity.get('evidence', '')
-            
-            # Estimate timestamp (would need actual implementation)
-            timestamp = None
-            
-            cursor.execute("""
-                INSERT INTO entities (
-                    id, video_id, video_title, name, type, confidence, 
-                    evidence, timestamp, mention_count
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                entity_id, video_id, video_title, name, entity_type, 
-                confidence, evidence, timestamp, 1
-            ))
-            
-            total_loaded += 1
-    
-    conn.commit()
-    conn.close()
-    
-    print(f"\n✅ Loaded {total_loaded} entities into database")
-    print(f"   Database: {DB_PATH}")
-    
-    # Show summary by type
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT type, COUNT(*) as count
-        FROM entities
-        GROUP BY type
-        ORDER BY count DESC
-    """)
-    
-    print(f"\n📊 Entity Distribution:")
-    for row in cursor.fetchall():
-        print(f"   {row[0]}: {row[1]}")
-    
-    conn.close()
+TITLES = {
+    "P-2": "All-In Podcast",
+    "View-1": "The View Oct 14",
+    "P-1": "MTG Interview",
+}
+
+
+class ValidationSource(GCSOutputSource):
+    """Validation outputs carry no metadata; fill in the known titles."""
+
+    def read(self, key):
+        record = super().read(key)
+        if record is not None:
+            record["title"] = TITLES.get(record["video_id"], record["title"])
+        return record
 
-if __name__ == "__main__":
-    load_entities_from_gcs()
 
+def load_validation_outputs():
+    """Load every validation output into ``data/station10.db``."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    with ClipScribeDatabase(str(DB_PATH)) as db:
+        stats = load_outputs(db, ValidationSource(SOURCE))
+        print(f"\n✅ Loaded {stats.videos} videos ({stats.rows} rows) into {DB_PATH}")
+
+        print(f"\n📊 Entity Distribution:")
+        for entity_type, count in db.conn.execute(
+            """
+            SELECT entity_type, COUNT(*) AS count FROM entities
+            GROUP BY entity_type ORDER BY count DESC
+            """
+        ):
+            print(f"   {entity_type}: {count}")
+
+
+if __name__ == "__main__":
+    load_validation_outputs()
@@ -193,6 +193,9 @@ async def validate_all_videos():
         # Rate limiting
         await asyncio.sleep(1)
     
+    # Finish queued knowledge base uploads before asyncio.run() exits
+    await processor.close()
+    
     # Get cache stats
     cache = get_prompt_cache()
     cache_stats = cache.get_stats_summary()
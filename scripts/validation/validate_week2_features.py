@@ -30,9 +30,12 @@ def test_database_initialization():
     print("TEST 1: Database Initialization")
     print("="*80)
     
-    # Import should create database
+    # Schema is created at app startup; run the same initializers here
     from src.clipscribe.api.topic_search import init_database as init_topics
     from src.clipscribe.api.entity_search import init_database as init_entities
+
+    init_topics()
+    init_entities()
     
     if DB_PATH.exists():
         print(f"✅ Database exists: {DB_PATH}")
@@ -181,7 +184,7 @@ def test_database_queries():
             print(f"     - {row[0]} (relevance: {row[1]})")
     
     if entity_count > 0:
-        cursor.execute("SELECT name, type FROM entities LIMIT 5")
+        cursor.execute("SELECT name, entity_type FROM entities LIMIT 5")
         print(f"\n   Sample entities:")
         for row in cursor.fetchall():
             print(f"     - {row[0]} ({row[1]})")
@@ -190,8 +193,7 @@ def test_database_queries():
     
     if topic_count == 0 and entity_count == 0:
         print(f"\n⚠️  Database is empty - run data loaders:")
-        print(f"   poetry run python scripts/load_validated_topics.py")
-        print(f"   poetry run python scripts/load_validated_entities.py")
+        print(f"   poetry run python scripts/database/load_validated_entities.py")
     else:
         print(f"\n✅ Database has data and queries work")
     
@@ -239,10 +241,9 @@ def main():
         print("  - Entity search API ✅")
         print("  - TUI components ✅")
         print("\nReady for:")
-        print("  1. Load data: poetry run python scripts/load_validated_topics.py")
-        print("  2. Load data: poetry run python scripts/load_validated_entities.py")
-        print("  3. Test TUI: poetry run python scripts/run_tui.py")
-        print("  4. Week 3 development (auto-clip generation)")
+        print("  1. Load data: poetry run python scripts/database/load_validated_entities.py")
+        print("  2. Test TUI: poetry run python scripts/run_tui.py")
+        print("  3. Week 3 development (auto-clip generation)")
     else:
         print("\n❌ SOME VALIDATIONS FAILED")
         print("Fix issues before proceeding to Week 3")
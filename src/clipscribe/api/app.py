@@ -7,6 +7,7 @@ import logging
 import os
 import time
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, cast
 
@@ -22,9 +23,18 @@ from starlette.responses import Response
 # from clipscribe.config.settings import Settings  # Not needed for API
 from clipscribe.version import __version__
 
+from .db_pool import close_db_pools
+from .entity_graph import init_database as init_graph_database
+from .entity_graph import router as entity_graph_router
+from .entity_search import init_database as init_entity_database
+from .entity_search import router as entity_search_router
 from .estimator import estimate_job
 from .monitoring import get_alert_manager, get_metrics_collector
 from .retry_manager import get_retry_manager
+from .segment_search import init_database as init_segment_database
+from .segment_search import router as segment_search_router
+from .topic_search import init_database as init_topic_database
+from .topic_search import router as topic_search_router
 
 logger = logging.getLogger(__name__)
 
@@ -80,7 +90,22 @@ def _error(
     return JSONResponse(status_code=status, content=payload, headers=headers)
 
 
-app = FastAPI(title="ClipScribe API v1", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Search schema/FTS setup runs once here rather than on router import
+    await asyncio.to_thread(init_entity_database)
+    await asyncio.to_thread(init_topic_database)
+    await asyncio.to_thread(init_segment_database)
+    await asyncio.to_thread(init_graph_database)
+    yield
+    close_db_pools()
+
+
+app = FastAPI(title="ClipScribe API v1", version="1.0.0", lifespan=lifespan)
+app.include_router(entity_search_router)
+app.include_router(topic_search_router)
+app.include_router(segment_search_router)
+app.include_router(entity_graph_router)
 
 # Basic CORS for staging/dev; configure via env CORS_ALLOW_ORIGINS="https://*.repl.co,https://localhost:3000"
 origins_raw = os.getenv("CORS_ALLOW_ORIGINS", "")
@@ -251,6 +276,15 @@ def _metrics_dump() -> str:
                 lines.append(f"clipscribe_{metric}_total {val}")
         except Exception:
             pass
+    # Outbound HTTP connection pool gauges (per upstream host)
+    try:
+        from clipscribe.utils.http_pool import get_http_registry
+
+        for host, pool in get_http_registry().get_metrics().items():
+            for name, value in pool.items():
+                lines.append(f'clipscribe_http_pool_{name}{{host="{host}"}} {value}')
+    except Exception:
+        pass
     return "\n".join(lines) + "\n"
 
 
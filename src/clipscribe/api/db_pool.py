@@ -0,0 +1,134 @@
+"""
+Pooled, non-blocking SQLite access for the search routers.
+
+The entity and topic routers used to open a new connection per request and
+run queries synchronously inside ``async def`` handlers, so every search
+blocked the event loop. ``ReadOnlyConnectionPool`` runs queries on a thread
+pool instead; each worker thread keeps one read-only connection open, with
+its own prepared-statement cache. SQLite releases the GIL while executing,
+so concurrent searches spread across cores.
+
+The database must be in WAL mode (set by the routers' ``init_database`` at
+app startup) for readers to run alongside writers.
+
+Examples:
+    >>> pool = get_db_pool("data/station10.db")
+    >>> rows = await pool.fetchall("SELECT name FROM entities WHERE type = ?", ("ORG",))
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ReadOnlyConnectionPool:
+    """Read-only SQLite connections, one per worker thread."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        size: Optional[int] = None,
+        cached_statements: int = 256,
+        busy_timeout_ms: int = 5000,
+    ):
+        """
+        Initialize the pool (connections open lazily on first use).
+
+        Args:
+            db_path: SQLite database file
+            size: Worker threads / connections (default: CPU count, at least 4)
+            cached_statements: Prepared statements cached per connection
+            busy_timeout_ms: How long a query waits on a locked database
+        """
+        self.db_path = Path(db_path)
+        self.size = size or max(4, os.cpu_count() or 1)
+        self.cached_statements = cached_statements
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="sqlite-read")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._tables: Dict[str, bool] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,  # closed from the shutdown thread
+                cached_statements=self.cached_statements,
+            )
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    async def run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Call ``fn(connection)`` on a pool thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(self._connection()))
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """Run a query on a pool thread and return all rows."""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def has_table(self, name: str) -> bool:
+        """Whether ``name`` exists in the database (cached once found)."""
+        if not self._tables.get(name):
+            rows = await self.fetchall(
+                "SELECT 1 FROM sqlite_master WHERE name = ? AND type = 'table'", (name,)
+            )
+            self._tables[name] = bool(rows)
+        return self._tables[name]
+
+    def close(self) -> None:
+        """Wait for running queries, then close every connection."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+# Global pool instances, one per database file
+_pools: Dict[Path, ReadOnlyConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_db_pool(db_path: Union[str, Path]) -> ReadOnlyConnectionPool:
+    """
+    Get the process-wide read pool for a database file.
+
+    Args:
+        db_path: SQLite database file
+
+    Returns:
+        Shared ReadOnlyConnectionPool for that file
+    """
+    key = Path(db_path).resolve()
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ReadOnlyConnectionPool(key)
+        return _pools[key]
+
+
+def close_db_pools() -> None:
+    """Close every pool (app shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
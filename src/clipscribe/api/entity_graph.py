@@ -0,0 +1,196 @@
+"""
+Entity Graph API for Station10.media
+
+Co-occurrence neighbours, 2-hop expansion, shortest paths, and shared videos
+from the adjacency index in the local intelligence database.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from ..database import cooccurrence
+from ..database.db_manager import ClipScribeDatabase
+from .db_pool import get_db_pool
+
+router = APIRouter(prefix="/api/graph", tags=["graph"])
+
+
+class Neighbor(BaseModel):
+    """Entity co-occurring with the requested one."""
+
+    name: str
+    videos: int = Field(description="Videos shared with the requested entity")
+    total_videos: int = Field(description="Videos this entity appears in")
+    predicates: List[str] = Field(
+        default_factory=list, description="Relationship types from the requested entity"
+    )
+    inverse_predicates: List[str] = Field(
+        default_factory=list, description="Relationship types toward the requested entity"
+    )
+
+
+class GraphNode(BaseModel):
+    """Entity in an expanded neighbourhood."""
+
+    name: str
+    videos: int
+    hops: int = Field(description="Distance from the requested entity")
+
+
+class GraphEdge(BaseModel):
+    """Co-occurrence between two entities."""
+
+    source: str
+    target: str
+    videos: int = Field(description="Videos both entities appear in")
+
+
+class SharedVideo(BaseModel):
+    """Video in which both entities appear."""
+
+    video_id: str
+    title: Optional[str] = None
+    processed_at: Optional[str] = None
+
+
+class NeighborResponse(BaseModel):
+    """Top co-occurring entities."""
+
+    entity: str
+    neighbors: List[Neighbor]
+    query_time_ms: float
+
+
+class GraphResponse(BaseModel):
+    """Subgraph as nodes and edges (a neighbourhood or a path)."""
+
+    nodes: List[GraphNode]
+    edges: List[GraphEdge]
+    query_time_ms: float
+
+
+class SharedVideoResponse(BaseModel):
+    """Videos shared by two entities."""
+
+    videos: List[SharedVideo]
+    total: int
+    query_time_ms: float
+
+
+# Database (shared schema; written by `clipscribe db load`)
+DB_PATH = Path("data/station10.db")
+
+
+def init_database():
+    """Create or migrate the shared database schema (called at app startup)."""
+    with ClipScribeDatabase(str(DB_PATH)):
+        pass
+
+
+def _elapsed_ms(start_time: float) -> float:
+    import time
+
+    return (time.time() - start_time) * 1000
+
+
+@router.get("/neighbors", response_model=NeighborResponse)
+async def get_neighbors(
+    entity: str = Query(..., description="Entity name (any casing)"),
+    limit: int = Query(20, ge=1, le=200),
+    min_videos: int = Query(1, ge=1, description="Fewest shared videos"),
+):
+    """
+    Get the entities that appear in the most videos together with ``entity``.
+
+    Examples:
+        - /api/graph/neighbors?entity=NASA&limit=10
+    """
+    import time
+
+    start_time = time.time()
+    rows = await get_db_pool(DB_PATH).run(
+        lambda conn: cooccurrence.neighbors(conn, entity, limit, min_videos)
+    )
+    return NeighborResponse(
+        entity=entity,
+        neighbors=[Neighbor(**row) for row in rows],
+        query_time_ms=_elapsed_ms(start_time),
+    )
+
+
+@router.get("/expand", response_model=GraphResponse)
+async def expand_entity(
+    entity: str = Query(..., description="Entity name (any casing)"),
+    limit: int = Query(10, ge=1, le=50, description="Neighbours kept per node"),
+    min_videos: int = Query(1, ge=1, description="Fewest shared videos per edge"),
+):
+    """
+    Get the 2-hop neighbourhood of ``entity``: its top neighbours and theirs.
+
+    Examples:
+        - /api/graph/expand?entity=Zelensky&limit=5
+    """
+    import time
+
+    start_time = time.time()
+    graph = await get_db_pool(DB_PATH).run(
+        lambda conn: cooccurrence.expand(conn, entity, limit, min_videos)
+    )
+    return GraphResponse(
+        nodes=[GraphNode(**node) for node in graph["nodes"]],
+        edges=[GraphEdge(**edge) for edge in graph["edges"]],
+        query_time_ms=_elapsed_ms(start_time),
+    )
+
+
+@router.get("/path", response_model=GraphResponse)
+async def get_path(
+    source: str = Query(..., description="Start entity"),
+    target: str = Query(..., description="End entity"),
+    max_depth: int = Query(4, ge=1, le=6, description="Longest path in edges"),
+    min_videos: int = Query(1, ge=1, description="Fewest shared videos per edge"),
+):
+    """
+    Get the shortest chain of co-occurring entities between two entities.
+
+    Examples:
+        - /api/graph/path?source=NASA&target=Kremlin
+    """
+    import time
+
+    start_time = time.time()
+    path = await get_db_pool(DB_PATH).run(
+        lambda conn: cooccurrence.shortest_path(conn, source, target, max_depth, min_videos)
+    )
+    if path is None:
+        raise HTTPException(
+            status_code=404, detail=f"No path within {max_depth} hops from {source} to {target}"
+        )
+    return GraphResponse(
+        nodes=[GraphNode(**node) for node in path["nodes"]],
+        edges=[GraphEdge(**edge) for edge in path["edges"]],
+        query_time_ms=_elapsed_ms(start_time),
+    )
+
+
+@router.get("/videos", response_model=SharedVideoResponse)
+async def get_shared_videos(
+    entity: str = Query(..., description="First entity"),
+    other: str = Query(..., description="Second entity"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Get the videos in which both entities appear, most recent first."""
+    import time
+
+    start_time = time.time()
+    rows = await get_db_pool(DB_PATH).run(
+        lambda conn: cooccurrence.shared_videos(conn, entity, other, limit)
+    )
+    return SharedVideoResponse(
+        videos=[SharedVideo(**row) for row in rows],
+        total=len(rows),
+        query_time_ms=_elapsed_ms(start_time),
+    )
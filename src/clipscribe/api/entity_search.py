@@ -4,14 +4,27 @@ Entity Search API for Station10.media
 Search for entities across processed videos with 18 spaCy type filtering.
 """
 
-import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from ..database.db_manager import ClipScribeDatabase
+from ..database.fts import build_match_query
+from ..database.trigram import DEFAULT_MIN_SIMILARITY, fuzzy_query
+from .db_pool import ReadOnlyConnectionPool, get_db_pool
+from .pagination import (
+    SearchPlan,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    iter_rows,
+    request_fingerprint,
+)
+
 router = APIRouter(prefix="/api/entities", tags=["entities"])
 
 
@@ -33,11 +46,24 @@ class Entity(BaseModel):
 class EntitySearchRequest(BaseModel):
     """Entity search request parameters."""
 
-    query: Optional[str] = Field(None, description="Search in entity names")
+    query: Optional[str] = Field(
+        None, description='Search in entity names (word prefixes, "quoted phrases")'
+    )
     entity_type: Optional[str] = Field(None, description="spaCy type (PERSON, ORG, GPE, etc.)")
     min_confidence: float = Field(0.7, ge=0.0, le=1.0)
     video_id: Optional[str] = Field(None, description="Filter by video")
     limit: int = Field(100, ge=1, le=1000)
+    sort: Literal["relevance", "confidence"] = Field(
+        "relevance",
+        description="Text relevance (BM25, or similarity when fuzzy) when query is set, or confidence",
+    )
+    fuzzy: bool = Field(
+        False, description="Typo-tolerant name/alias matching, ranked by trigram similarity"
+    )
+    min_similarity: float = Field(
+        DEFAULT_MIN_SIMILARITY, ge=0.0, le=1.0, description="Similarity cutoff when fuzzy"
+    )
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page")
 
 
 class EntitySearchResponse(BaseModel):
@@ -46,44 +72,87 @@ class EntitySearchResponse(BaseModel):
     entities: List[Entity]
     total: int
     query_time_ms: float
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 # Database
 DB_PATH = Path("data/station10.db")
 
+# Entity fields in API shape; titles live on videos, and ids are the stable ids
+ENTITY_COLUMNS = """e.stable_id, e.video_id,
+               (SELECT v.title FROM videos v WHERE v.video_id = e.video_id),
+               e.name, COALESCE(e.entity_type, 'UNKNOWN'), e.confidence,
+               e.evidence, e.timestamp, e.mention_count, e.created_at"""
 
-def init_database():
-    """Initialize entities database."""
-    DB_PATH.parent.mkdir(exist_ok=True)
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS entities (
-            id TEXT PRIMARY KEY,
-            video_id TEXT NOT NULL,
-            video_title TEXT,
-            name TEXT NOT NULL,
-            type TEXT NOT NULL,
-            confidence REAL NOT NULL,
-            evidence TEXT,
-            timestamp REAL,
-            mention_count INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
+
+def init_database() -> bool:
     """
-    )
+    Create or migrate the shared database schema (called at app startup).
+
+    Returns:
+        True if the entity name full-text index is available
+    """
+    with ClipScribeDatabase(str(DB_PATH)) as database:
+        return database.fts_enabled
+
 
-    # Indexes for search
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_video ON entities(video_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_name ON entities(name)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_type ON entities(type)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_confidence ON entities(confidence)")
+async def _search_plan(request: EntitySearchRequest, pool: ReadOnlyConnectionPool) -> SearchPlan:
+    """Filters and keyset sort keys for an entity search."""
+    query_parts = []
+    params = []
+    from_clause = "entities e"
+    # id last makes the order total, so every row has a unique cursor position
+    keys = [("e.confidence", True), ("e.mention_count", True), ("e.id", False)]
+
+    from_params = []
+    if request.query and request.fuzzy and await pool.has_table("trigram_terms"):
+        # Uncapped: type/confidence/video filters and paging apply to the joined rows
+        candidates_sql, from_params = fuzzy_query(
+            request.query, limit=None, min_similarity=request.min_similarity
+        )
+        from_clause = f"({candidates_sql}) c JOIN entities e ON e.name = c.name"
+        if request.sort == "relevance":
+            keys.insert(0, ("c.similarity", True))
+    elif request.query:
+        match = build_match_query(request.query)
+        if match and await pool.has_table("entities_fts"):
+            from_clause = "entities_fts f JOIN entities e ON e.id = f.rowid"
+            query_parts.append("entities_fts MATCH ?")
+            params.append(match)
+            if request.sort == "relevance":
+                keys.insert(0, ("f.rank", False))
+        else:
+            query_parts.append("e.name LIKE ?")
+            params.append(f"%{request.query}%")
+
+    if request.entity_type:
+        query_parts.append("e.entity_type = ?")
+        params.append(request.entity_type)
+
+    if request.min_confidence > 0:
+        query_parts.append("e.confidence >= ?")
+        params.append(request.min_confidence)
+
+    if request.video_id:
+        query_parts.append("e.video_id = ?")
+        params.append(request.video_id)
 
-    conn.commit()
-    conn.close()
+    return SearchPlan(ENTITY_COLUMNS, from_clause, query_parts, params, keys, from_params)
+
+
+def _row_to_entity(row: tuple) -> Entity:
+    return Entity(
+        id=row[0],
+        video_id=row[1],
+        video_title=row[2],
+        name=row[3],
+        type=row[4],
+        confidence=row[5],
+        evidence=row[6],
+        timestamp=row[7],
+        mention_count=row[8],
+        created_at=row[9],
+    )
 
 
 @router.post("/search", response_model=EntitySearchResponse)
@@ -91,89 +160,70 @@ async def search_entities(request: EntitySearchRequest):
     """
     Search for entities across processed videos.
 
+    Results are paged with keyset cursors: pass a response's ``next_cursor``
+    back as ``cursor`` (with the same filters) to get the following page.
+
     Examples:
         - Find all Trump mentions: {"query": "Trump", "min_confidence": 0.9}
         - Find all people: {"entity_type": "PERSON"}
         - Find organizations in video: {"entity_type": "ORG", "video_id": "P-2"}
+        - Tolerate misspellings: {"query": "Zelenski", "fuzzy": true}
     """
     import time
 
     start_time = time.time()
+    pool = get_db_pool(DB_PATH)
+    plan = await _search_plan(request, pool)
+    fingerprint = request_fingerprint(request)
+    after = decode_cursor(request.cursor, fingerprint, len(plan.keys)) if request.cursor else None
 
-    # Build SQL
-    query_parts = []
-    params = []
+    # One extra row tells us whether another page exists
+    rows = await fetch_page(pool, plan, after, request.limit + 1)
+    next_cursor = None
+    if len(rows) > request.limit:
+        rows = rows[: request.limit]
+        next_cursor = encode_cursor(plan.key_values(rows[-1]), fingerprint)
 
-    if request.query:
-        query_parts.append("name LIKE ?")
-        params.append(f"%{request.query}%")
+    entities = [_row_to_entity(row) for row in rows]
 
-    if request.entity_type:
-        query_parts.append("type = ?")
-        params.append(request.entity_type)
+    query_time = (time.time() - start_time) * 1000
 
-    if request.min_confidence > 0:
-        query_parts.append("confidence >= ?")
-        params.append(request.min_confidence)
+    return EntitySearchResponse(
+        entities=entities,
+        total=len(entities),
+        query_time_ms=query_time,
+        next_cursor=next_cursor,
+    )
 
-    if request.video_id:
-        query_parts.append("video_id = ?")
-        params.append(request.video_id)
 
-    where_clause = " AND ".join(query_parts) if query_parts else "1=1"
+@router.post("/export")
+async def export_entities(request: EntitySearchRequest):
+    """
+    Stream every entity matching a search as NDJSON (one Entity per line).
 
-    sql = f"""
-        SELECT id, video_id, video_title, name, type, confidence, 
-               evidence, timestamp, mention_count, created_at
-        FROM entities
-        WHERE {where_clause}
-        ORDER BY confidence DESC, mention_count DESC
-        LIMIT ?
+    ``limit`` is ignored; rows are read in keyset pages so memory stays flat
+    however large the result. ``cursor`` resumes an export from a search page.
     """
-    params.append(request.limit)
-
-    # Execute
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(sql, params)
-
-    rows = cursor.fetchall()
-    conn.close()
-
-    # Convert to Entity objects
-    entities = []
-    for row in rows:
-        entities.append(
-            Entity(
-                id=row[0],
-                video_id=row[1],
-                video_title=row[2],
-                name=row[3],
-                type=row[4],
-                confidence=row[5],
-                evidence=row[6],
-                timestamp=row[7],
-                mention_count=row[8],
-                created_at=row[9],
-            )
-        )
+    pool = get_db_pool(DB_PATH)
+    plan = await _search_plan(request, pool)
+    after = None
+    if request.cursor:
+        after = decode_cursor(request.cursor, request_fingerprint(request), len(plan.keys))
 
-    query_time = (time.time() - start_time) * 1000
+    async def lines():
+        async for row in iter_rows(pool, plan, after):
+            yield _row_to_entity(row).model_dump_json() + "\n"
 
-    return EntitySearchResponse(entities=entities, total=len(entities), query_time_ms=query_time)
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/types", response_model=List[str])
 async def get_entity_types():
     """Get all unique entity types in database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT DISTINCT type FROM entities ORDER BY type")
-    types = [row[0] for row in cursor.fetchall()]
-
-    conn.close()
-    return types
+    rows = await get_db_pool(DB_PATH).fetchall(
+        "SELECT DISTINCT entity_type FROM entities WHERE entity_type IS NOT NULL ORDER BY 1"
+    )
+    return [row[0] for row in rows]
 
 
 @router.get("/video/{video_id}", response_model=List[Entity])
@@ -181,46 +231,18 @@ async def get_video_entities(
     video_id: str, entity_type: Optional[str] = None, min_confidence: float = 0.7
 ):
     """Get all entities for a specific video."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    sql = """
-        SELECT id, video_id, video_title, name, type, confidence,
-               evidence, timestamp, mention_count, created_at
-        FROM entities
-        WHERE video_id = ? AND confidence >= ?
+    sql = f"""
+        SELECT {ENTITY_COLUMNS}
+        FROM entities e
+        WHERE e.video_id = ? AND e.confidence >= ?
     """
     params = [video_id, min_confidence]
 
     if entity_type:
-        sql += " AND type = ?"
+        sql += " AND e.entity_type = ?"
         params.append(entity_type)
 
-    sql += " ORDER BY confidence DESC"
-
-    cursor.execute(sql, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    entities = []
-    for row in rows:
-        entities.append(
-            Entity(
-                id=row[0],
-                video_id=row[1],
-                video_title=row[2],
-                name=row[3],
-                type=row[4],
-                confidence=row[5],
-                evidence=row[6],
-                timestamp=row[7],
-                mention_count=row[8],
-                created_at=row[9],
-            )
-        )
-
-    return entities
-
+    sql += " ORDER BY e.confidence DESC"
 
-# Initialize database
-init_database()
+    rows = await get_db_pool(DB_PATH).fetchall(sql, params)
+    return [_row_to_entity(row) for row in rows]
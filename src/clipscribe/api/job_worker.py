@@ -117,6 +117,7 @@ class CloudRunJobWorker:
 
         # Model selection - Voxtral + Grok pipeline
         self.model_name = "voxtral-grok-pipeline"
+        self.transcription_provider = os.getenv("TRANSCRIPTION_PROVIDER", "whisperx-modal")
 
         # Initialize Redis connection
         if not self.redis_url:
@@ -167,7 +168,7 @@ class CloudRunJobWorker:
             file_path = await self.download_from_gcs(gcs_uri)
 
             # Process using new provider system
-            logger.info(f"Processing with providers (WhisperX Modal + Grok)")
+            logger.info(f"Processing with providers ({self.transcription_provider} + Grok)")
             analysis_result = await self.process_file(file_path, gcs_uri)
 
             # Upload results to GCS
@@ -249,8 +250,8 @@ class CloudRunJobWorker:
             get_intelligence_provider,
         )
 
-        # Use providers (default to Modal for API)
-        transcriber = get_transcription_provider("whisperx-modal")
+        # Use providers (default to Modal for API; "auto" routes per file)
+        transcriber = get_transcription_provider(self.transcription_provider)
         extractor = get_intelligence_provider("grok")
 
         # Transcribe
@@ -0,0 +1,154 @@
+"""
+Keyset pagination helpers for the search routers.
+
+OFFSET paging re-reads every skipped row, so deep pages get slower. Keyset
+(seek) pagination instead resumes after the last row's sort key: the next
+page is ``WHERE (sort keys) come after (last row's keys)``, which the
+composite sort indexes answer directly at any depth.
+
+Cursors are opaque to clients: URL-safe base64 of the last row's sort-key
+values plus a fingerprint of the search parameters, so a cursor cannot be
+replayed against a different query.
+
+Examples:
+    >>> keys = [("e.confidence", True), ("e.id", False)]
+    >>> condition, params = keyset_condition(keys, [0.9, "abc"])
+    >>> condition
+    '(e.confidence < ?) OR (e.confidence = ? AND e.id > ?)'
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from .db_pool import ReadOnlyConnectionPool
+
+# (SQL expression, descending)
+SortKey = Tuple[str, bool]
+
+# Rows fetched per round-trip when streaming exports
+EXPORT_PAGE_SIZE = 1000
+
+
+def request_fingerprint(request: BaseModel, exclude: Sequence[str] = ("cursor", "limit")) -> str:
+    """Short hash of the search parameters a cursor is valid for."""
+    payload = request.model_dump_json(exclude=set(exclude))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(values: Sequence[Any], fingerprint: str) -> str:
+    """Opaque cursor for resuming after a row with these sort-key values."""
+    payload = json.dumps({"k": list(values), "f": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str, key_count: int) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for other parameters
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if payload.get("f") != fingerprint or len(values) != key_count:
+        raise HTTPException(status_code=400, detail="Cursor does not match these search parameters")
+    return values
+
+
+def order_by_clause(keys: Sequence[SortKey]) -> str:
+    """ORDER BY expression list for ``keys``."""
+    return ", ".join(f"{expr} DESC" if descending else expr for expr, descending in keys)
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """
+    WHERE condition selecting rows strictly after ``values`` in ``keys`` order.
+
+    Expanded into OR-ed prefixes rather than a row-value comparison because
+    the keys mix ascending and descending directions.
+
+    Args:
+        keys: Sort keys, most significant first
+        values: Sort-key values of the last row already returned
+
+    Returns:
+        SQL condition and its parameters
+    """
+    clauses, params = [], []
+    for i, (expr, descending) in enumerate(keys):
+        terms = [f"{prefix} = ?" for prefix, _ in keys[:i]]
+        terms.append(f"{expr} {'<' if descending else '>'} ?")
+        clauses.append("(" + " AND ".join(terms) + ")")
+        params.extend(values[: i + 1])
+    return " OR ".join(clauses), params
+
+
+@dataclass
+class SearchPlan:
+    """A search query split into parts so pages can be fetched after any row."""
+
+    columns: str
+    from_clause: str
+    conditions: List[str]
+    params: List[Any]
+    keys: List[SortKey]
+    # Parameters of subqueries in from_clause (bound before the conditions')
+    from_params: List[Any] = field(default_factory=list)
+
+    def page_sql(self, after: Optional[Sequence[Any]], limit: int) -> Tuple[str, List[Any]]:
+        """SELECT for one page; each row ends with its sort-key values."""
+        conditions, params = list(self.conditions), self.from_params + self.params
+        if after is not None:
+            condition, seek_params = keyset_condition(self.keys, after)
+            conditions.append(f"({condition})")
+            params.extend(seek_params)
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        sql = f"""
+            SELECT {self.columns}, {", ".join(expr for expr, _ in self.keys)}
+            FROM {self.from_clause}
+            WHERE {where_clause}
+            ORDER BY {order_by_clause(self.keys)}
+            LIMIT ?
+        """
+        return sql, params + [limit]
+
+    def key_values(self, row: Sequence[Any]) -> List[Any]:
+        """Sort-key values of a row returned by ``page_sql``."""
+        return list(row[-len(self.keys) :])
+
+
+async def fetch_page(
+    pool: ReadOnlyConnectionPool,
+    plan: SearchPlan,
+    after: Optional[Sequence[Any]],
+    limit: int,
+) -> List[tuple]:
+    """Fetch up to ``limit`` rows following ``after`` (from the start if None)."""
+    sql, params = plan.page_sql(after, limit)
+    return await pool.fetchall(sql, params)
+
+
+async def iter_rows(
+    pool: ReadOnlyConnectionPool,
+    plan: SearchPlan,
+    after: Optional[Sequence[Any]] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> AsyncIterator[tuple]:
+    """Yield every matching row, one keyset page in memory at a time."""
+    while True:
+        rows = await fetch_page(pool, plan, after, page_size)
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        after = plan.key_values(rows[-1])
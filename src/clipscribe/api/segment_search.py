@@ -0,0 +1,145 @@
+"""
+Transcript Segment API for Station10.media
+
+Time-range and full-text lookups over transcript segments stored in the
+local intelligence database.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from ..database.db_manager import ClipScribeDatabase
+from ..database.fts import build_match_query
+from ..database.segments import interval_query, text_query
+from .db_pool import get_db_pool
+
+router = APIRouter(prefix="/api/segments", tags=["segments"])
+
+
+class Segment(BaseModel):
+    """Transcript segment with timing and optional speaker."""
+
+    id: int
+    video_id: str
+    start_time: float = Field(description="Start time in seconds")
+    end_time: float = Field(description="End time in seconds")
+    speaker: Optional[str] = Field(None, description="Speaker label if diarized")
+    text: str
+
+
+class SegmentSearchRequest(BaseModel):
+    """Segment text search request parameters."""
+
+    query: str = Field(..., description='Search in segment text (word prefixes, "quoted phrases")')
+    video_id: Optional[str] = Field(None, description="Filter by video")
+    start: Optional[float] = Field(None, ge=0.0, description="Only segments ending after this time")
+    end: Optional[float] = Field(
+        None, ge=0.0, description="Only segments starting before this time"
+    )
+    limit: int = Field(50, ge=1, le=500)
+
+
+class SegmentResponse(BaseModel):
+    """Segment lookup response."""
+
+    segments: List[Segment]
+    total: int
+    query_time_ms: float
+
+
+# Database (shared schema; written by `clipscribe db load`)
+DB_PATH = Path("data/station10.db")
+
+
+def init_database() -> bool:
+    """
+    Create or migrate the shared database schema (called at app startup).
+
+    Returns:
+        True if the cross-video R-tree time index is available
+    """
+    with ClipScribeDatabase(str(DB_PATH)) as database:
+        return database.rtree_enabled
+
+
+async def _fetch(sql: str, params: list, start_time: float) -> SegmentResponse:
+    import time
+
+    rows = await get_db_pool(DB_PATH).fetchall(sql, params)
+    segments = [
+        Segment(
+            id=row[0],
+            video_id=row[1],
+            start_time=row[2],
+            end_time=row[3],
+            speaker=row[4],
+            text=row[5],
+        )
+        for row in rows
+    ]
+    query_time = (time.time() - start_time) * 1000
+    return SegmentResponse(segments=segments, total=len(segments), query_time_ms=query_time)
+
+
+@router.get("/range", response_model=SegmentResponse)
+async def get_segments_between(
+    start: float = Query(..., ge=0.0, description="Range start in seconds"),
+    end: float = Query(..., ge=0.0, description="Range end in seconds"),
+    video_id: Optional[str] = None,
+    speaker: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=5000),
+):
+    """
+    Get what was said between two times, in one video or across all videos.
+
+    Examples:
+        - Minute 5 of every video: /api/segments/range?start=300&end=360
+        - One video's opening: /api/segments/range?start=0&end=60&video_id=P-2
+    """
+    import time
+
+    start_time = time.time()
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    use_rtree = await get_db_pool(DB_PATH).has_table("segments_rtree")
+    sql, params = interval_query(start, end, video_id, speaker, limit, use_rtree=use_rtree)
+    return await _fetch(sql, params, start_time)
+
+
+@router.get("/at", response_model=SegmentResponse)
+async def get_segments_at(
+    t: float = Query(..., ge=0.0, description="Time in seconds"),
+    video_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Get the segments being spoken at time ``t``."""
+    import time
+
+    start_time = time.time()
+    use_rtree = await get_db_pool(DB_PATH).has_table("segments_rtree")
+    sql, params = interval_query(t, t, video_id, None, limit, use_rtree=use_rtree)
+    return await _fetch(sql, params, start_time)
+
+
+@router.post("/search", response_model=SegmentResponse)
+async def search_segments(request: SegmentSearchRequest):
+    """
+    Search segment text, optionally inside a time window.
+
+    Examples:
+        - Every mention of a ceasefire: {"query": "ceasefire"}
+        - In the first ten minutes of a video: {"query": "budget", "video_id": "P-2", "end": 600}
+    """
+    import time
+
+    start_time = time.time()
+    match = None
+    if await get_db_pool(DB_PATH).has_table("segments_fts"):
+        match = build_match_query(request.query)
+    sql, params = text_query(
+        match, request.query, request.video_id, request.start, request.end, request.limit
+    )
+    return await _fetch(sql, params, start_time)
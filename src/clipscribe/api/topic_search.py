@@ -4,14 +4,26 @@ Topic Search API for Station10.media
 Enables searching for topics across processed videos with relevance filtering.
 """
 
-import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from ..database.db_manager import ClipScribeDatabase
+from ..database.fts import build_match_query
+from .db_pool import ReadOnlyConnectionPool, get_db_pool
+from .pagination import (
+    SearchPlan,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    iter_rows,
+    request_fingerprint,
+)
+
 router = APIRouter(prefix="/api/topics", tags=["topics"])
 
 
@@ -32,11 +44,17 @@ class Topic(BaseModel):
 class TopicSearchRequest(BaseModel):
     """Topic search request parameters."""
 
-    query: Optional[str] = Field(None, description="Text search in topic names")
+    query: Optional[str] = Field(
+        None, description='Text search in topic names (word prefixes, "quoted phrases")'
+    )
     min_relevance: float = Field(0.0, ge=0.0, le=1.0, description="Minimum relevance threshold")
     schema_type: Optional[str] = Field(None, description="Filter by Schema.org type")
     video_id: Optional[str] = Field(None, description="Filter by specific video")
     limit: int = Field(50, ge=1, le=500, description="Maximum results")
+    sort: Literal["relevance", "confidence"] = Field(
+        "relevance", description="BM25 text relevance (when query is set) or topic relevance score"
+    )
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page")
 
 
 class TopicSearchResponse(BaseModel):
@@ -45,43 +63,77 @@ class TopicSearchResponse(BaseModel):
     topics: List[Topic]
     total: int
     query_time_ms: float
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 # Database initialization
 DB_PATH = Path("data/station10.db")
 
+# Topic fields in API shape; titles live on videos, and ids are the stable ids
+TOPIC_COLUMNS = """t.stable_id, t.video_id,
+               (SELECT v.title FROM videos v WHERE v.video_id = t.video_id),
+               t.name, t.relevance, t.time_range,
+               t.schema_type, t.schema_subtype, t.created_at"""
 
-def init_database():
-    """Initialize topics database with Schema.org taxonomy."""
-    DB_PATH.parent.mkdir(exist_ok=True)
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS topics (
-            id TEXT PRIMARY KEY,
-            video_id TEXT NOT NULL,
-            video_title TEXT,
-            name TEXT NOT NULL,
-            relevance REAL NOT NULL,
-            time_range TEXT,
-            schema_type TEXT DEFAULT 'Event',
-            schema_subtype TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
+
+def init_database() -> bool:
     """
-    )
+    Create or migrate the shared database schema (called at app startup).
+
+    Returns:
+        True if the topic name full-text index is available
+    """
+    with ClipScribeDatabase(str(DB_PATH)) as database:
+        return database.fts_enabled
+
+
+async def _search_plan(request: TopicSearchRequest, pool: ReadOnlyConnectionPool) -> SearchPlan:
+    """Filters and keyset sort keys for a topic search."""
+    query_parts = []
+    params = []
+    from_clause = "topics t"
+    # id last makes the order total, so every row has a unique cursor position
+    keys = [("t.relevance", True), ("t.id", False)]
+
+    if request.query:
+        match = build_match_query(request.query)
+        if match and await pool.has_table("topics_fts"):
+            from_clause = "topics_fts f JOIN topics t ON t.id = f.rowid"
+            query_parts.append("topics_fts MATCH ?")
+            params.append(match)
+            if request.sort == "relevance":
+                keys.insert(0, ("f.rank", False))
+        else:
+            query_parts.append("t.name LIKE ?")
+            params.append(f"%{request.query}%")
+
+    if request.min_relevance > 0:
+        query_parts.append("t.relevance >= ?")
+        params.append(request.min_relevance)
 
-    # Create indexes for search performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_video_id ON topics(video_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_name ON topics(name)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_relevance ON topics(relevance)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_schema_type ON topics(schema_type)")
+    if request.schema_type:
+        query_parts.append("t.schema_type = ?")
+        params.append(request.schema_type)
 
-    conn.commit()
-    conn.close()
+    if request.video_id:
+        query_parts.append("t.video_id = ?")
+        params.append(request.video_id)
+
+    return SearchPlan(TOPIC_COLUMNS, from_clause, query_parts, params, keys)
+
+
+def _row_to_topic(row: tuple) -> Topic:
+    return Topic(
+        id=row[0],
+        video_id=row[1],
+        video_title=row[2],
+        name=row[3],
+        relevance=row[4],
+        time_range=row[5],
+        schema_type=row[6],
+        schema_subtype=row[7],
+        created_at=row[8],
+    )
 
 
 @router.post("/search", response_model=TopicSearchResponse)
@@ -89,6 +141,9 @@ async def search_topics(request: TopicSearchRequest):
     """
     Search for topics across processed videos.
 
+    Results are paged with keyset cursors: pass a response's ``next_cursor``
+    back as ``cursor`` (with the same filters) to get the following page.
+
     Examples:
         - Find all ceasefire topics: {"query": "ceasefire", "min_relevance": 0.8}
         - Find political events: {"schema_type": "PoliticalEvent"}
@@ -97,107 +152,58 @@ async def search_topics(request: TopicSearchRequest):
     import time
 
     start_time = time.time()
+    pool = get_db_pool(DB_PATH)
+    plan = await _search_plan(request, pool)
+    fingerprint = request_fingerprint(request)
+    after = decode_cursor(request.cursor, fingerprint, len(plan.keys)) if request.cursor else None
 
-    # Build SQL query
-    query_parts = []
-    params = []
+    # One extra row tells us whether another page exists
+    rows = await fetch_page(pool, plan, after, request.limit + 1)
+    next_cursor = None
+    if len(rows) > request.limit:
+        rows = rows[: request.limit]
+        next_cursor = encode_cursor(plan.key_values(rows[-1]), fingerprint)
 
-    if request.query:
-        query_parts.append("name LIKE ?")
-        params.append(f"%{request.query}%")
+    topics = [_row_to_topic(row) for row in rows]
 
-    if request.min_relevance > 0:
-        query_parts.append("relevance >= ?")
-        params.append(request.min_relevance)
+    query_time = (time.time() - start_time) * 1000
 
-    if request.schema_type:
-        query_parts.append("schema_type = ?")
-        params.append(request.schema_type)
+    return TopicSearchResponse(
+        topics=topics, total=len(topics), query_time_ms=query_time, next_cursor=next_cursor
+    )
 
-    if request.video_id:
-        query_parts.append("video_id = ?")
-        params.append(request.video_id)
 
-    where_clause = " AND ".join(query_parts) if query_parts else "1=1"
+@router.post("/export")
+async def export_topics(request: TopicSearchRequest):
+    """
+    Stream every topic matching a search as NDJSON (one Topic per line).
 
-    sql = f"""
-        SELECT id, video_id, video_title, name, relevance, time_range, 
-               schema_type, schema_subtype, created_at
-        FROM topics
-        WHERE {where_clause}
-        ORDER BY relevance DESC
-        LIMIT ?
+    ``limit`` is ignored; rows are read in keyset pages so memory stays flat
+    however large the result. ``cursor`` resumes an export from a search page.
     """
-    params.append(request.limit)
-
-    # Execute query
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(sql, params)
-
-    rows = cursor.fetchall()
-    conn.close()
-
-    # Convert to Topic objects
-    topics = []
-    for row in rows:
-        topics.append(
-            Topic(
-                id=row[0],
-                video_id=row[1],
-                video_title=row[2],
-                name=row[3],
-                relevance=row[4],
-                time_range=row[5],
-                schema_type=row[6],
-                schema_subtype=row[7],
-                created_at=row[8],
-            )
-        )
+    pool = get_db_pool(DB_PATH)
+    plan = await _search_plan(request, pool)
+    after = None
+    if request.cursor:
+        after = decode_cursor(request.cursor, request_fingerprint(request), len(plan.keys))
 
-    query_time = (time.time() - start_time) * 1000
+    async def lines():
+        async for row in iter_rows(pool, plan, after):
+            yield _row_to_topic(row).model_dump_json() + "\n"
 
-    return TopicSearchResponse(topics=topics, total=len(topics), query_time_ms=query_time)
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/video/{video_id}", response_model=List[Topic])
 async def get_video_topics(video_id: str):
     """Get all topics for a specific video."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT id, video_id, video_title, name, relevance, time_range,
-               schema_type, schema_subtype, created_at
-        FROM topics
-        WHERE video_id = ?
-        ORDER BY relevance DESC
+    rows = await get_db_pool(DB_PATH).fetchall(
+        f"""
+        SELECT {TOPIC_COLUMNS}
+        FROM topics t
+        WHERE t.video_id = ?
+        ORDER BY t.relevance DESC
     """,
         (video_id,),
     )
-
-    rows = cursor.fetchall()
-    conn.close()
-
-    topics = []
-    for row in rows:
-        topics.append(
-            Topic(
-                id=row[0],
-                video_id=row[1],
-                video_title=row[2],
-                name=row[3],
-                relevance=row[4],
-                time_range=row[5],
-                schema_type=row[6],
-                schema_subtype=row[7],
-                created_at=row[8],
-            )
-        )
-
-    return topics
-
-
-# Initialize database on module import
-init_database()
+    return [_row_to_topic(row) for row in rows]
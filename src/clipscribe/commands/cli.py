@@ -11,7 +11,7 @@ import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import click
 
@@ -38,9 +38,9 @@ def cli(ctx: click.Context, debug: bool):
 @click.option(
     "--transcription-provider",
     "-t",
-    type=click.Choice(["voxtral", "whisperx-modal", "whisperx-local"]),
+    type=click.Choice(["voxtral", "whisperx-modal", "whisperx-local", "auto"]),
     default="whisperx-local",
-    help="Transcription provider (voxtral=Mistral API/cheap/no-speakers, whisperx-modal=Modal GPU/quality/speakers, whisperx-local=Local/FREE/speakers)",
+    help="Transcription provider (voxtral=Mistral API/cheap/no-speakers, whisperx-modal=Modal GPU/quality/speakers, whisperx-local=Local/FREE/speakers, auto=route per file by duration/SLA/budget)",
 )
 @click.option(
     "--intelligence-provider",
@@ -147,27 +147,9 @@ async def process_file_logic(
         diarize = False
 
     # Estimate costs (get duration)
-    import subprocess
+    from clipscribe.utils.file_utils import get_media_duration
 
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                str(audio_file),
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        duration = float(result.stdout.strip())
-    except Exception:
-        duration = 1800.0  # Default 30 min if can't detect
+    duration = get_media_duration(str(audio_file), default=1800.0)  # Default 30 min
     transcript_cost_est = transcriber.estimate_cost(duration)
     transcript_length_est = int(duration * 150)  # Rough: 150 chars/sec
     intelligence_cost_est = extractor.estimate_cost(transcript_length_est)
@@ -340,9 +322,9 @@ async def process_file_logic(
 @click.option(
     "--transcription-provider",
     "-t",
-    type=click.Choice(["voxtral", "whisperx-modal", "whisperx-local"]),
+    type=click.Choice(["voxtral", "whisperx-modal", "whisperx-local", "auto"]),
     default="whisperx-local",
-    help="Transcription provider",
+    help="Transcription provider (auto routes each file to the best available backend)",
 )
 @click.option("--output-dir", "-o", type=click.Path(path_type=Path), default=Path("output"))
 @click.option(
@@ -351,6 +333,12 @@ async def process_file_logic(
     default=["json", "docx", "csv", "pptx"],
     help="Formats for individual videos (series gets PPTX + aggregate CSVs automatically)",
 )
+@click.option(
+    "--max-cost",
+    type=float,
+    default=None,
+    help="Cost ceiling in USD for the whole series (videos that would exceed it are skipped)",
+)
 @click.pass_context
 def process_series(
     ctx: click.Context,
@@ -359,6 +347,7 @@ def process_series(
     transcription_provider: str,
     output_dir: Path,
     formats: tuple,
+    max_cost: Optional[float],
 ):
     """Process multiple videos as a series with aggregate analysis.
 
@@ -393,6 +382,7 @@ def process_series(
             transcription_provider,
             output_dir,
             list(formats),
+            max_cost,
         )
     )
 
@@ -403,9 +393,11 @@ async def process_series_logic(
     transcription_provider: str,
     output_dir: Path,
     formats: List[str],
+    max_cost: Optional[float] = None,
 ):
     """Core series processing logic."""
     from clipscribe.processors.series_analyzer import SeriesAnalyzer
+    from clipscribe.providers.bulk import BulkItem, BulkRunner
     from clipscribe.providers.factory import get_intelligence_provider, get_transcription_provider
 
     logger = logging.getLogger(__name__)
@@ -436,21 +428,36 @@ async def process_series_logic(
     transcriber = get_transcription_provider(transcription_provider)
     extractor = get_intelligence_provider("grok")
 
-    for idx, file_path in enumerate(files, 1):
-        logger.info(f"\n📹 Processing {idx}/{len(files)}: {Path(file_path).name}")
+    runner = BulkRunner(transcriber, extractor, max_total_cost=max_cost)
+    items = [
+        BulkItem(audio_path=file_path, diarize=True, metadata={"filename": Path(file_path).name})
+        for file_path in files
+    ]
+    video_numbers = {id(item): idx for idx, item in enumerate(items, 1)}
+    # Results arrive in completion order; the analyzer needs series order
+    completed = {}
+
+    async for result in runner.run(items):
+        file_path = result.item.audio_path
+        idx = video_numbers[id(result.item)]
+        logger.info(f"\n📹 Finished {idx}/{len(files)}: {Path(file_path).name}")
+
+        if not result.succeeded:
+            logger.error(f"   ✗ Failed to process {file_path}: {result.error}")
+            continue
 
         try:
-            # Transcribe
-            transcript = await transcriber.transcribe(file_path, diarize=True)
+            transcript = result.transcript
+            intelligence = result.intelligence
             logger.info(f"   ✓ Transcribed: {transcript.language}, {transcript.speakers} speakers")
-
-            # Extract intelligence
-            intelligence = await extractor.extract(
-                transcript, metadata={"filename": Path(file_path).name}
-            )
             logger.info(
                 f"   ✓ Intelligence: {len(intelligence.entities)} entities, {len(intelligence.relationships)} relationships"
             )
+            logger.info(
+                f"   ⏱  {result.total_seconds:.1f}s "
+                f"(transcribe {result.transcription_seconds:.1f}s, "
+                f"extract {result.extraction_seconds:.1f}s)"
+            )
 
             # Save individual video results
             video_output = videos_dir / f"video{idx}_{Path(file_path).stem}"
@@ -498,13 +505,16 @@ async def process_series_logic(
 
                 export_to_csv(intelligence, transcript, video_output)
 
-            # Add to series analyzer
-            analyzer.add_video(video_data, Path(file_path).name)
+            completed[idx] = (video_data, Path(file_path).name)
 
         except Exception as e:
             logger.error(f"   ✗ Failed to process {file_path}: {e}")
             continue
 
+    # Add to series analyzer in series order
+    for idx in sorted(completed):
+        analyzer.add_video(*completed[idx])
+
     # Generate aggregate analysis
     logger.info("\n📊 Generating series analysis...")
     series_analysis = analyzer.analyze()
@@ -711,9 +721,9 @@ def dashboard(output_dir, dashboard_dir):
 @click.option(
     "--transcription-provider",
     "-t",
-    type=click.Choice(["voxtral", "whisperx-modal", "whisperx-local"]),
+    type=click.Choice(["voxtral", "whisperx-modal", "whisperx-local", "auto"]),
     default="whisperx-local",
-    help="Transcription provider",
+    help="Transcription provider (auto routes each file to the best available backend)",
 )
 @click.option("--batch-id", help="Custom batch identifier (auto-generated if not provided)")
 def batch_process(files_list, output_dir, max_concurrent, transcription_provider, batch_id):
@@ -943,3 +953,81 @@ def show_stats():
     click.echo(f"  ✅ Completed: {stats['completed']}")
     click.echo(f"  ❌ Failed: {stats['failed']}")
     click.echo(f"Success rate: {stats['success_rate']}")
+
+
+# === Database Commands ===
+# --db-path defaults to the database the API routers read (api.entity_search.DB_PATH)
+
+
+@cli.group()
+def db():
+    """Local intelligence database commands."""
+
+
+@db.command("load")
+@click.argument("source")
+@click.option("--db-path", default="data/station10.db", help="SQLite database file")
+@click.option("--batch-size", type=int, default=100, help="Videos written per transaction")
+@click.option("--read-workers", type=int, default=8, help="Threads downloading/parsing outputs")
+def db_load(source: str, db_path: str, batch_size: int, read_workers: int):
+    """Load every transcript.json under SOURCE into the database.
+
+    SOURCE is a local output directory or a gs://bucket/prefix URI. Safe to
+    re-run: rows are upserted by stable id, never duplicated. Older databases
+    are migrated to the current schema first.
+    """
+    from ..database.backfill import load_outputs, open_source
+    from ..database.db_manager import ClipScribeDatabase
+
+    if not source.startswith("gs://") and not Path(source).is_dir():
+        raise click.BadParameter(f"Not a directory or gs:// URI: {source}", param_hint="SOURCE")
+
+    def report(stats):
+        click.echo(
+            f"  {stats.videos}/{stats.directories} videos, {stats.rows} rows "
+            f"({stats.rows_per_second:.0f} rows/s)"
+        )
+
+    with ClipScribeDatabase(db_path) as database:
+        stats = load_outputs(
+            database,
+            open_source(source),
+            batch_size=batch_size,
+            read_workers=read_workers,
+            progress=report,
+        )
+
+    click.echo(
+        f"\n✅ Loaded {stats.videos} videos ({stats.rows} rows) in {stats.seconds:.1f}s "
+        f"({stats.rows_per_second:.0f} rows/s)"
+    )
+    if stats.skipped:
+        click.echo(f"⚠️  Skipped {stats.skipped} unreadable outputs")
+
+
+# Former name of `db load`, when it only read local output directories
+db.add_command(db_load, name="backfill")
+
+
+@db.command("rollups")
+@click.option("--db-path", default="data/station10.db", help="SQLite database file")
+@click.option("--check", is_flag=True, help="Only report drift; fail if any is found")
+def db_rollups(db_path: str, check: bool):
+    """Verify the stats rollups against the base tables and rebuild them."""
+    from ..database.db_manager import ClipScribeDatabase
+
+    with ClipScribeDatabase(db_path) as database:
+        problems = database.verify_rollups()
+        for problem in problems[:20]:
+            click.echo(f"  {problem}")
+        if len(problems) > 20:
+            click.echo(f"  ... and {len(problems) - 20} more")
+
+        if check:
+            if problems:
+                raise click.ClickException(f"{len(problems)} rollup rows out of date")
+            click.echo("✅ Rollups consistent")
+            return
+
+        database.rebuild_rollups()
+    click.echo(f"✅ Rollups rebuilt ({len(problems)} rows were out of date)")
@@ -211,6 +211,25 @@ class Settings(BaseSettings):
         le=1.0,
         description="Only fact-check entities below this confidence threshold",
     )
+    fact_check_max_concurrency: int = Field(
+        default=8, ge=1, description="Max fact-check calls in flight at once"
+    )
+    enable_fact_check_batching: bool = Field(
+        default=True, description="Verify several entities of one type per fact-check call"
+    )
+    fact_check_max_batch_size: int = Field(
+        default=10, ge=1, le=50, description="Upper bound for the adaptive fact-check batch size"
+    )
+    fact_check_cache_path: Optional[str] = Field(
+        default="fact_check_cache.db",
+        description=(
+            "SQLite file caching fact-check results across runs, relative to output_dir "
+            "(None for memory only)"
+        ),
+    )
+    fact_check_cache_ttl_hours: float = Field(
+        default=168.0, gt=0, description="How long a cached fact-check result stays valid"
+    )
 
     # Knowledge Base / Collections API (August 2025)
     enable_knowledge_base: bool = Field(
@@ -226,12 +245,35 @@ class Settings(BaseSettings):
     auto_add_to_knowledge_base: bool = Field(
         default=True, description="Automatically add processed videos to knowledge base"
     )
+    knowledge_base_batch_size: int = Field(
+        default=16, ge=1, description="Videos added to the collection per batched request"
+    )
+    knowledge_base_batch_window: float = Field(
+        default=5.0, gt=0, description="Seconds to wait for a knowledge base batch to fill"
+    )
+    knowledge_index_path: Optional[str] = Field(
+        default="data/knowledge_index.db",
+        description="SQLite file backing the local knowledge search index (None for memory only)",
+    )
 
     # Structured Outputs (November 2025)
     enable_grok_structured_outputs: bool = Field(
         default=True,
         description="Use json_schema mode for type-safe structured outputs (vs basic json_object)",
     )
+    enable_grok_streaming: bool = Field(
+        default=False,
+        description="Stream chunk extraction responses (SSE), parsing objects as they arrive",
+    )
+
+    # Request hedging (tail-latency reduction)
+    enable_grok_request_hedging: bool = Field(
+        default=False,
+        description="Send a duplicate Grok request when a call exceeds the observed p90 latency",
+    )
+    grok_hedge_budget_per_minute: int = Field(
+        default=10, ge=0, description="Maximum hedge (duplicate) Grok requests per minute"
+    )
 
     # Performance Settings
     concurrent_downloads: int = Field(default=10)  # Increased for enterprise
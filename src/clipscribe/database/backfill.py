@@ -0,0 +1,280 @@
+"""
+Load processed outputs into the local intelligence database.
+
+Every ``clipscribe process`` run writes ``<timestamp>_<name>/transcript.json``.
+``load_outputs`` reads those files from an ``OutputSource`` (a local output
+tree or a ``gs://`` prefix) on a thread pool, turns each into a video record
+and writes them through ``ClipScribeDatabase.ingest_videos`` in batches of
+``batch_size`` videos per transaction. Rows are upserted by stable id, so
+re-running a load updates in place. With the database in WAL mode, readers
+keep querying while a load runs.
+
+This replaces the one-off importers that used to live in ``scripts/database/``.
+
+Examples:
+    >>> with ClipScribeDatabase("clipscribe.db") as db:
+    ...     stats = load_outputs(db, open_source("gs://clipscribe-validation/validation/"))
+    >>> print(f"{stats.rows_per_second:.0f} rows/s")
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from .db_manager import ClipScribeDatabase
+
+try:
+    from google.cloud import storage
+except ImportError:
+    storage = None
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FILENAME = "transcript.json"
+
+
+@dataclass
+class BackfillStats:
+    """Outcome of a load run."""
+
+    directories: int = 0
+    videos: int = 0
+    skipped: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def parse_output(data: Dict[str, Any], name: str, output_path: str) -> Dict[str, Any]:
+    """
+    Build an ``ingest_video`` record from a parsed output file.
+
+    Accepts the pipeline layout (``transcript`` / ``intelligence`` /
+    ``file_metadata`` sections) and the flat validation layout with
+    top-level ``entities``, ``relationships`` and ``topics``.
+
+    Args:
+        data: Parsed ``transcript.json``
+        name: Name of the directory holding the file (fallback video id)
+        output_path: Where the output lives, recorded on the video
+
+    Returns:
+        Video record
+    """
+    transcript = data.get("transcript") or {}
+    intelligence = data.get("intelligence") or data
+    file_metadata = data.get("file_metadata") or {}
+    source_metadata = transcript.get("metadata") or {}
+
+    processed_at = None
+    if file_metadata.get("processed_at"):
+        try:
+            processed_at = datetime.strptime(
+                file_metadata["processed_at"], "%Y%m%d_%H%M%S"
+            ).isoformat(sep=" ")
+        except ValueError:
+            processed_at = file_metadata["processed_at"]
+
+    filename = file_metadata.get("filename") or name
+    return {
+        "video_id": source_metadata.get("video_id") or name,
+        "url": source_metadata.get("url") or filename,
+        "title": source_metadata.get("title") or Path(filename).stem,
+        "cost": file_metadata.get("total_cost", 0.0),
+        "entities": intelligence.get("entities") or [],
+        "relationships": intelligence.get("relationships") or [],
+        "topics": intelligence.get("topics") or [],
+        "segments": transcript.get("segments") or data.get("segments") or [],
+        "output_path": output_path,
+        "channel": source_metadata.get("channel"),
+        "duration": transcript.get("duration"),
+        "processed_at": processed_at,
+    }
+
+
+def read_output_directory(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Build an ``ingest_video`` record from one output directory.
+
+    Args:
+        path: Directory containing ``transcript.json``
+
+    Returns:
+        Video record, or None if the directory holds no readable output
+    """
+    output_file = path / OUTPUT_FILENAME
+    try:
+        with open(output_file, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping {path}: {e}")
+        return None
+    return parse_output(data, path.name, str(path))
+
+
+def find_output_directories(root: Path) -> Iterator[Path]:
+    """Directories under ``root`` (recursively) that contain an output file."""
+    for output_file in sorted(root.rglob(OUTPUT_FILENAME)):
+        yield output_file.parent
+
+
+class LocalOutputSource:
+    """Output directories under a local root."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def keys(self) -> List[Path]:
+        """One key per output file."""
+        return list(find_output_directories(self.root))
+
+    def read(self, key: Path) -> Optional[Dict[str, Any]]:
+        """Video record for a key, or None if unreadable (called from worker threads)."""
+        return read_output_directory(key)
+
+
+class GCSOutputSource:
+    """Output files under a ``gs://bucket/prefix``."""
+
+    def __init__(self, uri: str, client: Optional[Any] = None):
+        """
+        Args:
+            uri: ``gs://bucket/prefix`` to scan recursively
+            client: ``google.cloud.storage.Client`` or compatible (default: ambient credentials)
+
+        Raises:
+            ValueError: If ``uri`` is not a ``gs://`` URI
+            ImportError: If no client is given and google-cloud-storage is missing
+        """
+        if not uri.startswith("gs://"):
+            raise ValueError(f"Not a gs:// URI: {uri}")
+        bucket_name, _, self.prefix = uri[len("gs://") :].partition("/")
+        if client is None:
+            if storage is None:
+                raise ImportError(
+                    "google-cloud-storage is required to load from GCS. "
+                    "Install with: pip install google-cloud-storage"
+                )
+            client = storage.Client()
+        self.bucket = client.bucket(bucket_name)
+
+    def keys(self) -> List[str]:
+        """Blob names of every output file under the prefix."""
+        return sorted(
+            blob.name
+            for blob in self.bucket.list_blobs(prefix=self.prefix)
+            if PurePosixPath(blob.name).name == OUTPUT_FILENAME
+        )
+
+    def read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Video record for a blob, or None if unreadable (called from worker threads)."""
+        uri = f"gs://{self.bucket.name}/{key}"
+        try:
+            data = json.loads(self.bucket.blob(key).download_as_bytes())
+        except Exception as e:
+            logger.warning(f"Skipping {uri}: {e}")
+            return None
+        # Validation uploads are named "<video>//transcript.json"; PurePosixPath drops the empty part
+        return parse_output(data, PurePosixPath(key).parent.name, uri)
+
+
+def open_source(location: str, client: Optional[Any] = None):
+    """``GCSOutputSource`` for ``gs://`` URIs, otherwise ``LocalOutputSource``."""
+    if location.startswith("gs://"):
+        return GCSOutputSource(location, client=client)
+    return LocalOutputSource(Path(location))
+
+
+def _read_ahead(
+    pool: ThreadPoolExecutor, read: Callable[[Any], Any], keys: Iterable[Any], window: int
+) -> Iterator[Any]:
+    """Ordered ``pool.map`` with at most ``window`` reads in flight, bounding memory."""
+    pending: Deque[Future] = deque()
+    for key in keys:
+        pending.append(pool.submit(read, key))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def load_outputs(
+    db: ClipScribeDatabase,
+    source: Any,
+    batch_size: int = 100,
+    read_workers: int = 8,
+    progress: Optional[Callable[[BackfillStats], None]] = None,
+) -> BackfillStats:
+    """
+    Load every output file from ``source`` into the database.
+
+    Files are downloaded and parsed on a thread pool while earlier batches
+    are being written; each batch of ``batch_size`` videos is one
+    transaction.
+
+    Args:
+        db: Target database
+        source: ``LocalOutputSource``, ``GCSOutputSource`` (see ``open_source``)
+            or any object with ``keys()`` and ``read(key)``
+        batch_size: Videos per transaction
+        read_workers: Threads reading and parsing output files
+        progress: Called with the running stats after each batch
+
+    Returns:
+        Load statistics
+    """
+    stats = BackfillStats()
+    started = time.perf_counter()
+    keys = source.keys()
+    stats.directories = len(keys)
+
+    def write(batch: List[Dict[str, Any]]) -> None:
+        counts = db.ingest_videos(batch)
+        stats.videos += counts["videos"]
+        stats.rows += sum(counts.values())
+        stats.seconds = time.perf_counter() - started
+        if progress:
+            progress(stats)
+
+    batch: List[Dict[str, Any]] = []
+    workers = max(1, read_workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for record in _read_ahead(pool, source.read, keys, window=workers + batch_size):
+            if record is None:
+                stats.skipped += 1
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                write(batch)
+                batch = []
+        if batch:
+            write(batch)
+
+    stats.seconds = time.perf_counter() - started
+    logger.info(
+        f"Loaded {stats.videos} videos ({stats.rows} rows) in {stats.seconds:.1f}s "
+        f"({stats.rows_per_second:.0f} rows/s, {stats.skipped} skipped)"
+    )
+    return stats
+
+
+def backfill_outputs(
+    db: ClipScribeDatabase,
+    root: Path,
+    batch_size: int = 100,
+    read_workers: int = 4,
+    progress: Optional[Callable[[BackfillStats], None]] = None,
+) -> BackfillStats:
+    """Load every output directory under a local ``root`` (see ``load_outputs``)."""
+    return load_outputs(
+        db, LocalOutputSource(root), batch_size, read_workers=read_workers, progress=progress
+    )
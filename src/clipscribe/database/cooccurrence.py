@@ -0,0 +1,489 @@
+"""
+Entity co-occurrence graph maintained inside the intelligence database.
+
+"Which entities appear with X, and in which videos" used to need the remote
+knowledge base (``find_entity_cooccurrences``) or reading every video's
+output. ``ensure_cooccurrence_index`` adds an adjacency index kept current
+by triggers, in the same transaction as every entity and relationship write:
+
+- ``graph_nodes``: one node per canonical entity (``lower(trim(name))``, so
+  "NASA" in one video and "Nasa" in another are the same node), displayed
+  under the smallest spelling seen (as ``rebuild_cooccurrence_index`` picks
+  with ``MIN(name)``), with the number of videos it appears in
+- ``graph_video_nodes``: which nodes each video contains
+- ``graph_edges``: node pairs with the number of videos they share, stored in
+  both directions so neighbours are one primary-key range, plus a covering
+  ``(source, videos DESC, target)`` index for top-k
+- ``graph_predicates``: extracted relationship types between two nodes
+
+Neighbour and 2-hop queries read only index ranges, so their cost depends on
+``limit`` rather than corpus size. ``shortest_path`` runs a bidirectional
+breadth-first search over the same ranges.
+
+Pairs are counted when a node first appears in a video, so a video with n
+distinct entities costs O(n^2) edge updates on first ingest; reloading an
+unchanged video touches nothing. SQLite's ``lower`` folds ASCII only.
+
+Examples:
+    >>> ensure_cooccurrence_index(conn)
+    >>> [n["name"] for n in neighbors(conn, "NASA", limit=3)]
+    ['SpaceX', 'Artemis', 'ESA']
+    >>> [n["name"] for n in shortest_path(conn, "NASA", "Kremlin")["nodes"]]
+    ['NASA', 'Roscosmos', 'Kremlin']
+"""
+
+import json
+import logging
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_NODE_ID = "(SELECT id FROM graph_nodes WHERE key = lower(trim({name})))"
+
+
+def _add_node(name: str) -> str:
+    return f"""
+        INSERT INTO graph_nodes (key, name) VALUES (lower(trim({name})), {name})
+        ON CONFLICT(key) DO UPDATE SET name = excluded.name WHERE excluded.name < name;"""
+
+
+def _entity_in(ref: str) -> str:
+    node = _NODE_ID.format(name=f"{ref}.name")
+    return _add_node(f"{ref}.name") + f"""
+        INSERT INTO graph_video_nodes VALUES ({ref}.video_id, {node}, 1)
+        ON CONFLICT(video_id, node_id) DO UPDATE SET entity_rows = entity_rows + 1;"""
+
+
+def _entity_out(ref: str) -> str:
+    node = _NODE_ID.format(name=f"{ref}.name")
+    return f"""
+        UPDATE graph_video_nodes SET entity_rows = entity_rows - 1
+        WHERE video_id = {ref}.video_id AND node_id = {node};
+        DELETE FROM graph_video_nodes
+        WHERE video_id = {ref}.video_id AND node_id = {node} AND entity_rows <= 0;"""
+
+
+def _predicate_in(ref: str) -> str:
+    source = _NODE_ID.format(name=f"{ref}.source_entity")
+    target = _NODE_ID.format(name=f"{ref}.target_entity")
+    return _add_node(f"{ref}.source_entity") + _add_node(f"{ref}.target_entity") + f"""
+        INSERT INTO graph_predicates
+        VALUES ({source}, {target}, COALESCE({ref}.relationship_type, ''), 1)
+        ON CONFLICT(source, target, predicate) DO UPDATE SET relationships = relationships + 1;"""
+
+
+def _predicate_out(ref: str) -> str:
+    source = _NODE_ID.format(name=f"{ref}.source_entity")
+    target = _NODE_ID.format(name=f"{ref}.target_entity")
+    key = f"""source = {source} AND target = {target}
+            AND predicate = COALESCE({ref}.relationship_type, '')"""
+    return f"""
+        UPDATE graph_predicates SET relationships = relationships - 1 WHERE {key};
+        DELETE FROM graph_predicates WHERE {key} AND relationships <= 0;"""
+
+
+_INDEX_SQL = f"""
+    CREATE TABLE IF NOT EXISTS graph_nodes (
+        id INTEGER PRIMARY KEY,
+        key TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        videos INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS graph_video_nodes (
+        video_id TEXT NOT NULL,
+        node_id INTEGER NOT NULL,
+        entity_rows INTEGER NOT NULL,
+        PRIMARY KEY (video_id, node_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_graph_video_nodes_node ON graph_video_nodes(node_id, video_id);
+    CREATE TABLE IF NOT EXISTS graph_edges (
+        source INTEGER NOT NULL,
+        target INTEGER NOT NULL,
+        videos INTEGER NOT NULL,
+        PRIMARY KEY (source, target)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_graph_edges_weight ON graph_edges(source, videos DESC, target);
+    CREATE TABLE IF NOT EXISTS graph_predicates (
+        source INTEGER NOT NULL,
+        target INTEGER NOT NULL,
+        predicate TEXT NOT NULL,
+        relationships INTEGER NOT NULL,
+        PRIMARY KEY (source, target, predicate)
+    ) WITHOUT ROWID;
+
+    CREATE TRIGGER IF NOT EXISTS graph_entities_ai AFTER INSERT ON entities BEGIN
+        {_entity_in("new")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS graph_entities_ad AFTER DELETE ON entities BEGIN
+        {_entity_out("old")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS graph_entities_au AFTER UPDATE OF name, video_id ON entities
+    WHEN lower(trim(old.name)) != lower(trim(new.name)) OR old.video_id != new.video_id BEGIN
+        {_entity_out("old")}
+        {_entity_in("new")}
+    END;
+
+    -- A node entering or leaving a video adds or removes one shared video on each pair
+    CREATE TRIGGER IF NOT EXISTS graph_video_nodes_ai AFTER INSERT ON graph_video_nodes BEGIN
+        UPDATE graph_nodes SET videos = videos + 1 WHERE id = new.node_id;
+        INSERT INTO graph_edges (source, target, videos)
+        SELECT new.node_id, node_id, 1 FROM graph_video_nodes
+        WHERE video_id = new.video_id AND node_id != new.node_id
+        ON CONFLICT(source, target) DO UPDATE SET videos = videos + 1;
+        INSERT INTO graph_edges (source, target, videos)
+        SELECT node_id, new.node_id, 1 FROM graph_video_nodes
+        WHERE video_id = new.video_id AND node_id != new.node_id
+        ON CONFLICT(source, target) DO UPDATE SET videos = videos + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS graph_video_nodes_ad AFTER DELETE ON graph_video_nodes BEGIN
+        UPDATE graph_nodes SET videos = videos - 1 WHERE id = old.node_id;
+        UPDATE graph_edges SET videos = videos - 1
+        WHERE source = old.node_id
+          AND target IN (SELECT node_id FROM graph_video_nodes WHERE video_id = old.video_id);
+        UPDATE graph_edges SET videos = videos - 1
+        WHERE source IN (SELECT node_id FROM graph_video_nodes WHERE video_id = old.video_id)
+          AND target = old.node_id;
+        DELETE FROM graph_edges WHERE source = old.node_id AND videos <= 0;
+        DELETE FROM graph_edges
+        WHERE source IN (SELECT node_id FROM graph_video_nodes WHERE video_id = old.video_id)
+          AND target = old.node_id AND videos <= 0;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS graph_relationships_ai AFTER INSERT ON relationships BEGIN
+        {_predicate_in("new")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS graph_relationships_ad AFTER DELETE ON relationships BEGIN
+        {_predicate_out("old")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS graph_relationships_au
+    AFTER UPDATE OF source_entity, target_entity, relationship_type ON relationships
+    WHEN lower(trim(old.source_entity)) != lower(trim(new.source_entity))
+        OR lower(trim(old.target_entity)) != lower(trim(new.target_entity))
+        OR old.relationship_type IS NOT new.relationship_type BEGIN
+        {_predicate_out("old")}
+        {_predicate_in("new")}
+    END;
+"""
+
+# Expected contents of each derived table, computed from entities/relationships
+_REBUILD_SQL = """
+    INSERT INTO graph_nodes (key, name)
+        SELECT lower(trim(name)), MIN(name) FROM (
+            SELECT name FROM entities
+            UNION ALL SELECT source_entity FROM relationships
+            UNION ALL SELECT target_entity FROM relationships
+        )
+        GROUP BY lower(trim(name));
+    INSERT INTO graph_video_nodes
+        SELECT e.video_id, n.id, COUNT(*) FROM entities e
+        JOIN graph_nodes n ON n.key = lower(trim(e.name))
+        GROUP BY e.video_id, n.id;
+    UPDATE graph_nodes SET videos = (
+        SELECT COUNT(*) FROM graph_video_nodes WHERE node_id = graph_nodes.id
+    );
+    INSERT INTO graph_edges
+        SELECT a.node_id, b.node_id, COUNT(*) FROM graph_video_nodes a
+        JOIN graph_video_nodes b ON b.video_id = a.video_id AND b.node_id != a.node_id
+        GROUP BY a.node_id, b.node_id;
+    INSERT INTO graph_predicates
+        SELECT s.id, t.id, COALESCE(r.relationship_type, ''), COUNT(*) FROM relationships r
+        JOIN graph_nodes s ON s.key = lower(trim(r.source_entity))
+        JOIN graph_nodes t ON t.key = lower(trim(r.target_entity))
+        GROUP BY s.id, t.id, COALESCE(r.relationship_type, '');
+"""
+
+_TABLES = ("graph_predicates", "graph_edges", "graph_video_nodes", "graph_nodes")
+
+_DROP_TRIGGERS = ("graph_video_nodes_ai", "graph_video_nodes_ad")
+
+
+def ensure_cooccurrence_index(conn: sqlite3.Connection) -> None:
+    """
+    Create the co-occurrence tables and their triggers, building them on first use.
+
+    Args:
+        conn: Open connection to a database with the ClipScribe schema
+    """
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'graph_edges'"
+    ).fetchone()
+    conn.executescript(_INDEX_SQL)
+    if not existed:
+        rebuild_cooccurrence_index(conn)
+        logger.info("Created entity co-occurrence index")
+
+
+def rebuild_cooccurrence_index(conn: sqlite3.Connection) -> None:
+    """Recompute the co-occurrence tables from entities and relationships."""
+    with conn:
+        # The bulk insert counts pairs itself; the per-node triggers would double them
+        for trigger in _DROP_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        for table in _TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        for statement in _REBUILD_SQL.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+    conn.executescript(_INDEX_SQL)
+
+
+def node_id(conn: sqlite3.Connection, name: str) -> Optional[int]:
+    """Node id of an entity name (any casing), or None if it is not in the graph."""
+    row = conn.execute(f"SELECT {_NODE_ID.format(name='?')}", (name,)).fetchone()
+    return row[0]
+
+
+def neighbors(
+    conn: sqlite3.Connection, name: str, limit: int = 20, min_videos: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Entities appearing in the most videos together with ``name``.
+
+    Args:
+        conn: Open connection
+        name: Entity name (any casing)
+        limit: Maximum neighbours
+        min_videos: Fewest shared videos
+
+    Returns:
+        One dict per neighbour, most shared videos first: ``name``,
+        ``videos`` (shared), ``total_videos`` (the neighbour's own count),
+        ``predicates`` (relationship types name -> neighbour) and
+        ``inverse_predicates`` (neighbour -> name)
+    """
+    source = node_id(conn, name)
+    if source is None:
+        return []
+    rows = conn.execute(
+        """
+        SELECT e.target, n.name, e.videos, n.videos
+        FROM graph_edges e INDEXED BY idx_graph_edges_weight
+        JOIN graph_nodes n ON n.id = e.target
+        WHERE e.source = ? AND e.videos >= ?
+        ORDER BY e.videos DESC, e.target
+        LIMIT ?
+        """,
+        (source, min_videos, limit),
+    ).fetchall()
+    predicates = _predicates(conn, source, [row[0] for row in rows])
+    return [
+        {
+            "name": neighbor_name,
+            "videos": shared,
+            "total_videos": total,
+            "predicates": predicates.get((source, target), []),
+            "inverse_predicates": predicates.get((target, source), []),
+        }
+        for target, neighbor_name, shared, total in rows
+    ]
+
+
+def _predicates(conn: sqlite3.Connection, node: int, others: List[int]) -> Dict[tuple, List[str]]:
+    """Predicates between ``node`` and each of ``others``, both ways, keyed by (source, target)."""
+    rows = conn.execute(
+        """
+        SELECT source, target, predicate FROM (
+            SELECT source, target, predicate, relationships FROM graph_predicates
+            WHERE source = ? AND target IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT source, target, predicate, relationships FROM graph_predicates
+            WHERE source IN (SELECT value FROM json_each(?)) AND target = ?
+        )
+        WHERE predicate != ''
+        ORDER BY relationships DESC, predicate
+        """,
+        (node, json.dumps(others), json.dumps(others), node),
+    )
+    predicates: Dict[tuple, List[str]] = {}
+    for source, target, predicate in rows:
+        predicates.setdefault((source, target), []).append(predicate)
+    return predicates
+
+
+def expand(
+    conn: sqlite3.Connection, name: str, limit: int = 10, min_videos: int = 1
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Two-hop neighbourhood: the top ``limit`` neighbours, and the top ``limit`` of each.
+
+    Args:
+        conn: Open connection
+        name: Entity name (any casing)
+        limit: Neighbours kept per node
+        min_videos: Fewest shared videos per edge
+
+    Returns:
+        ``nodes`` (``name``, ``videos``, ``hops`` from ``name``) and ``edges``
+        (``source``, ``target``, shared ``videos``), each undirected pair listed
+        once; empty if ``name`` is unknown
+    """
+    source = node_id(conn, name)
+    if source is None:
+        return {"nodes": [], "edges": []}
+    # The correlated LIMIT keeps each hop-2 lookup to ``limit`` index entries, even for hubs
+    rows = conn.execute(
+        """
+        WITH hop1 AS (
+            SELECT target, videos FROM graph_edges INDEXED BY idx_graph_edges_weight
+            WHERE source = :source AND videos >= :min_videos
+            ORDER BY videos DESC, target
+            LIMIT :limit
+        )
+        SELECT :source, target, videos, 1 FROM hop1
+        UNION ALL
+        SELECT e.source, e.target, e.videos, 2
+        FROM hop1 h
+        JOIN graph_edges e ON e.source = h.target
+        WHERE e.target IN (
+            SELECT target FROM graph_edges INDEXED BY idx_graph_edges_weight
+            WHERE source = h.target AND target != :source AND videos >= :min_videos
+            ORDER BY videos DESC, target
+            LIMIT :limit
+        )
+        """,
+        {"source": source, "min_videos": min_videos, "limit": limit},
+    ).fetchall()
+
+    hops = {source: 0}
+    pairs: Dict[tuple, int] = {}
+    for a, b, shared, hop in rows:
+        hops[b] = min(hops.get(b, hop), hop)
+        # Co-occurrence is symmetric; two hop-1 nodes can list each other
+        if (b, a) not in pairs:
+            pairs.setdefault((a, b), shared)
+    names = _names(conn, list(hops))
+    return {
+        "nodes": [
+            {"name": names[node][0], "videos": names[node][1], "hops": hop}
+            for node, hop in sorted(hops.items(), key=lambda item: item[1])
+        ],
+        "edges": [
+            {"source": names[a][0], "target": names[b][0], "videos": shared}
+            for (a, b), shared in pairs.items()
+        ],
+    }
+
+
+def _names(conn: sqlite3.Connection, ids: List[int]) -> Dict[int, tuple]:
+    rows = conn.execute(
+        "SELECT id, name, videos FROM graph_nodes WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(ids),),
+    )
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def shortest_path(
+    conn: sqlite3.Connection,
+    source_name: str,
+    target_name: str,
+    max_depth: int = 4,
+    min_videos: int = 1,
+) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Fewest-hop chain of co-occurring entities connecting two entities.
+
+    Bidirectional breadth-first search: each step expands the smaller
+    frontier with one batched adjacency read.
+
+    Args:
+        conn: Open connection
+        source_name: Start entity (any casing)
+        target_name: End entity (any casing)
+        max_depth: Longest path, in edges
+        min_videos: Fewest shared videos for an edge to be followed
+
+    Returns:
+        ``nodes`` along the path and ``edges`` between them, shaped as in
+        ``expand``, or None if not connected within ``max_depth``
+    """
+    start, goal = node_id(conn, source_name), node_id(conn, target_name)
+    if start is None or goal is None:
+        return None
+
+    # Parent pointers toward start (forward) and toward goal (backward)
+    forward: Dict[int, Optional[int]] = {start: None}
+    backward: Dict[int, Optional[int]] = {goal: None}
+    forward_frontier, backward_frontier = [start], [goal]
+    meet = start if start == goal else None
+
+    for _ in range(max_depth):
+        if meet is not None or not forward_frontier or not backward_frontier:
+            break
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        frontier = forward_frontier if expand_forward else backward_frontier
+        seen, other = (forward, backward) if expand_forward else (backward, forward)
+        next_frontier = []
+        for node, neighbor in conn.execute(
+            """
+            SELECT source, target FROM graph_edges
+            WHERE source IN (SELECT value FROM json_each(?)) AND videos >= ?
+            """,
+            (json.dumps(frontier), min_videos),
+        ):
+            if neighbor in seen:
+                continue
+            seen[neighbor] = node
+            next_frontier.append(neighbor)
+            if neighbor in other:
+                meet = neighbor
+                break
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    if meet is None:
+        return None
+    path = []
+    node: Optional[int] = meet
+    while node is not None:
+        path.append(node)
+        node = forward[node]
+    path.reverse()
+    node = backward[meet]
+    while node is not None:
+        path.append(node)
+        node = backward[node]
+
+    names = _names(conn, path)
+    edges = []
+    for a, b in zip(path, path[1:]):
+        shared = conn.execute(
+            "SELECT videos FROM graph_edges WHERE source = ? AND target = ?", (a, b)
+        ).fetchone()[0]
+        edges.append({"source": names[a][0], "target": names[b][0], "videos": shared})
+    return {
+        "nodes": [
+            {"name": names[node][0], "videos": names[node][1], "hops": hop}
+            for hop, node in enumerate(path)
+        ],
+        "edges": edges,
+    }
+
+
+def shared_videos(
+    conn: sqlite3.Connection, name: str, other: str, limit: int = 100
+) -> List[Dict[str, Any]]:
+    """
+    Videos in which two entities both appear, most recent first.
+
+    Returns:
+        ``video_id``, ``title`` and ``processed_at`` per video
+    """
+    a, b = node_id(conn, name), node_id(conn, other)
+    if a is None or b is None:
+        return []
+    rows = conn.execute(
+        """
+        SELECT v.video_id, v.title, v.processed_at
+        FROM graph_video_nodes x
+        JOIN graph_video_nodes y ON y.video_id = x.video_id AND y.node_id = ?
+        JOIN videos v ON v.video_id = x.video_id
+        WHERE x.node_id = ?
+        ORDER BY v.processed_at DESC
+        LIMIT ?
+        """,
+        (b, a, limit),
+    )
+    return [{"video_id": row[0], "title": row[1], "processed_at": row[2]} for row in rows]
@@ -4,14 +4,101 @@ ClipScribe Local Intelligence Database
 Single-user database for entity search, relationship tracking, and cost management.
 """
 
+import json
 import logging
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cooccurrence import ensure_cooccurrence_index, expand, neighbors, shared_videos, shortest_path
+from .fts import build_match_query, ensure_fts_index
+from .migrations import migrate
+from .records import alias_rows, entity_rows, relationship_rows, topic_rows
+from .rollups import ensure_rollups, rebuild_rollups, verify_rollups
+from .segments import ensure_segment_index, interval_query, segment_rows, text_query
+from .trigram import (
+    DEFAULT_MIN_SIMILARITY,
+    ensure_trigram_index,
+    fuzzy_query,
+    sync_trigram_index,
+)
 
 logger = logging.getLogger(__name__)
 
+# Statements reused on every ingest; sqlite3 keeps them prepared in its statement cache
+_UPSERT_VIDEO_SQL = """
+    INSERT INTO videos (
+        video_id, url, title, processing_cost,
+        entity_count, relationship_count, output_path,
+        channel, duration, processed_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    ON CONFLICT(video_id) DO UPDATE SET
+        url = excluded.url,
+        title = excluded.title,
+        processing_cost = excluded.processing_cost,
+        entity_count = excluded.entity_count,
+        relationship_count = excluded.relationship_count,
+        output_path = excluded.output_path,
+        channel = excluded.channel,
+        duration = excluded.duration,
+        processed_at = excluded.processed_at
+"""
+# Upserts by stable id skip unchanged rows, so reloading an output writes nothing
+_UPSERT_ENTITY_SQL = """
+    INSERT INTO entities (
+        stable_id, video_id, name, entity_type,
+        mention_count, confidence, evidence, timestamp
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(stable_id) DO UPDATE SET
+        mention_count = excluded.mention_count,
+        confidence = excluded.confidence,
+        evidence = excluded.evidence,
+        timestamp = excluded.timestamp
+    WHERE mention_count IS NOT excluded.mention_count
+        OR confidence IS NOT excluded.confidence
+        OR evidence IS NOT excluded.evidence
+        OR timestamp IS NOT excluded.timestamp
+"""
+_UPSERT_RELATIONSHIP_SQL = """
+    INSERT INTO relationships (
+        stable_id, video_id, source_entity, target_entity,
+        relationship_type, evidence
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(stable_id) DO UPDATE SET evidence = excluded.evidence
+    WHERE evidence IS NOT excluded.evidence
+"""
+_UPSERT_TOPIC_SQL = """
+    INSERT INTO topics (
+        stable_id, video_id, name, relevance, time_range,
+        schema_type, schema_subtype
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(stable_id) DO UPDATE SET
+        relevance = excluded.relevance,
+        time_range = excluded.time_range,
+        schema_type = excluded.schema_type,
+        schema_subtype = excluded.schema_subtype
+    WHERE relevance IS NOT excluded.relevance
+        OR time_range IS NOT excluded.time_range
+        OR schema_type IS NOT excluded.schema_type
+        OR schema_subtype IS NOT excluded.schema_subtype
+"""
+# Rows of a video that the latest output no longer contains
+_DELETE_STALE_SQL = """
+    DELETE FROM {table}
+    WHERE video_id = ? AND stable_id NOT IN (SELECT value FROM json_each(?))
+"""
+_INSERT_ALIAS_SQL = "INSERT OR IGNORE INTO entity_aliases (video_id, name, alias) VALUES (?, ?, ?)"
+_DELETE_ALIAS_SQL = "DELETE FROM entity_aliases WHERE video_id = ? AND name = ? AND alias = ?"
+_INSERT_SEGMENT_SQL = """
+    INSERT INTO segments (video_id, start_time, end_time, speaker, text)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
 
 class ClipScribeDatabase:
     """Manage ClipScribe local intelligence database."""
@@ -25,19 +112,53 @@ class ClipScribeDatabase:
         """
         self.db_path = Path(db_path)
         self.conn = None
+        self.fts_enabled = False
+        self.rtree_enabled = False
+        self.schema_version = 0
         self._initialize()
 
     def _initialize(self):
         """Create database and tables from schema."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn = sqlite3.connect(str(self.db_path), cached_statements=256)
         self.conn.row_factory = sqlite3.Row  # Dict-like access
 
-        # Read and execute schema
-        schema_path = Path(__file__).parent / "schema.sql"
-        if schema_path.exists():
-            with open(schema_path) as f:
-                self.conn.executescript(f.read())
+        # WAL lets readers query while a backfill writes; NORMAL only fsyncs at checkpoints
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA busy_timeout = 5000")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+        # Writes are ON CONFLICT DO UPDATE upserts, which fire the rollup UPDATE triggers;
+        # recursive triggers keep a REPLACE from other tools firing delete triggers too
+        self.conn.execute("PRAGMA recursive_triggers = ON")
+
+        # Create or upgrade the schema (versioned in PRAGMA user_version)
+        self.schema_version = migrate(self.conn)
+
+        # Full-text indexes for name/evidence search (LIKE '%q%' cannot use B-tree indexes)
+        self.fts_enabled = ensure_fts_index(
+            self.conn, "entities", ["name"], content_rowid="id"
+        ) and ensure_fts_index(
+            self.conn,
+            "relationships",
+            ["source_entity", "target_entity", "relationship_type", "evidence"],
+            content_rowid="id",
+        )
+        if self.fts_enabled:
+            ensure_fts_index(self.conn, "topics", ["name"], content_rowid="id")
+            ensure_fts_index(self.conn, "segments", ["text"], content_rowid="id")
+
+        # Interval index for time-range segment lookups across videos
+        self.rtree_enabled = ensure_segment_index(self.conn)
+
+        # Trigger-maintained aggregates behind the stats methods
+        ensure_rollups(self.conn)
+
+        # Trigram posting lists for typo-tolerant entity name lookup
+        ensure_trigram_index(self.conn)
+
+        # Trigger-maintained entity co-occurrence graph
+        ensure_cooccurrence_index(self.conn)
 
         logger.info(f"Database initialized: {self.db_path}")
 
@@ -70,15 +191,8 @@ class ClipScribeDatabase:
         Returns:
             Row ID of inserted/updated video
         """
-        cursor = self.conn.execute(
-            """
-            INSERT OR REPLACE INTO videos (
-                video_id, url, title, processing_cost,
-                entity_count, relationship_count, output_path,
-                channel, duration, processed_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """,
+        self.conn.execute(
+            _UPSERT_VIDEO_SQL,
             (
                 video_id,
                 url,
@@ -89,12 +203,130 @@ class ClipScribeDatabase:
                 output_path,
                 kwargs.get("channel"),
                 kwargs.get("duration"),
+                None,  # processed now
             ),
         )
+        row = self.conn.execute("SELECT id FROM videos WHERE video_id = ?", (video_id,)).fetchone()
 
         self.conn.commit()
         logger.info(f"Video recorded: {video_id} ({entity_count} entities, ${cost:.4f})")
-        return cursor.lastrowid
+        return row["id"]
+
+    def ingest_video(
+        self,
+        video_id: str,
+        url: str,
+        title: str,
+        cost: float,
+        entities: List[Dict],
+        relationships: List[Dict],
+        topics: Optional[List[Dict]] = None,
+        output_path: str = "",
+        **kwargs,
+    ) -> None:
+        """
+        Write a processed video and all of its rows in one transaction.
+
+        Replaces any earlier entities, relationships and topics of the video,
+        and its transcript segments when ``segments`` is given. Rows are
+        upserted by stable id, so re-ingesting an unchanged output rewrites
+        nothing and row ids stay the same.
+
+        Args:
+            video_id: Unique video identifier
+            url: Video URL or source
+            title: Video title
+            cost: Processing cost in USD
+            entities: Entity dicts (name, type, mention_count, confidence)
+            relationships: Relationship dicts (source/subject, target/object, type/predicate,
+                evidence)
+            topics: Topic dicts (name, relevance, time_range)
+            output_path: Path to output directory
+            **kwargs: Optional fields (channel, duration, processed_at, segments)
+        """
+        record = dict(
+            kwargs,
+            video_id=video_id,
+            url=url,
+            title=title,
+            cost=cost,
+            entities=entities,
+            relationships=relationships,
+            topics=topics or [],
+            output_path=output_path,
+        )
+        self.ingest_videos([record])
+
+    def ingest_videos(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Write many processed videos in a single transaction with batched inserts.
+
+        Each record takes the keyword arguments of ``ingest_video``. The
+        transaction is rolled back as a whole if any record fails.
+
+        Args:
+            records: Video records
+
+        Returns:
+            Row counts written (videos, entities, relationships, topics, segments)
+        """
+        counts = {"videos": 0, "entities": 0, "relationships": 0, "topics": 0, "segments": 0}
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for record in records:
+                video_id = record["video_id"]
+                entities = entity_rows(video_id, record.get("entities") or [])
+                relationships = relationship_rows(video_id, record.get("relationships") or [])
+                topics = topic_rows(video_id, record.get("topics") or [])
+
+                self.conn.execute(
+                    _UPSERT_VIDEO_SQL,
+                    (
+                        video_id,
+                        record.get("url") or "",
+                        record.get("title"),
+                        record.get("cost", 0.0),
+                        len(entities),
+                        len(relationships),
+                        record.get("output_path", ""),
+                        record.get("channel"),
+                        record.get("duration"),
+                        record.get("processed_at"),
+                    ),
+                )
+                for table, sql, rows in (
+                    ("entities", _UPSERT_ENTITY_SQL, entities),
+                    ("relationships", _UPSERT_RELATIONSHIP_SQL, relationships),
+                    ("topics", _UPSERT_TOPIC_SQL, topics),
+                ):
+                    self.conn.executemany(sql, rows)
+                    self.conn.execute(
+                        _DELETE_STALE_SQL.format(table=table),
+                        (video_id, json.dumps([row[0] for row in rows])),
+                    )
+                self._replace_aliases(video_id, record.get("entities") or [])
+                # Segments are optional per record; absent means keep the stored ones
+                if record.get("segments") is not None:
+                    rows = segment_rows(video_id, record["segments"])
+                    self.conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
+                    self.conn.executemany(_INSERT_SEGMENT_SQL, rows)
+                    counts["segments"] += len(rows)
+
+                counts["videos"] += 1
+                counts["entities"] += len(entities)
+                counts["relationships"] += len(relationships)
+                counts["topics"] += len(topics)
+            sync_trigram_index(self.conn)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        logger.debug(
+            f"Ingested {counts['videos']} videos ({counts['entities']} entities, "
+            f"{counts['relationships']} relationships, {counts['topics']} topics)"
+        )
+        return counts
 
     def get_video(self, video_id: str) -> Optional[Dict]:
         """Get video by ID."""
@@ -134,35 +366,95 @@ class ClipScribeDatabase:
         self.conn.execute("DELETE FROM entities WHERE video_id = ?", (video_id,))
 
         # Add new entities
-        for entity in entities:
-            self.conn.execute(
-                """
-                INSERT INTO entities (video_id, name, entity_type, mention_count, confidence)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    video_id,
-                    entity.get("name"),
-                    entity.get("type"),
-                    entity.get("mention_count", 1),
-                    entity.get("confidence", 1.0),
-                ),
-            )
+        self.conn.executemany(_UPSERT_ENTITY_SQL, entity_rows(video_id, entities))
+        self._replace_aliases(video_id, entities)
+        sync_trigram_index(self.conn)
 
         self.conn.commit()
         logger.debug(f"Added {len(entities)} entities for video: {video_id}")
 
-    def search_entities(self, query: str, limit: int = 50) -> List[Dict]:
+    def _replace_aliases(self, video_id: str, entities: List[Dict]) -> None:
+        """Make a video's alias rows match its entities, like the stale-row delete for entities."""
+        rows = alias_rows(video_id, entities)
+        stored = self.conn.execute(
+            "SELECT video_id, name, alias FROM entity_aliases WHERE video_id = ?", (video_id,)
+        )
+        # Unchanged aliases are left alone, so reloads queue nothing for the trigram index
+        self.conn.executemany(_DELETE_ALIAS_SQL, {tuple(row) for row in stored} - set(rows))
+        self.conn.executemany(_INSERT_ALIAS_SQL, rows)
+
+    def search_entities(
+        self,
+        query: str,
+        limit: int = 50,
+        fuzzy: bool = False,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+    ) -> List[Dict]:
         """
         Search entities by name.
 
+        Uses the FTS5 index when available: words match as prefixes,
+        ``"quoted phrases"`` match exactly, and results are ranked by BM25.
+        With ``fuzzy``, names and aliases are matched by trigram similarity
+        instead, so misspellings ("Zelenski") still find "Zelenskyy".
+
         Args:
-            query: Search term (partial match)
+            query: Search term (word prefixes and quoted phrases)
             limit: Maximum results
+            fuzzy: Rank by trigram similarity (typo tolerant)
+            min_similarity: Lowest similarity returned when fuzzy (0.0 to 1.0)
 
         Returns:
-            List of entity matches with video context
+            List of entity matches with video context (plus ``similarity`` when fuzzy)
         """
+        if fuzzy:
+            candidates_sql, params = fuzzy_query(query, limit, min_similarity)
+            cursor = self.conn.execute(
+                f"""
+                SELECT
+                    e.name,
+                    e.entity_type,
+                    e.mention_count,
+                    e.confidence,
+                    v.title,
+                    v.url,
+                    v.video_id,
+                    v.processed_at,
+                    c.similarity
+                FROM ({candidates_sql}) c
+                JOIN entities e ON e.name = c.name
+                JOIN videos v ON e.video_id = v.video_id
+                ORDER BY c.similarity DESC, e.mention_count DESC, v.processed_at DESC
+                LIMIT ?
+            """,
+                params + [limit],
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+        match = build_match_query(query)
+        if self.fts_enabled and match:
+            cursor = self.conn.execute(
+                """
+                SELECT
+                    e.name,
+                    e.entity_type,
+                    e.mention_count,
+                    e.confidence,
+                    v.title,
+                    v.url,
+                    v.video_id,
+                    v.processed_at
+                FROM entities_fts f
+                JOIN entities e ON e.id = f.rowid
+                JOIN videos v ON e.video_id = v.video_id
+                WHERE entities_fts MATCH ?
+                ORDER BY f.rank, e.mention_count DESC, v.processed_at DESC
+                LIMIT ?
+            """,
+                (match, limit),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
         cursor = self.conn.execute(
             """
             SELECT
@@ -186,18 +478,14 @@ class ClipScribeDatabase:
         return [dict(row) for row in cursor.fetchall()]
 
     def get_entity_stats(self) -> Dict[str, int]:
-        """Get entity statistics."""
-        cursor = self.conn.execute(
-            """
-            SELECT
-                COUNT(DISTINCT name) as unique_entities,
-                COUNT(*) as total_mentions,
-                COUNT(DISTINCT entity_type) as entity_types,
-                COUNT(DISTINCT video_id) as videos_with_entities
-            FROM entities
-        """
-        )
-        return dict(cursor.fetchone())
+        """Get entity statistics (from the rollup counters, O(1))."""
+        counters = dict(self.conn.execute("SELECT name, value FROM rollup_counters").fetchall())
+        return {
+            "unique_entities": counters.get("unique_entities", 0),
+            "total_mentions": counters.get("entity_rows", 0),
+            "entity_types": counters.get("entity_types", 0),
+            "videos_with_entities": counters.get("videos_with_entities", 0),
+        }
 
     # RELATIONSHIP MANAGEMENT
 
@@ -213,23 +501,7 @@ class ClipScribeDatabase:
         self.conn.execute("DELETE FROM relationships WHERE video_id = ?", (video_id,))
 
         # Add new relationships
-        for rel in relationships:
-            self.conn.execute(
-                """
-                INSERT INTO relationships (
-                    video_id, source_entity, target_entity,
-                    relationship_type, evidence
-                )
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    video_id,
-                    rel.get("source"),
-                    rel.get("target"),
-                    rel.get("type"),
-                    rel.get("evidence", ""),
-                ),
-            )
+        self.conn.executemany(_UPSERT_RELATIONSHIP_SQL, relationship_rows(video_id, relationships))
 
         self.conn.commit()
         logger.debug(f"Added {len(relationships)} relationships for video: {video_id}")
@@ -240,6 +512,9 @@ class ClipScribeDatabase:
         """
         Search relationships involving an entity.
 
+        Matches source/target entity names through the FTS5 index when
+        available (prefix and phrase matching, BM25 ranking).
+
         Args:
             entity: Entity name to search for
             relationship_type: Optional filter by relationship type
@@ -248,6 +523,27 @@ class ClipScribeDatabase:
         Returns:
             List of relationships with video context
         """
+        match = build_match_query(entity, columns=["source_entity", "target_entity"])
+        if self.fts_enabled and match:
+            query = """
+                SELECT
+                    r.*,
+                    v.title,
+                    v.url,
+                    v.processed_at
+                FROM relationships_fts f
+                JOIN relationships r ON r.id = f.rowid
+                JOIN videos v ON r.video_id = v.video_id
+                WHERE relationships_fts MATCH ?
+            """
+            params: tuple = (match,)
+            if relationship_type:
+                query += " AND r.relationship_type = ?"
+                params += (relationship_type,)
+            query += " ORDER BY f.rank, v.processed_at DESC LIMIT ?"
+            cursor = self.conn.execute(query, params + (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+
         if relationship_type:
             query = """
                 SELECT
@@ -281,59 +577,198 @@ class ClipScribeDatabase:
         cursor = self.conn.execute(query, params)
         return [dict(row) for row in cursor.fetchall()]
 
+    # TRANSCRIPT SEGMENTS
+
+    def add_segments(self, video_id: str, segments: List[Dict]):
+        """
+        Store transcript segments for a video, replacing any earlier ones.
+
+        Args:
+            video_id: Video identifier
+            segments: Segment dicts (start/start_time, end/end_time, text, speaker)
+        """
+        rows = segment_rows(video_id, segments)
+        with self.conn:
+            self.conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
+            self.conn.executemany(_INSERT_SEGMENT_SQL, rows)
+        logger.debug(f"Added {len(rows)} segments for {video_id}")
+
+    def get_segments_between(
+        self,
+        start: float,
+        end: float,
+        video_id: Optional[str] = None,
+        speaker: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[Dict]:
+        """
+        Get segments overlapping a time range, in one video or across all.
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds
+            video_id: Optional video filter
+            speaker: Optional speaker label filter
+            limit: Max results
+
+        Returns:
+            Segment dicts ordered by video and start time
+        """
+        sql, params = interval_query(
+            start, end, video_id, speaker, limit, use_rtree=self.rtree_enabled
+        )
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def get_segments_at(
+        self, timestamp: float, video_id: Optional[str] = None, limit: int = 100
+    ) -> List[Dict]:
+        """Get segments being spoken at ``timestamp`` seconds."""
+        return self.get_segments_between(timestamp, timestamp, video_id=video_id, limit=limit)
+
+    def search_segments(
+        self,
+        query: str,
+        video_id: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[Dict]:
+        """
+        Full-text search over segment text, optionally inside a time window.
+
+        Args:
+            query: Search words or "quoted phrases"
+            video_id: Optional video filter
+            start: Only segments ending at or after this time
+            end: Only segments starting at or before this time
+            limit: Max results
+
+        Returns:
+            Matching segment dicts, best matches first
+        """
+        match = build_match_query(query) if self.fts_enabled else None
+        sql, params = text_query(match, query, video_id, start, end, limit)
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
     # COST TRACKING & STATS
 
     def get_cost_stats(self, days: int = 30) -> Dict[str, Any]:
         """
         Get cost statistics for last N days.
 
+        Whole days come from the daily rollup; only the partial first day is
+        read from ``videos`` (an index range scan), so the result matches an
+        aggregate over ``processed_at >= cutoff`` exactly.
+
         Args:
             days: Number of days to analyze
 
         Returns:
             Dictionary with cost stats
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-
         cursor = self.conn.execute(
-            """
+            f"""
             SELECT
-                COUNT(*) as video_count,
-                SUM(processing_cost) as total_cost,
-                AVG(processing_cost) as avg_cost_per_video,
-                MIN(processing_cost) as min_cost,
-                MAX(processing_cost) as max_cost,
-                SUM(entity_count) as total_entities,
-                AVG(entity_count) as avg_entities_per_video
-            FROM videos
-            WHERE processed_at >= ?
-        """,
-            (cutoff_date.isoformat(),),
+                COALESCE(SUM(video_count), 0) as video_count,
+                CASE WHEN SUM(costed_videos) > 0 THEN SUM(total_cost) END as total_cost,
+                SUM(total_cost) / NULLIF(SUM(costed_videos), 0) as avg_cost_per_video,
+                MIN(min_cost) as min_cost,
+                MAX(max_cost) as max_cost,
+                CASE WHEN SUM(counted_videos) > 0 THEN SUM(entity_count) END as total_entities,
+                1.0 * SUM(entity_count) / NULLIF(SUM(counted_videos), 0)
+                    as avg_entities_per_video
+            FROM ({self._cost_window_sql()})
+            """,
+            self._cost_window_params(days),
         )
 
         return dict(cursor.fetchone())
 
     def get_daily_costs(self, days: int = 30) -> List[Dict]:
-        """Get daily cost breakdown."""
-        cutoff_date = datetime.now() - timedelta(days=days)
-
+        """Get daily cost breakdown (from the daily rollup, O(days))."""
         cursor = self.conn.execute(
-            """
+            f"""
             SELECT
-                DATE(processed_at) as date,
-                COUNT(*) as video_count,
-                SUM(processing_cost) as daily_cost,
-                SUM(entity_count) as entities_extracted
-            FROM videos
-            WHERE processed_at >= ?
-            GROUP BY DATE(processed_at)
+                date,
+                video_count,
+                CASE WHEN costed_videos > 0 THEN total_cost END as daily_cost,
+                CASE WHEN counted_videos > 0 THEN entity_count END as entities_extracted
+            FROM ({self._cost_window_sql()})
             ORDER BY date DESC
-        """,
-            (cutoff_date.isoformat(),),
+            """,
+            self._cost_window_params(days),
         )
 
         return [dict(row) for row in cursor.fetchall()]
 
+    @staticmethod
+    def _cost_window_sql() -> str:
+        # Full days after the cutoff's day from the rollup, plus the cutoff's day itself
+        return """
+            SELECT date, video_count, total_cost, costed_videos, min_cost, max_cost,
+                   entity_count, counted_videos
+            FROM rollup_daily_costs
+            WHERE date > ?
+            UNION ALL
+            SELECT DATE(processed_at), COUNT(*), TOTAL(processing_cost), COUNT(processing_cost),
+                   MIN(processing_cost), MAX(processing_cost),
+                   COALESCE(SUM(entity_count), 0), COUNT(entity_count)
+            FROM videos
+            WHERE processed_at >= ? AND processed_at < ?
+            GROUP BY DATE(processed_at)
+        """
+
+    @staticmethod
+    def _cost_window_params(days: int) -> Tuple[str, str, str]:
+        cutoff = datetime.now() - timedelta(days=days)
+        cutoff_day = cutoff.date()
+        return (
+            cutoff_day.isoformat(),
+            cutoff.isoformat(),
+            (cutoff_day + timedelta(days=1)).isoformat(),
+        )
+
+    # ENTITY GRAPH
+
+    def get_entity_neighbors(self, name: str, limit: int = 20, min_videos: int = 1) -> List[Dict]:
+        """
+        Entities that appear in the most videos together with ``name``.
+
+        Args:
+            name: Entity name (any casing)
+            limit: Maximum neighbours
+            min_videos: Fewest shared videos
+
+        Returns:
+            Neighbours with shared video counts and relationship types
+        """
+        return neighbors(self.conn, name, limit, min_videos)
+
+    def expand_entity(self, name: str, limit: int = 10, min_videos: int = 1) -> Dict[str, List]:
+        """Two-hop co-occurrence neighbourhood of ``name`` as nodes and edges."""
+        return expand(self.conn, name, limit, min_videos)
+
+    def find_entity_path(
+        self, source: str, target: str, max_depth: int = 4, min_videos: int = 1
+    ) -> Optional[Dict[str, List]]:
+        """Shortest chain of co-occurring entities from ``source`` to ``target``."""
+        return shortest_path(self.conn, source, target, max_depth, min_videos)
+
+    def get_cooccurrence_videos(self, name: str, other: str, limit: int = 100) -> List[Dict]:
+        """Videos in which both entities appear, most recent first."""
+        return shared_videos(self.conn, name, other, limit)
+
+    # ROLLUP MAINTENANCE
+
+    def verify_rollups(self) -> List[str]:
+        """Describe any rollup rows that disagree with the base tables."""
+        return verify_rollups(self.conn)
+
+    def rebuild_rollups(self):
+        """Recompute the stats rollups from scratch."""
+        rebuild_rollups(self.conn)
+        logger.info("Stats rollups rebuilt")
+
     # UTILITY METHODS
 
     def close(self):
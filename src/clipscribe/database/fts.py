@@ -0,0 +1,149 @@
+"""
+SQLite FTS5 full-text indexes for entity, relationship and topic search.
+
+``LIKE '%query%'`` cannot use a B-tree index, so every name search was a full
+table scan. ``ensure_fts_index`` attaches an external-content FTS5 table to an
+existing table (no duplicated text) and keeps it in sync with triggers;
+``build_match_query`` turns user input into a safe MATCH expression with
+prefix and phrase matching. Results rank with FTS5's built-in BM25.
+
+FTS5 is compiled into the SQLite bundled with CPython on all major platforms;
+callers should still check ``fts5_available`` and fall back to LIKE.
+
+Examples:
+    >>> ensure_fts_index(conn, "entities", ["name"], content_rowid="id")
+    >>> build_match_query('"white house" bid')
+    '"white house" "bid"*'
+"""
+
+import logging
+import re
+import sqlite3
+from typing import Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_PHRASE_OR_TERM = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_fts5_supported: Optional[bool] = None
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    """Whether this SQLite build supports FTS5 (probed once per process)."""
+    global _fts5_supported
+    if _fts5_supported is None:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)")
+            conn.execute("DROP TABLE temp._fts5_probe")
+            _fts5_supported = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite FTS5 unavailable; text search falls back to LIKE scans")
+            _fts5_supported = False
+    return _fts5_supported
+
+
+def ensure_fts_index(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    fts_table: Optional[str] = None,
+    content_rowid: str = "rowid",
+) -> bool:
+    """
+    Create an external-content FTS5 index over ``table`` plus sync triggers.
+
+    Existing rows are indexed the first time the index is created. Tables
+    without an INTEGER PRIMARY KEY (``content_rowid="rowid"``) should have
+    the index rebuilt with ``rebuild_fts_index`` after a VACUUM, which may
+    renumber their rowids.
+
+    Args:
+        conn: Open connection
+        table: Content table
+        columns: Text columns to index
+        fts_table: Index name (default ``<table>_fts``)
+        content_rowid: Integer key of ``table`` the index rows point at
+
+    Returns:
+        True if the index exists, False if FTS5 is unavailable
+    """
+    if not fts5_available(conn):
+        return False
+
+    fts_table = fts_table or f"{table}_fts"
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+    ).fetchone()
+
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    conn.executescript(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            {cols},
+            content='{table}',
+            content_rowid='{content_rowid}',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.{content_rowid}, {new_values});
+        END;
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {cols})
+            VALUES ('delete', old.{content_rowid}, {old_values});
+        END;
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {cols})
+            VALUES ('delete', old.{content_rowid}, {old_values});
+            INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.{content_rowid}, {new_values});
+        END;
+        """
+    )
+    if not existed:
+        rebuild_fts_index(conn, fts_table)
+        logger.info(f"Created full-text index {fts_table} on {table}({cols})")
+    return True
+
+
+def rebuild_fts_index(conn: sqlite3.Connection, fts_table: str) -> None:
+    """Re-index every row of an external-content FTS5 table's content table."""
+    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    conn.commit()
+
+
+def build_match_query(
+    text: Optional[str], columns: Optional[Sequence[str]] = None, prefix: bool = True
+) -> Optional[str]:
+    """
+    Convert free text into an FTS5 MATCH expression.
+
+    Double-quoted parts become exact phrases; every other word becomes a
+    quoted term (a prefix match when ``prefix`` is set). All parts must
+    match. FTS5 operators and punctuation in user input are never
+    interpreted, so arbitrary input is safe to bind as the MATCH parameter.
+
+    Args:
+        text: User query, e.g. ``'"white house" bid'``
+        columns: Restrict matching to these FTS columns
+        prefix: Treat unquoted words as prefixes
+
+    Returns:
+        MATCH expression, or None if the query has no searchable words
+    """
+    parts = []
+    for phrase, term in _PHRASE_OR_TERM.findall(text or ""):
+        words = _WORD.findall(phrase or term)
+        if not words:
+            continue
+        # Punctuated words ("al-Qaeda") stay together as a phrase
+        quoted = '"' + " ".join(words) + '"'
+        parts.append(quoted if phrase or not prefix else quoted + "*")
+    if not parts:
+        return None
+    expression = " ".join(parts)
+    if columns:
+        expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+    return expression
@@ -0,0 +1,246 @@
+"""
+Versioned schema migrations for the intelligence database.
+
+The schema version lives in ``PRAGMA user_version``. A new database is
+created directly from ``schema.sql`` at ``SCHEMA_VERSION``; an older one runs
+each pending migration in its own transaction, in order.
+
+Version 0 is any database from before versioning, in one of two layouts:
+
+- ``clipscribe.db`` (``schema.sql``): integer ids, ``entity_type``
+- ``data/station10.db`` (API routers): uuid text ids, ``type``, with
+  ``video_title`` denormalised onto every row
+
+Migration 1 rebuilds both layouts into the unified schema with stable ids
+(see ``records.py``) and moves video titles into ``videos``. Migration 2 adds
+``entity_aliases`` (empty: entity rows never stored alias lists, so aliases
+arrive as videos are loaded again). Migration 3 records which video reported
+each alias, so a reload can drop the ones it no longer reports.
+
+To change the schema: edit ``schema.sql`` and append a migration that brings
+a database at the previous version to the same result.
+
+Examples:
+    >>> migrate(conn)
+    3
+"""
+
+import logging
+import sqlite3
+from itertools import groupby
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from .records import entity_rows, relationship_rows, topic_rows
+from .rollups import drop_rollups
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+_BASE_TABLES = ("videos", "entities", "relationships", "topics")
+
+
+def _statements(script: str) -> Iterator[str]:
+    """Split a SQL script into statements (``executescript`` would commit)."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        if line.lstrip().startswith("--"):
+            continue
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement.strip()
+            statement = ""
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    for statement in _statements(SCHEMA_PATH.read_text()):
+        conn.execute(statement)
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _legacy_rows(conn: sqlite3.Connection, table: str) -> Iterator[Tuple[str, List[Dict]]]:
+    """(video_id, rows as dicts) for a renamed legacy table, grouped by video."""
+    cursor = conn.execute(f"SELECT * FROM {table} ORDER BY video_id")
+    names = [d[0] for d in cursor.description]
+    rows = (dict(zip(names, row)) for row in cursor)
+    for video_id, group in groupby(rows, key=lambda row: row["video_id"]):
+        yield video_id, list(group)
+
+
+def _migrate_1_unified_schema(conn: sqlite3.Connection) -> None:
+    """Rebuild legacy entities/relationships/topics into the unified schema."""
+    # Derived indexes are rebuilt from scratch on the next open
+    drop_rollups(conn)
+    for fts_table in ("entities_fts", "relationships_fts", "topics_fts"):
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+        conn.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+    legacy = []
+    for table in ("entities", "relationships", "topics"):
+        if _columns(conn, table):
+            conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v0")
+            # Free the index names for the new table
+            for (index,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+                "AND sql IS NOT NULL",
+                (f"{table}_v0",),
+            ).fetchall():
+                conn.execute(f"DROP INDEX {index}")
+            legacy.append(table)
+    _create_schema(conn)
+
+    # The API layout kept titles on each row and had no videos table
+    for table in legacy:
+        if "video_title" in _columns(conn, f"{table}_v0"):
+            conn.execute(
+                f"""
+                INSERT OR IGNORE INTO videos (video_id, url, title)
+                SELECT video_id, '', MAX(video_title) FROM {table}_v0 GROUP BY video_id
+                """
+            )
+
+    if "entities" in legacy:
+        for video_id, rows in _legacy_rows(conn, "entities_v0"):
+            conn.executemany(
+                """
+                INSERT INTO entities (
+                    stable_id, video_id, name, entity_type,
+                    mention_count, confidence, evidence, timestamp
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                entity_rows(video_id, rows),
+            )
+    if "relationships" in legacy:
+        for video_id, rows in _legacy_rows(conn, "relationships_v0"):
+            conn.executemany(
+                """
+                INSERT INTO relationships (
+                    stable_id, video_id, source_entity, target_entity,
+                    relationship_type, evidence
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                relationship_rows(
+                    video_id,
+                    [
+                        dict(
+                            row,
+                            source=row["source_entity"],
+                            target=row["target_entity"],
+                            type=row["relationship_type"],
+                        )
+                        for row in rows
+                    ],
+                ),
+            )
+    if "topics" in legacy:
+        for video_id, rows in _legacy_rows(conn, "topics_v0"):
+            conn.executemany(
+                """
+                INSERT INTO topics (
+                    stable_id, video_id, name, relevance, time_range,
+                    schema_type, schema_subtype
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                topic_rows(video_id, rows),
+            )
+
+    for table in legacy:
+        conn.execute(f"DROP TABLE {table}_v0")
+    logger.info(f"Migrated {', '.join(legacy) or 'no'} legacy tables to the unified schema")
+
+
+def _migrate_2_entity_aliases(conn: sqlite3.Connection) -> None:
+    """Add the entity alias lexicon used by fuzzy name lookup."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS entity_aliases (
+            name TEXT NOT NULL,
+            alias TEXT NOT NULL,
+            PRIMARY KEY (name, alias)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _migrate_3_alias_videos(conn: sqlite3.Connection) -> None:
+    """Key aliases by the video that reported them."""
+    # Renaming moves the alias triggers along; they go with the old table and are recreated
+    conn.execute("ALTER TABLE entity_aliases RENAME TO entity_aliases_v2")
+    _create_schema(conn)
+    # Credit each alias to every video with its name; the next load of a video corrects it
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO entity_aliases (video_id, name, alias)
+        SELECT DISTINCT e.video_id, a.name, a.alias
+        FROM entity_aliases_v2 a JOIN entities e ON e.name = a.name
+        """
+    )
+    conn.execute("DROP TABLE entity_aliases_v2")
+
+
+# (version, migration); version N upgrades a database at N-1
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _migrate_1_unified_schema),
+    (2, _migrate_2_entity_aliases),
+    (3, _migrate_3_alias_videos),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Current ``PRAGMA user_version`` of a database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Bring a database to ``SCHEMA_VERSION``.
+
+    Args:
+        conn: Open connection (no transaction in progress)
+
+    Returns:
+        Schema version after migrating
+
+    Raises:
+        RuntimeError: If the database is newer than this code
+    """
+    version = schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than supported ({SCHEMA_VERSION})"
+        )
+
+    existing = {
+        row[0]
+        for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' "
+            f"AND name IN ({', '.join('?' * len(_BASE_TABLES))})",
+            _BASE_TABLES,
+        )
+    }
+    if version == 0 and not existing:
+        # New database: create the current schema directly
+        steps = [(SCHEMA_VERSION, _create_schema)]
+    else:
+        steps = MIGRATIONS[version:]
+
+    for target, apply in steps:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"Database schema at version {target}")
+    return schema_version(conn)
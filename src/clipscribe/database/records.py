@@ -0,0 +1,157 @@
+"""
+Row builders and stable ids for the intelligence database.
+
+Every entity, relationship and topic row carries a ``stable_id`` derived from
+its video and identifying fields (``utils/stable_id.py``), so loading the
+same output twice updates rows in place instead of duplicating them, and ids
+handed out by the API survive reloads. Duplicates within one video (the same
+entity listed twice) are merged here, before they reach SQL.
+
+Examples:
+    >>> rows = entity_rows("P-2", [{"name": "NASA", "type": "ORG"}, {"name": "nasa", "type": "ORG"}])
+    >>> [(name, mentions) for _, _, name, _, mentions, *_ in rows]
+    [('NASA', 2)]
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.stable_id import generate_stable_id
+
+
+def _stable_id(*parts: Optional[str]) -> str:
+    # Unit separator keeps ("a b", "c") and ("a", "b c") distinct
+    return generate_stable_id("\x1f".join((p or "").strip().casefold() for p in parts))
+
+
+def entity_id(video_id: str, name: str, entity_type: Optional[str]) -> str:
+    """Stable id of an entity within a video."""
+    return _stable_id("entity", video_id, name, entity_type)
+
+
+def relationship_id(
+    video_id: str, source: str, relationship_type: Optional[str], target: str
+) -> str:
+    """Stable id of a relationship within a video."""
+    return _stable_id("relationship", video_id, source, relationship_type, target)
+
+
+def topic_id(video_id: str, name: str) -> str:
+    """Stable id of a topic within a video."""
+    return _stable_id("topic", video_id, name)
+
+
+def _default(value: Any, fallback: Any) -> Any:
+    return fallback if value is None else value
+
+
+def entity_rows(video_id: str, entities: List[Dict]) -> List[Tuple]:
+    """
+    Entity rows ``(stable_id, video_id, name, entity_type, mention_count,
+    confidence, evidence, timestamp)``, one per distinct entity.
+
+    Repeated entities add their mention counts and keep the highest
+    confidence and the earliest timestamp.
+    """
+    merged: Dict[str, List[Any]] = {}
+    for entity in entities:
+        name = entity.get("name")
+        if not name:
+            continue
+        entity_type = entity.get("type", entity.get("entity_type"))
+        key = entity_id(video_id, name, entity_type)
+        mentions = _default(entity.get("mention_count"), 1)
+        confidence = _default(entity.get("confidence"), 1.0)
+        timestamp = entity.get("timestamp")
+        row = merged.get(key)
+        if row is None:
+            merged[key] = [
+                key,
+                video_id,
+                name,
+                entity_type,
+                mentions,
+                confidence,
+                entity.get("evidence") or None,
+                timestamp,
+            ]
+            continue
+        row[4] += mentions
+        row[5] = max(row[5], confidence)
+        row[6] = row[6] or entity.get("evidence") or None
+        if timestamp is not None and (row[7] is None or timestamp < row[7]):
+            row[7] = timestamp
+    return [tuple(row) for row in merged.values()]
+
+
+def alias_rows(video_id: str, entities: List[Dict]) -> List[Tuple]:
+    """
+    Alias rows ``(video_id, name, alias)`` from the entities' ``aliases`` lists.
+
+    Aliases that only differ from the name by case are dropped.
+    """
+    rows = set()
+    for entity in entities:
+        name = entity.get("name")
+        if not name:
+            continue
+        for alias in entity.get("aliases") or []:
+            alias = (alias or "").strip()
+            if alias and alias.casefold() != name.casefold():
+                rows.add((video_id, name, alias))
+    return sorted(rows)
+
+
+def relationship_rows(video_id: str, relationships: List[Dict]) -> List[Tuple]:
+    """
+    Relationship rows ``(stable_id, video_id, source_entity, target_entity,
+    relationship_type, evidence)``, one per distinct relationship.
+
+    Accepts extraction output (subject/predicate/object) and the older
+    source/target/type keys.
+    """
+    merged: Dict[str, Tuple] = {}
+    for rel in relationships:
+        source = rel.get("source", rel.get("subject"))
+        target = rel.get("target", rel.get("object"))
+        if not source or not target:
+            continue
+        relationship_type = rel.get("type", rel.get("predicate"))
+        key = relationship_id(video_id, source, relationship_type, target)
+        if key not in merged:
+            merged[key] = (
+                key,
+                video_id,
+                source,
+                target,
+                relationship_type,
+                rel.get("evidence", ""),
+            )
+    return list(merged.values())
+
+
+def topic_rows(video_id: str, topics: List[Any]) -> List[Tuple]:
+    """
+    Topic rows ``(stable_id, video_id, name, relevance, time_range,
+    schema_type, schema_subtype)``, one per distinct topic name.
+
+    Topics may be dicts or bare names.
+    """
+    merged: Dict[str, Tuple] = {}
+    for topic in topics:
+        if not isinstance(topic, dict):
+            topic = {"name": topic}
+        name = topic.get("name")
+        if not name:
+            continue
+        key = topic_id(video_id, name)
+        if key not in merged:
+            merged[key] = (
+                key,
+                video_id,
+                name,
+                _default(topic.get("relevance"), 1.0),
+                topic.get("time_range"),
+                _default(topic.get("schema_type"), "Event"),
+                topic.get("schema_subtype"),
+            )
+    return list(merged.values())
@@ -0,0 +1,286 @@
+"""
+Incrementally maintained rollups behind the database stats queries.
+
+``get_cost_stats``, ``get_daily_costs`` and ``get_entity_stats`` used to
+aggregate the whole ``videos`` / ``entities`` tables on every call (four
+``COUNT(DISTINCT ...)`` for entity stats). ``ensure_rollups`` adds small
+rollup tables kept current by triggers, so every write path (``add_video``,
+``ingest_videos``, backfill) updates them in the same transaction:
+
+- ``rollup_daily_costs``: per-day video count, cost sum/min/max, entity sum
+- ``rollup_entity_names`` / ``_types`` / ``_videos``: entity rows per key
+- ``rollup_counters``: running totals for O(1) entity stats
+
+Stats then read O(days) or O(1) rows. Triggers keep the rollups exact, but
+float sums drift slightly and rows written with triggers absent (another
+tool, a restored dump) are missed; ``verify_rollups`` reports differences
+and ``rebuild_rollups`` recomputes everything (``clipscribe db rollups``).
+
+Videos are written with ``ON CONFLICT DO UPDATE`` upserts, which fire the
+UPDATE triggers. An ``INSERT OR REPLACE`` (e.g. from another tool) only
+fires the delete triggers for the replaced row with
+``PRAGMA recursive_triggers = ON``; connections that write must enable it.
+
+Examples:
+    >>> ensure_rollups(conn)
+    >>> verify_rollups(conn)
+    []
+"""
+
+import logging
+import sqlite3
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Relative tolerance for float sums when verifying
+_FLOAT_TOLERANCE = 1e-9
+
+_TABLES_SQL = """
+    CREATE TABLE IF NOT EXISTS rollup_daily_costs (
+        date TEXT PRIMARY KEY,
+        video_count INTEGER NOT NULL,
+        total_cost REAL NOT NULL,
+        costed_videos INTEGER NOT NULL,
+        min_cost REAL,
+        max_cost REAL,
+        entity_count INTEGER NOT NULL,
+        counted_videos INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS rollup_entity_names (
+        name TEXT PRIMARY KEY,
+        mentions INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS rollup_entity_types (
+        entity_type TEXT PRIMARY KEY,
+        mentions INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS rollup_entity_videos (
+        video_id TEXT PRIMARY KEY,
+        mentions INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS rollup_counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    ) WITHOUT ROWID;
+"""
+
+# Expected contents of each rollup table, computed from the base tables
+_ROLLUP_QUERIES: Dict[str, str] = {
+    "rollup_daily_costs": """
+        SELECT DATE(processed_at), COUNT(*), TOTAL(processing_cost), COUNT(processing_cost),
+               MIN(processing_cost), MAX(processing_cost),
+               COALESCE(SUM(entity_count), 0), COUNT(entity_count)
+        FROM videos
+        WHERE DATE(processed_at) IS NOT NULL
+        GROUP BY DATE(processed_at)
+    """,
+    "rollup_entity_names": "SELECT name, COUNT(*) FROM entities GROUP BY name",
+    "rollup_entity_types": """
+        SELECT COALESCE(entity_type, ''), COUNT(*) FROM entities GROUP BY COALESCE(entity_type, '')
+    """,
+    "rollup_entity_videos": "SELECT video_id, COUNT(*) FROM entities GROUP BY video_id",
+    "rollup_counters": """
+        SELECT 'entity_rows', COUNT(*) FROM entities
+        UNION ALL SELECT 'unique_entities', COUNT(DISTINCT name) FROM entities
+        UNION ALL SELECT 'entity_types', COUNT(DISTINCT NULLIF(entity_type, '')) FROM entities
+        UNION ALL SELECT 'videos_with_entities', COUNT(DISTINCT video_id) FROM entities
+    """,
+}
+
+
+def _add_video(ref: str) -> str:
+    return f"""
+        INSERT INTO rollup_daily_costs VALUES (
+            DATE({ref}.processed_at), 1,
+            COALESCE({ref}.processing_cost, 0), {ref}.processing_cost IS NOT NULL,
+            {ref}.processing_cost, {ref}.processing_cost,
+            COALESCE({ref}.entity_count, 0), {ref}.entity_count IS NOT NULL
+        )
+        ON CONFLICT(date) DO UPDATE SET
+            video_count = video_count + 1,
+            total_cost = total_cost + excluded.total_cost,
+            costed_videos = costed_videos + excluded.costed_videos,
+            min_cost = MIN(COALESCE(min_cost, excluded.min_cost),
+                           COALESCE(excluded.min_cost, min_cost)),
+            max_cost = MAX(COALESCE(max_cost, excluded.max_cost),
+                           COALESCE(excluded.max_cost, max_cost)),
+            entity_count = entity_count + excluded.entity_count,
+            counted_videos = counted_videos + excluded.counted_videos;
+    """
+
+
+def _remove_video(ref: str) -> str:
+    day = f"DATE({ref}.processed_at)"
+    # min/max cannot be decremented; re-read the day (a processed_at index range scan)
+    return f"""
+        UPDATE rollup_daily_costs SET
+            video_count = video_count - 1,
+            total_cost = total_cost - COALESCE({ref}.processing_cost, 0),
+            costed_videos = costed_videos - ({ref}.processing_cost IS NOT NULL),
+            entity_count = entity_count - COALESCE({ref}.entity_count, 0),
+            counted_videos = counted_videos - ({ref}.entity_count IS NOT NULL)
+        WHERE date = {day};
+        UPDATE rollup_daily_costs SET (min_cost, max_cost) = (
+            SELECT MIN(processing_cost), MAX(processing_cost) FROM videos
+            WHERE processed_at >= {day} AND processed_at < DATE({day}, '+1 day')
+        )
+        WHERE date = {day} AND {ref}.processing_cost IN (min_cost, max_cost);
+        DELETE FROM rollup_daily_costs WHERE date = {day} AND video_count <= 0;
+    """
+
+
+def _add_entity(ref: str) -> str:
+    return (
+        "".join(
+            f"""
+        INSERT INTO {table} VALUES ({key}, 1)
+        ON CONFLICT({column}) DO UPDATE SET mentions = mentions + 1;"""
+            for table, column, key in _entity_keys(ref)
+        )
+        + ("\n        UPDATE rollup_counters SET value = value + 1 WHERE name = 'entity_rows';")
+    )
+
+
+def _remove_entity(ref: str) -> str:
+    return (
+        "".join(
+            f"""
+        UPDATE {table} SET mentions = mentions - 1 WHERE {column} = {key};
+        DELETE FROM {table} WHERE {column} = {key} AND mentions <= 0;"""
+            for table, column, key in _entity_keys(ref)
+        )
+        + ("\n        UPDATE rollup_counters SET value = value - 1 WHERE name = 'entity_rows';")
+    )
+
+
+def _entity_keys(ref: str) -> List[Tuple[str, str, str]]:
+    # (rollup table, key column, key expression); NULL types roll up under ''
+    return [
+        ("rollup_entity_names", "name", f"{ref}.name"),
+        ("rollup_entity_types", "entity_type", f"COALESCE({ref}.entity_type, '')"),
+        ("rollup_entity_videos", "video_id", f"{ref}.video_id"),
+    ]
+
+
+def _triggers_sql() -> str:
+    video_when = "WHEN DATE({ref}.processed_at) IS NOT NULL"
+    triggers = [
+        (
+            "rollup_videos_ai",
+            "AFTER INSERT ON videos",
+            video_when.format(ref="new"),
+            _add_video("new"),
+        ),
+        (
+            "rollup_videos_ad",
+            "AFTER DELETE ON videos",
+            video_when.format(ref="old"),
+            _remove_video("old"),
+        ),
+        (
+            "rollup_videos_au_old",
+            "AFTER UPDATE OF processed_at, processing_cost, entity_count ON videos",
+            video_when.format(ref="old"),
+            _remove_video("old"),
+        ),
+        (
+            "rollup_videos_au_new",
+            "AFTER UPDATE OF processed_at, processing_cost, entity_count ON videos",
+            video_when.format(ref="new"),
+            _add_video("new"),
+        ),
+        ("rollup_entities_ai", "AFTER INSERT ON entities", "", _add_entity("new")),
+        ("rollup_entities_ad", "AFTER DELETE ON entities", "", _remove_entity("old")),
+        (
+            "rollup_entities_au",
+            "AFTER UPDATE OF name, entity_type, video_id ON entities",
+            "",
+            _remove_entity("old") + _add_entity("new"),
+        ),
+    ]
+    # Distinct-key counters follow rows appearing in / leaving the keyed rollups
+    for table, counter, when in (
+        ("rollup_entity_names", "unique_entities", ""),
+        ("rollup_entity_types", "entity_types", "WHEN {ref}.entity_type != ''"),
+        ("rollup_entity_videos", "videos_with_entities", ""),
+    ):
+        for suffix, event, ref, delta in (
+            ("ai", "INSERT", "new", "+"),
+            ("ad", "DELETE", "old", "-"),
+        ):
+            triggers.append(
+                (
+                    f"{table}_{suffix}",
+                    f"AFTER {event} ON {table}",
+                    when.format(ref=ref),
+                    f"UPDATE rollup_counters SET value = value {delta} 1 WHERE name = '{counter}';",
+                )
+            )
+    return "\n".join(
+        f"CREATE TRIGGER IF NOT EXISTS {name} {event} {when} BEGIN {body} END;"
+        for name, event, when, body in triggers
+    )
+
+
+def ensure_rollups(conn: sqlite3.Connection) -> None:
+    """
+    Create the rollup tables and their triggers, populating them on first use.
+
+    Args:
+        conn: Open connection to a database with the ClipScribe schema
+    """
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_counters'"
+    ).fetchone()
+    conn.executescript(_TABLES_SQL + _triggers_sql())
+    if not existed:
+        rebuild_rollups(conn)
+        logger.info("Created stats rollups")
+
+
+def drop_rollups(conn: sqlite3.Connection) -> None:
+    """Drop the rollup tables and triggers; the next ``ensure_rollups`` rebuilds them."""
+    for (trigger,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB 'rollup_*'"
+    ).fetchall():
+        conn.execute(f"DROP TRIGGER {trigger}")
+    for table in _ROLLUP_QUERIES:
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """Recompute every rollup table from the base tables in one transaction."""
+    with conn:
+        for table, query in _ROLLUP_QUERIES.items():
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"INSERT INTO {table} {query}")
+
+
+def verify_rollups(conn: sqlite3.Connection) -> List[str]:
+    """
+    Compare the rollups with freshly computed aggregates.
+
+    Args:
+        conn: Open connection
+
+    Returns:
+        One description per mismatched row (empty if consistent)
+    """
+    problems = []
+    for table, query in _ROLLUP_QUERIES.items():
+        expected = {row[0]: tuple(row[1:]) for row in conn.execute(query)}
+        actual = {row[0]: tuple(row[1:]) for row in conn.execute(f"SELECT * FROM {table}")}
+        for key in sorted(expected.keys() | actual.keys(), key=str):
+            want, got = expected.get(key), actual.get(key)
+            if want is None or got is None or not all(map(_close, want, got)):
+                problems.append(f"{table}[{key!r}]: expected {want}, found {got}")
+    return problems
+
+
+def _close(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        if a is None or b is None:
+            return a is b
+        return abs(a - b) <= _FLOAT_TOLERANCE * max(1.0, abs(a), abs(b))
+    return a == b
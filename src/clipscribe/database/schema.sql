@@ -1,5 +1,7 @@
 -- ClipScribe Local Intelligence Database Schema
--- Single-user database for entity search and cost tracking
+-- Single schema for the CLI database (clipscribe.db) and the search API (data/station10.db).
+-- New databases are created from this file at the latest version; migrations.py
+-- upgrades older ones. The version is kept in PRAGMA user_version.
 
 -- Videos processed
 CREATE TABLE IF NOT EXISTS videos (
@@ -19,17 +21,30 @@ CREATE TABLE IF NOT EXISTS videos (
 -- Entities (for search across all videos)
 CREATE TABLE IF NOT EXISTS entities (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stable_id TEXT UNIQUE NOT NULL,
     video_id TEXT NOT NULL,
     name TEXT NOT NULL,
     entity_type TEXT,
-    mention_count INTEGER DEFAULT 1,
-    confidence REAL,
+    mention_count INTEGER NOT NULL DEFAULT 1,
+    confidence REAL NOT NULL DEFAULT 1.0,
+    evidence TEXT,
+    timestamp REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (video_id) REFERENCES videos(video_id)
 );
 
+-- Alternative names of entities, per video that reported them (for fuzzy name lookup)
+CREATE TABLE IF NOT EXISTS entity_aliases (
+    video_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    alias TEXT NOT NULL,
+    PRIMARY KEY (name, alias, video_id)
+) WITHOUT ROWID;
+
 -- Relationships (for cross-video relationship search)
 CREATE TABLE IF NOT EXISTS relationships (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stable_id TEXT UNIQUE NOT NULL,
     video_id TEXT NOT NULL,
     source_entity TEXT NOT NULL,
     target_entity TEXT NOT NULL,
@@ -38,10 +53,46 @@ CREATE TABLE IF NOT EXISTS relationships (
     FOREIGN KEY (video_id) REFERENCES videos(video_id)
 );
 
+-- Topics (for cross-video topic search)
+CREATE TABLE IF NOT EXISTS topics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stable_id TEXT UNIQUE NOT NULL,
+    video_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    relevance REAL NOT NULL DEFAULT 1.0,
+    time_range TEXT,
+    schema_type TEXT DEFAULT 'Event',
+    schema_subtype TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (video_id) REFERENCES videos(video_id)
+);
+
+-- Transcript segments (for time-range and full-text lookups)
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    speaker TEXT,
+    text TEXT NOT NULL,
+    FOREIGN KEY (video_id) REFERENCES videos(video_id)
+);
+
 -- Indexes for fast queries
 CREATE INDEX IF NOT EXISTS idx_entities_name ON entities(name);
 CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(entity_type);
 CREATE INDEX IF NOT EXISTS idx_entities_video ON entities(video_id);
+CREATE INDEX IF NOT EXISTS idx_entity_aliases_video ON entity_aliases(video_id);
 CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source_entity);
 CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target_entity);
+CREATE INDEX IF NOT EXISTS idx_relationships_video ON relationships(video_id);
+CREATE INDEX IF NOT EXISTS idx_topics_video ON topics(video_id);
+CREATE INDEX IF NOT EXISTS idx_topics_schema_type ON topics(schema_type);
+CREATE INDEX IF NOT EXISTS idx_segments_video_time ON segments(video_id, start_time);
 CREATE INDEX IF NOT EXISTS idx_videos_processed_at ON videos(processed_at);
+
+-- Keyset pagination sort keys for the search API
+CREATE INDEX IF NOT EXISTS idx_entities_sort ON entities(confidence DESC, mention_count DESC, id);
+CREATE INDEX IF NOT EXISTS idx_entities_type_sort
+    ON entities(entity_type, confidence DESC, mention_count DESC, id);
+CREATE INDEX IF NOT EXISTS idx_topics_sort ON topics(relevance DESC, id);
@@ -0,0 +1,206 @@
+"""
+Time-indexed transcript segments.
+
+Segments used to live only in each video's output JSON, so answering "what
+was said between t1 and t2" meant re-parsing whole files. The ``segments``
+table holds one row per transcript segment. Two indexes cover the interval
+lookups:
+
+- ``(video_id, start_time)`` B-tree for lookups inside one video
+- ``segments_rtree``, an SQLite R-tree over ``[start_time, end_time]``, for
+  overlap queries across every video
+
+Segment text is also indexed with FTS5 (see ``fts.py``).
+
+R-tree coordinates are 32-bit floats rounded outward, so the R-tree is used
+as a prefilter and the exact bounds are re-checked against ``segments``.
+Builds without the R-tree module fall back to the B-tree.
+
+Examples:
+    >>> sql, params = interval_query(60.0, 90.0)
+    >>> rows = conn.execute(sql, params).fetchall()
+"""
+
+import logging
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_COLUMNS = "s.id, s.video_id, s.start_time, s.end_time, s.speaker, s.text"
+
+_rtree_supported: Optional[bool] = None
+
+
+def rtree_available(conn: sqlite3.Connection) -> bool:
+    """Whether this SQLite build supports R-tree tables (probed once per process)."""
+    global _rtree_supported
+    if _rtree_supported is None:
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS temp._rtree_probe USING rtree(id, a, b)"
+            )
+            conn.execute("DROP TABLE temp._rtree_probe")
+            _rtree_supported = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite R-tree unavailable; segment time lookups use the B-tree index")
+            _rtree_supported = False
+    return _rtree_supported
+
+
+def ensure_segment_index(conn: sqlite3.Connection) -> bool:
+    """
+    Create the segment R-tree and the triggers that keep it in sync.
+
+    Args:
+        conn: Open connection to a database with the ``segments`` table
+
+    Returns:
+        True if the R-tree exists, False if the module is unavailable
+    """
+    if not rtree_available(conn):
+        return False
+
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segments_rtree'"
+    ).fetchone()
+    conn.executescript(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS segments_rtree USING rtree(id, start_time, end_time);
+        CREATE TRIGGER IF NOT EXISTS segments_rtree_ai AFTER INSERT ON segments BEGIN
+            INSERT INTO segments_rtree VALUES (new.id, new.start_time, new.end_time);
+        END;
+        CREATE TRIGGER IF NOT EXISTS segments_rtree_ad AFTER DELETE ON segments BEGIN
+            DELETE FROM segments_rtree WHERE id = old.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS segments_rtree_au
+        AFTER UPDATE OF start_time, end_time ON segments BEGIN
+            UPDATE segments_rtree SET start_time = new.start_time, end_time = new.end_time
+            WHERE id = new.id;
+        END;
+        """
+    )
+    if not existed:
+        with conn:
+            conn.execute("INSERT INTO segments_rtree SELECT id, start_time, end_time FROM segments")
+        logger.info("Created segment time index segments_rtree")
+    return True
+
+
+def segment_rows(video_id: str, segments: List[Dict[str, Any]]) -> List[Tuple]:
+    """
+    Rows for ``segments`` from transcript segment dicts.
+
+    Accepts both provider output (``start``/``end``) and core output
+    (``start_time``/``end_time``); segments without text or a start are skipped.
+    """
+    rows = []
+    for segment in segments:
+        text = (segment.get("text") or "").strip()
+        start = segment.get("start_time", segment.get("start"))
+        if not text or start is None:
+            continue
+        end = segment.get("end_time", segment.get("end"))
+        start = float(start)
+        # R-tree rejects inverted intervals
+        end = max(start, float(end)) if end is not None else start
+        rows.append((video_id, start, end, segment.get("speaker"), text))
+    return rows
+
+
+def interval_query(
+    start: float,
+    end: float,
+    video_id: Optional[str] = None,
+    speaker: Optional[str] = None,
+    limit: int = 1000,
+    use_rtree: bool = True,
+) -> Tuple[str, List[Any]]:
+    """
+    SELECT for segments overlapping ``[start, end]`` (both inclusive).
+
+    ``start == end`` finds what was being said at that instant.
+
+    Args:
+        start: Range start in seconds
+        end: Range end in seconds
+        video_id: Restrict to one video (uses the per-video B-tree)
+        speaker: Restrict to one speaker label
+        limit: Maximum rows
+        use_rtree: Whether ``segments_rtree`` exists
+
+    Returns:
+        SQL and parameters; rows are ``SEGMENT_COLUMNS`` ordered by video and time
+    """
+    conditions = ["s.start_time <= ?", "s.end_time >= ?"]
+    params: List[Any] = [end, start]
+    from_clause = "segments s"
+    if video_id is not None:
+        conditions.insert(0, "s.video_id = ?")
+        params.insert(0, video_id)
+    elif use_rtree:
+        from_clause = "segments_rtree r JOIN segments s ON s.id = r.id"
+        conditions = ["r.start_time <= ?", "r.end_time >= ?"] + conditions
+        params = [end, start] + params
+    if speaker is not None:
+        conditions.append("s.speaker = ?")
+        params.append(speaker)
+
+    sql = f"""
+        SELECT {SEGMENT_COLUMNS}
+        FROM {from_clause}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY s.video_id, s.start_time
+        LIMIT ?
+    """
+    return sql, params + [limit]
+
+
+def text_query(
+    match: Optional[str],
+    text: str,
+    video_id: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    limit: int = 50,
+) -> Tuple[str, List[Any]]:
+    """
+    SELECT for segments containing ``text``, optionally inside a time window.
+
+    Args:
+        match: FTS5 MATCH expression (``build_match_query``), or None to use LIKE
+        text: Raw query, for the LIKE fallback
+        video_id: Restrict to one video
+        start: Only segments ending at or after this time
+        end: Only segments starting at or before this time
+        limit: Maximum rows
+
+    Returns:
+        SQL and parameters; rows are ``SEGMENT_COLUMNS``, best matches first
+    """
+    if match:
+        from_clause = "segments_fts f JOIN segments s ON s.id = f.rowid"
+        conditions, params = ["segments_fts MATCH ?"], [match]
+        order_by = "f.rank"
+    else:
+        from_clause = "segments s"
+        conditions, params = ["s.text LIKE ?"], [f"%{text}%"]
+        order_by = "s.video_id, s.start_time"
+    if video_id is not None:
+        conditions.append("s.video_id = ?")
+        params.append(video_id)
+    if start is not None:
+        conditions.append("s.end_time >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("s.start_time <= ?")
+        params.append(end)
+
+    sql = f"""
+        SELECT {SEGMENT_COLUMNS}
+        FROM {from_clause}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {order_by}
+        LIMIT ?
+    """
+    return sql, params + [limit]
@@ -0,0 +1,267 @@
+"""
+Trigram index for typo-tolerant entity name lookup.
+
+FTS5 matches whole words and prefixes, so "Zelenski" or an ASR misspelling
+never finds "Zelenskyy", and scoring every name in Python is a full scan.
+This index stores, for each distinct entity name, alias, and word of a
+multi-word name (a *term*), the set of its character trigrams as posting
+lists in SQLite:
+
+- ``trigram_terms``: one row per (term, canonical name) with its trigram count
+- ``trigram_postings``: ``(gram, gram_count, term_id)``, clustered by gram
+  and then term length (WITHOUT ROWID)
+
+A lookup reads only the posting lists of the query's trigrams and ranks
+terms by Jaccard similarity of the trigram sets, the measure used by
+PostgreSQL's ``pg_trgm``: shared / (query + term - shared). Terms too short
+or too long to reach the threshold are skipped by range within each posting
+list, and scoring needs no join. Words are case- and accent-folded and
+padded (``"  word "``) so word starts weigh more.
+
+Terms change rarely compared with entity rows (the same names recur across
+videos), so triggers only queue touched names in ``trigram_pending`` and
+``sync_trigram_index`` re-indexes those names inside the writer's
+transaction. ``ClipScribeDatabase`` syncs on every write.
+
+Examples:
+    >>> similarity("Zelensky", "Zelenskyy")
+    0.7272727272727273
+    >>> sql, params = fuzzy_query("Zelenski", limit=10)
+    >>> conn.execute(sql, params).fetchall()
+    [('Volodymyr Zelenskyy', 0.6363636363636364), ...]
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import unicodedata
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# pg_trgm's default similarity threshold
+DEFAULT_MIN_SIMILARITY = 0.3
+
+# Most candidate names a fuzzy lookup returns
+MAX_CANDIDATES = 200
+
+# Words of multi-word names shorter than this are not indexed on their own ("of", "the")
+MIN_WORD_TERM_LENGTH = 4
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_INDEX_SQL = """
+    CREATE TABLE IF NOT EXISTS trigram_terms (
+        id INTEGER PRIMARY KEY,
+        term TEXT NOT NULL,
+        name TEXT NOT NULL,
+        gram_count INTEGER NOT NULL,
+        UNIQUE (name, term)
+    );
+    CREATE TABLE IF NOT EXISTS trigram_postings (
+        gram TEXT NOT NULL,
+        gram_count INTEGER NOT NULL,
+        term_id INTEGER NOT NULL,
+        PRIMARY KEY (gram, gram_count, term_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS trigram_pending (
+        name TEXT PRIMARY KEY
+    ) WITHOUT ROWID;
+    CREATE TRIGGER IF NOT EXISTS trigram_entities_ai AFTER INSERT ON entities BEGIN
+        INSERT OR IGNORE INTO trigram_pending VALUES (new.name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trigram_entities_ad AFTER DELETE ON entities BEGIN
+        INSERT OR IGNORE INTO trigram_pending VALUES (old.name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trigram_entities_au AFTER UPDATE OF name ON entities BEGIN
+        INSERT OR IGNORE INTO trigram_pending VALUES (old.name);
+        INSERT OR IGNORE INTO trigram_pending VALUES (new.name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trigram_aliases_ai AFTER INSERT ON entity_aliases BEGIN
+        INSERT OR IGNORE INTO trigram_pending VALUES (new.name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS trigram_aliases_ad AFTER DELETE ON entity_aliases BEGIN
+        INSERT OR IGNORE INTO trigram_pending VALUES (old.name);
+    END;
+"""
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigrams of each case- and accent-folded word, padded ``"  word "``."""
+    grams = set()
+    for word in _WORD.findall(_fold(text)):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: str, b: str) -> float:
+    """Trigram Jaccard similarity of two strings (0.0 to 1.0)."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+def index_terms(name: str, aliases: Iterable[str] = ()) -> Set[str]:
+    """
+    Terms indexed for a name: the name, its aliases, and their longer words.
+
+    Indexing words separately lets a surname alone ("Zelenski") score
+    against that word rather than the whole name ("Volodymyr Zelenskyy").
+    """
+    terms = {name, *aliases}
+    for term in list(terms):
+        words = _WORD.findall(term)
+        if len(words) > 1:
+            terms.update(word for word in words if len(word) >= MIN_WORD_TERM_LENGTH)
+    return terms
+
+
+def ensure_trigram_index(conn: sqlite3.Connection) -> None:
+    """
+    Create the trigram index and its triggers, indexing every name on first use.
+
+    Args:
+        conn: Open connection to a database with the ClipScribe schema
+    """
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trigram_terms'"
+    ).fetchone()
+    conn.executescript(_INDEX_SQL)
+    if not existed:
+        rebuild_trigram_index(conn)
+        logger.info("Created entity name trigram index")
+
+
+def rebuild_trigram_index(conn: sqlite3.Connection) -> None:
+    """Re-index every entity name and alias in one transaction."""
+    with conn:
+        conn.execute("DELETE FROM trigram_postings")
+        conn.execute("DELETE FROM trigram_terms")
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO trigram_pending
+            SELECT DISTINCT name FROM entities UNION SELECT name FROM entity_aliases
+            """
+        )
+        sync_trigram_index(conn)
+
+
+def sync_trigram_index(conn: sqlite3.Connection) -> int:
+    """
+    Re-index the names queued by the triggers.
+
+    Runs inside the caller's transaction (does not commit), so the index
+    changes commit or roll back together with the rows that caused them.
+    Works set-at-a-time (a few reads for the whole queue, then bulk
+    writes with term ids assigned up front), so a large load re-indexes in
+    one pass.
+
+    Args:
+        conn: Open connection
+
+    Returns:
+        Number of names re-indexed
+    """
+    live = {row[0] for row in conn.execute(
+        """
+            SELECT p.name FROM trigram_pending p
+            WHERE EXISTS (SELECT 1 FROM entities e WHERE e.name = p.name)
+        """
+    )}
+    aliases: Dict[str, List[str]] = {}
+    for name, alias in conn.execute(
+        """
+        SELECT DISTINCT a.name, a.alias
+        FROM trigram_pending p JOIN entity_aliases a ON a.name = p.name
+        """
+    ):
+        aliases.setdefault(name, []).append(alias)
+    indexed = {
+        (name, term): term_id
+        for name, term, term_id in conn.execute(
+            "SELECT t.name, t.term, t.id FROM trigram_pending p JOIN trigram_terms t ON t.name = p.name"
+        )
+    }
+    pending = conn.execute("SELECT COUNT(*) FROM trigram_pending").fetchone()[0]
+
+    wanted = {(name, term) for name in live for term in index_terms(name, aliases.get(name, ()))}
+    stale = [(term, indexed[name, term]) for name, term in indexed.keys() - wanted]
+    removed, added = [], []
+    for term, term_id in stale:
+        grams = trigrams(term)
+        removed.extend((gram, len(grams), term_id) for gram in grams)
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM trigram_terms").fetchone()[0]
+    terms = []
+    for name, term in sorted(wanted - indexed.keys()):
+        grams = trigrams(term)
+        if grams:
+            terms.append((next_id, term, name, len(grams)))
+            added.extend((gram, len(grams), next_id) for gram in grams)
+            next_id += 1
+
+    conn.executemany(
+        "DELETE FROM trigram_postings WHERE gram = ? AND gram_count = ? AND term_id = ?", removed
+    )
+    conn.executemany("DELETE FROM trigram_terms WHERE id = ?", [(i,) for _, i in stale])
+    conn.executemany(
+        "INSERT INTO trigram_terms (id, term, name, gram_count) VALUES (?, ?, ?, ?)", terms
+    )
+    conn.executemany("INSERT INTO trigram_postings VALUES (?, ?, ?)", added)
+    conn.execute("DELETE FROM trigram_pending")
+    return pending
+
+
+def fuzzy_query(
+    text: str,
+    limit: Optional[int] = MAX_CANDIDATES,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+) -> Tuple[str, List[Any]]:
+    """
+    SELECT for the entity names most similar to ``text``.
+
+    A name matches through any of its ``index_terms``, scoring the best
+    of them. Terms whose trigram count rules out reaching
+    ``min_similarity`` are skipped before scoring.
+
+    Args:
+        text: Query, possibly misspelled
+        limit: Maximum names (None for every name above ``min_similarity``, e.g.
+            when the caller filters or pages the matching rows afterwards)
+        min_similarity: Lowest Jaccard similarity to return (0.0 to 1.0)
+
+    Returns:
+        SQL and parameters; rows are ``(name, similarity)``, most similar first
+        (no rows if ``text`` has no word characters)
+    """
+    grams = sorted(trigrams(text))
+    count = len(grams)
+    # |A ∩ B| / |A ∪ B| >= s requires s * |A| <= |B| <= |A| / s
+    floor = min_similarity * count
+    ceiling = count / min_similarity if min_similarity > 0 else 2**31
+    sql = """
+        SELECT t.name, MAX(s.similarity) AS similarity
+        FROM (
+            SELECT term_id, COUNT(*) * 1.0 / (? + gram_count - COUNT(*)) AS similarity
+            FROM trigram_postings
+            WHERE gram IN (SELECT value FROM json_each(?))
+              AND gram_count BETWEEN ? AND ?
+            GROUP BY term_id
+        ) s
+        JOIN trigram_terms t ON t.id = s.term_id
+        WHERE s.similarity >= ?
+        GROUP BY t.name
+        ORDER BY similarity DESC, t.name
+        LIMIT ?
+    """
+    # A negative LIMIT is no limit in SQLite
+    limit = -1 if limit is None else limit
+    return sql, [count, json.dumps(grams), floor, ceiling, min_similarity, limit]
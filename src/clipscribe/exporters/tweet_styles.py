@@ -7,7 +7,7 @@ Each style targets different audiences and engagement patterns.
 import logging
 import os
 
-import httpx
+from ..utils.http_pool import get_http_registry
 
 logger = logging.getLogger(__name__)
 
@@ -153,34 +153,37 @@ Write tweet. 270 chars max. Complete sentences. NO hashtags. NO jargon.
     async def _call_grok(self, prompt: str, max_tokens: int = 100, temperature: float = 0.3) -> str:
         """Call Grok API for generation."""
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                data = {
-                    "model": "grok-4-1-fast-reasoning",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You write engaging X posts in specific styles.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                }
-
-                response = await client.post(
-                    f"{self.grok_base_url}/chat/completions", headers=self.grok_headers, json=data
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    tweet = result["choices"][0]["message"]["content"].strip()
-                    tweet = tweet.strip('"').strip("'")  # Remove quotes
-
-                    # Smart truncate if needed
-                    if len(tweet) > 270:
-                        tweet = self._truncate_smart(tweet, 270)
-
-                    return tweet
+            client = get_http_registry().get_async_client(self.grok_base_url)
+            data = {
+                "model": "grok-4-1-fast-reasoning",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You write engaging X posts in specific styles.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+
+            response = await client.post(
+                f"{self.grok_base_url}/chat/completions",
+                headers=self.grok_headers,
+                json=data,
+                timeout=30,
+            )
+
+            if response.status_code == 200:
+                result = response.json()
+                tweet = result["choices"][0]["message"]["content"].strip()
+                tweet = tweet.strip('"').strip("'")  # Remove quotes
+
+                # Smart truncate if needed
+                if len(tweet) > 270:
+                    tweet = self._truncate_smart(tweet, 270)
+
+                return tweet
 
         except Exception as e:
             logger.warning(f"Style generation failed: {e}")
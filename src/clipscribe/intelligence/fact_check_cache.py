@@ -0,0 +1,202 @@
+"""
+Persistent cache for fact-check results.
+
+The same people and organisations show up across many videos, and each
+verification is a tool-using Grok call. ``FactCheckCache`` keeps results
+keyed by canonical entity name and type in memory and in a small SQLite file,
+so an entity verified in one video is not re-verified in the next until its
+TTL expires. Results are stored as plain dicts (``asdict(FactCheckResult)``).
+
+Examples:
+    >>> cache = get_fact_check_cache()
+    >>> cache.get(entity_cache_key("NVIDIA ", "ORG"))
+    {'entity_name': 'Nvidia', 'verified': True, ...}
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def entity_cache_key(name: str, entity_type: str) -> str:
+    """
+    Canonical key for an entity: case, Unicode compatibility forms and whitespace folded.
+
+    Args:
+        name: Entity name as extracted
+        entity_type: Entity type (e.g. PERSON, ORG)
+
+    Returns:
+        Key such as ``"ORG:nvidia"``
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+    type_name = getattr(entity_type, "value", entity_type)  # EntityType enum or plain str
+    return f"{str(type_name).upper()}:{normalized}"
+
+
+@dataclass
+class FactCheckCacheStats:
+    """Cache hit/miss counters."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            **asdict(self),
+            "hit_rate": (
+                round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+            ),
+        }
+
+
+class FactCheckCache:
+    """Two-level (memory + SQLite) TTL cache of fact-check results."""
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite file for persistence (None keeps results in memory only)
+            ttl_seconds: How long a verification stays valid
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stats = FactCheckCacheStats()
+        self._memory: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if db_path is not None:
+            path = Path(db_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fact_checks (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Key from ``entity_cache_key``
+
+        Returns:
+            The cached result fields, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.stats.memory_hits += 1
+                    return dict(entry[1])
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT result, expires_at FROM fact_checks WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._memory[key] = (row[1], result)
+                    self.stats.disk_hits += 1
+                    return dict(result)
+
+            self.stats.misses += 1
+            return None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Key from ``entity_cache_key``
+            result: Verification result fields (``asdict(FactCheckResult)``)
+        """
+        result = dict(result)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._memory[key] = (expires_at, result)
+            self.stats.stores += 1
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO fact_checks (key, result, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), expires_at),
+                )
+                self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Drop expired entries.
+
+        Returns:
+            Number of persisted rows removed
+        """
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (expires, _) in self._memory.items() if expires <= now]:
+                del self._memory[key]
+            if self._conn is None:
+                return 0
+            removed = self._conn.execute(
+                "DELETE FROM fact_checks WHERE expires_at <= ?", (now,)
+            ).rowcount
+            self._conn.commit()
+            return removed
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global cache instance (shared by every fact checker in the process)
+_global_cache: Optional[FactCheckCache] = None
+
+
+def get_fact_check_cache(
+    db_path: Optional[Union[str, Path]] = None, ttl_seconds: float = DEFAULT_TTL_SECONDS
+) -> FactCheckCache:
+    """
+    Get the process-wide fact-check cache.
+
+    Args:
+        db_path: SQLite file used when the cache is first created
+        ttl_seconds: TTL used when the cache is first created
+
+    Returns:
+        Global FactCheckCache instance
+    """
+    global _global_cache
+    if _global_cache is None:
+        _global_cache = FactCheckCache(db_path=db_path, ttl_seconds=ttl_seconds)
+    return _global_cache
@@ -8,16 +8,60 @@ Leverages xAI's server-side tools (October 2025) for fact-checking and enrichmen
 - collections_search: Search knowledge base
 """
 
+import asyncio
+import json
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..retrievers.grok_client import GrokAPIClient, GrokAPIError
 from ..schemas_grok import Entity, Relationship
+from ..utils.json_stream import salvage_json
+from ..utils.token_counter import get_token_counter
+from .fact_check_cache import FactCheckCache, entity_cache_key
 
 logger = logging.getLogger(__name__)
 
+# System prompts hold every instruction so they form a stable, cacheable prefix;
+# the user message only carries the entity/relationship being checked.
+ENTITY_VERIFICATION_SYSTEM_PROMPT = (
+    "You are a fact-checking assistant. Use available tools to verify information and "
+    "provide evidence. Be thorough but conservative.\n\n"
+    "You will receive an entity extracted from a video transcript (name, type, extraction "
+    "confidence, evidence quote) and optional context. Use available tools to verify this "
+    "entity is accurate. Provide sources."
+)
+
+RELATIONSHIP_VERIFICATION_SYSTEM_PROMPT = (
+    "You are a fact-checking assistant. Verify relationships between entities using "
+    "available tools.\n\n"
+    "You will receive a relationship (subject, predicate, object), the evidence quote it "
+    "was extracted from and optional context. Is this relationship factually accurate? "
+    "Provide evidence."
+)
+
+BATCH_VERIFICATION_SYSTEM_PROMPT = (
+    "You are a fact-checking assistant. Use available tools to verify information and "
+    "provide evidence. Be thorough but conservative.\n\n"
+    "You will receive a numbered list of entities extracted from a video transcript, each "
+    "with its type, extraction confidence and evidence quote. Verify every entity "
+    "independently and answer with a JSON object only:\n"
+    '{"results": [{"index": 0, "verified": true, "sources": ["https://..."], '
+    '"evidence": "one-sentence justification"}]}\n'
+    "Include exactly one result per entity, using the index shown in the list. Mark an "
+    "entity verified only if you found supporting sources, and list only URLs returned "
+    "by your tool calls."
+)
+
+# Output tokens reserved per entity in a batched verification answer
+BATCH_OUTPUT_TOKENS_PER_ENTITY = 120
+
+ENRICHMENT_SYSTEM_PROMPT = (
+    "You are an information enrichment assistant. Find current, relevant information "
+    "about the given entity."
+)
+
 
 class ToolType(str, Enum):
     """Available server-side tools."""
@@ -40,6 +84,38 @@ class FactCheckResult:
     evidence: List[str]
     tool_used: str
     enrichment_data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None  # set when the check itself failed (never cached)
+    entity_type: str = ""
+
+    @classmethod
+    def from_cache(cls, cached: Dict[str, Any]) -> Optional["FactCheckResult"]:
+        """Rebuild a cached result; None if it was stored by an incompatible version."""
+        known = {field.name for field in fields(cls)}
+        try:
+            return cls(**{key: value for key, value in cached.items() if key in known})
+        except TypeError:
+            return None
+
+
+@dataclass
+class AdaptiveBatchSize:
+    """
+    Batch size for multi-entity verification, tuned by observed failures.
+
+    Grows by one after a clean batch and halves when more than
+    ``max_failure_rate`` of a batch had to fall back to individual checks.
+    """
+
+    size: int = 8
+    min_size: int = 1
+    max_size: int = 20
+    max_failure_rate: float = 0.25
+
+    def record(self, batch_len: int, failed: int) -> None:
+        if batch_len and failed / batch_len > self.max_failure_rate:
+            self.size = max(self.min_size, min(self.size, batch_len) // 2)
+        elif failed == 0 and batch_len >= self.size:
+            self.size = min(self.max_size, self.size + 1)
 
 
 class GrokFactChecker:
@@ -67,6 +143,11 @@ class GrokFactChecker:
         enable_code_execution: bool = False,
         collection_id: Optional[str] = None,
         model: str = "grok-4-1-fast-reasoning",
+        max_concurrency: int = 8,
+        cache: Optional[FactCheckCache] = None,
+        enable_batching: bool = True,
+        max_batch_size: int = 10,
+        batch_token_budget: int = 4000,
     ):
         """
         Initialize fact checker.
@@ -78,6 +159,11 @@ class GrokFactChecker:
             enable_code_execution: Enable code execution tool
             collection_id: Collection ID for knowledge base search
             model: Grok model to use
+            max_concurrency: Max verification calls in flight at once
+            cache: Shared result cache (None disables caching)
+            enable_batching: Verify several entities of one type per call
+            max_batch_size: Upper bound for the adaptive batch size
+            batch_token_budget: Max prompt tokens of entity descriptions per batch
         """
         self.client = GrokAPIClient(api_key=api_key)
         self.enable_web_search = enable_web_search
@@ -85,6 +171,13 @@ class GrokFactChecker:
         self.enable_code_execution = enable_code_execution
         self.collection_id = collection_id
         self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
+        self.enable_batching = enable_batching
+        self.batch_size = AdaptiveBatchSize(
+            size=min(8, max(1, max_batch_size)), max_size=max(1, max_batch_size)
+        )
+        self.batch_token_budget = batch_token_budget
 
         # Build available tools list
         self.available_tools = self._build_tools_list()
@@ -156,10 +249,7 @@ class GrokFactChecker:
         prompt = self._build_verification_prompt(entity, context)
 
         messages = [
-            {
-                "role": "system",
-                "content": "You are a fact-checking assistant. Use available tools to verify information and provide evidence. Be thorough but conservative.",
-            },
+            {"role": "system", "content": ENTITY_VERIFICATION_SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ]
 
@@ -171,6 +261,7 @@ class GrokFactChecker:
                 tools=self.available_tools,
                 tool_choice="auto" if auto_select_tool else "required",
                 temperature=0.1,
+                call_site="fact_check_entity",
             )
 
             # Parse tool results
@@ -186,6 +277,8 @@ class GrokFactChecker:
                 sources=[],
                 evidence=[entity.evidence],
                 tool_used="none",
+                error=str(e),
+                entity_type=getattr(entity.type, "value", entity.type),
             )
 
     async def fact_check_entities(
@@ -196,7 +289,13 @@ class GrokFactChecker:
         confidence_threshold: float = 0.7,
     ) -> List[FactCheckResult]:
         """
-        Fact-check multiple entities.
+        Fact-check multiple entities concurrently.
+
+        Entities are deduplicated by canonical name and type, so each distinct
+        entity is verified at most once (and not at all if a cached result is
+        still valid). At most ``max_concurrency`` checks run at once. With
+        batching enabled, entities of the same type are verified several per
+        call, and any entity its batch failed to resolve is re-checked alone.
 
         Args:
             entities: List of entities to verify
@@ -205,23 +304,136 @@ class GrokFactChecker:
             confidence_threshold: Only check entities below this confidence
 
         Returns:
-            List of fact-check results
+            One fact-check result per distinct entity (see ``entity_cache_key``)
         """
-        results = []
-
-        # Filter entities that need fact-checking
-        entities_to_check = [e for e in entities if e.confidence < confidence_threshold]
+        # Filter entities that need fact-checking, keeping the first of each duplicate
+        unique: Dict[str, Entity] = {}
+        for entity in entities:
+            if entity.confidence < confidence_threshold:
+                unique.setdefault(entity_cache_key(entity.name, entity.type), entity)
+
+        results: Dict[str, FactCheckResult] = {}
+        pending: Dict[str, Entity] = {}
+        for key, entity in unique.items():
+            cached = self.cache.get(key) if self.cache else None
+            result = FactCheckResult.from_cache(cached) if cached is not None else None
+            if result is not None:
+                results[key] = result
+            else:
+                pending[key] = entity
 
         logger.info(
-            f"Fact-checking {len(entities_to_check)}/{len(entities)} entities "
-            f"below confidence threshold {confidence_threshold}"
+            f"Fact-checking {len(unique)}/{len(entities)} distinct entities below confidence "
+            f"threshold {confidence_threshold} ({len(unique) - len(pending)} cached)"
         )
 
-        for entity in entities_to_check:
-            result = await self.fact_check_entity(entity)
-            results.append(result)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def check(key: str, entity: Entity) -> None:
+            async with semaphore:
+                result = await self.fact_check_entity(entity)
+            results[key] = result
+            if self.cache and result.error is None:
+                self.cache.set(key, asdict(result))
+
+        async def check_batch(batch: List[Tuple[str, Entity]]) -> None:
+            async with semaphore:
+                batch_results = await self.fact_check_batch([entity for _, entity in batch])
+            fallbacks = [
+                (key, entity)
+                for (key, entity), result in zip(batch, batch_results)
+                if result is None
+            ]
+            self.batch_size.record(len(batch), len(fallbacks))
+            for (key, _), result in zip(batch, batch_results):
+                if result is not None:
+                    results[key] = result
+                    if self.cache:
+                        self.cache.set(key, asdict(result))
+            if fallbacks:
+                logger.info(f"Re-checking {len(fallbacks)}/{len(batch)} entities individually")
+                await asyncio.gather(*(check(key, entity) for key, entity in fallbacks))
+
+        if self.enable_batching and len(pending) > 1:
+            batches = self._build_batches(list(pending.items()))
+            await asyncio.gather(
+                *(check_batch(batch) if len(batch) > 1 else check(*batch[0]) for batch in batches)
+            )
+        else:
+            await asyncio.gather(*(check(key, entity) for key, entity in pending.items()))
+
+        return [results[key] for key in unique]
 
-        return results
+    def _build_batches(self, items: List[Tuple[str, Entity]]) -> List[List[Tuple[str, Entity]]]:
+        """
+        Group entities by type into batches within the size and token budgets.
+
+        Args:
+            items: (cache key, entity) pairs to verify
+
+        Returns:
+            Batches of (cache key, entity) pairs
+        """
+        by_type: Dict[str, List[Tuple[str, Entity]]] = {}
+        for key, entity in items:
+            by_type.setdefault(str(getattr(entity.type, "value", entity.type)), []).append(
+                (key, entity)
+            )
+
+        counter = get_token_counter()
+        batches = []
+        for group in by_type.values():
+            lines = [self._format_batch_line(i, entity) for i, (_, entity) in enumerate(group)]
+            for start, end in counter.pack(lines, self.batch_token_budget):
+                for offset in range(start, end, self.batch_size.size):
+                    batches.append(group[offset : min(end, offset + self.batch_size.size)])
+        return batches
+
+    @staticmethod
+    def _format_batch_line(index: int, entity: Entity) -> str:
+        entity_type = getattr(entity.type, "value", entity.type)
+        return (
+            f"[{index}] {entity.name} ({entity_type}, confidence {entity.confidence:.2f}) "
+            f"- evidence: {entity.evidence}"
+        )
+
+    async def fact_check_batch(
+        self, entities: List[Entity], context: str = ""
+    ) -> List[Optional[FactCheckResult]]:
+        """
+        Fact-check several entities with one tool-using call.
+
+        Args:
+            entities: Entities to verify (ideally of one type)
+            context: Additional context shared by all entities
+
+        Returns:
+            One result per entity, or None where the batch gave no usable
+            answer for it (callers fall back to ``fact_check_entity``)
+        """
+        lines = [self._format_batch_line(i, entity) for i, entity in enumerate(entities)]
+        prompt = "Entities:\n" + "\n".join(lines) + f"\n\nContext: {context}\n"
+        messages = [
+            {"role": "system", "content": BATCH_VERIFICATION_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+
+        try:
+            response = await self.client.chat_completion(
+                messages=messages,
+                model=self.model,
+                tools=self.available_tools,
+                tool_choice="auto",
+                temperature=0.1,
+                max_tokens=BATCH_OUTPUT_TOKENS_PER_ENTITY * len(entities) + 256,
+                response_format={"type": "json_object"},
+                call_site="fact_check_batch",
+            )
+            return self._parse_verification_response(entities, response)
+
+        except GrokAPIError as e:
+            logger.warning(f"Batched fact-check of {len(entities)} entities failed: {e}")
+            return [None] * len(entities)
 
     async def enrich_with_current_info(
         self, entity: Entity, search_query: Optional[str] = None
@@ -239,10 +451,7 @@ class GrokFactChecker:
         query = search_query or f"{entity.name} {entity.type.lower()} latest news"
 
         messages = [
-            {
-                "role": "system",
-                "content": "You are an information enrichment assistant. Find current, relevant information about the given entity.",
-            },
+            {"role": "system", "content": ENRICHMENT_SYSTEM_PROMPT},
             {"role": "user", "content": f"Find latest information about: {query}"},
         ]
 
@@ -253,6 +462,7 @@ class GrokFactChecker:
                 tools=self.available_tools,
                 tool_choice="auto",
                 temperature=0.1,
+                call_site="fact_check_enrichment",
             )
 
             # Extract enrichment data
@@ -275,24 +485,18 @@ class GrokFactChecker:
         Returns:
             FactCheckResult with verification status
         """
-        prompt = f"""
-        Verify this relationship:
-        Subject: {relationship.subject}
-        Predicate: {relationship.predicate}
-        Object: {relationship.object}
-
-        Evidence provided: {relationship.evidence}
+        prompt = f"""Relationship:
+Subject: {relationship.subject}
+Predicate: {relationship.predicate}
+Object: {relationship.object}
 
-        Context: {context}
+Evidence provided: {relationship.evidence}
 
-        Is this relationship factually accurate? Provide evidence.
-        """
+Context: {context}
+"""
 
         messages = [
-            {
-                "role": "system",
-                "content": "You are a fact-checking assistant. Verify relationships between entities using available tools.",
-            },
+            {"role": "system", "content": RELATIONSHIP_VERIFICATION_SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ]
 
@@ -303,6 +507,7 @@ class GrokFactChecker:
                 tools=self.available_tools,
                 tool_choice="auto",
                 temperature=0.1,
+                call_site="fact_check_relationship",
             )
 
             # Parse verification result
@@ -318,59 +523,44 @@ class GrokFactChecker:
                 sources=[],
                 evidence=[relationship.evidence],
                 tool_used="none",
+                error=str(e),
             )
 
     def _build_verification_prompt(self, entity: Entity, context: str) -> str:
         """Build verification prompt for entity."""
-        return f"""
-        Verify this entity:
-        Name: {entity.name}
-        Type: {entity.type}
-        Confidence: {entity.confidence}
-        Evidence: {entity.evidence}
-
-        Context: {context}
+        return f"""Entity:
+Name: {entity.name}
+Type: {entity.type}
+Confidence: {entity.confidence}
+Evidence: {entity.evidence}
 
-        Use available tools to verify this entity is accurate. Provide sources.
-        """
+Context: {context}
+"""
 
     def _parse_verification_response(
-        self, entity: Entity, response: Dict[str, Any]
-    ) -> FactCheckResult:
+        self, entity: Union[Entity, List[Entity]], response: Dict[str, Any]
+    ) -> Union[FactCheckResult, List[Optional[FactCheckResult]]]:
         """
         Parse verification response from Grok.
 
         Args:
-            entity: Original entity
+            entity: Original entity, or the entities of a batched prompt
             response: API response with tool results
 
         Returns:
-            FactCheckResult
+            FactCheckResult, or for a batch one result per entity (None where
+            the response has no valid answer for that entity)
         """
         # Extract tool calls and results
         tool_calls = response.get("choices", [{}])[0].get("message", {}).get("tool_calls", [])
         content = response.get("choices", [{}])[0].get("message", {}).get("content", "")
 
-        sources = []
-        evidence = [entity.evidence]
-        tool_used = "none"
-
-        # Process tool calls
-        for tool_call in tool_calls:
-            tool_type = tool_call.get("function", {}).get("name", "")
-            tool_result = tool_call.get("function", {}).get("arguments", {})
-
-            if tool_type:
-                tool_used = tool_type
+        if isinstance(entity, list):
+            truncated = response.get("choices", [{}])[0].get("finish_reason") == "length"
+            return self._parse_batch_verification(entity, tool_calls, content or "", truncated)
 
-                # Extract sources from tool results
-                if isinstance(tool_result, dict):
-                    if "sources" in tool_result:
-                        sources.extend(tool_result["sources"])
-                    if "results" in tool_result:
-                        for result in tool_result.get("results", []):
-                            if isinstance(result, dict) and "url" in result:
-                                sources.append(result["url"])
+        sources, tool_used = self._extract_tool_sources(tool_calls)
+        evidence = [entity.evidence]
 
         # Simple heuristic: if we found sources, consider it verified
         verified = len(sources) > 0
@@ -389,8 +579,88 @@ class GrokFactChecker:
             sources=sources,
             evidence=evidence,
             tool_used=tool_used,
+            entity_type=getattr(entity.type, "value", entity.type),
         )
 
+    def _parse_batch_verification(
+        self,
+        entities: List[Entity],
+        tool_calls: List[Dict[str, Any]],
+        content: str,
+        truncated: bool = False,
+    ) -> List[Optional[FactCheckResult]]:
+        """
+        Map the ``results`` array of a batched answer back to its entities by index.
+
+        As for a single entity, only sources from the actual tool calls count: an
+        entity is verified only if the answer cites at least one of them.
+        """
+        tool_sources, tool_used = self._extract_tool_sources(tool_calls)
+        found = set(tool_sources)
+        try:
+            parsed = salvage_json(content, ("results",), truncated=truncated)
+        except json.JSONDecodeError as e:
+            # Every entity gets None and is re-verified on its own
+            logger.warning(f"Unparseable batch verification answer: {e}")
+            parsed = {}
+        answers: Dict[int, Dict[str, Any]] = {}
+        for answer in parsed.get("results", []):
+            index = answer.get("index") if isinstance(answer, dict) else None
+            if isinstance(index, int) and 0 <= index < len(entities):
+                answers.setdefault(index, answer)
+
+        results: List[Optional[FactCheckResult]] = []
+        for index, entity in enumerate(entities):
+            answer = answers.get(index)
+            if answer is None or not isinstance(answer.get("verified"), bool):
+                results.append(None)
+                continue
+            sources = [str(url) for url in answer.get("sources") or [] if url in found]
+            evidence = [entity.evidence]
+            if answer.get("evidence"):
+                evidence.append(str(answer["evidence"]))
+            verified = answer["verified"] and len(sources) > 0
+            results.append(
+                FactCheckResult(
+                    entity_name=entity.name,
+                    original_confidence=entity.confidence,
+                    verified=verified,
+                    verification_confidence=(
+                        min(1.0, entity.confidence + 0.1) if verified else entity.confidence
+                    ),
+                    sources=sources,
+                    evidence=evidence,
+                    tool_used=tool_used,
+                    entity_type=getattr(entity.type, "value", entity.type),
+                )
+            )
+        return results
+
+    @staticmethod
+    def _extract_tool_sources(tool_calls: List[Dict[str, Any]]) -> Tuple[List[str], str]:
+        """Collect source URLs and the last tool name from tool calls."""
+        sources = []
+        tool_used = "none"
+
+        # Process tool calls
+        for tool_call in tool_calls:
+            tool_type = tool_call.get("function", {}).get("name", "")
+            tool_result = tool_call.get("function", {}).get("arguments", {})
+
+            if tool_type:
+                tool_used = tool_type
+
+                # Extract sources from tool results
+                if isinstance(tool_result, dict):
+                    if "sources" in tool_result:
+                        sources.extend(tool_result["sources"])
+                    if "results" in tool_result:
+                        for result in tool_result.get("results", []):
+                            if isinstance(result, dict) and "url" in result:
+                                sources.append(result["url"])
+
+        return sources, tool_used
+
     def _parse_relationship_verification(
         self, relationship: Relationship, response: Dict[str, Any]
     ) -> FactCheckResult:
@@ -428,7 +698,7 @@ class GrokFactChecker:
 
     async def close(self):
         """Close the API client."""
-        await self.client.client.aclose()
+        await self.client.close()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -0,0 +1,306 @@
+"""
+Salient excerpt sampling for speaker identification.
+
+Sending the first N characters of a diarized transcript to Grok makes speaker
+ID cost grow with video length and misses speakers who only introduce
+themselves later. ``SpeakerExcerptSampler`` runs a local pre-pass that keeps,
+per ``SPEAKER_XX``, the turns most likely to reveal who is speaking:
+
+- self-introductions ("I'm Tim", "my name is ...")
+- vocative name mentions by others ("Thanks for having me, Tim.") and the
+  addressed speaker's neighbouring turn
+- turns mentioning names from the entity index (introductions, vocatives,
+  video title/channel)
+- each speaker's first and last turns
+
+within a fixed token budget, so the context is the same size for a
+10-minute clip and a 4-hour podcast.
+
+Examples:
+    >>> sampler = SpeakerExcerptSampler(token_budget=3000)
+    >>> excerpt = sampler.sample(transcript, ["SPEAKER_00", "SPEAKER_01"], metadata)
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from ..utils.token_counter import get_token_counter
+
+logger = logging.getLogger(__name__)
+
+_TURN = re.compile(r"^\s*\[?(SPEAKER_\d+)\]?\s*:\s*(.*)$")
+_NAME = r"[A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+){0,2}"
+_TITLE = (
+    r"(?:Mr|Mrs|Ms|Dr|Senator|Congressman|Congresswoman|Representative|Governor|"
+    r"President|Secretary|General|Professor|Judge|Mayor|Chairman|Director)\.?"
+)
+_SELF_INTRO = re.compile(
+    rf"\b(?:I'm|I am|my name is|this is|call me|I'm your host,?)\s+(?:{_TITLE}\s+)?({_NAME})"
+)
+_VOCATIVE = re.compile(
+    rf"(?:^|[.!?]\s+)({_NAME}),\s|,\s+({_NAME})\s*[.!?]|\b({_TITLE}\s+{_NAME})",
+)
+_SENTENCE_START = re.compile(r"(?:^|[.!?]\s+)")
+
+# Capitalised words that open sentences rather than name people
+_NOT_NAMES = {
+    "I",
+    "Im",
+    "Well",
+    "So",
+    "Yes",
+    "Yeah",
+    "No",
+    "Okay",
+    "OK",
+    "Thanks",
+    "Thank",
+    "And",
+    "But",
+    "Oh",
+    "Look",
+    "Right",
+    "Now",
+    "The",
+    "That",
+    "This",
+    "What",
+    "Why",
+    "How",
+    "Sure",
+    "Absolutely",
+    "Exactly",
+    "Please",
+    "Hey",
+    "Hi",
+    "Hello",
+    "Welcome",
+    "Everyone",
+    "Folks",
+    "Guys",
+    "Going",
+    "Here",
+    "There",
+    "Just",
+    "Not",
+}
+
+# Selection priority of each kind of evidence (higher is kept first)
+SCORE_SELF_INTRO = 10.0
+SCORE_ADDRESSED_BY_OTHER = 6.0
+SCORE_REPLY_TO_ADDRESS = 5.0
+SCORE_FIRST_TURN = 4.0
+SCORE_NAME_MENTION = 3.0
+SCORE_LAST_TURN = 2.0
+SCORE_FILLER = 0.5
+
+
+@dataclass
+class Turn:
+    """One speaker turn of a diarized transcript."""
+
+    index: int
+    speaker: str
+    text: str
+    self_intro: Optional[re.Match] = None
+    vocative: Optional[re.Match] = None
+    names: Set[str] = field(default_factory=set)
+
+
+_TITLE_WORD = re.compile(rf"^{_TITLE}$")
+
+
+def _clean_name(name: Optional[str]) -> Optional[str]:
+    """Drop sentence-opening words and titles from a candidate name."""
+    if not name:
+        return None
+    words = [w for w in name.split() if w not in _NOT_NAMES and not _TITLE_WORD.match(w)]
+    return " ".join(words) or None
+
+
+def _first_named_match(pattern: re.Pattern, text: str) -> Optional[re.Match]:
+    """First match of ``pattern`` whose captured name survives ``_clean_name``."""
+    for match in pattern.finditer(text):
+        if _clean_name(next((g for g in match.groups() if g), None)):
+            return match
+    return None
+
+
+def parse_turns(transcript: str) -> List[Turn]:
+    """
+    Split a ``[SPEAKER_XX]: text`` transcript into turns.
+
+    Consecutive lines of the same speaker (and unlabelled continuation lines)
+    are merged into one turn.
+
+    Args:
+        transcript: Transcript with speaker labels
+
+    Returns:
+        Turns in transcript order
+    """
+    turns: List[Turn] = []
+    for line in transcript.splitlines():
+        match = _TURN.match(line)
+        if match:
+            speaker, text = match.group(1), match.group(2).strip()
+            if turns and turns[-1].speaker == speaker:
+                turns[-1].text = f"{turns[-1].text} {text}".strip()
+            else:
+                turns.append(Turn(index=len(turns), speaker=speaker, text=text))
+        elif turns and line.strip():
+            turns[-1].text = f"{turns[-1].text} {line.strip()}"
+    return turns
+
+
+class SpeakerExcerptSampler:
+    """Pick the most identifying turns per speaker within a token budget."""
+
+    def __init__(self, token_budget: int = 4000, max_turn_tokens: int = 120):
+        """
+        Initialize the sampler.
+
+        Args:
+            token_budget: Total tokens of excerpt text across all speakers
+            max_turn_tokens: Longer turns are clipped around their evidence
+        """
+        self.token_budget = token_budget
+        self.max_turn_tokens = max_turn_tokens
+        self.counter = get_token_counter()
+
+    def sample(
+        self,
+        transcript: str,
+        speaker_labels: Sequence[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build a constant-size excerpt of the transcript for speaker identification.
+
+        Args:
+            transcript: Full transcript with ``[SPEAKER_XX]:`` labels
+            speaker_labels: Speakers to sample turns for
+            metadata: Video metadata (title/channel names seed the entity index)
+
+        Returns:
+            Selected turns in transcript order, with ``[...]`` marking skipped turns
+        """
+        turns = parse_turns(transcript)
+        if not turns:
+            # Unlabelled transcript: fall back to its head within the same budget
+            chunks = self.counter.split_text(transcript, self.token_budget)
+            return chunks[0] if chunks else ""
+
+        self._annotate(turns, metadata or {})
+        labels = [label for label in speaker_labels if label] or sorted({t.speaker for t in turns})
+        per_speaker = max(self.max_turn_tokens, self.token_budget // max(1, len(labels)))
+
+        selected: Dict[int, str] = {}
+        for label in labels:
+            spent = 0
+            for turn in self._rank_turns(turns, label):
+                if turn.index in selected:
+                    continue
+                text = self._clip(turn)
+                tokens = self.counter.count(text)
+                if spent + tokens > per_speaker:
+                    continue
+                selected[turn.index] = text
+                spent += tokens
+
+        lines: List[str] = []
+        previous = -1
+        for index in sorted(selected):
+            if index != previous + 1:
+                lines.append("[...]")
+            lines.append(f"[{turns[index].speaker}]: {selected[index]}")
+            previous = index
+        if previous != len(turns) - 1:
+            lines.append("[...]")
+
+        logger.debug(
+            f"Sampled {len(selected)}/{len(turns)} turns for {len(labels)} speakers "
+            f"(budget {self.token_budget} tokens)"
+        )
+        return "\n".join(lines)
+
+    def _annotate(self, turns: List[Turn], metadata: Dict[str, Any]) -> None:
+        """Find introductions and vocatives, then index every known name over the turns."""
+        known: Set[str] = set()
+        for turn in turns:
+            turn.self_intro = _first_named_match(_SELF_INTRO, turn.text)
+            turn.vocative = _first_named_match(_VOCATIVE, turn.text)
+            for match in (turn.self_intro, turn.vocative):
+                if match:
+                    name = _clean_name(next((g for g in match.groups() if g), None))
+                    if name:
+                        known.add(name)
+
+        for key in ("title", "channel"):
+            for name in re.findall(_NAME, str(metadata.get(key) or "")):
+                name = _clean_name(name)
+                if name and len(name) > 2:
+                    known.add(name)
+
+        if not known:
+            return
+        # Index last names / single tokens too, so "Greene" matches "Marjorie Taylor Greene"
+        tokens = {word for name in known for word in name.split() if len(word) > 2}
+        index_pattern = re.compile(
+            r"\b(" + "|".join(sorted(map(re.escape, tokens), key=len, reverse=True)) + r")\b"
+        )
+        for turn in turns:
+            turn.names = set(index_pattern.findall(turn.text))
+
+    def _rank_turns(self, turns: List[Turn], label: str) -> List[Turn]:
+        """Order candidate turns for ``label`` by evidence score (earliest first on ties)."""
+        own = [t for t in turns if t.speaker == label]
+        if not own:
+            return []
+
+        scores: Dict[int, float] = {}
+
+        def bump(turn: Turn, score: float) -> None:
+            scores[turn.index] = max(scores.get(turn.index, 0.0), score)
+
+        bump(own[0], SCORE_FIRST_TURN)
+        bump(own[-1], SCORE_LAST_TURN)
+        for turn in own:
+            if turn.self_intro:
+                bump(turn, SCORE_SELF_INTRO)
+            if turn.names:
+                bump(turn, SCORE_NAME_MENTION)
+            for neighbour_index in (turn.index - 1, turn.index + 1):
+                if 0 <= neighbour_index < len(turns):
+                    neighbour = turns[neighbour_index]
+                    if neighbour.speaker != label and neighbour.vocative:
+                        # Someone addressing this speaker by name, and this speaker's reply
+                        bump(neighbour, SCORE_ADDRESSED_BY_OTHER)
+                        bump(turn, SCORE_REPLY_TO_ADDRESS)
+
+        # Evenly spaced own turns fill any remaining budget (style and topic cues)
+        step = max(1, len(own) // 8)
+        for turn in own[::step]:
+            bump(turn, SCORE_FILLER)
+
+        return sorted((turns[index] for index in scores), key=lambda t: (-scores[t.index], t.index))
+
+    def _clip(self, turn: Turn) -> str:
+        """Clip a long turn to ``max_turn_tokens``, starting at the sentence holding its evidence."""
+        if self.counter.count(turn.text) <= self.max_turn_tokens:
+            return turn.text
+
+        focus = 0
+        match = turn.self_intro or turn.vocative
+        if match:
+            focus = match.start()
+        elif turn.names:
+            focus = min(turn.text.find(name) for name in turn.names)
+        starts = [m.end() for m in _SENTENCE_START.finditer(turn.text) if m.end() <= focus]
+        start = starts[-1] if starts else 0
+
+        chunks = self.counter.split_text(turn.text[start:], self.max_turn_tokens)
+        clipped = chunks[0] if chunks else ""
+        return ("... " if start else "") + clipped + " ..."
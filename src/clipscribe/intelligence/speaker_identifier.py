@@ -11,15 +11,57 @@ import json
 import logging
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-import httpx
 from dotenv import load_dotenv
 
+from ..utils.http_pool import get_http_registry
+from ..utils.prompt_cache import get_prompt_cache
+from .speaker_excerpts import SpeakerExcerptSampler
+from .voiceprint_registry import VoiceprintRegistry, get_voiceprint_registry
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+SPEAKER_IDENTIFICATION_SYSTEM_PROMPT = """You are an expert at identifying speakers from context. Be conservative - only identify when confident.
+
+You will receive video context, speaker statistics and a transcript excerpt, then the speaker labels to identify.
+
+For each speaker label, provide:
+
+1. **Most likely identity**: Full name or clear role
+2. **Confidence**: 0-100% (be conservative - only confident IDs)
+3. **Role**: Host, guest, panelist, interviewer, subject, etc.
+4. **Evidence**: Specific quotes or context clues that reveal identity
+
+Guidelines:
+- Only identify when CONFIDENT (60%+ confidence)
+- Use direct evidence: "As Senator X said..." = Senator X
+- Pay attention to introductions, names mentioned, how people are addressed
+- If uncertain, say "Unknown" with low confidence
+- For roles, be specific: "Host" vs "Guest" vs "Subject of discussion"
+- Consider video title/description as context
+
+Return JSON array:
+[
+  {
+    "speaker_label": "SPEAKER_00",
+    "identified_name": "Tim Dillon" or null,
+    "confidence": 95,
+    "role": "Host",
+    "evidence": [
+      "Introduces show: 'I'm Tim, welcome to my show'",
+      "Other speaker addresses him as 'Tim'",
+      "Channel is 'The Tim Dillon Show'"
+    ]
+  },
+  ...
+]
+
+Be conservative. Unknown is better than incorrect.
+"""
+
 
 @dataclass
 class SpeakerIdentity:
@@ -45,7 +87,12 @@ class SpeakerIdentifier:
     """
 
     def __init__(
-        self, grok_model: str = "grok-4-1-fast-reasoning", confidence_threshold: float = 0.70
+        self,
+        grok_model: str = "grok-4-1-fast-reasoning",
+        confidence_threshold: float = 0.70,
+        excerpt_token_budget: int = 4000,
+        voiceprint_registry: Optional[VoiceprintRegistry] = None,
+        use_voiceprints: bool = True,
     ):
         """
         Initialize speaker identifier.
@@ -53,9 +100,16 @@ class SpeakerIdentifier:
         Args:
             grok_model: Grok model to use
             confidence_threshold: Only return IDs above this confidence
+            excerpt_token_budget: Transcript tokens sent to Grok, regardless of video length
+            voiceprint_registry: Registry of known voices (defaults to the global registry)
+            use_voiceprints: Match speakers against known voices before asking Grok
         """
         self.grok_model = grok_model
         self.confidence_threshold = confidence_threshold
+        self.excerpt_sampler = SpeakerExcerptSampler(token_budget=excerpt_token_budget)
+        self.voiceprints = (
+            (voiceprint_registry or get_voiceprint_registry()) if use_voiceprints else None
+        )
 
         # Get API key
         self.xai_api_key = os.getenv("XAI_API_KEY", "").strip('"').strip("'")
@@ -76,19 +130,32 @@ class SpeakerIdentifier:
         speaker_segments: List[Dict[str, Any]],
         video_metadata: Optional[Dict[str, Any]] = None,
         manual_overrides: Optional[Dict[str, str]] = None,
+        speaker_embeddings: Optional[Dict[str, Sequence[float]]] = None,
     ) -> List[SpeakerIdentity]:
         """
         Identify speakers from transcript context.
 
+        Speakers whose diarization embedding matches a known voice-print are
+        identified locally; only the rest are sent to Grok. Confident
+        identifications (and manual overrides) are folded back into the
+        registry for later videos.
+
         Args:
             transcript_with_speakers: Full transcript with [SPEAKER_XX] labels
             speaker_segments: List of speaker segment info (from diarization)
             video_metadata: Video title, description, channel (helps context)
             manual_overrides: Dict of speaker_label -> name (user-provided)
+            speaker_embeddings: speaker_label -> diarization embedding (defaults to
+                each segment's ``embedding`` entry, if present)
 
         Returns:
             List of SpeakerIdentity objects with names and confidence
         """
+        embeddings = dict(speaker_embeddings or {})
+        for segment in speaker_segments:
+            if segment.get("embedding") is not None:
+                embeddings.setdefault(segment.get("speaker", ""), segment["embedding"])
+        channel = (video_metadata or {}).get("channel")
 
         # Apply manual overrides first
         if manual_overrides:
@@ -115,9 +182,18 @@ class SpeakerIdentifier:
             overridden = []
             remaining_speakers = speaker_segments
 
+        # Known voices skip the LLM entirely
+        recognized = self._match_voiceprints(remaining_speakers, embeddings, channel)
+        remaining_speakers = [
+            s
+            for s in remaining_speakers
+            if s.get("speaker") not in {r.speaker_label for r in recognized}
+        ]
+
         # If no speakers left to identify
         if not remaining_speakers:
-            return overridden
+            self._remember_voiceprints(overridden + recognized, embeddings, channel)
+            return overridden + recognized
 
         # Build context for Grok
         context = self._build_identification_context(
@@ -127,8 +203,57 @@ class SpeakerIdentifier:
         # Ask Grok to identify speakers
         identified = await self._identify_with_grok(context, remaining_speakers)
 
-        # Combine manual + AI identified
-        return overridden + identified
+        # Combine manual + voice-print + AI identified
+        self._remember_voiceprints(overridden + recognized + identified, embeddings, channel)
+        return overridden + recognized + identified
+
+    def _match_voiceprints(
+        self,
+        speakers: List[Dict[str, Any]],
+        embeddings: Dict[str, Sequence[float]],
+        channel: Optional[str],
+    ) -> List[SpeakerIdentity]:
+        """Identify speakers whose embedding confidently matches a known voice-print."""
+        if not self.voiceprints or not embeddings:
+            return []
+
+        labels = {s.get("speaker") for s in speakers}
+        matches = self.voiceprints.match(
+            {label: vector for label, vector in embeddings.items() if label in labels}, channel
+        )
+        if matches:
+            logger.info(f"Recognized {len(matches)} speakers from voice-prints (no Grok call)")
+        return [
+            SpeakerIdentity(
+                speaker_label=label,
+                identified_name=match.name,
+                confidence=match.similarity,
+                role=match.role,
+                evidence=[
+                    f"Voice-print match ({match.similarity:.2f} similarity) with "
+                    f"{match.name}, seen in {match.appearances} earlier videos"
+                ],
+            )
+            for label, match in matches.items()
+        ]
+
+    def _remember_voiceprints(
+        self,
+        identities: List[SpeakerIdentity],
+        embeddings: Dict[str, Sequence[float]],
+        channel: Optional[str],
+    ) -> None:
+        """Fold confidently identified speakers' embeddings into the registry."""
+        if not self.voiceprints or not embeddings:
+            return
+        for ident in identities:
+            embedding = embeddings.get(ident.speaker_label)
+            if (
+                embedding is not None
+                and ident.identified_name
+                and ident.confidence >= self.confidence_threshold
+            ):
+                self.voiceprints.update(ident.identified_name, channel, embedding, role=ident.role)
 
     def _build_identification_context(
         self, transcript: str, speakers: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]]
@@ -157,11 +282,13 @@ class SpeakerIdentifier:
             context_parts.append(f"{label}: {time:.1f}s speaking time, {segs} segments")
         context_parts.append("")
 
-        # Transcript (first 15,000 chars to stay under token limits)
+        # Most identifying turns per speaker, within a fixed token budget
         context_parts.append("TRANSCRIPT EXCERPT:")
-        context_parts.append(transcript[:15000])
-        if len(transcript) > 15000:
-            context_parts.append("\n[... transcript continues ...]")
+        context_parts.append(
+            self.excerpt_sampler.sample(
+                transcript, [spk.get("speaker", "") for spk in speakers], metadata
+            )
+        )
 
         return "\n".join(context_parts)
 
@@ -176,118 +303,89 @@ class SpeakerIdentifier:
 
         speaker_labels = [s.get("speaker", "") for s in speakers]
 
-        prompt = f"""Analyze this video transcript and identify each speaker.
-
-{context}
+        # Only the video context and labels vary; the instructions are a cacheable prefix
+        prompt = f"""{context}
 
-For each speaker label ({', '.join(speaker_labels)}), provide:
+Identify these speaker labels: {', '.join(speaker_labels)}
+"""
 
-1. **Most likely identity**: Full name or clear role
-2. **Confidence**: 0-100% (be conservative - only confident IDs)
-3. **Role**: Host, guest, panelist, interviewer, subject, etc.
-4. **Evidence**: Specific quotes or context clues that reveal identity
+        try:
+            client = get_http_registry().get_async_client(self.grok_base_url)
+            data = {
+                "model": self.grok_model,
+                "messages": [
+                    {"role": "system", "content": SPEAKER_IDENTIFICATION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": 0.1,  # Low temp for factual inference
+                "max_tokens": 2048,
+                "response_format": {"type": "json_object"},
+            }
+
+            response = await client.post(
+                f"{self.grok_base_url}/chat/completions",
+                headers=self.grok_headers,
+                json=data,
+                timeout=60,
+            )
 
-Guidelines:
-- Only identify when CONFIDENT (60%+ confidence)
-- Use direct evidence: "As Senator X said..." = Senator X
-- Pay attention to introductions, names mentioned, how people are addressed
-- If uncertain, say "Unknown" with low confidence
-- For roles, be specific: "Host" vs "Guest" vs "Subject of discussion"
-- Consider video title/description as context
+            if response.status_code != 200:
+                logger.error(f"Grok API error: {response.status_code} - {response.text}")
+                return self._fallback_unknown_speakers(speakers)
 
-Return JSON array:
-[
-  {{
-    "speaker_label": "SPEAKER_00",
-    "identified_name": "Tim Dillon" or null,
-    "confidence": 95,
-    "role": "Host",
-    "evidence": [
-      "Introduces show: 'I'm Tim, welcome to my show'",
-      "Other speaker addresses him as 'Tim'",
-      "Channel is 'The Tim Dillon Show'"
-    ]
-  }},
-  ...
-]
+            result_json = response.json()
+            get_prompt_cache().record_usage(
+                result_json.get("usage", {}), "speaker_identification", self.grok_model
+            )
+            content = result_json["choices"][0]["message"]["content"]
 
-Be conservative. Unknown is better than incorrect.
-"""
+            # Parse Grok's response
+            grok_identifications = json.loads(content)
 
-        try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                data = {
-                    "model": self.grok_model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are an expert at identifying speakers from context. Be conservative - only identify when confident.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.1,  # Low temp for factual inference
-                    "max_tokens": 2048,
-                    "response_format": {"type": "json_object"},
-                }
-
-                response = await client.post(
-                    f"{self.grok_base_url}/chat/completions", headers=self.grok_headers, json=data
-                )
-
-                if response.status_code != 200:
-                    logger.error(f"Grok API error: {response.status_code} - {response.text}")
-                    return self._fallback_unknown_speakers(speakers)
-
-                result_json = response.json()
-                content = result_json["choices"][0]["message"]["content"]
-
-                # Parse Grok's response
-                grok_identifications = json.loads(content)
-
-                # Handle both array and object with "speakers" key
-                if isinstance(grok_identifications, dict):
-                    if "speakers" in grok_identifications:
-                        identifications = grok_identifications["speakers"]
-                    elif "identifications" in grok_identifications:
-                        identifications = grok_identifications["identifications"]
-                    else:
-                        # Assume it's a single-speaker dict, wrap in array
-                        identifications = [grok_identifications]
+            # Handle both array and object with "speakers" key
+            if isinstance(grok_identifications, dict):
+                if "speakers" in grok_identifications:
+                    identifications = grok_identifications["speakers"]
+                elif "identifications" in grok_identifications:
+                    identifications = grok_identifications["identifications"]
                 else:
-                    identifications = grok_identifications
-
-                # Convert to SpeakerIdentity objects
-                results = []
-                for ident in identifications:
-                    conf = ident.get("confidence", 0) / 100.0  # Convert % to 0-1
-
-                    # Only include if above threshold
-                    if conf >= self.confidence_threshold:
-                        results.append(
-                            SpeakerIdentity(
-                                speaker_label=ident["speaker_label"],
-                                identified_name=ident.get("identified_name"),
-                                confidence=conf,
-                                role=ident.get("role"),
-                                evidence=ident.get("evidence", []),
-                            )
+                    # Assume it's a single-speaker dict, wrap in array
+                    identifications = [grok_identifications]
+            else:
+                identifications = grok_identifications
+
+            # Convert to SpeakerIdentity objects
+            results = []
+            for ident in identifications:
+                conf = ident.get("confidence", 0) / 100.0  # Convert % to 0-1
+
+                # Only include if above threshold
+                if conf >= self.confidence_threshold:
+                    results.append(
+                        SpeakerIdentity(
+                            speaker_label=ident["speaker_label"],
+                            identified_name=ident.get("identified_name"),
+                            confidence=conf,
+                            role=ident.get("role"),
+                            evidence=ident.get("evidence", []),
                         )
-                    else:
-                        # Below threshold - mark as unknown
-                        results.append(
-                            SpeakerIdentity(
-                                speaker_label=ident["speaker_label"],
-                                identified_name=None,
-                                confidence=conf,
-                                role=ident.get("role"),
-                                evidence=["Confidence below threshold"],
-                            )
+                    )
+                else:
+                    # Below threshold - mark as unknown
+                    results.append(
+                        SpeakerIdentity(
+                            speaker_label=ident["speaker_label"],
+                            identified_name=None,
+                            confidence=conf,
+                            role=ident.get("role"),
+                            evidence=["Confidence below threshold"],
                         )
+                    )
 
-                logger.info(
-                    f"Identified {sum(1 for r in results if r.identified_name)} of {len(results)} speakers"
-                )
-                return results
+            logger.info(
+                f"Identified {sum(1 for r in results if r.identified_name)} of {len(results)} speakers"
+            )
+            return results
 
         except Exception as e:
             logger.error(f"Speaker identification failed: {e}")
@@ -0,0 +1,293 @@
+"""
+Cross-video voice-print registry for speaker identification.
+
+Recurring hosts and guests are re-identified by an LLM call in every video.
+``VoiceprintRegistry`` keeps, per (identified name, channel), the centroid of
+the diarization speaker embeddings seen for that person, persisted in SQLite
+and held in memory as one normalised NumPy matrix. A new video's speakers are
+matched with a single matrix product (cosine similarity); confident matches
+skip the LLM entirely.
+
+NumPy is optional: without it the registry is disabled and every speaker goes
+to Grok as before.
+
+Storage location is configurable via the CLIPSCRIBE_VOICEPRINT_DB environment
+variable (default data/voiceprints.db).
+
+Examples:
+    >>> registry = get_voiceprint_registry()
+    >>> matches = registry.match({"SPEAKER_00": embedding}, channel="The Tim Dillon Show")
+    >>> registry.update("Tim Dillon", "The Tim Dillon Show", embedding, role="Host")
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VoiceprintMatch:
+    """A diarized speaker matched to a known voice."""
+
+    speaker_label: str
+    name: str
+    channel: str
+    role: Optional[str]
+    similarity: float
+    appearances: int
+
+
+class VoiceprintRegistry:
+    """Speaker embedding centroids keyed by identified name and channel."""
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        match_threshold: float = 0.75,
+        min_margin: float = 0.05,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            db_path: SQLite file for persistence (None keeps voice-prints in memory only)
+            match_threshold: Minimum cosine similarity for a confident match
+            min_margin: Required similarity lead over the next-best voice-print
+        """
+        self.match_threshold = match_threshold
+        self.min_margin = min_margin
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._keys: List[tuple] = []  # (name, channel) per matrix row
+        self._roles: List[Optional[str]] = []
+        self._counts: List[int] = []
+        self._matrix = None  # (n, dim) unit-normalised centroids
+
+        if not NUMPY_AVAILABLE:
+            logger.info("numpy not installed; voice-print matching disabled")
+            return
+
+        if db_path is not None:
+            path = Path(db_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS voiceprints (
+                    name TEXT NOT NULL,
+                    channel TEXT NOT NULL,
+                    role TEXT,
+                    centroid BLOB NOT NULL,
+                    appearances INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (name, channel)
+                )
+                """
+            )
+            self._conn.commit()
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return NUMPY_AVAILABLE
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT name, channel, role, centroid, appearances FROM voiceprints"
+        ).fetchall()
+        vectors = []
+        for name, channel, role, blob, appearances in rows:
+            self._keys.append((name, channel))
+            self._roles.append(role)
+            self._counts.append(appearances)
+            vectors.append(np.frombuffer(blob, dtype=np.float32))
+        if vectors:
+            self._matrix = np.vstack(vectors)
+        logger.debug(f"Loaded {len(rows)} voice-prints")
+
+    @staticmethod
+    def _normalise(vector: Sequence[float]):
+        array = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else None
+
+    def match(
+        self, embeddings: Dict[str, Sequence[float]], channel: Optional[str] = None
+    ) -> Dict[str, VoiceprintMatch]:
+        """
+        Match diarized speakers against known voice-prints.
+
+        A speaker matches its most similar voice-print only if the similarity
+        clears ``match_threshold`` and beats the runner-up by ``min_margin``;
+        each voice-print is assigned to at most one speaker. When ``channel``
+        is given only that channel's voice-prints are considered.
+
+        Args:
+            embeddings: speaker_label -> diarization embedding
+            channel: Channel of the video being processed
+
+        Returns:
+            speaker_label -> VoiceprintMatch for confident matches only
+        """
+        if not self.enabled or not embeddings:
+            return {}
+
+        labels, queries = [], []
+        for label, vector in embeddings.items():
+            unit = self._normalise(vector)
+            if unit is not None:
+                labels.append(label)
+                queries.append(unit)
+
+        with self._lock:
+            if self._matrix is None or not queries:
+                return {}
+            candidates = np.arange(len(self._keys))
+            if channel:
+                candidates = np.array(
+                    [i for i, (_, ch) in enumerate(self._keys) if ch == channel], dtype=int
+                )
+            if candidates.size == 0:
+                return {}
+            query_matrix = np.vstack(queries)
+            if query_matrix.shape[1] != self._matrix.shape[1]:
+                logger.warning("Embedding size differs from stored voice-prints; skipping match")
+                return {}
+            similarity = query_matrix @ self._matrix[candidates].T  # (speakers, voices)
+
+            # Each speaker's best voice must beat the runner-up by a margin (look-alike voices)
+            best = np.argmax(similarity, axis=1)
+            best_scores = similarity[np.arange(len(labels)), best]
+            if similarity.shape[1] > 1:
+                runner_up = np.sort(similarity, axis=1)[:, -2]
+            else:
+                runner_up = np.full(len(labels), -1.0)
+            confident = (best_scores >= self.match_threshold) & (
+                best_scores - runner_up >= self.min_margin
+            )
+
+            matches: Dict[str, VoiceprintMatch] = {}
+            used_voices = set()
+            for row in np.argsort(-best_scores):
+                voice = int(candidates[best[row]])
+                if not confident[row] or voice in used_voices:
+                    continue
+                name, voice_channel = self._keys[voice]
+                matches[labels[row]] = VoiceprintMatch(
+                    speaker_label=labels[row],
+                    name=name,
+                    channel=voice_channel,
+                    role=self._roles[voice],
+                    similarity=float(best_scores[row]),
+                    appearances=self._counts[voice],
+                )
+                used_voices.add(voice)
+            return matches
+
+    def update(
+        self,
+        name: str,
+        channel: Optional[str],
+        embedding: Sequence[float],
+        role: Optional[str] = None,
+    ) -> None:
+        """
+        Fold a confidently identified speaker's embedding into their voice-print.
+
+        Args:
+            name: Identified speaker name
+            channel: Channel the video belongs to
+            embedding: Diarization embedding for the speaker in this video
+            role: Speaker role (e.g. Host), kept from the latest identification
+        """
+        if not self.enabled:
+            return
+        unit = self._normalise(embedding)
+        if unit is None:
+            return
+
+        key = (name, channel or "")
+        with self._lock:
+            if self._matrix is not None and self._matrix.shape[1] != unit.shape[0]:
+                logger.warning(
+                    f"Embedding size differs from stored voice-prints; not storing {name}"
+                )
+                return
+            if key in self._keys:
+                index = self._keys.index(key)
+                count = self._counts[index]
+                centroid = self._normalise(self._matrix[index] * count + unit)
+                self._matrix[index] = centroid
+                self._counts[index] = count + 1
+                self._roles[index] = role or self._roles[index]
+            else:
+                index = len(self._keys)
+                centroid = unit
+                self._keys.append(key)
+                self._roles.append(role)
+                self._counts.append(1)
+                self._matrix = (
+                    unit[np.newaxis, :]
+                    if self._matrix is None
+                    else np.vstack([self._matrix, unit[np.newaxis, :]])
+                )
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO voiceprints "
+                    "(name, channel, role, centroid, appearances, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        name,
+                        key[1],
+                        self._roles[index],
+                        centroid.astype(np.float32).tobytes(),
+                        self._counts[index],
+                        time.time(),
+                    ),
+                )
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global registry instance
+_global_registry: Optional[VoiceprintRegistry] = None
+
+
+def get_voiceprint_registry() -> VoiceprintRegistry:
+    """
+    Get the process-wide voice-print registry.
+
+    Returns:
+        Global VoiceprintRegistry instance
+    """
+    global _global_registry
+    if _global_registry is None:
+        _global_registry = VoiceprintRegistry(
+            db_path=os.getenv("CLIPSCRIBE_VOICEPRINT_DB", "data/voiceprints.db")
+        )
+    return _global_registry
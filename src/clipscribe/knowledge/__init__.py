@@ -5,5 +5,14 @@ Handles Collections API integration and knowledge base management.
 """
 
 from .collection_manager import SearchResult, VideoKnowledgeBase, VideoReference
+from .ingestion_queue import KnowledgeIngestionQueue
+from .local_index import LocalSearchIndex, get_local_search_index
 
-__all__ = ["VideoKnowledgeBase", "SearchResult", "VideoReference"]
+__all__ = [
+    "VideoKnowledgeBase",
+    "SearchResult",
+    "VideoReference",
+    "KnowledgeIngestionQueue",
+    "LocalSearchIndex",
+    "get_local_search_index",
+]
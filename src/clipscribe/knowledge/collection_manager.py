@@ -16,6 +16,7 @@ from typing import Any, Dict, List, Optional
 
 from ..models import VideoIntelligence
 from ..retrievers.grok_client import GrokAPIClient, GrokAPIError
+from .local_index import LocalSearchIndex, apply_search_filters
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,7 @@ class VideoKnowledgeBase:
     - Cross-reference entities across videos
     - Build temporal intelligence from collection
     - Entity co-occurrence analysis
+    - Local BM25/vector index answering searches without a remote round-trip
 
     Collection structure:
     - Each video uploaded as a file
@@ -69,6 +71,7 @@ class VideoKnowledgeBase:
         collection_id: Optional[str] = None,
         collection_name: str = "clipscribe-videos",
         model: str = "grok-4-1-fast-reasoning",
+        local_index: Optional[LocalSearchIndex] = None,
     ):
         """
         Initialize knowledge base manager.
@@ -78,11 +81,13 @@ class VideoKnowledgeBase:
             collection_id: Existing collection ID (will create if None)
             collection_name: Name for new collection
             model: Model to use for embeddings
+            local_index: Local search index (defaults to a fresh in-memory index)
         """
         self.client = GrokAPIClient(api_key=api_key)
         self.collection_id = collection_id
         self.collection_name = collection_name
         self.model = model
+        self.local_index = local_index if local_index is not None else LocalSearchIndex()
 
         # Track uploaded videos
         self.video_files: Dict[str, str] = {}  # video_id -> file_id
@@ -140,11 +145,14 @@ class VideoKnowledgeBase:
         """
         Add processed video to knowledge base.
 
+        Uploads inline; use ``KnowledgeIngestionQueue`` to keep this off the
+        processing critical path and batch collection adds.
+
         Args:
             video_id: Video identifier
             transcript: Full transcript text
             intelligence: Extracted intelligence
-            temp_dir: Temporary directory for file creation
+            temp_dir: Unused (documents are uploaded from memory); kept for compatibility
 
         Returns:
             File ID of uploaded content
@@ -153,20 +161,17 @@ class VideoKnowledgeBase:
         if not self.collection_id:
             await self.initialize_collection()
 
-        # Create structured document for upload
-        document = self._create_video_document(video_id, transcript, intelligence)
-
-        # Save to temporary file
-        temp_dir = temp_dir or Path("output/.kb_temp")
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        # Searchable locally right away, whatever happens to the upload
+        self.index_video_locally(video_id, transcript, intelligence)
 
-        doc_path = temp_dir / f"{video_id}.json"
-        with open(doc_path, "w", encoding="utf-8") as f:
-            json.dump(document, f, indent=2, ensure_ascii=False)
+        # Create structured document for upload
+        payload = self.serialize_video_document(video_id, transcript, intelligence)
 
         try:
             # Upload file
-            file_result = await self.client.upload_file(file_path=doc_path, purpose="assistants")
+            file_result = await self.client.upload_bytes(
+                payload, filename=f"{video_id}.json", purpose="assistants"
+            )
 
             file_id = file_result.get("id")
             logger.info(f"Uploaded video {video_id} as file {file_id}")
@@ -181,32 +186,78 @@ class VideoKnowledgeBase:
             # Track video
             self.video_files[video_id] = file_id
 
-            # Clean up temp file
-            doc_path.unlink()
-
             return file_id
 
         except GrokAPIError as e:
             logger.error(f"Failed to add video to knowledge base: {e}")
-            # Clean up temp file
-            if doc_path.exists():
-                doc_path.unlink()
             raise
 
+    def index_video_locally(
+        self, video_id: str, transcript: str, intelligence: VideoIntelligence
+    ) -> None:
+        """
+        Add a processed video to the local search index only (no API calls).
+
+        Args:
+            video_id: Video identifier
+            transcript: Full transcript text
+            intelligence: Extracted intelligence
+        """
+        self.local_index.add_document(
+            self._create_video_document(video_id, transcript, intelligence)
+        )
+
     async def search_knowledge_base(
-        self, query: str, filters: Optional[Dict[str, Any]] = None, top_k: int = 5
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 5,
+        remote_fallback: Optional[bool] = None,
     ) -> List[SearchResult]:
         """
         Search knowledge base for relevant videos.
 
+        Answered from the local index; the remote collection is only queried
+        when the local index finds nothing and ``remote_fallback`` allows it.
+
         Args:
             query: Search query
             filters: Optional filters (date range, entity types, etc.)
             top_k: Number of results to return
+            remote_fallback: Search the remote collection if there are no local hits
+                (default: only while the local index is empty)
 
         Returns:
             List of search results with relevance scores
         """
+        local_results = [
+            SearchResult(
+                video_id=hit.video_id,
+                title=(hit.document.get("metadata") or {}).get("title", "Unknown"),
+                relevance_score=hit.score,
+                matched_content=hit.snippet,
+                entities=[e.get("name") for e in hit.document.get("entities", [])],
+                metadata=self.local_index.filter_view(hit.document),
+            )
+            for hit in self.local_index.search(query, filters=filters, top_k=top_k)
+        ]
+        if not self._use_remote(local_results, remote_fallback):
+            return local_results
+        return await self._search_remote(query, filters, top_k)
+
+    def _use_remote(self, local_hits: List[Any], remote_fallback: Optional[bool]) -> bool:
+        """Whether a lookup with no local hits should query the remote collection."""
+        if local_hits:
+            return False
+        if remote_fallback is None:
+            # An empty index (e.g. an existing collection opened without one) knows nothing
+            return len(self.local_index) == 0
+        return remote_fallback
+
+    async def _search_remote(
+        self, query: str, filters: Optional[Dict[str, Any]] = None, top_k: int = 5
+    ) -> List[SearchResult]:
+        """Search the remote Collections API."""
         if not self.collection_id:
             logger.warning("No collection initialized")
             return []
@@ -225,7 +276,10 @@ class VideoKnowledgeBase:
             return []
 
     async def cross_reference_entity(
-        self, entity_name: str, entity_type: Optional[str] = None
+        self,
+        entity_name: str,
+        entity_type: Optional[str] = None,
+        remote_fallback: Optional[bool] = None,
     ) -> List[VideoReference]:
         """
         Find all videos mentioning a specific entity.
@@ -233,15 +287,32 @@ class VideoKnowledgeBase:
         Args:
             entity_name: Entity to search for
             entity_type: Optional entity type filter
+            remote_fallback: Search the remote collection if no indexed video has the entity
+                (default: only while the local index is empty)
 
         Returns:
             List of video references containing the entity
         """
+        local_refs = [
+            VideoReference(
+                video_id=match["document"]["video_id"],
+                title=(match["document"].get("metadata") or {}).get("title", "Unknown"),
+                entity_mentions=match["mentions"],
+                contexts=match["contexts"],
+                timestamps=[],
+                confidence=match["confidence"],
+            )
+            for match in self.local_index.find_entity(entity_name, entity_type)
+        ]
+        if not self._use_remote(local_refs, remote_fallback):
+            logger.info(f"Found {len(local_refs)} videos mentioning '{entity_name}' (local)")
+            return local_refs
+
         query = f"entity: {entity_name}"
         if entity_type:
             query += f" type:{entity_type}"
 
-        search_results = await self.search_knowledge_base(query, top_k=20)
+        search_results = await self._search_remote(query, top_k=20)
 
         # Group by video and extract references
         video_refs = []
@@ -260,19 +331,40 @@ class VideoKnowledgeBase:
         logger.info(f"Found {len(video_refs)} videos mentioning '{entity_name}'")
         return video_refs
 
-    async def find_entity_cooccurrences(self, entity1: str, entity2: str) -> List[VideoReference]:
+    async def find_entity_cooccurrences(
+        self, entity1: str, entity2: str, remote_fallback: Optional[bool] = None
+    ) -> List[VideoReference]:
         """
         Find videos where two entities are mentioned together.
 
         Args:
             entity1: First entity
             entity2: Second entity
+            remote_fallback: Search the remote collection if no indexed video has both
+                (default: only while the local index is empty)
 
         Returns:
             Videos where both entities appear
         """
+        local_refs = [
+            VideoReference(
+                video_id=match["document"]["video_id"],
+                title=(match["document"].get("metadata") or {}).get("title", "Unknown"),
+                entity_mentions=2,  # Both entities present
+                contexts=match["contexts"],
+                timestamps=[],
+                confidence=match["confidence"],
+            )
+            for match in self.local_index.find_cooccurrences(entity1, entity2)
+        ]
+        if not self._use_remote(local_refs, remote_fallback):
+            logger.info(
+                f"Found {len(local_refs)} videos with both '{entity1}' and '{entity2}' (local)"
+            )
+            return local_refs
+
         query = f"{entity1} AND {entity2}"
-        results = await self.search_knowledge_base(query, top_k=10)
+        results = await self._search_remote(query, top_k=10)
 
         # Convert to video references
         video_refs = []
@@ -316,6 +408,7 @@ class VideoKnowledgeBase:
                 "collection_id": self.collection_id,
                 "name": collection_data.get("name"),
                 "files_count": len(self.video_files),
+                "locally_indexed": len(self.local_index),
                 "videos": list(self.video_files.keys()),
                 "model": self.model,
             }
@@ -324,6 +417,25 @@ class VideoKnowledgeBase:
             logger.error(f"Failed to get collection stats: {e}")
             return {"initialized": False, "error": str(e)}
 
+    def serialize_video_document(
+        self, video_id: str, transcript: str, intelligence: VideoIntelligence
+    ) -> bytes:
+        """
+        Build the upload payload for a video (compact UTF-8 JSON).
+
+        Args:
+            video_id: Video identifier
+            transcript: Full transcript
+            intelligence: Extracted intelligence
+
+        Returns:
+            Document bytes ready for upload
+        """
+        document = self._create_video_document(video_id, transcript, intelligence)
+        return json.dumps(document, ensure_ascii=False, separators=(",", ":"), default=str).encode(
+            "utf-8"
+        )
+
     def _create_video_document(
         self, video_id: str, transcript: str, intelligence: VideoIntelligence
     ) -> Dict[str, Any]:
@@ -412,21 +524,7 @@ class VideoKnowledgeBase:
 
     def _apply_filters(self, result: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """Apply filters to search result."""
-        # Example filter logic
-        metadata = result.get("metadata", {})
-
-        if "min_date" in filters:
-            pub_date = metadata.get("published_at", 0)
-            if pub_date < filters["min_date"]:
-                return False
-
-        if "entity_types" in filters:
-            entities = metadata.get("entities", [])
-            entity_types = {e.get("type") for e in entities}
-            if not entity_types.intersection(filters["entity_types"]):
-                return False
-
-        return True
+        return apply_search_filters(result.get("metadata", {}), filters)
 
     async def close(self):
         """Close the API client."""
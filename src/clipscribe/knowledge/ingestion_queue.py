@@ -0,0 +1,288 @@
+"""
+Background ingestion queue for the video knowledge base.
+
+Adding a video to the Collections API used to sit on the critical path of
+``HybridProcessor.process_video``: serialize to a temp file, upload, then add
+that single file to the collection. ``KnowledgeIngestionQueue`` takes the
+document off the hot path:
+
+- documents are serialized once and uploaded from memory (no temp files)
+- uploads run concurrently in the background
+- uploaded files are added to the collection in batches, flushed when
+  ``batch_size`` files are waiting or ``batch_window`` seconds have passed
+- failed uploads and adds are retried with exponential backoff; jobs that
+  exhaust their retries are kept in ``dead_letters``
+- queue depth and enqueue-to-indexed latency are exposed via ``get_stats()``
+
+Call ``drain()`` before the event loop shuts down to flush pending work.
+
+Examples:
+    >>> queue = KnowledgeIngestionQueue(knowledge_base)
+    >>> queue.enqueue(video_id, transcript, intelligence)  # returns immediately
+    >>> await queue.drain()
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from ..models import VideoIntelligence
+
+if TYPE_CHECKING:
+    from .collection_manager import VideoKnowledgeBase
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestionJob:
+    """One video document travelling through the queue."""
+
+    video_id: str
+    payload: bytes
+    enqueued_at: float
+    attempts: int = 0
+    file_id: Optional[str] = None
+
+
+@dataclass
+class IngestionStats:
+    """Ingestion counters and latency."""
+
+    enqueued: int = 0
+    uploaded: int = 0
+    indexed: int = 0
+    batches: int = 0
+    retries: int = 0
+    failed: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def record_indexed(self, latency: float) -> None:
+        self.indexed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "uploaded": self.uploaded,
+            "indexed": self.indexed,
+            "batches": self.batches,
+            "retries": self.retries,
+            "failed": self.failed,
+            "avg_latency_seconds": (
+                round(self.total_latency / self.indexed, 3) if self.indexed else 0.0
+            ),
+            "max_latency_seconds": round(self.max_latency, 3),
+        }
+
+
+class KnowledgeIngestionQueue:
+    """Upload video documents and batch collection adds off the critical path."""
+
+    def __init__(
+        self,
+        knowledge_base: "VideoKnowledgeBase",
+        batch_size: int = 16,
+        batch_window: float = 5.0,
+        upload_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 2.0,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            knowledge_base: Knowledge base whose client and collection are used
+            batch_size: Flush a collection add once this many files are uploaded
+            batch_window: Flush after this many seconds even if the batch is not full
+            upload_concurrency: Max uploads in flight
+            max_retries: Retries per job before it is moved to ``dead_letters``
+            retry_backoff: Base delay in seconds (doubles on each retry)
+        """
+        self.knowledge_base = knowledge_base
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.upload_concurrency = max(1, upload_concurrency)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self.stats = IngestionStats()
+        self.dead_letters: List[IngestionJob] = []
+
+        self._queue: Optional["asyncio.Queue[Tuple[str, IngestionJob]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._upload_slots: Optional[asyncio.Semaphore] = None
+        self._pending: List[IngestionJob] = []  # uploaded, waiting for a collection add
+        self._batch_started: Optional[float] = None
+        self._tasks: Set["asyncio.Task[Any]"] = set()  # uploads, adds and delayed retries
+        self._uploading = 0
+
+    def enqueue(self, video_id: str, transcript: str, intelligence: VideoIntelligence) -> None:
+        """
+        Queue a processed video for upload and indexing (returns immediately).
+
+        The video is added to the knowledge base's local index synchronously,
+        so local search sees it before the remote collection does.
+
+        Must be called from a running event loop.
+
+        Args:
+            video_id: Video identifier
+            transcript: Full transcript text
+            intelligence: Extracted intelligence
+        """
+        self.knowledge_base.index_video_locally(video_id, transcript, intelligence)
+        payload = self.knowledge_base.serialize_video_document(video_id, transcript, intelligence)
+        self._ensure_worker()
+        self._queue.put_nowait(("upload", IngestionJob(video_id, payload, time.monotonic())))
+        self.stats.enqueued += 1
+
+    @property
+    def depth(self) -> int:
+        """Jobs not yet indexed (queued, uploading, waiting for a batch or retrying)."""
+        return self.stats.enqueued - self.stats.indexed - self.stats.failed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, counters and latency."""
+        return {
+            **self.stats.to_dict(),
+            "queue_depth": self.depth,
+            "awaiting_batch": len(self._pending),
+            "dead_letters": len(self.dead_letters),
+        }
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush everything queued so far.
+
+        Args:
+            timeout: Give up after this many seconds (None waits indefinitely)
+
+        Returns:
+            True if the queue emptied, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.depth > 0:
+            # Flush a partial batch early once nothing else can join it
+            if self._pending and not self._uploading and self._queue.empty():
+                self._queue.put_nowait(("flush", None))  # type: ignore[arg-type]
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"Knowledge base queue drain timed out ({self.depth} pending)")
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Drain pending work, then stop the worker."""
+        await self.drain(timeout)
+        for task in [self._worker, *self._tasks]:
+            if task is not None and not task.done():
+                task.cancel()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        if self.depth > 0 and self._queue is not None:
+            logger.warning("Knowledge base queue restarted on a new event loop; pending jobs lost")
+            self.stats.failed += self.depth
+        self._queue = asyncio.Queue()
+        self._upload_slots = asyncio.Semaphore(self.upload_concurrency)
+        self._pending = []
+        self._batch_started = None
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self) -> None:
+        """Dispatch uploads and flush collection adds by size or time window."""
+        while True:
+            timeout = None
+            if self._batch_started is not None:
+                timeout = max(0.0, self._batch_started + self.batch_window - time.monotonic())
+            try:
+                kind, job = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                self._flush()
+                continue
+
+            if kind == "upload":
+                self._spawn(self._upload(job))
+            elif kind == "uploaded":
+                self._pending.append(job)
+                if self._batch_started is None:
+                    self._batch_started = time.monotonic()
+                if len(self._pending) >= self.batch_size:
+                    self._flush()
+            elif kind == "flush":
+                self._flush()
+
+    async def _upload(self, job: IngestionJob) -> None:
+        self._uploading += 1
+        try:
+            async with self._upload_slots:
+                result = await self.knowledge_base.client.upload_bytes(
+                    job.payload, filename=f"{job.video_id}.json", purpose="assistants"
+                )
+        except Exception as e:
+            self._retry_or_fail(job, "upload", e)
+            return
+        finally:
+            self._uploading -= 1
+        job.file_id = result.get("id")
+        self.stats.uploaded += 1
+        self._queue.put_nowait(("uploaded", job))
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        self._batch_started = None
+        if batch:
+            self._spawn(self._add_batch(batch))
+
+    async def _add_batch(self, batch: List[IngestionJob]) -> None:
+        kb = self.knowledge_base
+        try:
+            if not kb.collection_id:
+                await kb.initialize_collection()
+            await kb.client.add_files_to_collection(
+                collection_id=kb.collection_id, file_ids=[job.file_id for job in batch]
+            )
+        except Exception as e:
+            for job in batch:
+                self._retry_or_fail(job, "uploaded", e)
+            return
+
+        now = time.monotonic()
+        self.stats.batches += 1
+        for job in batch:
+            kb.video_files[job.video_id] = job.file_id
+            self.stats.record_indexed(now - job.enqueued_at)
+        logger.info(f"Added {len(batch)} videos to collection {kb.collection_id}")
+
+    def _retry_or_fail(self, job: IngestionJob, stage: str, error: Exception) -> None:
+        """Re-queue ``job`` at ``stage`` after a backoff, or dead-letter it."""
+        job.attempts += 1
+        if job.attempts > self.max_retries:
+            logger.error(f"Knowledge base ingestion of {job.video_id} failed: {error}")
+            self.stats.failed += 1
+            self.dead_letters.append(job)
+            return
+
+        delay = self.retry_backoff * (2 ** (job.attempts - 1))
+        logger.warning(
+            f"Knowledge base {stage} step for {job.video_id} failed ({error}); "
+            f"retry {job.attempts}/{self.max_retries} in {delay:.1f}s"
+        )
+        self.stats.retries += 1
+
+        async def requeue() -> None:
+            await asyncio.sleep(delay)
+            self._queue.put_nowait((stage, job))
+
+        self._spawn(requeue())
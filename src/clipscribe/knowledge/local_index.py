@@ -0,0 +1,578 @@
+"""
+Local hybrid search index for the video knowledge base.
+
+``VideoKnowledgeBase`` search used to round-trip to the remote Collections API
+even for "which videos mention X" lookups. ``LocalSearchIndex`` indexes the
+same documents ``_create_video_document`` builds for upload and answers those
+queries in-process:
+
+- an inverted index scored with BM25 (title, entities and topics weighted
+  above transcript text)
+- an optional embedding index (NumPy brute force, or IVF once the corpus is
+  large) fused with BM25 by reciprocal rank
+- an entity posting list for cross-referencing and co-occurrence queries
+- the same metadata filters the remote results go through
+
+Documents are persisted in SQLite and the in-memory index is rebuilt on load.
+NumPy and an embedding function are optional; without them search is BM25 only.
+
+Examples:
+    >>> index = LocalSearchIndex(db_path="data/knowledge_index.db")
+    >>> index.add_document(document)
+    >>> hits = index.search("drone strikes", filters={"entity_types": ["ORG"]})
+"""
+
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Maps a batch of texts to one embedding vector per text
+EmbeddingFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "as",
+    "at",
+    "be",
+    "but",
+    "by",
+    "for",
+    "from",
+    "in",
+    "is",
+    "it",
+    "of",
+    "on",
+    "or",
+    "that",
+    "the",
+    "this",
+    "to",
+    "was",
+    "were",
+    "with",
+}
+
+# Term-frequency multiplier per document field
+FIELD_WEIGHTS = {"title": 3, "entities": 2, "topics": 2, "summary": 1, "transcript": 1}
+
+RRF_K = 60  # reciprocal rank fusion constant
+SNIPPET_CHARS = 500
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with stopwords and single characters removed."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return [t for t in _TOKEN.findall(text) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def normalize_entity(name: str) -> str:
+    """Case- and whitespace-insensitive key for entity lookups."""
+    return " ".join(unicodedata.normalize("NFKC", name or "").casefold().split())
+
+
+def apply_search_filters(metadata: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check a result's metadata against search filters.
+
+    Shared by remote Collections results and the local index so both tiers
+    filter identically.
+
+    Args:
+        metadata: Result metadata (``published_at``, ``entities`` list of dicts)
+        filters: ``min_date`` and/or ``entity_types``
+
+    Returns:
+        True if the result passes every filter
+    """
+    if not filters:
+        return True
+
+    if "min_date" in filters:
+        pub_date, min_date = metadata.get("published_at", 0), filters["min_date"]
+        if pub_date is None:
+            return False
+        if isinstance(pub_date, str) != isinstance(min_date, str):
+            # Persisted documents carry dates as strings
+            pub_date, min_date = str(pub_date), str(min_date)
+        if pub_date < min_date:
+            return False
+
+    if "entity_types" in filters:
+        entities = metadata.get("entities", [])
+        entity_types = {_type_value(e.get("type")) for e in entities}
+        if not entity_types.intersection(filters["entity_types"]):
+            return False
+
+    return True
+
+
+def _type_value(entity_type: Any) -> Any:
+    return getattr(entity_type, "value", entity_type)
+
+
+@dataclass
+class LocalHit:
+    """One locally matched video."""
+
+    video_id: str
+    score: float
+    document: Dict[str, Any]
+    snippet: str
+
+
+class LocalSearchIndex:
+    """BM25 + optional vector index over knowledge base documents."""
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        embedding_fn: Optional[EmbeddingFunction] = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        ivf_min_documents: int = 4096,
+        ivf_probes: int = 8,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: SQLite file for persistence (None keeps the index in memory only)
+            embedding_fn: Optional batch embedding function enabling vector search
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalisation
+            ivf_min_documents: Switch from brute force to IVF at this corpus size
+            ivf_probes: IVF clusters searched per query
+        """
+        self.embedding_fn = embedding_fn if NUMPY_AVAILABLE else None
+        self.k1 = k1
+        self.b = b
+        self.ivf_min_documents = ivf_min_documents
+        self.ivf_probes = ivf_probes
+
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)  # term -> video_id -> tf
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._entities: Dict[str, Dict[str, int]] = defaultdict(dict)  # entity -> video_id -> n
+        self._embeddings: Dict[str, Any] = {}
+        self._vector_ids: List[str] = []
+        self._vector_matrix = None
+        self._ivf: Optional[Tuple[Any, List[Any]]] = None  # (centroids, member rows per list)
+
+        if embedding_fn is not None and not NUMPY_AVAILABLE:
+            logger.info("numpy not installed; local knowledge search is BM25 only")
+
+        if db_path is not None:
+            path = Path(db_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kb_documents (
+                    video_id TEXT PRIMARY KEY,
+                    document TEXT NOT NULL,
+                    embedding BLOB,
+                    indexed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._documents
+
+    def _load(self) -> None:
+        rows = self._conn.execute("SELECT document, embedding FROM kb_documents").fetchall()
+        with self._lock:
+            for document_json, blob in rows:
+                document = json.loads(document_json)
+                self._index(document)
+                if blob is not None and NUMPY_AVAILABLE:
+                    self._embeddings[document["video_id"]] = np.frombuffer(blob, dtype=np.float32)
+            self._vector_matrix = None
+        logger.debug(f"Loaded {len(rows)} documents into the local knowledge index")
+
+    def add_document(self, document: Dict[str, Any]) -> None:
+        """
+        Index (or re-index) a video document.
+
+        Args:
+            document: Document as built by ``VideoKnowledgeBase._create_video_document``
+        """
+        # JSON round-trip so in-memory documents match what is persisted (dates as strings)
+        document = json.loads(json.dumps(document, ensure_ascii=False, default=str))
+        video_id = document["video_id"]
+        embedding = None
+        if self.embedding_fn is not None:
+            try:
+                embedding = self._normalise(self.embedding_fn([self._embedding_text(document)])[0])
+            except Exception as e:
+                logger.warning(f"Embedding {video_id} failed, indexing for BM25 only: {e}")
+
+        with self._lock:
+            self._index(document)
+            if embedding is not None:
+                self._embeddings[video_id] = embedding
+            else:
+                self._embeddings.pop(video_id, None)
+            self._vector_matrix = None
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO kb_documents (video_id, document, embedding, indexed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        video_id,
+                        json.dumps(document, ensure_ascii=False, default=str),
+                        embedding.astype(np.float32).tobytes() if embedding is not None else None,
+                        time.time(),
+                    ),
+                )
+                self._conn.commit()
+
+    def remove_document(self, video_id: str) -> bool:
+        """Drop a video from the index. Returns False if it was not indexed."""
+        with self._lock:
+            if video_id not in self._documents:
+                return False
+            self._unindex(video_id)
+            self._embeddings.pop(video_id, None)
+            self._vector_matrix = None
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM kb_documents WHERE video_id = ?", (video_id,))
+                self._conn.commit()
+            return True
+
+    def _index(self, document: Dict[str, Any]) -> None:
+        video_id = document["video_id"]
+        if video_id in self._documents:
+            self._unindex(video_id)
+
+        counts: Counter = Counter()
+        for field_name, text in self._field_texts(document):
+            weight = FIELD_WEIGHTS[field_name]
+            for token in tokenize(text):
+                counts[token] += weight
+        for term, tf in counts.items():
+            self._postings[term][video_id] = tf
+        self._doc_terms[video_id] = set(counts)
+        self._doc_lengths[video_id] = sum(counts.values())
+        self._total_length += self._doc_lengths[video_id]
+
+        for entity in document.get("entities", []):
+            key = normalize_entity(entity.get("name", ""))
+            if key:
+                self._entities[key][video_id] = self._entities[key].get(video_id, 0) + 1
+
+        self._documents[video_id] = document
+
+    def _unindex(self, video_id: str) -> None:
+        for term in self._doc_terms.pop(video_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(video_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(video_id, 0)
+        for entity in self._documents[video_id].get("entities", []):
+            postings = self._entities.get(normalize_entity(entity.get("name", "")))
+            if postings is not None:
+                postings.pop(video_id, None)
+                if not postings:
+                    del self._entities[normalize_entity(entity.get("name", ""))]
+        del self._documents[video_id]
+
+    @staticmethod
+    def _field_texts(document: Dict[str, Any]) -> Iterable[Tuple[str, str]]:
+        metadata = document.get("metadata") or {}
+        yield "title", f"{metadata.get('title') or ''} {metadata.get('channel') or ''}"
+        yield "entities", " ".join(e.get("name", "") for e in document.get("entities", []))
+        yield "topics", " ".join(t.get("name", "") for t in document.get("topics", []))
+        yield "summary", document.get("summary") or ""
+        yield "transcript", document.get("transcript") or ""
+
+    @staticmethod
+    def _embedding_text(document: Dict[str, Any]) -> str:
+        """Title, summary, topics and entities: the gist without the full transcript."""
+        metadata = document.get("metadata") or {}
+        return "\n".join(
+            [
+                str(metadata.get("title") or ""),
+                document.get("summary") or "",
+                ", ".join(t.get("name", "") for t in document.get("topics", [])),
+                ", ".join(e.get("name", "") for e in document.get("entities", [])),
+            ]
+        )
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 5,
+        mode: str = "hybrid",
+    ) -> List[LocalHit]:
+        """
+        Search indexed videos.
+
+        Args:
+            query: Free-text query
+            filters: Filters as accepted by ``apply_search_filters``
+            top_k: Number of results
+            mode: "bm25", "vector" or "hybrid" (vector modes need an embedding function)
+
+        Returns:
+            Hits ordered by descending score
+        """
+        with self._lock:
+            rankings = []
+            if mode in ("bm25", "hybrid"):
+                rankings.append(self._bm25(tokenize(query)))
+            if mode in ("vector", "hybrid") and self.embedding_fn is not None and self._embeddings:
+                rankings.append(self._vector_scores(query))
+
+            rankings = [r for r in rankings if r]
+            if not rankings:
+                return []
+            if len(rankings) == 1:
+                scores = rankings[0]
+            else:
+                scores = self._fuse(rankings)
+
+            hits: List[LocalHit] = []
+            for video_id, score in sorted(scores.items(), key=lambda item: -item[1]):
+                document = self._documents[video_id]
+                if filters and not apply_search_filters(self.filter_view(document), filters):
+                    continue
+                hits.append(LocalHit(video_id, score, document, self._snippet(document, query)))
+                if len(hits) >= top_k:
+                    break
+            return hits
+
+    def _bm25(self, terms: List[str]) -> Dict[str, float]:
+        n = len(self._documents)
+        if not n or not terms:
+            return {}
+        avg_length = self._total_length / n or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for video_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[video_id] / avg_length)
+                scores[video_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def _vector_scores(self, query: str, candidates: int = 100) -> Dict[str, float]:
+        try:
+            query_vector = self._normalise(self.embedding_fn([query])[0])
+        except Exception as e:
+            logger.warning(f"Query embedding failed, using BM25 only: {e}")
+            return {}
+        if query_vector is None:
+            return {}
+
+        if self._vector_matrix is None:
+            self._build_vector_index()
+        if self._vector_matrix.shape[1] != query_vector.shape[0]:
+            logger.warning("Query embedding size differs from the index; using BM25 only")
+            return {}
+
+        rows = None
+        if self._ivf is not None:
+            centroids, lists = self._ivf
+            nearest = np.argsort(-(centroids @ query_vector))[: self.ivf_probes]
+            rows = np.concatenate([lists[i] for i in nearest])
+        matrix = self._vector_matrix if rows is None else self._vector_matrix[rows]
+        similarity = matrix @ query_vector
+        top = np.argsort(-similarity)[:candidates]
+        ids = self._vector_ids if rows is None else [self._vector_ids[i] for i in rows]
+        return {ids[i]: float(similarity[i]) for i in top}
+
+    def _build_vector_index(self) -> None:
+        """Stack embeddings; partition into IVF lists once the corpus is large."""
+        self._vector_ids = list(self._embeddings)
+        self._vector_matrix = np.vstack([self._embeddings[v] for v in self._vector_ids])
+        self._ivf = None
+        n = len(self._vector_ids)
+        if n < self.ivf_min_documents:
+            return
+
+        # A few rounds of spherical k-means on a sample are enough for coarse lists
+        n_lists = int(math.sqrt(n))
+        rng = np.random.default_rng(0)
+        sample = self._vector_matrix[rng.choice(n, size=min(n, n_lists * 40), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(10):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(n_lists):
+                members = sample[assignment == i]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    centroids[i] = mean / (np.linalg.norm(mean) or 1.0)
+        assignment = np.argmax(self._vector_matrix @ centroids.T, axis=1)
+        lists = [np.flatnonzero(assignment == i) for i in range(n_lists)]
+        self._ivf = (centroids, lists)
+        logger.debug(f"Built IVF index: {n} vectors in {n_lists} lists")
+
+    @staticmethod
+    def _fuse(rankings: List[Dict[str, float]]) -> Dict[str, float]:
+        """Reciprocal rank fusion of several score maps."""
+        fused: Dict[str, float] = defaultdict(float)
+        for scores in rankings:
+            ordered = sorted(scores, key=lambda video_id: -scores[video_id])
+            for rank, video_id in enumerate(ordered):
+                fused[video_id] += 1.0 / (RRF_K + rank + 1)
+        return fused
+
+    @staticmethod
+    def _normalise(vector: Sequence[float]):
+        array = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else None
+
+    @staticmethod
+    def filter_view(document: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata of a document in the shape ``apply_search_filters`` expects."""
+        return {
+            **(document.get("metadata") or {}),
+            "video_id": document["video_id"],
+            "entities": document.get("entities", []),
+        }
+
+    @staticmethod
+    def _snippet(document: Dict[str, Any], query: str) -> str:
+        """Transcript window around the first query term (summary if none match)."""
+        transcript = document.get("transcript") or ""
+        terms = tokenize(query)
+        if transcript and terms:
+            pattern = re.compile(
+                r"\b(" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE | re.UNICODE
+            )
+            match = pattern.search(transcript)
+            if match:
+                start = max(0, match.start() - SNIPPET_CHARS // 4)
+                return transcript[start : start + SNIPPET_CHARS]
+        return (document.get("summary") or transcript)[:SNIPPET_CHARS]
+
+    def find_entity(self, name: str, entity_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Videos whose extracted entities include ``name``.
+
+        Args:
+            name: Entity name (case- and whitespace-insensitive)
+            entity_type: Optional entity type filter
+
+        Returns:
+            One dict per video: ``document``, ``mentions`` (transcript occurrences),
+            ``contexts`` (entity evidence) and ``confidence``, best first
+        """
+        key = normalize_entity(name)
+        with self._lock:
+            matches = []
+            for video_id in self._entities.get(key, {}):
+                document = self._documents[video_id]
+                entities = [
+                    e
+                    for e in document.get("entities", [])
+                    if normalize_entity(e.get("name", "")) == key
+                    and (entity_type is None or _type_value(e.get("type")) == entity_type)
+                ]
+                if not entities:
+                    continue
+                transcript = document.get("transcript") or ""
+                mentions = len(
+                    re.findall(r"\b" + re.escape(name.strip()) + r"\b", transcript, re.IGNORECASE)
+                )
+                matches.append(
+                    {
+                        "document": document,
+                        "mentions": max(mentions, 1),
+                        "contexts": [e.get("evidence") for e in entities if e.get("evidence")],
+                        "confidence": max(float(e.get("confidence") or 0.0) for e in entities),
+                    }
+                )
+        matches.sort(key=lambda m: (-m["mentions"], -m["confidence"]))
+        return matches
+
+    def find_cooccurrences(self, entity1: str, entity2: str) -> List[Dict[str, Any]]:
+        """
+        Videos whose extracted entities include both names.
+
+        Returns:
+            One dict per video: ``document``, ``contexts`` and ``confidence``
+            (the lower of the two entities' confidences)
+        """
+        first = {m["document"]["video_id"]: m for m in self.find_entity(entity1)}
+        results = []
+        for match in self.find_entity(entity2):
+            other = first.get(match["document"]["video_id"])
+            if other is not None:
+                results.append(
+                    {
+                        "document": match["document"],
+                        "contexts": other["contexts"] + match["contexts"],
+                        "confidence": min(other["confidence"], match["confidence"]),
+                    }
+                )
+        results.sort(key=lambda r: -r["confidence"])
+        return results
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global index instance
+_global_index: Optional[LocalSearchIndex] = None
+
+
+def get_local_search_index(db_path: Optional[Union[str, Path]] = None) -> LocalSearchIndex:
+    """
+    Get the process-wide local knowledge index.
+
+    Args:
+        db_path: SQLite file used when the index is first created
+
+    Returns:
+        Global LocalSearchIndex instance
+    """
+    global _global_index
+    if _global_index is None:
+        _global_index = LocalSearchIndex(db_path=db_path)
+    return _global_index
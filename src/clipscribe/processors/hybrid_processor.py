@@ -4,10 +4,10 @@ This provides the best of both worlds - no censorship on BOTH transcription and
 """
 
 import asyncio
-import json
 import logging
 import os
 import time
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import httpx
@@ -21,10 +21,13 @@ from ..models import (
     VideoMetadata,
     VideoTranscript,
 )
+from ..prompts.intelligence_extraction import build_chunk_extraction_messages
 from ..retrievers.grok_client import GrokAPIClient
 from ..schemas_grok import get_video_intelligence_schema
 from ..transcribers.voxtral_transcriber import VoxtralTranscriber
+from ..utils.json_stream import salvage_json
 from ..utils.prompt_cache import get_prompt_cache
+from ..utils.token_counter import get_token_counter
 from ..utils.voxtral_chunker import VoxtralChunker
 
 logger = logging.getLogger(__name__)
@@ -38,6 +41,11 @@ class HybridProcessor:
     1. Voxtral transcribes (no censorship, cheaper, accurate)
     2. Full transcript passed to Grok-4 for intelligence extraction
     3. Zero censorship throughout the entire pipeline
+
+    Knowledge base uploads run in the background after ``process_video``
+    returns, so callers must drain them before the event loop exits: use
+    ``async with HybridProcessor() as processor:`` or ``await processor.close()``.
+    Uploads still queued when the loop stops are lost.
     """
 
     def __init__(
@@ -69,12 +77,17 @@ class HybridProcessor:
         self.chunker = VoxtralChunker(model=voxtral_model)
 
         # Initialize new Grok features (November 2025)
-        self.grok_client = GrokAPIClient(api_key=self.xai_api_key)
+        self.grok_client = GrokAPIClient(
+            api_key=self.xai_api_key,
+            enable_hedging=self.settings.enable_grok_request_hedging,
+            hedge_budget_per_minute=self.settings.grok_hedge_budget_per_minute,
+        )
         self.prompt_cache = get_prompt_cache()
 
         # Optional features (lazy initialization in async methods to avoid sync issues)
         self.fact_checker = None
         self.knowledge_base = None
+        self.ingestion_queue = None
         self._fact_checker_enabled = self.settings.enable_grok_fact_checking and self.xai_api_key
         self._knowledge_base_enabled = self.settings.enable_knowledge_base and self.xai_api_key
 
@@ -99,7 +112,8 @@ class HybridProcessor:
             force_reprocess: Skip cache and reprocess
 
         Returns:
-            Complete VideoIntelligence object
+            Complete VideoIntelligence object (knowledge base upload may still
+            be pending; see ``close``)
         """
         start_time = time.time()
 
@@ -180,31 +194,50 @@ class HybridProcessor:
         if self._fact_checker_enabled:
             # Lazy initialization
             if not self.fact_checker:
+                from ..intelligence.fact_check_cache import get_fact_check_cache
                 from ..intelligence.fact_checker import GrokFactChecker
 
+                # Relative cache paths live under the output directory, not the CWD
+                cache_path = self.settings.fact_check_cache_path
+                if cache_path is not None:
+                    cache_path = Path(self.settings.output_dir) / cache_path
                 self.fact_checker = GrokFactChecker(
                     api_key=self.xai_api_key,
                     enable_web_search=self.settings.enable_grok_web_search,
                     enable_x_search=self.settings.enable_grok_x_search,
                     enable_code_execution=self.settings.enable_grok_code_execution,
                     model=self.grok_model,
+                    max_concurrency=self.settings.fact_check_max_concurrency,
+                    enable_batching=self.settings.enable_fact_check_batching,
+                    max_batch_size=self.settings.fact_check_max_batch_size,
+                    cache=get_fact_check_cache(
+                        db_path=cache_path,
+                        ttl_seconds=self.settings.fact_check_cache_ttl_hours * 3600,
+                    ),
                 )
 
             try:
+                from ..intelligence.fact_check_cache import entity_cache_key
+
                 logger.info("Fact-checking entities with server-side tools...")
                 fact_check_results = await self.fact_checker.fact_check_entities(
                     entities=video_intelligence.entities,
                     confidence_threshold=self.settings.fact_check_confidence_threshold,
                 )
 
-                # Update entity confidence based on fact-checking
-                for result in fact_check_results:
-                    for entity in video_intelligence.entities:
-                        if entity.name == result.entity_name and result.verified:
-                            entity.confidence = result.verification_confidence
-                            logger.info(
-                                f"Fact-checked {entity.name}: {result.verification_confidence:.2f} (sources: {len(result.sources)})"
-                            )
+                # Update entity confidence based on fact-checking (one result per distinct entity)
+                verified = {
+                    entity_cache_key(result.entity_name, result.entity_type): result
+                    for result in fact_check_results
+                    if result.verified
+                }
+                for entity in video_intelligence.entities:
+                    result = verified.get(entity_cache_key(entity.name, entity.type))
+                    if result is not None:
+                        entity.confidence = result.verification_confidence
+                        logger.info(
+                            f"Fact-checked {entity.name}: {result.verification_confidence:.2f} (sources: {len(result.sources)})"
+                        )
 
             except Exception as e:
                 logger.warning(f"Fact-checking failed: {e}")
@@ -214,22 +247,32 @@ class HybridProcessor:
             # Lazy initialization
             if not self.knowledge_base:
                 from ..knowledge.collection_manager import VideoKnowledgeBase
+                from ..knowledge.ingestion_queue import KnowledgeIngestionQueue
+                from ..knowledge.local_index import get_local_search_index
 
                 self.knowledge_base = VideoKnowledgeBase(
                     api_key=self.xai_api_key,
                     collection_id=self.settings.grok_collection_id,
                     collection_name=self.settings.grok_collection_name,
                     model=self.grok_model,
+                    local_index=get_local_search_index(self.settings.knowledge_index_path),
+                )
+                self.ingestion_queue = KnowledgeIngestionQueue(
+                    self.knowledge_base,
+                    batch_size=self.settings.knowledge_base_batch_size,
+                    batch_window=self.settings.knowledge_base_batch_window,
                 )
 
             try:
-                logger.info("Adding video to knowledge base...")
-                await self.knowledge_base.add_video_to_knowledge_base(
+                # Uploaded and indexed in the background; call close() before exiting
+                self.ingestion_queue.enqueue(
                     video_id=metadata.get("video_id", "unknown"),
                     transcript=transcript_result["text"],
                     intelligence=video_intelligence,
                 )
-                logger.info("Video added to searchable knowledge base")
+                logger.info(
+                    f"Video queued for knowledge base ({self.ingestion_queue.depth} pending)"
+                )
             except Exception as e:
                 logger.warning(f"Knowledge base integration failed: {e}")
 
@@ -243,6 +286,27 @@ class HybridProcessor:
 
         return video_intelligence
 
+    async def close(self, timeout: Optional[float] = 60.0) -> None:
+        """
+        Flush background work (knowledge base ingestion) before shutdown.
+
+        Must be awaited (directly or via ``async with``) before the event loop
+        exits, or queued videos never reach the collection.
+
+        Args:
+            timeout: Max seconds to wait for queued videos to be indexed
+        """
+        if self.ingestion_queue is not None:
+            await self.ingestion_queue.close(timeout)
+
+    async def __aenter__(self) -> "HybridProcessor":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit: drain background uploads."""
+        await self.close()
+
     async def _get_transcript(
         self, audio_path: str, metadata: Dict[str, Any], force_reprocess: bool
     ) -> Dict[str, Any]:
@@ -445,8 +509,13 @@ class HybridProcessor:
                         response_format=response_format,
                     )
 
-                    content = response_json["choices"][0]["message"]["content"]
-                    result = json.loads(content)
+                    choice = response_json["choices"][0]
+                    content = choice["message"]["content"]
+                    result = salvage_json(
+                        content,
+                        ("entities", "relationships"),
+                        truncated=choice.get("finish_reason") == "length",
+                    )
 
                     # Track cache performance
                     usage_stats = self.grok_client.extract_usage_stats(response_json)
@@ -458,7 +527,9 @@ class HybridProcessor:
                         return_breakdown=True,  # Explicit request for Dict
                     )
 
-                    self.prompt_cache.record_api_response(usage_stats, cost_breakdown)
+                    self.prompt_cache.record_api_response(
+                        usage_stats, cost_breakdown, call_site="single_shot_extraction"
+                    )
 
                     if usage_stats["cached_tokens"] > 0:
                         logger.info(
@@ -636,7 +707,7 @@ class HybridProcessor:
         self, transcript_text: str, metadata: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Extract intelligence from long transcript using chunking."""
-        chunks = self._split_into_chunks(transcript_text, max_chars=2000, overlap=200)
+        chunks = self._split_into_chunks(transcript_text, max_tokens=500, overlap_tokens=50)
         logger.info(f"Split transcript into {len(chunks)} chunks for Grok processing")
 
         all_entities = []
@@ -667,63 +738,44 @@ class HybridProcessor:
             "cost": len(chunks) * 0.02,
         }
 
-    def _split_into_chunks(self, text: str, max_chars: int, overlap: int) -> List[str]:
-        """Split text into overlapping chunks."""
-        if len(text) <= max_chars:
-            return [text]
-
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + max_chars
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start = end - overlap
-
-        return chunks
+    def _split_into_chunks(self, text: str, max_tokens: int, overlap_tokens: int) -> List[str]:
+        """Split text into overlapping chunks at sentence boundaries, sized in tokens."""
+        return get_token_counter().split_text(text, max_tokens, overlap_tokens)
 
     async def _extract_from_chunk(
         self, chunk_text: str, metadata: Dict[str, Any], chunk_num: int, total_chunks: int
     ) -> Dict[str, Any]:
         """Extract intelligence from a single chunk."""
-
-        # Build context from metadata
-        context_lines = [f"Video: {metadata.get('title', 'Unknown')}"]
-        if metadata.get("channel"):
-            context_lines.append(f"Channel/Speaker: {metadata.get('channel')}")
-        if metadata.get("description"):
-            context_lines.append(f"Context: {metadata.get('description', '')[:200]}")
-
-        context = "\n".join(context_lines)
-
-        prompt = f"""Analyze this transcript (chunk {chunk_num}/{total_chunks}):
-
-CONTEXT:
-{context}
-
-TRANSCRIPT:
-{chunk_text}
-
-Extract all entities and relationships.
-Pay attention to the channel/speaker name for correct spelling.
-
-Return JSON:
-{{"entities": [{{"name": "...", "type": "...", "confidence": 0.9}}], "relationships": [{{"subject": "...", "predicate": "...", "object": "...", "confidence": 0.9}}]}}
-"""
+        # Stable rules/schema first, per-video context and chunk text last (prefix caching)
+        system_message, user_message = build_chunk_extraction_messages(
+            chunk_text, metadata, chunk_num, total_chunks
+        )
 
         try:
-            messages = [
-                {
-                    "role": "system",
-                    "content": "Extract entities and relationships from transcript.",
-                },
-                {"role": "user", "content": prompt},
-            ]
+            messages = self.prompt_cache.build_cached_message(
+                system_message["content"],
+                user_message["content"],
+                use_caching=self.settings.enable_grok_prompt_caching,
+            )
 
             # Retry chunk extraction (Grok can have 502/connection issues)
             for attempt in range(3):
                 try:
+                    if self.settings.enable_grok_streaming:
+                        # Entities and relationships are kept as each object closes, so a
+                        # reply cut off at max_tokens keeps every complete one
+                        result: Dict[str, Any] = {"entities": [], "relationships": []}
+                        async for key, item in self.grok_client.stream_json_objects(
+                            messages=messages,
+                            model=self.grok_model,
+                            temperature=0.1,
+                            max_tokens=2048,
+                            response_format={"type": "json_object"},
+                            call_site="chunk_extraction",
+                        ):
+                            result.setdefault(key, []).append(item)
+                        return result
+
                     # Use GrokAPIClient properly
                     response = await self.grok_client.chat_completion(
                         messages=messages,
@@ -731,10 +783,16 @@ Return JSON:
                         temperature=0.1,
                         max_tokens=2048,
                         response_format={"type": "json_object"},
+                        call_site="chunk_extraction",
                     )
 
-                    content = response["choices"][0]["message"]["content"]
-                    return json.loads(content)
+                    choice = response["choices"][0]
+                    # Keeps every complete entity if the reply hit max_tokens
+                    return salvage_json(
+                        choice["message"]["content"],
+                        ("entities", "relationships"),
+                        truncated=choice.get("finish_reason") == "length",
+                    )
 
                 except Exception as e:
                     logger.warning(f"Chunk {chunk_num} attempt {attempt + 1}/3 failed: {e}")
@@ -799,26 +857,18 @@ Length: 100-200 words
 """
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                data = {
-                    "model": self.grok_model,
-                    "messages": [
-                        {"role": "system", "content": "Create concise executive summaries."},
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 500,  # Increased from 300 - was cutting off summaries mid-sentence
-                }
-
-                response = await client.post(
-                    f"{self.grok_base_url}/chat/completions", headers=self.grok_headers, json=data
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    summary = result["choices"][0]["message"]["content"].strip()
-                    logger.info(f"Generated executive summary: {len(summary)} chars")
-                    return summary
+            result = await self.grok_client.chat_completion(
+                messages=[
+                    {"role": "system", "content": "Create concise executive summaries."},
+                    {"role": "user", "content": prompt},
+                ],
+                model=self.grok_model,
+                temperature=0.3,
+                max_tokens=500,  # Increased from 300 - was cutting off summaries mid-sentence
+            )
+            summary = result["choices"][0]["message"]["content"].strip()
+            logger.info(f"Generated executive summary: {len(summary)} chars")
+            return summary
         except Exception as e:
             logger.warning(f"Summary generation failed: {e}")
 
@@ -884,58 +934,3 @@ class SeamlessTranscriptAnalyzer:
             return False
 
         return True
-
-    async def _generate_summary(self, transcript: str, entities: list, relationships: list) -> str:
-        """Generate 100-200 word executive summary."""
-
-        # Extract entity names
-        entity_names = [e.get("name", "") for e in entities[:10]]
-
-        # Extract key relationships
-        rel_texts = [
-            f"{r.get('subject')} {r.get('predicate')} {r.get('object')}" for r in relationships[:5]
-        ]
-
-        prompt = f"""Create a 100-200 word executive summary:
-
-Transcript preview: {transcript[:1000]}
-Key entities: {', '.join(entity_names)}
-Key relationships: {'; '.join(rel_texts)}
-
-Format:
-- Overview (what this is about)
-- Key entities and their roles
-- Main relationships/connections
-- Implications or significance
-
-Tone: Informative, objective, professional
-Length: 100-200 words
-"""
-
-        try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                data = {
-                    "model": self.grok_model,
-                    "messages": [
-                        {"role": "system", "content": "Create concise executive summaries."},
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 300,
-                }
-
-                response = await client.post(
-                    f"{self.grok_base_url}/chat/completions", headers=self.grok_headers, json=data
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    summary = result["choices"][0]["message"]["content"].strip()
-                    logger.info(f"Generated executive summary: {len(summary)} chars")
-                    return summary
-
-        except Exception as e:
-            logger.warning(f"Summary generation failed: {e}")
-
-        # Fallback
-        return f"Analysis of video content covering {len(entities)} key entities and {len(relationships)} relationships."
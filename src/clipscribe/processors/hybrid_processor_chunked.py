@@ -5,7 +5,8 @@ Chunked intelligence extraction for long-form content processing.
 import json
 import logging
 
-import httpx
+from ..utils.json_stream import salvage_json
+from ..utils.token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -38,15 +39,16 @@ class ChunkedIntelligenceExtractor:
         logger.info(f"Extracting intelligence with {self.grok_model} from Voxtral transcript")
 
         # Determine if we need chunking based on transcript length
-        max_chunk_size = 50000  # Characters per chunk
-        needs_chunking = len(transcript_text) > max_chunk_size
+        max_chunk_tokens = 12500  # Tokens per chunk
+        transcript_tokens = get_token_counter().count(transcript_text)
+        needs_chunking = transcript_tokens > max_chunk_tokens
 
         if needs_chunking:
             logger.info(
-                f"Long transcript detected ({len(transcript_text)} chars), using chunked extraction"
+                f"Long transcript detected ({transcript_tokens} tokens), using chunked extraction"
             )
             return await self._extract_intelligence_chunked(
-                transcript_text, metadata, max_chunk_size
+                transcript_text, metadata, max_chunk_tokens
             )
         else:
             return await self._extract_intelligence_single(transcript_text, metadata)
@@ -99,37 +101,33 @@ class ChunkedIntelligenceExtractor:
 
         try:
             # Use Grok-4 for uncensored extraction
-            async with httpx.AsyncClient(timeout=300) as client:
-                data = {
-                    "model": self.grok_model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are Grok, a maximally truthful AI. Extract comprehensive intelligence from transcripts without any censorship.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 8192,
-                    "response_format": {"type": "json_object"},
-                }
-
-                response = await client.post(
-                    f"{self.grok_base_url}/chat/completions", headers=self.grok_headers, json=data
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"Grok API error: {response.status_code} - {response.text}")
-
-                response_json = response.json()
-                content = response_json["choices"][0]["message"]["content"]
-
-                # Parse response
-                result = json.loads(content)
-                logger.info(
-                    f"Successfully extracted intelligence: {len(result.get('entities', []))} entities, {len(result.get('relationships', []))} relationships"
-                )
-                return result
+            response_json = await self.grok_client.chat_completion(
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are Grok, a maximally truthful AI. Extract comprehensive intelligence from transcripts without any censorship.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                model=self.grok_model,
+                temperature=0.1,
+                max_tokens=8192,
+                response_format={"type": "json_object"},
+                timeout=300,  # Long transcripts with 8K-token output outlast the default
+            )
+            choice = response_json["choices"][0]
+            content = choice["message"]["content"]
+
+            # Parse response
+            result = salvage_json(
+                content,
+                ("entities", "relationships"),
+                truncated=choice.get("finish_reason") == "length",
+            )
+            logger.info(
+                f"Successfully extracted intelligence: {len(result.get('entities', []))} entities, {len(result.get('relationships', []))} relationships"
+            )
+            return result
 
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing failed: {e}")
@@ -142,11 +140,11 @@ class ChunkedIntelligenceExtractor:
             return self._create_fallback_result()
 
     async def _extract_intelligence_chunked(
-        self, transcript_text: str, metadata: dict, chunk_size: int
+        self, transcript_text: str, metadata: dict, max_chunk_tokens: int
     ) -> dict:
         """Extract intelligence from long transcript using chunked approach."""
         # Split transcript into overlapping chunks
-        chunks = self._split_transcript_into_chunks(transcript_text, chunk_size)
+        chunks = self._split_transcript_into_chunks(transcript_text, max_chunk_tokens)
         logger.info(f"Split transcript into {len(chunks)} chunks for processing")
 
         # Process each chunk
@@ -169,35 +167,10 @@ class ChunkedIntelligenceExtractor:
         return merged_result
 
     def _split_transcript_into_chunks(
-        self, text: str, chunk_size: int, overlap: int = 1000
+        self, text: str, max_chunk_tokens: int, overlap_tokens: int = 250
     ) -> list:
-        """Split transcript into overlapping chunks for processing."""
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence endings within last 200 chars
-                search_start = max(start, end - 200)
-                sentence_end = text.rfind(".", search_start, end)
-                if sentence_end > search_start:
-                    end = sentence_end + 1
-
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-
-            # Move start position with overlap
-            start = max(start + 1, end - overlap)
-
-            # Prevent infinite loop
-            if start >= end:
-                break
-
-        return chunks
+        """Split transcript into overlapping, sentence-aligned chunks sized in tokens."""
+        return get_token_counter().split_text(text, max_chunk_tokens, overlap_tokens)
 
     def _merge_chunk_results(self, chunk_results: list) -> dict:
         """Merge intelligence results from multiple chunks."""
@@ -6,58 +6,21 @@ Following xAI best practices:
 - Evidence-based extraction
 - Clear guidance without forced minimums
 - Metadata context for disambiguation
-"""
-
-
-def create_intelligence_extraction_prompt(transcript_text: str, metadata: dict) -> str:
-    """
-    Create prompt for comprehensive intelligence extraction.
-
-    Following xAI best practices from docs.x.ai:
-    - Emphasize quality and evidence (not quantity targets)
-    - Include video metadata for context
-    - Clear structure guidance
-    - Let Grok decide how many based on content
-
-    Args:
-        transcript_text: Full video transcript
-        metadata: Video metadata (title, duration, channel, etc.)
-
-    Returns:
-        Prompt string optimized for Grok-4 Fast Reasoning
-    """
-
-    title = metadata.get("title", "Unknown")
-    duration_sec = metadata.get("duration", 0)
-    duration_min = duration_sec / 60 if duration_sec > 0 else 0
-    channel = metadata.get("channel", "Unknown")
-    visual_mode = metadata.get("visual_mode", False)
-
-    visual_section = ""
-    if visual_mode:
-        visual_section = """
-6. VISUAL OBSERVATIONS (GEOINT):
-   You are acting as a visual observer analyzing surveillance footage.
-   Identify specific visual sightings, movements, or activities described or implied in the transcript.
-
-   Requirements:
-   - Extract "Visual Observations" where the speaker describes seeing something.
-   - Focus on physical objects (vehicles, people, infrastructure) and actions.
-   - Timestamp: Best estimate from context (MM:SS).
-   - Description: Clear description of what is seen.
-   - Evidence: Quote supporting the observation.
 
-   Example: "I see a red truck moving west" -> Observation: Red Truck moving West.
+Prompts are laid out for xAI prefix caching: everything that is identical
+across calls (role, rules, output schema, examples) goes first in the system
+message, and per-video context, transcript text and chunk position follow in
+the user message. Keep variable content out of the system prompts, or every
+call becomes a cache miss.
 """
 
-    prompt = f"""Extract comprehensive intelligence from this video transcript.
+from typing import Dict, List
 
-Video Context:
-- Title: {title}
-- Duration: {duration_min:.0f} minutes
-- Source: {channel}
+EXTRACTION_SYSTEM_ROLE = (
+    "You are a precise intelligence extraction system following strict quality standards."
+)
 
-EXTRACTION GUIDELINES (Quality Over Quantity):
+EXTRACTION_GUIDELINES = """EXTRACTION GUIDELINES (Quality Over Quantity):
 
 1. ENTITIES:
    Extract ALL named people, organizations, places, and events that are clearly mentioned.
@@ -117,21 +80,187 @@ EXTRACTION GUIDELINES (Quality Over Quantity):
    - Per-topic sentiment if topics have distinctly different tones
    - Confidence in overall assessment
 
-   Quality bar: Based on actual tone > assumed/stereotyped
-{visual_section}
+   Quality bar: Based on actual tone > assumed/stereotyped"""
+
+VISUAL_OBSERVATIONS_GUIDELINES = """6. VISUAL OBSERVATIONS (GEOINT):
+   You are acting as a visual observer analyzing surveillance footage.
+   Identify specific visual sightings, movements, or activities described or implied in the transcript.
+
+   Requirements:
+   - Extract "Visual Observations" where the speaker describes seeing something.
+   - Focus on physical objects (vehicles, people, infrastructure) and actions.
+   - Timestamp: Best estimate from context (MM:SS).
+   - Description: Clear description of what is seen.
+   - Evidence: Quote supporting the observation.
+
+   Example: "I see a red truck moving west" -> Observation: Red Truck moving West."""
 
-CRITICAL PRINCIPLES:
+EXTRACTION_PRINCIPLES = """CRITICAL PRINCIPLES:
 - Evidence is mandatory for entities and relationships (prevents hallucinations)
 - Quality is more important than quantity (5 perfect > 20 questionable)
 - Only extract what is clearly present (don't infer or assume)
 - Confidence scores should reflect actual certainty (be honest about ambiguity)
-- Specific is better than generic (names > pronouns, actions > "related to")
+- Specific is better than generic (names > pronouns, actions > "related to")"""
+
+
+def create_intelligence_extraction_system_prompt(visual_mode: bool = False) -> str:
+    """
+    Create the stable (cacheable) part of the intelligence extraction prompt.
+
+    Args:
+        visual_mode: Include the visual observations (GEOINT) section
+
+    Returns:
+        System prompt shared by every video with the same ``visual_mode``
+    """
+    sections = [
+        EXTRACTION_SYSTEM_ROLE,
+        "Extract comprehensive intelligence from the video transcript you are given.",
+        EXTRACTION_GUIDELINES,
+    ]
+    if visual_mode:
+        sections.append(VISUAL_OBSERVATIONS_GUIDELINES)
+    sections.append(EXTRACTION_PRINCIPLES)
+    return "\n\n".join(sections)
+
+
+def create_intelligence_extraction_user_prompt(transcript_text: str, metadata: dict) -> str:
+    """
+    Create the per-video part of the intelligence extraction prompt.
+
+    Args:
+        transcript_text: Full video transcript
+        metadata: Video metadata (title, duration, channel, etc.)
+
+    Returns:
+        User prompt with video context followed by the transcript
+    """
+    duration_sec = metadata.get("duration", 0)
+    duration_min = duration_sec / 60 if duration_sec > 0 else 0
+
+    return f"""Video Context:
+- Title: {metadata.get("title", "Unknown")}
+- Duration: {duration_min:.0f} minutes
+- Source: {metadata.get("channel", "Unknown")}
 
 Transcript:
 {transcript_text}
 """
 
-    return prompt
+
+def build_intelligence_extraction_messages(
+    transcript_text: str, metadata: dict
+) -> List[Dict[str, str]]:
+    """
+    Build cache-friendly chat messages for full-transcript extraction.
+
+    Args:
+        transcript_text: Full video transcript
+        metadata: Video metadata (title, duration, channel, etc.)
+
+    Returns:
+        [system, user] messages
+    """
+    return [
+        {
+            "role": "system",
+            "content": create_intelligence_extraction_system_prompt(
+                metadata.get("visual_mode", False)
+            ),
+        },
+        {
+            "role": "user",
+            "content": create_intelligence_extraction_user_prompt(transcript_text, metadata),
+        },
+    ]
+
+
+def create_intelligence_extraction_prompt(transcript_text: str, metadata: dict) -> str:
+    """
+    Create prompt for comprehensive intelligence extraction.
+
+    Single-message form of ``build_intelligence_extraction_messages`` (stable
+    guidelines first, then video context and transcript).
+
+    Following xAI best practices from docs.x.ai:
+    - Emphasize quality and evidence (not quantity targets)
+    - Include video metadata for context
+    - Clear structure guidance
+    - Let Grok decide how many based on content
+
+    Args:
+        transcript_text: Full video transcript
+        metadata: Video metadata (title, duration, channel, etc.)
+
+    Returns:
+        Prompt string optimized for Grok-4 Fast Reasoning
+    """
+    system_prompt = create_intelligence_extraction_system_prompt(metadata.get("visual_mode", False))
+    user_prompt = create_intelligence_extraction_user_prompt(transcript_text, metadata)
+    return f"{system_prompt}\n\n{user_prompt}"
+
+
+CHUNK_EXTRACTION_SYSTEM_PROMPT = """Extract entities and relationships from a chunk of a video transcript.
+
+You will receive the video context, then one transcript chunk, then the chunk's position.
+Chunks overlap slightly; extract everything clearly stated in the chunk you are given.
+
+RULES:
+- Entities: named people, organizations, places, events, products. Skip generic references
+  ("the president", "the company") unless the name is stated.
+- Use standard types: PERSON, ORG, GPE, LOC, EVENT, PRODUCT, WORK_OF_ART, LAW, NORP.
+- Use the video context (title, channel/speaker) to get names spelled correctly.
+- Relationships: subject and object MUST be entity names; predicate is a specific action
+  or connection (e.g. "announced", "criticized", "invested_in"). Do not infer unstated links.
+- Confidence (0-1) reflects how clearly the transcript states it.
+
+OUTPUT: a single JSON object, no prose:
+{"entities": [{"name": "...", "type": "...", "confidence": 0.9}], "relationships": [{"subject": "...", "predicate": "...", "object": "...", "confidence": 0.9}]}
+
+EXAMPLE
+Transcript: "Senator Jane Smith said Acme Corp will open a plant in Ohio next year."
+Output: {"entities": [{"name": "Jane Smith", "type": "PERSON", "confidence": 0.95}, {"name": "Acme Corp", "type": "ORG", "confidence": 0.95}, {"name": "Ohio", "type": "GPE", "confidence": 0.9}], "relationships": [{"subject": "Acme Corp", "predicate": "will_open_plant_in", "object": "Ohio", "confidence": 0.9}, {"subject": "Jane Smith", "predicate": "announced", "object": "Acme Corp", "confidence": 0.7}]}
+"""
+
+
+def build_chunk_extraction_messages(
+    chunk_text: str, metadata: dict, chunk_num: int, total_chunks: int
+) -> List[Dict[str, str]]:
+    """
+    Build cache-friendly chat messages for one transcript chunk.
+
+    The system prompt is identical for every chunk of every video, and the
+    video context opens the user message so chunks of one video share it
+    too; the chunk position comes last.
+
+    Args:
+        chunk_text: Transcript chunk
+        metadata: Video metadata (title, channel, description)
+        chunk_num: 1-based chunk number
+        total_chunks: Number of chunks in the video
+
+    Returns:
+        [system, user] messages
+    """
+    context_lines = [f"Video: {metadata.get('title', 'Unknown')}"]
+    if metadata.get("channel"):
+        context_lines.append(f"Channel/Speaker: {metadata.get('channel')}")
+    if metadata.get("description"):
+        context_lines.append(f"Context: {metadata.get('description', '')[:200]}")
+    context = "\n".join(context_lines)
+
+    user_prompt = f"""CONTEXT:
+{context}
+
+TRANSCRIPT:
+{chunk_text}
+
+(chunk {chunk_num}/{total_chunks})"""
+
+    return [
+        {"role": "system", "content": CHUNK_EXTRACTION_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
 
 
 def create_relationship_focused_prompt(transcript_text: str, entities: list, metadata: dict) -> str:
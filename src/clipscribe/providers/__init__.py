@@ -4,9 +4,14 @@ This module provides swappable providers for transcription and intelligence extr
 Enables testing, flexibility, and future support for additional providers.
 """
 
+from .bulk import BulkItem, BulkItemResult, BulkItemStatus, BulkRunner
 from .factory import get_intelligence_provider, get_transcription_provider
 
 __all__ = [
     "get_transcription_provider",
     "get_intelligence_provider",
+    "BulkRunner",
+    "BulkItem",
+    "BulkItemResult",
+    "BulkItemStatus",
 ]
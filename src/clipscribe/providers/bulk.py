@@ -0,0 +1,253 @@
+"""Bulk execution of transcription + intelligence providers.
+
+``BulkRunner`` takes a list of media items and drives them through a
+transcription provider and (optionally) an intelligence provider with:
+
+- per-provider concurrency limits (keyed by ``provider.name``)
+- a global cost ceiling based on each provider's ``estimate_cost``
+- longest-job-first ordering to minimise the makespan of the batch
+- results streamed back as soon as each item finishes
+- per-item timing and failure isolation (one bad file never aborts the run)
+
+Examples:
+    >>> runner = BulkRunner(transcriber, extractor, max_total_cost=5.0)
+    >>> async for result in runner.run([BulkItem("a.mp3"), BulkItem("b.mp3")]):
+    ...     print(result.item.audio_path, result.status, result.total_seconds)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from ..utils.file_utils import get_media_duration
+from .base import IntelligenceProvider, IntelligenceResult, TranscriptionProvider, TranscriptResult
+
+logger = logging.getLogger(__name__)
+
+# Default number of in-flight jobs per provider. Local CPU models get a single
+# slot; remote APIs and GPU backends can overlap several jobs.
+DEFAULT_CONCURRENCY: Dict[str, int] = {
+    "voxtral": 4,
+    "whisperx-modal": 4,
+    "whisperx-local": 1,
+    "auto": 4,
+    "grok": 8,
+}
+
+# Fallbacks used when a duration cannot be probed (matches the CLI default).
+DEFAULT_DURATION_SECONDS = 1800.0
+# Rough transcript density used to turn audio duration into an extraction estimate.
+DEFAULT_CHARS_PER_SECOND = 150.0
+
+
+class BulkItemStatus(str, Enum):
+    """Outcome of a single bulk item."""
+
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclass
+class BulkItem:
+    """A single media file to process in a bulk run."""
+
+    audio_path: str
+    duration: Optional[float] = None
+    diarize: bool = True
+    language: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    transcriber: Optional[TranscriptionProvider] = None
+
+
+@dataclass
+class BulkItemResult:
+    """Result of processing one bulk item."""
+
+    item: BulkItem
+    status: BulkItemStatus
+    transcript: Optional[TranscriptResult] = None
+    intelligence: Optional[IntelligenceResult] = None
+    error: Optional[str] = None
+    estimated_cost: float = 0.0
+    actual_cost: float = 0.0
+    queued_seconds: float = 0.0
+    transcription_seconds: float = 0.0
+    extraction_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == BulkItemStatus.COMPLETED
+
+
+class BulkRunner:
+    """Run transcription and extraction over many items with bounded concurrency and cost."""
+
+    def __init__(
+        self,
+        transcriber: TranscriptionProvider,
+        extractor: Optional[IntelligenceProvider] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        max_total_cost: Optional[float] = None,
+        chars_per_second: float = DEFAULT_CHARS_PER_SECOND,
+    ):
+        """
+        Initialize the bulk runner.
+
+        Args:
+            transcriber: Default transcription provider for items without an override
+            extractor: Intelligence provider (extraction is skipped if None)
+            concurrency_limits: Max in-flight jobs per provider name (merged over defaults)
+            max_total_cost: Global cost ceiling in USD; items that would exceed it are skipped
+            chars_per_second: Transcript density used for extraction cost estimates
+        """
+        self.transcriber = transcriber
+        self.extractor = extractor
+        self.concurrency_limits = {**DEFAULT_CONCURRENCY, **(concurrency_limits or {})}
+        self.max_total_cost = max_total_cost
+        self.chars_per_second = chars_per_second
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._budget_lock = asyncio.Lock()
+        self.spent_cost = 0.0
+        self.reserved_cost = 0.0
+
+    def _semaphore(self, provider_name: str) -> asyncio.Semaphore:
+        if provider_name not in self._semaphores:
+            limit = max(1, self.concurrency_limits.get(provider_name, 1))
+            self._semaphores[provider_name] = asyncio.Semaphore(limit)
+        return self._semaphores[provider_name]
+
+    def estimate_item_cost(self, item: BulkItem) -> float:
+        """Estimate the combined transcription + extraction cost of an item."""
+        duration = item.duration if item.duration is not None else DEFAULT_DURATION_SECONDS
+        transcriber = item.transcriber or self.transcriber
+        cost = transcriber.estimate_cost(duration)
+        if self.extractor is not None:
+            cost += self.extractor.estimate_cost(int(duration * self.chars_per_second))
+        return cost
+
+    async def _reserve_budget(self, estimate: float) -> bool:
+        """Reserve ``estimate`` against the ceiling; False if it would not fit."""
+        async with self._budget_lock:
+            if self.max_total_cost is not None:
+                committed = self.spent_cost + self.reserved_cost
+                if committed + estimate > self.max_total_cost:
+                    return False
+            self.reserved_cost += estimate
+            return True
+
+    async def _settle_budget(self, estimate: float, actual: float) -> None:
+        async with self._budget_lock:
+            self.reserved_cost = max(0.0, self.reserved_cost - estimate)
+            self.spent_cost += actual
+
+    async def _probe_durations(self, items: Sequence[BulkItem]) -> None:
+        """Fill in missing durations with ffprobe (run off the event loop)."""
+        missing = [item for item in items if item.duration is None]
+        if not missing:
+            return
+        durations = await asyncio.gather(
+            *(
+                asyncio.to_thread(get_media_duration, item.audio_path, DEFAULT_DURATION_SECONDS)
+                for item in missing
+            )
+        )
+        for item, duration in zip(missing, durations):
+            item.duration = duration
+
+    async def _process_item(self, item: BulkItem, submitted_at: float) -> BulkItemResult:
+        transcriber = item.transcriber or self.transcriber
+        result = BulkItemResult(item=item, status=BulkItemStatus.FAILED)
+
+        async with self._semaphore(transcriber.name):
+            started_at = time.perf_counter()
+            result.queued_seconds = started_at - submitted_at
+
+            result.estimated_cost = self.estimate_item_cost(item)
+            if not await self._reserve_budget(result.estimated_cost):
+                result.status = BulkItemStatus.SKIPPED
+                result.error = (
+                    f"Cost ceiling ${self.max_total_cost:.4f} reached "
+                    f"(item estimate ${result.estimated_cost:.4f})"
+                )
+                logger.warning(f"Skipping {item.audio_path}: {result.error}")
+                return result
+
+            diarize = item.diarize and transcriber.supports_diarization
+            try:
+                t0 = time.perf_counter()
+                result.transcript = await transcriber.transcribe(
+                    item.audio_path, language=item.language, diarize=diarize
+                )
+                result.transcription_seconds = time.perf_counter() - t0
+                result.actual_cost += result.transcript.cost
+            except Exception as e:
+                result.error = f"Transcription failed: {e}"
+                logger.error(f"{item.audio_path}: {result.error}")
+
+        try:
+            if result.transcript is not None and self.extractor is not None:
+                async with self._semaphore(self.extractor.name):
+                    try:
+                        t0 = time.perf_counter()
+                        result.intelligence = await self.extractor.extract(
+                            result.transcript, metadata=item.metadata or None
+                        )
+                        result.extraction_seconds = time.perf_counter() - t0
+                        result.actual_cost += result.intelligence.cost
+                    except Exception as e:
+                        result.error = f"Extraction failed: {e}"
+                        logger.error(f"{item.audio_path}: {result.error}")
+
+            if result.error is None:
+                result.status = BulkItemStatus.COMPLETED
+        finally:
+            await self._settle_budget(result.estimated_cost, result.actual_cost)
+            result.total_seconds = time.perf_counter() - started_at
+
+        return result
+
+    async def run(self, items: Sequence[BulkItem]) -> AsyncIterator[BulkItemResult]:
+        """Process items and yield results as they finish.
+
+        Items are started longest-first so long files don't end up as the
+        tail of the batch. Breaking out of the iteration cancels any work
+        still in flight.
+
+        Args:
+            items: Media items to process
+
+        Yields:
+            BulkItemResult for each item, in completion order
+        """
+        items = list(items)
+        if not items:
+            return
+
+        await self._probe_durations(items)
+        ordered = sorted(items, key=lambda item: item.duration or 0.0, reverse=True)
+
+        submitted_at = time.perf_counter()
+        tasks = [asyncio.create_task(self._process_item(item, submitted_at)) for item in ordered]
+        logger.info(
+            f"Bulk run started: {len(tasks)} items, "
+            f"ceiling={'none' if self.max_total_cost is None else f'${self.max_total_cost:.2f}'}"
+        )
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_all(self, items: Sequence[BulkItem]) -> List[BulkItemResult]:
+        """Process all items and return results in completion order."""
+        return [result async for result in self.run(items)]
@@ -4,7 +4,7 @@ from typing import Literal
 
 from .base import ConfigurationError, IntelligenceProvider, TranscriptionProvider
 
-TranscriptionProviderType = Literal["voxtral", "whisperx-modal", "whisperx-local"]
+TranscriptionProviderType = Literal["voxtral", "whisperx-modal", "whisperx-local", "auto"]
 IntelligenceProviderType = Literal["grok"]
 
 
@@ -14,7 +14,8 @@ def get_transcription_provider(
     """Get transcription provider by name.
 
     Args:
-        provider_name: Provider to use (voxtral, whisperx-modal, whisperx-local)
+        provider_name: Provider to use (voxtral, whisperx-modal, whisperx-local, or
+            auto to route each job to the best available backend)
         **kwargs: Provider-specific configuration
 
     Returns:
@@ -29,6 +30,7 @@ def get_transcription_provider(
         >>> result = await transcriber.transcribe("audio.mp3")
     """
     # Import providers (lazy loading)
+    from .transcription.router import RoutingTranscriptionProvider
     from .transcription.voxtral import VoxtralProvider
     from .transcription.whisperx_local import WhisperXLocalProvider
     from .transcription.whisperx_modal import WhisperXModalProvider
@@ -37,6 +39,7 @@ def get_transcription_provider(
         "voxtral": VoxtralProvider,
         "whisperx-modal": WhisperXModalProvider,
         "whisperx-local": WhisperXLocalProvider,
+        "auto": RoutingTranscriptionProvider,
     }
 
     provider_cls = providers.get(provider_name)
@@ -5,6 +5,8 @@ import os
 from typing import Dict, Optional
 
 from clipscribe.retrievers.grok_client import GrokAPIClient
+from clipscribe.utils.json_stream import salvage_json
+from clipscribe.utils.token_counter import get_token_counter
 
 from ..base import (
     ConfigurationError,
@@ -90,51 +92,52 @@ class GrokProvider(IntelligenceProvider):
         try:
             # Build extraction prompt (reuse existing)
             from clipscribe.prompts.intelligence_extraction import (
-                create_intelligence_extraction_prompt,
+                build_intelligence_extraction_messages,
             )
             from clipscribe.schemas_grok import get_video_intelligence_schema
 
             # Combine transcript segments into full text
             transcript_text = " ".join(seg.text for seg in transcript.segments)
 
-            # Build prompt with metadata
-            prompt = create_intelligence_extraction_prompt(transcript_text, metadata or {})
+            # Build prompt with metadata (stable rules in the system message for prefix caching)
+            messages = build_intelligence_extraction_messages(transcript_text, metadata or {})
 
             # Call existing Grok client (ALL features preserved!)
             # Note: get_video_intelligence_schema() returns full response_format dict
             schema_format = get_video_intelligence_schema()
 
             response = await self.client.chat_completion(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a precise intelligence extraction system following strict quality standards.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=messages,
                 model=self.model,
                 temperature=0.1,
                 max_tokens=4096,
                 response_format=schema_format,  # Already includes "type": "json_schema" wrapper
+                call_site="provider_extract",
             )
 
             # Parse JSON result
-            content = response["choices"][0]["message"]["content"]
-            result = json.loads(content)
+            choice = response["choices"][0]
+            content = choice["message"]["content"]
+            result = salvage_json(
+                content,
+                ("entities", "relationships"),
+                truncated=choice.get("finish_reason") == "length",
+            )
 
             # Calculate cost using EXISTING client method (preserves all features!)
             usage = response.get("usage", {})
+            usage_stats = self.client.extract_usage_stats(response)
             cost_breakdown = self.client.calculate_cost(
-                input_tokens=usage.get("prompt_tokens", 0),
-                output_tokens=usage.get("completion_tokens", 0),
-                cached_tokens=usage.get("cached_tokens", 0),
+                input_tokens=usage_stats["input_tokens"],
+                output_tokens=usage_stats["output_tokens"],
+                cached_tokens=usage_stats["cached_tokens"],
                 model=self.model,
                 return_breakdown=True,
             )
 
             # Build cache stats
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            cached_tokens = usage.get("cached_tokens", 0)
+            prompt_tokens = usage_stats["input_tokens"]
+            cached_tokens = usage_stats["cached_tokens"]
 
             # Calculate CORRECT hit rate percentage
             # hit_rate = cached_tokens / (prompt_tokens + cached_tokens) * 100
@@ -186,8 +189,8 @@ class GrokProvider(IntelligenceProvider):
         Returns:
             Estimated cost in USD
         """
-        # Estimate tokens (1 char ≈ 0.25 tokens)
-        estimated_tokens = transcript_length // 4
+        # Only the length is known here; use the tokenizer's observed chars/token ratio
+        estimated_tokens = get_token_counter().estimate_from_chars(transcript_length)
         output_tokens = 4000  # Typical output size
 
         # Calculate cost using existing client (without caching for conservative estimate)
@@ -1,5 +1,6 @@
 """Transcription providers for ClipScribe."""
 
+from .router import RoutingPolicy, RoutingTranscriptionProvider
 from .voxtral import VoxtralProvider
 from .whisperx_local import WhisperXLocalProvider
 from .whisperx_modal import WhisperXModalProvider
@@ -8,4 +9,6 @@ __all__ = [
     "VoxtralProvider",
     "WhisperXLocalProvider",
     "WhisperXModalProvider",
+    "RoutingTranscriptionProvider",
+    "RoutingPolicy",
 ]
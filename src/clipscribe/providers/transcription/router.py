@@ -0,0 +1,355 @@
+"""Routing transcription provider that picks a backend per job.
+
+Instead of fixing the backend with ``-t voxtral|whisperx-local|whisperx-modal``,
+``RoutingTranscriptionProvider`` (registered as ``auto``) chooses one per file
+from:
+
+- media duration and whether diarization was requested
+- live moving-average latency (seconds per audio second) and error rate per backend
+- local CPU queue depth (in-flight jobs on ``whisperx-local``)
+- a configured SLA (latency target) and per-job budget
+
+Short clips go straight to the free local model; long multi-speaker files go
+to the GPU backend. Every decision and its observed outcome is logged (and
+optionally appended to a JSONL file) so the policy can be tuned.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from clipscribe.utils.file_utils import get_media_duration
+
+from ..base import ConfigurationError, ProcessingError, TranscriptionProvider, TranscriptResult
+
+logger = logging.getLogger(__name__)
+
+# Backends considered by default, in preference order for ties.
+DEFAULT_BACKENDS = ["whisperx-local", "whisperx-modal", "voxtral"]
+
+# Priors used until real observations arrive: processing seconds per audio
+# second, plus fixed per-job overhead (model load / container cold start / upload).
+DEFAULT_REALTIME_FACTORS = {
+    "whisperx-local": 0.25,  # 3-5x realtime on CPU
+    "whisperx-modal": 0.10,  # ~10x realtime on A10G
+    "voxtral": 0.05,
+}
+DEFAULT_OVERHEAD_SECONDS = {
+    "whisperx-local": 10.0,
+    "whisperx-modal": 45.0,
+    "voxtral": 5.0,
+}
+# Backends that run on this machine and therefore queue behind each other.
+LOCAL_BACKENDS = {"whisperx-local"}
+
+
+@dataclass
+class RoutingPolicy:
+    """Tunable routing policy.
+
+    A job meets the SLA if its expected wall-clock time is within
+    ``max(sla_floor_seconds, sla_realtime_factor * duration)`` (or
+    ``max_latency_seconds`` when set). Among backends meeting the SLA and
+    budget, the cheapest wins; ties go to the faster backend.
+    """
+
+    max_latency_seconds: Optional[float] = None
+    sla_realtime_factor: float = 0.2
+    sla_floor_seconds: float = 120.0
+    max_cost_per_job: Optional[float] = None
+    max_local_queue_depth: int = 2
+    max_error_rate: float = 0.5
+    ewma_alpha: float = 0.2
+
+    def latency_target(self, duration_seconds: float) -> float:
+        if self.max_latency_seconds is not None:
+            return self.max_latency_seconds
+        return max(self.sla_floor_seconds, self.sla_realtime_factor * duration_seconds)
+
+
+@dataclass
+class BackendStats:
+    """Moving-average health of a single backend."""
+
+    name: str
+    realtime_factor: float
+    overhead_seconds: float
+    error_rate: float = 0.0
+    in_flight: int = 0
+    completed: int = 0
+    failed: int = 0
+
+    def expected_latency(self, duration_seconds: float) -> float:
+        """Expected wall-clock seconds for a job, including local queueing."""
+        latency = self.overhead_seconds + self.realtime_factor * duration_seconds
+        if self.name in LOCAL_BACKENDS:
+            # Local jobs run one after another on the CPU
+            latency *= self.in_flight + 1
+        return latency
+
+    def record_success(self, elapsed: float, duration_seconds: float, alpha: float) -> None:
+        self.completed += 1
+        if duration_seconds > 0:
+            observed = max(0.0, elapsed - self.overhead_seconds) / duration_seconds
+            self.realtime_factor = (1 - alpha) * self.realtime_factor + alpha * observed
+        self.error_rate = (1 - alpha) * self.error_rate
+
+    def record_failure(self, alpha: float) -> None:
+        self.failed += 1
+        self.error_rate = (1 - alpha) * self.error_rate + alpha
+
+
+@dataclass
+class RoutingDecision:
+    """Outcome of a routing decision (logged for policy tuning)."""
+
+    audio_path: str
+    duration: float
+    diarize: bool
+    backend: str
+    reason: str
+    candidates: List[Dict] = field(default_factory=list)
+
+
+# Process-wide backend statistics so moving averages survive across router instances
+_backend_stats: Dict[str, BackendStats] = {}
+
+
+def get_backend_stats(name: str) -> BackendStats:
+    """Get (or create) the shared moving-average stats for a backend."""
+    if name not in _backend_stats:
+        _backend_stats[name] = BackendStats(
+            name=name,
+            realtime_factor=DEFAULT_REALTIME_FACTORS.get(name, 0.2),
+            overhead_seconds=DEFAULT_OVERHEAD_SECONDS.get(name, 10.0),
+        )
+    return _backend_stats[name]
+
+
+class RoutingTranscriptionProvider(TranscriptionProvider):
+    """Transcription provider that routes each job to the best available backend."""
+
+    def __init__(
+        self,
+        backends: Optional[Dict[str, TranscriptionProvider]] = None,
+        policy: Optional[RoutingPolicy] = None,
+        decision_log_path: Optional[str] = None,
+    ):
+        """Initialize the router.
+
+        Args:
+            backends: Backend providers by name. If None, every default backend
+                that initializes successfully is used.
+            policy: Routing policy (SLA, budget, thresholds)
+            decision_log_path: Optional JSONL file for decisions and outcomes
+                (defaults to CLIPSCRIBE_ROUTER_LOG env var)
+
+        Raises:
+            ConfigurationError: If no backend is available
+        """
+        if backends is None:
+            backends = self._load_default_backends()
+        if not backends:
+            raise ConfigurationError(
+                "No transcription backends available for routing.\n"
+                "Configure at least one of: " + ", ".join(DEFAULT_BACKENDS)
+            )
+
+        self.backends = backends
+        self.policy = policy or RoutingPolicy()
+        log_path = decision_log_path or os.getenv("CLIPSCRIBE_ROUTER_LOG")
+        self.decision_log_path = Path(log_path) if log_path else None
+
+    @staticmethod
+    def _load_default_backends() -> Dict[str, TranscriptionProvider]:
+        from ..factory import get_transcription_provider
+
+        backends = {}
+        for name in DEFAULT_BACKENDS:
+            try:
+                backends[name] = get_transcription_provider(name)
+            except (ConfigurationError, ValueError) as e:
+                logger.info(f"Router: backend {name} unavailable ({str(e).splitlines()[0]})")
+        return backends
+
+    @property
+    def name(self) -> str:
+        """Provider identifier."""
+        return "auto"
+
+    @property
+    def supports_diarization(self) -> bool:
+        """Diarization is available if any backend supports it."""
+        return any(b.supports_diarization for b in self.backends.values())
+
+    def _rank_candidates(self, duration: float, diarize: bool) -> List[Dict]:
+        """Score every eligible backend for a job, best first."""
+        names = list(self.backends)
+        if diarize and any(self.backends[n].supports_diarization for n in names):
+            names = [n for n in names if self.backends[n].supports_diarization]
+
+        healthy = [n for n in names if get_backend_stats(n).error_rate < self.policy.max_error_rate]
+        names = healthy or names
+
+        target = self.policy.latency_target(duration)
+        candidates = []
+        for name in names:
+            stats = get_backend_stats(name)
+            latency = stats.expected_latency(duration)
+            cost = self.backends[name].estimate_cost(duration)
+            queue_ok = (
+                name not in LOCAL_BACKENDS or stats.in_flight < self.policy.max_local_queue_depth
+            )
+            candidates.append(
+                {
+                    "backend": name,
+                    "expected_latency": round(latency, 1),
+                    "expected_cost": round(cost, 4),
+                    "error_rate": round(stats.error_rate, 3),
+                    "in_flight": stats.in_flight,
+                    "meets_sla": latency <= target and queue_ok,
+                    "within_budget": self.policy.max_cost_per_job is None
+                    or cost <= self.policy.max_cost_per_job,
+                }
+            )
+
+        # Preference: SLA + budget (cheapest, then fastest) > budget only (fastest) > cheapest
+        def sort_key(c: Dict):
+            if c["meets_sla"] and c["within_budget"]:
+                return (0, c["expected_cost"], c["expected_latency"])
+            if c["within_budget"]:
+                return (1, c["expected_latency"], c["expected_cost"])
+            return (2, c["expected_cost"], c["expected_latency"])
+
+        return sorted(candidates, key=sort_key)
+
+    def choose_backend(
+        self, duration: float, diarize: bool = True, audio_path: str = ""
+    ) -> RoutingDecision:
+        """Pick a backend for a job without running it.
+
+        Args:
+            duration: Media duration in seconds
+            diarize: Whether speaker diarization is requested
+            audio_path: Path (for logging only)
+
+        Returns:
+            RoutingDecision with the chosen backend and scored candidates
+        """
+        candidates = self._rank_candidates(duration, diarize)
+        best = candidates[0]
+        if best["meets_sla"] and best["within_budget"]:
+            reason = "cheapest backend meeting SLA and budget"
+        elif best["within_budget"]:
+            reason = "no backend meets SLA; fastest within budget"
+        else:
+            reason = "no backend within budget; cheapest available"
+
+        return RoutingDecision(
+            audio_path=audio_path,
+            duration=duration,
+            diarize=diarize,
+            backend=best["backend"],
+            reason=reason,
+            candidates=candidates,
+        )
+
+    def _log_event(self, event: str, payload: Dict) -> None:
+        if self.decision_log_path is None:
+            return
+        record = {"event": event, "timestamp": datetime.now().isoformat(), **payload}
+        try:
+            self.decision_log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.decision_log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.warning(f"Router: could not write decision log: {e}")
+
+    async def transcribe(
+        self,
+        audio_path: str,
+        language: Optional[str] = None,
+        diarize: bool = True,
+    ) -> TranscriptResult:
+        """Route and transcribe, falling back to the next candidate on failure.
+
+        Args:
+            audio_path: Path to audio/video file
+            language: Optional language code (auto-detected if None)
+            diarize: Enable speaker diarization if supported
+
+        Returns:
+            TranscriptResult from the chosen backend (routing info in metadata)
+
+        Raises:
+            ProcessingError: If every candidate backend fails
+        """
+        duration = await asyncio.to_thread(get_media_duration, audio_path, 1800.0)
+        decision = self.choose_backend(duration, diarize, audio_path)
+        logger.info(
+            f"Router: {Path(audio_path).name} ({duration/60:.1f} min, diarize={diarize}) "
+            f"-> {decision.backend}: {decision.reason}"
+        )
+        self._log_event("decision", asdict(decision))
+
+        errors = []
+        for candidate in decision.candidates:
+            name = candidate["backend"]
+            backend = self.backends[name]
+            stats = get_backend_stats(name)
+
+            stats.in_flight += 1
+            start = time.perf_counter()
+            try:
+                result = await backend.transcribe(
+                    audio_path, language=language, diarize=diarize and backend.supports_diarization
+                )
+            except Exception as e:
+                stats.record_failure(self.policy.ewma_alpha)
+                errors.append(f"{name}: {e}")
+                logger.warning(f"Router: {name} failed on {Path(audio_path).name}: {e}")
+                self._log_event(
+                    "outcome",
+                    {"audio_path": audio_path, "backend": name, "success": False, "error": str(e)},
+                )
+                continue
+            finally:
+                stats.in_flight -= 1
+
+            elapsed = time.perf_counter() - start
+            stats.record_success(elapsed, duration, self.policy.ewma_alpha)
+            self._log_event(
+                "outcome",
+                {
+                    "audio_path": audio_path,
+                    "backend": name,
+                    "success": True,
+                    "elapsed": round(elapsed, 2),
+                    "expected_latency": candidate["expected_latency"],
+                    "cost": result.cost,
+                    "expected_cost": candidate["expected_cost"],
+                },
+            )
+            result.metadata["routing"] = {
+                "backend": name,
+                "reason": decision.reason if name == decision.backend else "fallback",
+                "elapsed": round(elapsed, 2),
+            }
+            return result
+
+        raise ProcessingError(f"All routed backends failed for {audio_path}: {'; '.join(errors)}")
+
+    def estimate_cost(self, duration_seconds: float) -> float:
+        """Estimate cost using the backend the router would pick (diarized job)."""
+        decision = self.choose_backend(duration_seconds, diarize=True)
+        return self.backends[decision.backend].estimate_cost(duration_seconds)
+
+    def validate_config(self) -> bool:
+        """Valid if at least one backend is configured."""
+        return any(b.validate_config() for b in self.backends.values())
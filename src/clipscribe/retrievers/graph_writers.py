@@ -0,0 +1,249 @@
+"""
+Streaming writers for knowledge graph exports.
+
+Each writer takes the serializable graph built by ``KnowledgeGraphBuilder``
+(``{"nodes": [...], "edges": [...], ...}``) and writes one node or edge
+record at a time to a text file handle, so an export never holds a second
+copy of the graph (or the whole document) in memory and needs no graph
+library.
+
+Examples:
+    >>> with open("knowledge_graph.graphml", "w", encoding="utf-8") as f:
+    ...     write_graphml(video.knowledge_graph, f)
+    >>> write_graph_file(Path("knowledge_graph.gexf"), write_gexf, video.knowledge_graph)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, TextIO, Tuple
+from xml.sax.saxutils import escape
+
+# GraphML <key> declarations: (id, domain, attribute, GraphML type, default)
+_GRAPHML_KEYS: List[Tuple[str, str, str, str, Any]] = [
+    ("d0", "node", "type", "string", "unknown"),
+    ("d1", "node", "confidence", "double", 0.9),
+    ("d2", "node", "mention_count", "long", 1),
+    ("d3", "node", "occurrences", "long", 1),
+    ("d4", "node", "canonical_form", "string", None),
+    ("d5", "edge", "predicate", "string", "related_to"),
+    ("d6", "edge", "confidence", "double", 0.9),
+    ("d7", "edge", "extraction_source", "string", "unknown"),
+]
+
+# Gephi node colours by entity type
+_GEXF_COLORS = {
+    "PERSON": (255, 107, 107),  # Red
+    "ORGANIZATION": (78, 205, 196),  # Teal
+    "LOCATION": (69, 183, 209),  # Blue
+    "EVENT": (247, 220, 111),  # Yellow
+    "CONCEPT": (187, 143, 206),  # Purple
+    "TECHNOLOGY": (82, 190, 128),  # Green
+    "DATE": (243, 156, 18),  # Orange
+    "MONEY": (133, 193, 226),  # Light Blue
+    "unknown": (149, 165, 166),  # Gray
+}
+
+_GEXF_HEADER = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<gexf xmlns="http://www.gexf.net/1.3" xmlns:viz="http://www.gexf.net/1.3/viz" \
+xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" \
+xsi:schemaLocation="http://gexf.net/1.3 http://gexf.net/1.3/gexf.xsd" version="1.3">
+  <meta lastmodifieddate="{date}">
+    <creator>ClipScribe</creator>
+    <description>Knowledge graph extracted from video content</description>
+  </meta>
+  <graph mode="static" defaultedgetype="directed" idtype="string">
+    <attributes class="node">
+      <attribute id="0" title="Type" type="string"/>
+      <attribute id="1" title="Confidence" type="double"/>
+      <attribute id="2" title="MentionCount" type="integer"/>
+      <attribute id="3" title="Occurrences" type="integer"/>
+      <attribute id="4" title="Name" type="string"/>
+    </attributes>
+    <attributes class="edge">
+      <attribute id="0" title="Predicate" type="string"/>
+      <attribute id="1" title="Confidence" type="double"/>
+    </attributes>
+    <nodes>
+"""
+
+
+def _attr(text: str) -> str:
+    """Escape text for a double-quoted XML attribute."""
+    return escape(text, {'"': "&quot;"})
+
+
+def _graphml_value(value: Any, xml_type: str) -> str:
+    if xml_type == "long":
+        return str(int(value)) if isinstance(value, (int, float)) else "0"
+    if xml_type == "double":
+        return str(float(value))
+    return escape(str(value))
+
+
+def write_graphml(knowledge_graph: Dict[str, Any], fh: TextIO) -> None:
+    """
+    Write a knowledge graph as GraphML (yEd, Cytoscape, NetworkX).
+
+    Args:
+        knowledge_graph: Serializable graph with ``nodes`` and ``edges``
+        fh: Text file handle opened for writing
+    """
+    fh.write("<?xml version='1.0' encoding='utf-8'?>\n")
+    fh.write(
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+        'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+    )
+    for key_id, domain, name, xml_type, _ in _GRAPHML_KEYS:
+        fh.write(
+            f'  <key id="{key_id}" for="{domain}" attr.name="{name}" attr.type="{xml_type}" />\n'
+        )
+    fh.write('  <graph edgedefault="directed">\n')
+
+    for node in knowledge_graph.get("nodes", []):
+        fh.write(f'    <node id="{_attr(str(node["id"]))}">\n')
+        for key_id, domain, name, xml_type, default in _GRAPHML_KEYS:
+            if domain != "node":
+                continue
+            value = node.get(name, node["id"] if default is None else default)
+            if value is not None:
+                fh.write(f'      <data key="{key_id}">{_graphml_value(value, xml_type)}</data>\n')
+        fh.write("    </node>\n")
+
+    for edge in knowledge_graph.get("edges", []):
+        source, target = _attr(str(edge["source"])), _attr(str(edge["target"]))
+        fh.write(f'    <edge source="{source}" target="{target}">\n')
+        for key_id, domain, name, xml_type, default in _GRAPHML_KEYS:
+            if domain != "edge":
+                continue
+            value = edge.get(name, default)
+            if value is not None:
+                fh.write(f'      <data key="{key_id}">{_graphml_value(value, xml_type)}</data>\n')
+        fh.write("    </edge>\n")
+
+    fh.write("  </graph>\n")
+    fh.write("</graphml>\n")
+
+
+def _gexf_node_id(label: str) -> str:
+    # SHA-256 of the XML-escaped name, truncated to 12 hex chars; ids match earlier exports
+    return f"n_{hashlib.sha256(label.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _gexf_count(value: Any) -> int:
+    return int(value) if isinstance(value, (int, float)) else 0
+
+
+def write_gexf(knowledge_graph: Dict[str, Any], fh: TextIO) -> None:
+    """
+    Write a knowledge graph as GEXF for Gephi, with type colours and confidence sizes.
+
+    Args:
+        knowledge_graph: Serializable graph with ``nodes`` and ``edges``
+        fh: Text file handle opened for writing
+    """
+    fh.write(_GEXF_HEADER.format(date=datetime.now().strftime("%Y-%m-%d")))
+
+    # Node ids by escaped name, so edges reuse the node pass's hashes
+    node_ids: Dict[str, str] = {}
+    for node in knowledge_graph.get("nodes", []):
+        name = str(node.get("id", "unknown"))
+        node_type = node.get("type", "unknown")
+        confidence = node.get("confidence", 0.9)
+        r, g, b = _GEXF_COLORS.get(node_type, _GEXF_COLORS["unknown"])
+        label = _attr(name)
+        node_id = node_ids[escape(name)] = _gexf_node_id(escape(name))
+        fh.write(
+            f'      <node id="{node_id}" label="{label}">\n'
+            "        <attvalues>\n"
+            f'          <attvalue for="0" value="{_attr(str(node_type))}"/>\n'
+            f'          <attvalue for="1" value="{confidence}"/>\n'
+            f'          <attvalue for="2" value="{_gexf_count(node.get("mention_count", 0))}"/>\n'
+            f'          <attvalue for="3" value="{_gexf_count(node.get("occurrences", 0))}"/>\n'
+            f'          <attvalue for="4" value="{label}"/>\n'
+            "        </attvalues>\n"
+            f'        <viz:color r="{r}" g="{g}" b="{b}" a="1.0"/>\n'
+            f'        <viz:size value="{20 + (confidence * 30)}"/>\n'
+            "      </node>\n"
+        )
+
+    fh.write("    </nodes>\n")
+    fh.write("    <edges>\n")
+
+    for i, edge in enumerate(knowledge_graph.get("edges", [])):
+        source, target = escape(str(edge["source"])), escape(str(edge["target"]))
+        source = node_ids.get(source) or _gexf_node_id(source)
+        target = node_ids.get(target) or _gexf_node_id(target)
+        predicate = _attr(str(edge.get("predicate", "related_to")))
+        confidence = edge.get("confidence", 0.9)
+        fh.write(
+            f'      <edge id="{i}" source="{source}" target="{target}" weight="{confidence}" '
+            f'label="{predicate}" kind="{predicate}">\n'
+            "        <attvalues>\n"
+            f'          <attvalue for="0" value="{predicate}"/>\n'
+            f'          <attvalue for="1" value="{confidence}"/>\n'
+            "        </attvalues>\n"
+            "      </edge>\n"
+        )
+
+    fh.write("    </edges>\n")
+    fh.write("  </graph>\n")
+    fh.write("</gexf>\n")
+
+
+def write_json(knowledge_graph: Dict[str, Any], fh: TextIO) -> None:
+    """
+    Write a knowledge graph as JSON, one node or edge record per line.
+
+    Records are encoded one at a time with the C encoder instead of
+    ``json.dump(indent=...)``, which formats the whole graph in Python.
+
+    Args:
+        knowledge_graph: Serializable graph with ``nodes`` and ``edges``
+        fh: Text file handle opened for writing
+    """
+    fh.write("{")
+    for i, (key, value) in enumerate(knowledge_graph.items()):
+        fh.write(",\n" if i else "\n")
+        fh.write(f"  {json.dumps(key)}: ")
+        if isinstance(value, list) and value:
+            fh.write("[\n")
+            for j, record in enumerate(value):
+                fh.write(",\n" if j else "")
+                fh.write(f"    {json.dumps(record, default=str)}")
+            fh.write("\n  ]")
+        else:
+            fh.write(json.dumps(value, default=str))
+    fh.write("\n}\n")
+
+
+def write_graph_file(
+    path: Path,
+    writer: Callable[[Dict[str, Any], TextIO], None],
+    knowledge_graph: Dict[str, Any],
+) -> None:
+    """
+    Stream a graph export to ``path`` atomically.
+
+    The writer fills a temporary file next to ``path``, which replaces
+    ``path`` only once every record is written; if a record fails, the
+    temporary file is removed and ``path`` is left as it was.
+
+    Args:
+        path: Destination file
+        writer: ``write_graphml``, ``write_gexf`` or ``write_json``
+        knowledge_graph: Serializable graph with ``nodes`` and ``edges``
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            writer(knowledge_graph, fh)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -9,12 +9,26 @@ import asyncio
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import httpx
 
+from ..utils.http_pool import get_http_registry
+from ..utils.json_stream import JSONArrayStreamParser, salvage_json
+from ..utils.prompt_cache import get_prompt_cache, normalize_usage
+from ..utils.single_flight import SingleFlight, canonical_hash
+from ..utils.token_counter import get_token_counter
+from .grok_hedging import get_request_hedger
+from .grok_rate_limiter import get_grok_rate_limiter, parse_retry_after
+
 logger = logging.getLogger(__name__)
 
+# Completion budget reserved against the tokens/min limit when max_tokens is unset
+DEFAULT_COMPLETION_TOKEN_RESERVATION = 2048
+
+# Identical in-flight chat completions are coalesced process-wide
+_chat_flights = SingleFlight()
+
 
 class GrokAPIError(Exception):
     """Base exception for Grok API errors."""
@@ -34,6 +48,12 @@ class GrokRateLimitError(GrokAPIError):
     pass
 
 
+class GrokContextLengthError(GrokAPIError):
+    """Prompt plus requested output exceeds the model's context window."""
+
+    pass
+
+
 class GrokAPIClient:
     """
     Real Grok API client using xAI's REST API.
@@ -47,6 +67,9 @@ class GrokAPIClient:
         base_url: str = "https://api.x.ai/v1",
         timeout: int = 60,
         max_retries: int = 3,
+        enable_hedging: bool = False,
+        hedge_budget_per_minute: int = 10,
+        enable_coalescing: bool = True,
     ):
         """
         Initialize Grok API client.
@@ -56,27 +79,46 @@ class GrokAPIClient:
             base_url: Base URL for API calls
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
+            enable_hedging: Issue a duplicate chat completion when a call exceeds the
+                observed p90 latency for its model and prompt size
+            hedge_budget_per_minute: Max duplicate requests per minute (process-wide)
+            enable_coalescing: Share one in-flight request between concurrent callers
+                sending an identical payload
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
+        self.enable_hedging = enable_hedging
+        self.hedger = get_request_hedger(hedge_budget_per_minute) if enable_hedging else None
+        self.rate_limiter = get_grok_rate_limiter()
+        self.enable_coalescing = enable_coalescing
+        self.token_counter = get_token_counter()
 
-        # HTTP client for connection reuse
-        self.client = httpx.AsyncClient(
-            timeout=timeout,
-            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-        )
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
 
         logger.info("Grok API client initialized")
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client for the API host (see utils.http_pool)."""
+        return get_http_registry().get_async_client(self.base_url, timeout=self.timeout)
+
+    async def close(self):
+        """Release the client.
+
+        The underlying connection pool is shared process-wide, so this is a
+        no-op kept for API compatibility; pools are closed on shutdown via
+        ``get_http_registry().aclose()``.
+        """
+
     async def __aenter__(self):
         """Async context manager entry."""
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        await self.client.aclose()
+        await self.close()
 
     async def chat_completion(
         self,
@@ -88,6 +130,8 @@ class GrokAPIClient:
         tools: Optional[List[Dict[str, Any]]] = None,
         tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
         response_format: Optional[Dict[str, Any]] = None,
+        call_site: Optional[str] = None,
+        timeout: Optional[float] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         """
@@ -98,15 +142,78 @@ class GrokAPIClient:
             model: Model to use (grok-4-1-fast-reasoning, grok-4-1-fast-non-reasoning)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
-            stream: Whether to stream the response
+            stream: Stream the response over SSE and assemble it (same return shape)
             tools: List of tools for server-side execution (web_search, x_search, etc.)
             tool_choice: Tool choice strategy ("auto", "required", "none", or specific tool)
             response_format: Response format spec (json_object or json_schema)
+            call_site: Caller name; when set, prompt-cache usage is recorded under it
+            timeout: Per-request timeout in seconds (defaults to the client's)
             **kwargs: Additional parameters
 
         Returns:
             API response dictionary with usage stats and cached token info
-        """
+
+        Raises:
+            GrokContextLengthError: If the prompt cannot fit the model's context window
+        """
+        payload, prompt_tokens = self._build_chat_payload(
+            messages,
+            model,
+            temperature,
+            max_tokens,
+            stream,
+            tools,
+            tool_choice,
+            response_format,
+            **kwargs,
+        )
+
+        async def send() -> Dict[str, Any]:
+            if self.hedger is not None:
+                return await self.hedger.run(
+                    model,
+                    prompt_tokens,
+                    lambda: self._make_request("chat/completions", payload, timeout=timeout),
+                )
+            return await self._make_request("chat/completions", payload, timeout=timeout)
+
+        if stream:
+            response = await self._collect_stream(payload, timeout=timeout)
+        elif self.enable_coalescing:
+            # Key on the account and endpoint too so different keys never share a response
+            key = canonical_hash(self.base_url, canonical_hash(self.api_key), payload)
+            response, shared = await _chat_flights.do(key, send)
+            if shared:
+                # Another caller already paid for this response
+                response["coalesced"] = True
+        else:
+            response = await send()
+
+        if call_site and not response.get("coalesced"):
+            get_prompt_cache().record_usage(response.get("usage", {}), call_site, model)
+        return response
+
+    def _build_chat_payload(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Tuple[Dict[str, Any], int]:
+        """Build a chat completion payload after a context-window pre-flight check."""
+        # Pre-flight: fail fast instead of sending a request the API will reject
+        prompt_tokens = self.token_counter.count_messages(messages)
+        if not self.token_counter.fits_context(model, prompt_tokens, max_tokens or 0):
+            raise GrokContextLengthError(
+                f"Prompt is {prompt_tokens} tokens (+{max_tokens or 0} output), exceeding "
+                f"{model}'s {self.token_counter.context_limit(model)}-token context window"
+            )
+
         payload = {
             "model": model,
             "messages": messages,
@@ -127,13 +234,222 @@ class GrokAPIClient:
         if response_format:
             payload["response_format"] = response_format
 
+        if stream:
+            # Final SSE chunk carries token usage
+            payload["stream_options"] = {"include_usage": True}
+
         # Add any additional parameters
         payload.update(kwargs)
 
-        return await self._make_request("chat/completions", payload)
+        return payload, prompt_tokens
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "grok-4-1-fast-reasoning",
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion as server-sent event chunks.
+
+        Args:
+            messages: List of message dictionaries
+            model: Model to use
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            response_format: Response format spec (json_object or json_schema)
+            **kwargs: Additional parameters
+
+        Yields:
+            Completion chunks (``choices[0].delta`` holds the new content; the
+            last chunk carries ``usage``)
+        """
+        payload, _ = self._build_chat_payload(
+            messages,
+            model,
+            temperature,
+            max_tokens,
+            True,
+            response_format=response_format,
+            **kwargs,
+        )
+        async for chunk in self._stream_request("chat/completions", payload):
+            yield chunk
+
+    async def stream_json_objects(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "grok-4-1-fast-reasoning",
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        call_site: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream a JSON completion and yield array items as soon as they are complete.
+
+        For a response like ``{"entities": [...], "relationships": [...]}`` each
+        entity and relationship is yielded when its closing brace arrives. If
+        the stream ends early (e.g. at ``max_tokens``) everything complete has
+        already been yielded.
+
+        Args:
+            messages: List of message dictionaries
+            model: Model to use
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            response_format: Response format spec (json_object or json_schema)
+            call_site: Caller name; when set, prompt-cache usage is recorded under it
+            **kwargs: Additional parameters
+
+        Yields:
+            (top-level array key, object) tuples
+
+        Raises:
+            json.JSONDecodeError: If the reply finished without a single item and is
+                not a JSON object (same rule as ``salvage_json``)
+        """
+        parser = JSONArrayStreamParser()
+        parts: List[str] = []
+        finish_reason = None
+        usage: Dict[str, Any] = {}
+        async for chunk in self.stream_chat_completion(
+            messages, model, temperature, max_tokens, response_format, **kwargs
+        ):
+            usage = chunk.get("usage") or usage
+            for choice in chunk.get("choices") or []:
+                finish_reason = choice.get("finish_reason") or finish_reason
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    parts.append(content)
+                    for item in parser.feed(content):
+                        yield item
+
+        if call_site:
+            get_prompt_cache().record_usage(usage, call_site, model)
+        if finish_reason != "length" and not any(
+            items for key, items in parser.objects.items() if key
+        ):
+            # Nothing was yielded: an empty but valid reply is fine, anything else raises
+            salvage_json("".join(parts))
+
+    async def _collect_stream(
+        self, payload: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Consume a streamed completion and assemble a regular response dict."""
+        content: List[str] = []
+        finish_reason = None
+        usage: Dict[str, Any] = {}
+        response_id = None
+        async for chunk in self._stream_request("chat/completions", payload, timeout):
+            response_id = response_id or chunk.get("id")
+            usage = chunk.get("usage") or usage
+            for choice in chunk.get("choices") or []:
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    content.append(delta["content"])
+                finish_reason = choice.get("finish_reason") or finish_reason
+
+        return {
+            "id": response_id,
+            "object": "chat.completion",
+            "model": payload.get("model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(content)},
+                    "finish_reason": finish_reason,
+                }
+            ],
+            "usage": usage,
+        }
+
+    async def _stream_request(
+        self, endpoint: str, payload: Dict[str, Any], timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        POST a streaming request and yield parsed SSE ``data:`` events.
+
+        Rate-limited (429) responses, timeouts and connection errors are retried
+        up to ``max_retries`` times (the latter with exponential backoff, as in
+        ``_make_request``) until the first event has been yielded; after that a
+        retry would repeat events, so errors are raised.
+
+        Raises:
+            GrokAPIError: For API-related errors
+        """
+        url = f"{self.base_url}/{endpoint}"
+        model = payload.get("model", "default")
+        reserved_tokens = self._estimate_request_tokens(payload)
+
+        yielded = False
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(model, reserved_tokens)
+            try:
+                async with self.client.stream(
+                    "POST", url, json=payload, headers=self.headers, timeout=timeout or self.timeout
+                ) as response:
+                    await self.rate_limiter.update_from_headers(model, response.headers)
+
+                    if response.status_code == 429:
+                        text = (await response.aread()).decode("utf-8", errors="replace")
+                        retry_after = parse_retry_after(response.headers.get("retry-after"))
+                        await self.rate_limiter.on_rate_limited(model, retry_after)
+                        if attempt < self.max_retries:
+                            logger.warning(
+                                f"Rate limited, retrying stream ({attempt + 1}/{self.max_retries})"
+                            )
+                            continue
+                        raise GrokRateLimitError(f"Rate limit exceeded: {text}")
+                    if response.status_code != 200:
+                        text = (await response.aread()).decode("utf-8", errors="replace")
+                        if response.status_code == 401:
+                            raise GrokAuthenticationError(f"Authentication failed: {text}")
+                        raise GrokAPIError(f"Unexpected status {response.status_code}: {text}")
+
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:") :].strip()
+                        if data == "[DONE]":
+                            break
+                        chunk = json.loads(data)
+                        total_tokens = (chunk.get("usage") or {}).get("total_tokens")
+                        if total_tokens is not None:
+                            await self.rate_limiter.settle(model, reserved_tokens, total_tokens)
+                        yielded = True
+                        yield chunk
+                    return
+
+            except GrokAPIError:
+                raise
+            except httpx.TimeoutException as e:
+                if not yielded and attempt < self.max_retries:
+                    logger.warning(f"Stream timeout, retrying ({attempt + 1}/{self.max_retries})")
+                    await asyncio.sleep(2**attempt)  # Exponential backoff
+                    continue
+                raise GrokAPIError(f"Stream timeout: {e}")
+            except httpx.ConnectError as e:
+                if not yielded and attempt < self.max_retries:
+                    logger.warning(
+                        f"Stream connection error, retrying ({attempt + 1}/{self.max_retries})"
+                    )
+                    await asyncio.sleep(2**attempt)
+                    continue
+                raise GrokAPIError(f"Stream connection error: {e}")
+            except (httpx.HTTPError, json.JSONDecodeError) as e:
+                raise GrokAPIError(f"Stream error: {e}")
 
     async def _make_request(
-        self, endpoint: str, payload: Dict[str, Any], retry_count: int = 0
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        retry_count: int = 0,
+        timeout: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Make HTTP request to Grok API with retry logic.
@@ -142,6 +458,7 @@ class GrokAPIClient:
             endpoint: API endpoint
             payload: Request payload
             retry_count: Current retry count
+            timeout: Timeout in seconds (defaults to the client's)
 
         Returns:
             API response dictionary
@@ -150,20 +467,38 @@ class GrokAPIClient:
             GrokAPIError: For API-related errors
         """
         url = f"{self.base_url}/{endpoint}"
+        model = payload.get("model", "default")
+        reserved_tokens = self._estimate_request_tokens(payload)
 
         try:
+            await self.rate_limiter.acquire(model, reserved_tokens)
+
             logger.debug(f"Making request to {url} with payload: {json.dumps(payload, indent=2)}")
 
             response = await self.client.post(
-                url, json=payload, headers={"Content-Type": "application/json"}
+                url, json=payload, headers=self.headers, timeout=timeout or self.timeout
             )
+            await self.rate_limiter.update_from_headers(model, response.headers)
 
             # Handle different response codes
             if response.status_code == 200:
-                return response.json()
+                data = response.json()
+                total_tokens = data.get("usage", {}).get("total_tokens")
+                if total_tokens is not None:
+                    await self.rate_limiter.settle(model, reserved_tokens, total_tokens)
+                return data
             elif response.status_code == 401:
                 raise GrokAuthenticationError(f"Authentication failed: {response.text}")
             elif response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                delay = await self.rate_limiter.on_rate_limited(model, retry_after)
+                if retry_count < self.max_retries:
+                    logger.warning(
+                        f"Rate limited, retrying in {delay:.1f}s "
+                        f"({retry_count + 1}/{self.max_retries})"
+                    )
+                    # The limiter holds this model back until Retry-After has passed
+                    return await self._make_request(endpoint, payload, retry_count + 1, timeout)
                 raise GrokRateLimitError(f"Rate limit exceeded: {response.text}")
             elif response.status_code == 400:
                 raise GrokAPIError(f"Bad request: {response.text}")
@@ -176,7 +511,7 @@ class GrokAPIClient:
             if retry_count < self.max_retries:
                 logger.warning(f"Request timeout, retrying ({retry_count + 1}/{self.max_retries})")
                 await asyncio.sleep(2**retry_count)  # Exponential backoff
-                return await self._make_request(endpoint, payload, retry_count + 1)
+                return await self._make_request(endpoint, payload, retry_count + 1, timeout)
             else:
                 raise GrokAPIError(f"Request timeout after {self.max_retries} retries: {e}")
 
@@ -184,10 +519,13 @@ class GrokAPIClient:
             if retry_count < self.max_retries:
                 logger.warning(f"Connection error, retrying ({retry_count + 1}/{self.max_retries})")
                 await asyncio.sleep(2**retry_count)
-                return await self._make_request(endpoint, payload, retry_count + 1)
+                return await self._make_request(endpoint, payload, retry_count + 1, timeout)
             else:
                 raise GrokAPIError(f"Connection error after {self.max_retries} retries: {e}")
 
+        except GrokAPIError:
+            raise
+
         except Exception as e:
             logger.error(f"Unexpected error in Grok API request: {e}")
             raise GrokAPIError(f"Unexpected error: {e}")
@@ -301,11 +639,33 @@ class GrokAPIClient:
 
         return breakdown
 
+    def get_client_stats(self) -> Dict[str, Any]:
+        """
+        Client-side request statistics (coalescing, hedging, rate limiting, connection pool).
+
+        Returns:
+            Dict of stats sections
+        """
+        stats: Dict[str, Any] = {
+            "connection_pool": get_http_registry().get_host_metrics(self.base_url)
+        }
+        if self.hedger is not None:
+            stats["hedging"] = self.hedger.stats.to_dict()
+        stats["rate_limiter"] = self.rate_limiter.get_stats()
+        stats["coalescing"] = _chat_flights.stats.to_dict()
+        return stats
+
+    def _estimate_request_tokens(self, payload: Dict[str, Any]) -> int:
+        """Tokens to reserve against the tokens/min budget for one request."""
+        prompt_tokens = self.token_counter.count_messages(payload.get("messages", []))
+        completion_tokens = payload.get("max_tokens") or DEFAULT_COMPLETION_TOKEN_RESERVATION
+        return prompt_tokens + completion_tokens
+
     def estimate_tokens(self, text: str) -> int:
         """
         Estimate token count for text.
 
-        Rough approximation: ~4 characters per token for English text.
+        Uses the shared memoising tokenizer (see ``utils.token_counter``).
 
         Args:
             text: Input text
@@ -313,7 +673,7 @@ class GrokAPIClient:
         Returns:
             Estimated token count
         """
-        return len(text) // 4
+        return self.token_counter.count(text)
 
     async def health_check(self) -> bool:
         """
@@ -381,6 +741,37 @@ class GrokAPIClient:
         else:
             raise GrokAPIError(f"File upload failed: {response.status_code} - {response.text}")
 
+    async def upload_bytes(
+        self,
+        content: bytes,
+        filename: str,
+        purpose: str = "assistants",
+        content_type: str = "application/json",
+    ) -> Dict[str, Any]:
+        """
+        Upload an in-memory document to xAI (no temporary file needed).
+
+        Args:
+            content: File content
+            filename: Name reported to the API
+            purpose: Purpose of file ("assistants" for Collections)
+            content_type: MIME type of the content
+
+        Returns:
+            File metadata including file_id
+        """
+        response = await self.client.post(
+            f"{self.base_url}/files",
+            files={"file": (filename, content, content_type)},
+            data={"purpose": purpose},
+            headers={"Authorization": f"Bearer {self.api_key}"},  # Don't set Content-Type
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise GrokAPIError(f"File upload failed: {response.status_code} - {response.text}")
+
     async def list_files(self) -> Dict[str, Any]:
         """
         List all uploaded files.
@@ -389,7 +780,7 @@ class GrokAPIClient:
             List of file objects
         """
         url = f"{self.base_url}/files"
-        response = await self.client.get(url)
+        response = await self.client.get(url, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -407,7 +798,7 @@ class GrokAPIClient:
             File metadata
         """
         url = f"{self.base_url}/files/{file_id}"
-        response = await self.client.get(url)
+        response = await self.client.get(url, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -425,7 +816,7 @@ class GrokAPIClient:
             Deletion confirmation
         """
         url = f"{self.base_url}/files/{file_id}"
-        response = await self.client.delete(url)
+        response = await self.client.delete(url, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -453,7 +844,7 @@ class GrokAPIClient:
         url = f"{self.base_url}/collections"
         payload = {"name": name, "description": description, "model": model}
 
-        response = await self.client.post(url, json=payload)
+        response = await self.client.post(url, json=payload, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -478,7 +869,7 @@ class GrokAPIClient:
         url = f"{self.base_url}/collections/{collection_id}/files"
         payload = {"file_ids": file_ids}
 
-        response = await self.client.post(url, json=payload)
+        response = await self.client.post(url, json=payload, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -504,7 +895,7 @@ class GrokAPIClient:
         url = f"{self.base_url}/collections/{collection_id}/search"
         payload = {"query": query, "top_k": top_k}
 
-        response = await self.client.post(url, json=payload)
+        response = await self.client.post(url, json=payload, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -521,7 +912,7 @@ class GrokAPIClient:
             List of collection objects
         """
         url = f"{self.base_url}/collections"
-        response = await self.client.get(url)
+        response = await self.client.get(url, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -539,7 +930,7 @@ class GrokAPIClient:
             Deletion confirmation
         """
         url = f"{self.base_url}/collections/{collection_id}"
-        response = await self.client.delete(url)
+        response = await self.client.delete(url, headers=self.headers)
 
         if response.status_code == 200:
             return response.json()
@@ -559,13 +950,19 @@ class GrokAPIClient:
         Args:
             response: API response
 
+        Responses shared with a concurrent identical request (see
+        ``enable_coalescing``) report zero tokens so the cost is counted once.
+
         Returns:
-            Dict with input_tokens, output_tokens, cached_tokens
-        """
-        usage = response.get("usage", {})
-        return {
-            "input_tokens": usage.get("prompt_tokens", 0),
-            "output_tokens": usage.get("completion_tokens", 0),
-            "cached_tokens": usage.get("cached_tokens", 0),  # May 2025 feature
-            "total_tokens": usage.get("total_tokens", 0),
-        }
+            Dict with input_tokens (non-cached), output_tokens, cached_tokens,
+            total_tokens, coalesced
+        """
+        if response.get("coalesced"):
+            return {
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cached_tokens": 0,
+                "total_tokens": 0,
+                "coalesced": 1,
+            }
+        return {**normalize_usage(response.get("usage", {})), "coalesced": 0}
@@ -0,0 +1,200 @@
+"""
+Request hedging for Grok API calls.
+
+A handful of slow completions dominate chunk-extraction latency. When a call
+has not returned by the observed p90 latency for its model and prompt size,
+``RequestHedger`` fires one duplicate request, takes whichever finishes
+first and cancels the loser. A per-minute hedge budget caps the extra spend,
+and win-rate statistics show whether hedging is paying off.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def prompt_size_bucket(prompt_tokens: int) -> int:
+    """Power-of-two bucket for prompt sizes (1K, 2K, 4K, ... tokens)."""
+    return max(10, int(math.log2(max(1, prompt_tokens))))
+
+
+class LatencyTracker:
+    """Rolling latency samples per (model, prompt-size bucket)."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20, quantile: float = 0.9):
+        self.window = window
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self._samples: Dict[Tuple[str, int], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, prompt_tokens: int, seconds: float) -> None:
+        key = (model, prompt_size_bucket(prompt_tokens))
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def threshold(self, model: str, prompt_tokens: int) -> Optional[float]:
+        """Observed quantile latency, or None until enough samples exist."""
+        key = (model, prompt_size_bucket(prompt_tokens))
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(math.ceil(self.quantile * len(ordered))) - 1)
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Sliding one-minute budget of hedge requests."""
+
+    def __init__(self, per_minute: int = 10):
+        self.per_minute = per_minute
+        self._issued: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            while self._issued and now - self._issued[0] > 60.0:
+                self._issued.popleft()
+            if len(self._issued) >= self.per_minute:
+                return False
+            self._issued.append(now)
+            return True
+
+
+@dataclass
+class HedgeStats:
+    """Hedging counters."""
+
+    requests: int = 0
+    hedges_issued: int = 0
+    hedge_wins: int = 0
+    primary_wins: int = 0
+    budget_denied: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of hedges where the duplicate finished first."""
+        return self.hedge_wins / self.hedges_issued if self.hedges_issued else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedges_issued": self.hedges_issued,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "budget_denied": self.budget_denied,
+            "hedge_rate": round(self.hedges_issued / self.requests, 3) if self.requests else 0.0,
+            "win_rate": round(self.win_rate, 3),
+        }
+
+
+class RequestHedger:
+    """Issue a duplicate request once a call exceeds the observed p90 latency."""
+
+    def __init__(
+        self,
+        budget_per_minute: int = 10,
+        min_samples: int = 20,
+        quantile: float = 0.9,
+    ):
+        self.tracker = LatencyTracker(min_samples=min_samples, quantile=quantile)
+        self.budget = HedgeBudget(per_minute=budget_per_minute)
+        self.stats = HedgeStats()
+
+    async def run(self, model: str, prompt_tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call``, hedging it with a duplicate if it is slower than p90.
+
+        Args:
+            model: Model name (latency is tracked per model)
+            prompt_tokens: Prompt size (latency is tracked per size bucket)
+            call: Zero-argument coroutine factory issuing the request
+
+        Returns:
+            Result of whichever request finished first
+        """
+        self.stats.requests += 1
+        delay = self.tracker.threshold(model, prompt_tokens)
+
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(call())
+        tasks = [primary]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    if self.budget.try_acquire():
+                        self.stats.hedges_issued += 1
+                        logger.debug(f"Hedging {model} request after {delay:.1f}s (p90)")
+                        hedge_started = time.perf_counter()
+                        tasks.append(asyncio.ensure_future(call()))
+                        return await self._first_success(
+                            model, prompt_tokens, tasks, started, hedge_started
+                        )
+                    self.stats.budget_denied += 1
+
+            result = await primary
+            self.tracker.record(model, prompt_tokens, time.perf_counter() - started)
+            return result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _first_success(
+        self,
+        model: str,
+        prompt_tokens: int,
+        tasks: list,
+        started: float,
+        hedge_started: float,
+    ) -> Any:
+        primary, hedge = tasks
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    first_error = first_error or task.exception()
+                    continue
+                if task is hedge:
+                    self.stats.hedge_wins += 1
+                    latency = time.perf_counter() - hedge_started
+                else:
+                    self.stats.primary_wins += 1
+                    latency = time.perf_counter() - started
+                self.tracker.record(model, prompt_tokens, latency)
+                return task.result()
+        raise first_error
+
+
+# Global hedger instance (latency history and budget are per process)
+_global_hedger: Optional[RequestHedger] = None
+
+
+def get_request_hedger(budget_per_minute: int = 10) -> RequestHedger:
+    """
+    Get the process-wide request hedger.
+
+    Args:
+        budget_per_minute: Hedge budget used when the hedger is first created
+
+    Returns:
+        Global RequestHedger instance
+    """
+    global _global_hedger
+    if _global_hedger is None:
+        _global_hedger = RequestHedger(budget_per_minute=budget_per_minute)
+    return _global_hedger
@@ -0,0 +1,387 @@
+"""
+Client-side rate limiting for Grok API calls.
+
+Chunk extraction, fact checking and speaker identification all call Grok
+concurrently. Without client-side pacing the account quota is discovered by
+hitting 429s. ``GrokRateLimiter`` keeps a requests/min and a tokens/min token
+bucket per model, shared by every coroutine in the process, and recalibrates
+them from the ``x-ratelimit-*`` response headers and ``Retry-After``.
+
+Multiple workers sharing one account can set ``GROK_RATE_LIMIT_REDIS_URL`` so
+the buckets live in Redis (requires the optional ``redis`` package).
+
+Environment variables:
+- GROK_RATE_LIMIT_RPM: initial requests/min budget per model (default 480)
+- GROK_RATE_LIMIT_TPM: initial tokens/min budget per model (default 2,000,000)
+- GROK_RATE_LIMIT_REDIS_URL: share buckets across processes via Redis
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Import redis conditionally (optional dependency, see the "api" extra)
+try:
+    import redis.asyncio as aioredis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_MINUTE = 480
+DEFAULT_TOKENS_PER_MINUTE = 2_000_000
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a rate-limit reset value ("1s", "6m0s", "20ms", "0.5") into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RateLimitHeaders:
+    """Quota information reported by the server on one response."""
+
+    limit_requests: Optional[int] = None
+    remaining_requests: Optional[int] = None
+    reset_requests: Optional[float] = None
+    limit_tokens: Optional[int] = None
+    remaining_tokens: Optional[int] = None
+    reset_tokens: Optional[float] = None
+    retry_after: Optional[float] = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "RateLimitHeaders":
+        lowered = {k.lower(): v for k, v in headers.items()}
+
+        def as_int(name: str) -> Optional[int]:
+            try:
+                return int(float(lowered[name]))
+            except (KeyError, ValueError):
+                return None
+
+        return cls(
+            limit_requests=as_int("x-ratelimit-limit-requests"),
+            remaining_requests=as_int("x-ratelimit-remaining-requests"),
+            reset_requests=parse_reset_duration(lowered.get("x-ratelimit-reset-requests")),
+            limit_tokens=as_int("x-ratelimit-limit-tokens"),
+            remaining_tokens=as_int("x-ratelimit-remaining-tokens"),
+            reset_tokens=parse_reset_duration(lowered.get("x-ratelimit-reset-tokens")),
+            retry_after=parse_retry_after(lowered.get("retry-after")),
+        )
+
+
+class TokenBucket:
+    """Per-minute token bucket that lets callers reserve capacity ahead of time.
+
+    Reservations are deducted immediately and may drive the balance negative;
+    the caller then waits until the refill covers the debt. This keeps waiting
+    coroutines in FIFO order without a polling loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """Reserve ``amount`` and return seconds to wait before using it."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def recalibrate(
+        self, limit: Optional[int], remaining: Optional[int], reset: Optional[float]
+    ) -> None:
+        """Adopt the server's view of the quota."""
+        self._refill(time.monotonic())
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            # Never believe we have more than the server says; if the server
+            # says the window resets soon, the refill rate already covers it.
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining == 0 and reset:
+                self.tokens = min(self.tokens, -reset * self.rate)
+
+
+@dataclass
+class RateLimitStats:
+    """Rate limiter counters."""
+
+    acquired: int = 0
+    throttled: int = 0
+    wait_seconds: float = 0.0
+    rate_limited_responses: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "rate_limited_responses": self.rate_limited_responses,
+        }
+
+
+class GrokRateLimiter:
+    """Shared requests/min + tokens/min limiter, one pair of buckets per model."""
+
+    def __init__(
+        self,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        model_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Initial request budget per model
+            tokens_per_minute: Initial token budget per model
+            model_limits: Optional {model: (rpm, tpm)} overrides
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.model_limits = model_limits or {}
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self.stats = RateLimitStats()
+
+    def _limits_for(self, model: str) -> Tuple[int, int]:
+        return self.model_limits.get(model, (self.requests_per_minute, self.tokens_per_minute))
+
+    def _buckets_for(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        if model not in self._buckets:
+            rpm, tpm = self._limits_for(model)
+            self._buckets[model] = (TokenBucket(rpm), TokenBucket(tpm))
+        return self._buckets[model]
+
+    async def acquire(self, model: str, tokens: int) -> float:
+        """
+        Wait until ``model`` has budget for one request of ``tokens`` tokens.
+
+        Args:
+            model: Model name (budgets are per model)
+            tokens: Estimated prompt + completion tokens
+
+        Returns:
+            Seconds spent waiting
+        """
+        requests, token_bucket = self._buckets_for(model)
+        wait = max(requests.reserve(1), token_bucket.reserve(tokens))
+        wait = max(wait, self._blocked_until.get(model, 0.0) - time.monotonic())
+        self.stats.acquired += 1
+        if wait > 0:
+            self.stats.throttled += 1
+            self.stats.wait_seconds += wait
+            logger.debug(f"Rate limiter: waiting {wait:.2f}s for {model}")
+            await asyncio.sleep(wait)
+        return max(wait, 0.0)
+
+    async def settle(self, model: str, reserved_tokens: int, actual_tokens: int) -> None:
+        """Return over-reserved tokens once the real usage is known."""
+        _, token_bucket = self._buckets_for(model)
+        if actual_tokens < reserved_tokens:
+            token_bucket.refund(reserved_tokens - actual_tokens)
+
+    async def update_from_headers(self, model: str, headers: Mapping[str, str]) -> None:
+        """Recalibrate the model's buckets from response headers."""
+        info = RateLimitHeaders.from_headers(headers)
+        requests, token_bucket = self._buckets_for(model)
+        requests.recalibrate(info.limit_requests, info.remaining_requests, info.reset_requests)
+        token_bucket.recalibrate(info.limit_tokens, info.remaining_tokens, info.reset_tokens)
+
+    async def on_rate_limited(self, model: str, retry_after: Optional[float]) -> float:
+        """
+        Record a 429 and pause the model for ``retry_after`` seconds.
+
+        Returns:
+            Seconds callers will be held back
+        """
+        self.stats.rate_limited_responses += 1
+        delay = retry_after if retry_after is not None else 1.0
+        until = time.monotonic() + delay
+        self._blocked_until[model] = max(self._blocked_until.get(model, 0.0), until)
+        return delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats["models"] = {
+            model: {"rpm": requests.capacity, "tpm": tokens.capacity}
+            for model, (requests, tokens) in self._buckets.items()
+        }
+        return stats
+
+
+# Token bucket with debt, evaluated atomically in Redis.
+# KEYS[1] bucket hash; ARGV: capacity, amount, now (s). Returns wait in ms.
+_REDIS_RESERVE_SCRIPT = """
+local capacity = tonumber(redis.call('HGET', KEYS[1], 'capacity') or ARGV[1])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens') or capacity)
+local updated = tonumber(redis.call('HGET', KEYS[1], 'updated') or ARGV[3])
+local now = tonumber(ARGV[3])
+local rate = capacity / 60.0
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+tokens = tokens - math.min(tonumber(ARGV[2]), capacity)
+redis.call('HSET', KEYS[1], 'capacity', capacity, 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], 300)
+if tokens >= 0 then return 0 end
+return math.ceil(-tokens / rate * 1000)
+"""
+
+# KEYS[1] bucket hash; ARGV: limit (or ''), remaining (or ''), refund (or '0').
+_REDIS_ADJUST_SCRIPT = """
+if ARGV[1] ~= '' then redis.call('HSET', KEYS[1], 'capacity', ARGV[1]) end
+local capacity = tonumber(redis.call('HGET', KEYS[1], 'capacity'))
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if not capacity or not tokens then return 0 end
+tokens = math.min(capacity, tokens + tonumber(ARGV[3]))
+if ARGV[2] ~= '' then tokens = math.min(tokens, tonumber(ARGV[2])) end
+redis.call('HSET', KEYS[1], 'tokens', tokens)
+return 0
+"""
+
+
+class RedisGrokRateLimiter(GrokRateLimiter):
+    """``GrokRateLimiter`` whose buckets live in Redis, shared by all workers."""
+
+    def __init__(self, redis_url: str, key_prefix: str = "cs:grok_rl", **kwargs):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package required for GROK_RATE_LIMIT_REDIS_URL")
+        super().__init__(**kwargs)
+        self.redis = aioredis.from_url(redis_url)
+        self.key_prefix = key_prefix
+        self._reserve = self.redis.register_script(_REDIS_RESERVE_SCRIPT)
+        self._adjust = self.redis.register_script(_REDIS_ADJUST_SCRIPT)
+
+    def _key(self, model: str, kind: str) -> str:
+        return f"{self.key_prefix}:{model}:{kind}"
+
+    async def acquire(self, model: str, tokens: int) -> float:
+        rpm, tpm = self._limits_for(model)
+        now = time.time()
+        waits = []
+        for kind, capacity, amount in (("requests", rpm, 1), ("tokens", tpm, tokens)):
+            wait_ms = await self._reserve(
+                keys=[self._key(model, kind)], args=[capacity, amount, now]
+            )
+            waits.append(int(wait_ms) / 1000.0)
+        blocked_until = await self.redis.get(self._key(model, "blocked_until"))
+        if blocked_until:
+            waits.append(float(blocked_until) - now)
+
+        wait = max(waits)
+        self.stats.acquired += 1
+        if wait > 0:
+            self.stats.throttled += 1
+            self.stats.wait_seconds += wait
+            await asyncio.sleep(wait)
+        return max(wait, 0.0)
+
+    async def settle(self, model: str, reserved_tokens: int, actual_tokens: int) -> None:
+        if actual_tokens < reserved_tokens:
+            await self._adjust(
+                keys=[self._key(model, "tokens")], args=["", "", reserved_tokens - actual_tokens]
+            )
+
+    async def update_from_headers(self, model: str, headers: Mapping[str, str]) -> None:
+        info = RateLimitHeaders.from_headers(headers)
+        for kind, limit, remaining in (
+            ("requests", info.limit_requests, info.remaining_requests),
+            ("tokens", info.limit_tokens, info.remaining_tokens),
+        ):
+            if limit is None and remaining is None:
+                continue
+            await self._adjust(
+                keys=[self._key(model, kind)],
+                args=["" if limit is None else limit, "" if remaining is None else remaining, 0],
+            )
+
+    async def on_rate_limited(self, model: str, retry_after: Optional[float]) -> float:
+        self.stats.rate_limited_responses += 1
+        delay = retry_after if retry_after is not None else 1.0
+        key = self._key(model, "blocked_until")
+        await self.redis.set(key, time.time() + delay, ex=max(1, int(delay) + 1))
+        return delay
+
+
+# Global limiter instance (shared by every GrokAPIClient in the process)
+_global_limiter: Optional[GrokRateLimiter] = None
+
+
+def get_grok_rate_limiter() -> GrokRateLimiter:
+    """
+    Get the process-wide Grok rate limiter.
+
+    Uses Redis-backed buckets when GROK_RATE_LIMIT_REDIS_URL is set and the
+    redis package is installed, otherwise in-process buckets.
+
+    Returns:
+        Global GrokRateLimiter instance
+    """
+    global _global_limiter
+    if _global_limiter is None:
+        limits = {
+            "requests_per_minute": int(
+                os.getenv("GROK_RATE_LIMIT_RPM", str(DEFAULT_REQUESTS_PER_MINUTE))
+            ),
+            "tokens_per_minute": int(
+                os.getenv("GROK_RATE_LIMIT_TPM", str(DEFAULT_TOKENS_PER_MINUTE))
+            ),
+        }
+        redis_url = os.getenv("GROK_RATE_LIMIT_REDIS_URL", "")
+        if redis_url and REDIS_AVAILABLE:
+            _global_limiter = RedisGrokRateLimiter(redis_url, **limits)
+            logger.info("Grok rate limiter: sharing quota via Redis")
+        else:
+            if redis_url:
+                logger.warning("GROK_RATE_LIMIT_REDIS_URL set but redis is not installed")
+            _global_limiter = GrokRateLimiter(**limits)
+    return _global_limiter
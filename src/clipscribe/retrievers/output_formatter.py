@@ -10,6 +10,7 @@ from ..config.settings import Settings
 from ..models import VideoIntelligence
 from ..utils.file_utils import calculate_sha256
 from ..utils.filename import create_output_filename, create_output_structure
+from .graph_writers import write_gexf, write_graph_file, write_graphml, write_json
 
 logger = logging.getLogger(__name__)
 
@@ -301,8 +302,7 @@ class OutputFormatter:
 
         # Knowledge Graph JSON
         graph_path = paths["directory"] / "knowledge_graph.json"
-        with open(graph_path, "w", encoding="utf-8") as f:
-            json.dump(video.knowledge_graph, f, indent=2)
+        write_graph_file(graph_path, write_json, video.knowledge_graph)
         paths["knowledge_graph"] = graph_path
 
         settings = Settings()
@@ -310,28 +310,16 @@ class OutputFormatter:
         if settings.export_graph_formats:
             # Knowledge Graph GEXF (for Gephi visualization)
             try:
-                from ..retrievers.knowledge_graph_builder import KnowledgeGraphBuilder
-
-                kg_builder = KnowledgeGraphBuilder()
-                gexf_content = kg_builder.generate_gexf_content(video.knowledge_graph)
-
                 gexf_path = paths["directory"] / "knowledge_graph.gexf"
-                with open(gexf_path, "w", encoding="utf-8") as f:
-                    f.write(gexf_content)
+                write_graph_file(gexf_path, write_gexf, video.knowledge_graph)
                 paths["knowledge_graph_gexf"] = gexf_path
             except Exception as e:
                 logger.warning(f"Could not generate GEXF file: {e}")
 
             # Knowledge Graph GraphML (for yEd, Cytoscape, etc.)
             try:
-                from ..retrievers.knowledge_graph_builder import KnowledgeGraphBuilder
-
-                kg_builder = KnowledgeGraphBuilder()
-                graphml_content = kg_builder.generate_graphml_content(video.knowledge_graph)
-
                 graphml_path = paths["directory"] / "knowledge_graph.graphml"
-                with open(graphml_path, "w", encoding="utf-8") as f:
-                    f.write(graphml_content)
+                write_graph_file(graphml_path, write_graphml, video.knowledge_graph)
                 paths["knowledge_graph_graphml"] = graphml_path
             except Exception as e:
                 logger.warning(f"Could not generate GraphML file: {e}")
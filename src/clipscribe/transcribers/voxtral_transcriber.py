@@ -15,6 +15,8 @@ from typing import Any, Dict, List, Optional
 import aiohttp
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from ..utils.http_pool import get_http_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -129,33 +131,35 @@ class VoxtralTranscriber:
             f"Transcribing {duration:.1f} seconds ({duration/60:.1f} min) with Voxtral {self.model}"
         )
 
-        async with aiohttp.ClientSession() as session:
-            # Option 1: Upload file first, then get signed URL
-            file_id = await self._upload_file(session, audio_path)
-
-            try:
-                # Get signed URL for the uploaded file
-                signed_url = await self._get_signed_url(session, file_id)
-
-                # Transcribe using the signed URL
-                result = await self._transcribe_with_url(session, signed_url, language, prompt)
-
-                # Calculate cost
-                cost = (duration / 60) * self.COST_PER_MINUTE
-
-                return VoxtralTranscriptionResult(
-                    text=result["text"],
-                    language=result.get("language", language or "en"),
-                    duration=duration,
-                    cost=cost,
-                    model=self.model,
-                    confidence=result.get("confidence"),
-                    segments=result.get("segments"),
-                )
-
-            finally:
-                # Clean up uploaded file
-                await self._delete_file(session, file_id)
+        # Shared keep-alive session: no per-file TCP/TLS setup
+        session = get_http_registry().get_aiohttp_session(self.BASE_URL)
+
+        # Option 1: Upload file first, then get signed URL
+        file_id = await self._upload_file(session, audio_path)
+
+        try:
+            # Get signed URL for the uploaded file
+            signed_url = await self._get_signed_url(session, file_id)
+
+            # Transcribe using the signed URL
+            result = await self._transcribe_with_url(session, signed_url, language, prompt)
+
+            # Calculate cost
+            cost = (duration / 60) * self.COST_PER_MINUTE
+
+            return VoxtralTranscriptionResult(
+                text=result["text"],
+                language=result.get("language", language or "en"),
+                duration=duration,
+                cost=cost,
+                model=self.model,
+                confidence=result.get("confidence"),
+                segments=result.get("segments"),
+            )
+
+        finally:
+            # Clean up uploaded file
+            await self._delete_file(session, file_id)
 
     @retry(
         stop=stop_after_attempt(3),
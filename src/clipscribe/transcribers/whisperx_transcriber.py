@@ -205,8 +205,15 @@ class WhisperXTranscriber:
         if self.diarize_model:
             logger.info("Step 3/4: Identifying speakers...")
             try:
-                # Run pyannote diarization
-                diarization = self.diarize_model(audio_path)
+                # Run pyannote diarization; per-speaker embedding centroids feed the
+                # cross-video voice-print registry used by SpeakerIdentifier
+                speaker_embeddings = {}
+                try:
+                    diarization, centroids = self.diarize_model(audio_path, return_embeddings=True)
+                    for label, centroid in zip(diarization.labels(), centroids):
+                        speaker_embeddings[label] = [float(x) for x in centroid]
+                except TypeError:  # pyannote < 3.1 has no return_embeddings
+                    diarization = self.diarize_model(audio_path)
 
                 # Convert pyannote format to dict format whisperx expects
                 diarize_dict = {}
@@ -259,13 +266,14 @@ class WhisperXTranscriber:
                         seg for seg in result["segments"] if seg.get("speaker") == speaker
                     ]
                     total_time = sum(seg["end"] - seg["start"] for seg in speaker_segs)
-                    speaker_segments.append(
-                        {
-                            "speaker": speaker,
-                            "segments": len(speaker_segs),
-                            "total_time": round(total_time, 2),
-                        }
-                    )
+                    speaker_summary = {
+                        "speaker": speaker,
+                        "segments": len(speaker_segs),
+                        "total_time": round(total_time, 2),
+                    }
+                    if speaker in speaker_embeddings:
+                        speaker_summary["embedding"] = speaker_embeddings[speaker]
+                    speaker_segments.append(speaker_summary)
 
                 logger.info(f"Identified {len(speakers_found)} speakers")
 
@@ -11,7 +11,7 @@ try:
 except ImportError:
     BatchProgress = None  # type: ignore
 
-from .file_utils import calculate_sha256
+from .file_utils import calculate_sha256, get_media_duration
 
 # Lazy-load PerformanceDashboard (requires streamlit - dev dependency)
 # from .performance_dashboard import PerformanceDashboard
@@ -34,7 +34,9 @@ except ImportError:
     console = None  # type: ignore
     progress_tracker = None  # type: ignore
 
+from .http_pool import HTTPClientRegistry, get_http_registry
 from .prompt_cache import GrokPromptCache, get_prompt_cache
+from .single_flight import SingleFlight
 
 # from .web_research import WebResearchIntegrator  # Removed - uses Gemini
 
@@ -53,7 +55,11 @@ __all__ = [
     "create_structured_filename",
     "create_output_structure",
     "calculate_sha256",
+    "get_media_duration",
     "GrokPromptCache",
     "get_prompt_cache",
+    "HTTPClientRegistry",
+    "get_http_registry",
+    "SingleFlight",
     # "WebResearchIntegrator",  # Removed - uses Gemini
 ]
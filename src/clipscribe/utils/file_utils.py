@@ -3,6 +3,8 @@ File system utilities for ClipScribe.
 """
 
 import hashlib
+import subprocess
+from typing import Optional
 
 
 def calculate_sha256(file_path: str) -> str:
@@ -24,3 +26,35 @@ def calculate_sha256(file_path: str) -> str:
         return sha256.hexdigest()
     except IOError:
         return ""
+
+
+def get_media_duration(file_path: str, default: Optional[float] = None) -> Optional[float]:
+    """
+    Probe the duration of an audio/video file with ffprobe.
+
+    Args:
+        file_path: The path to the media file.
+        default: Value returned when the duration cannot be determined.
+
+    Returns:
+        The duration in seconds, or ``default`` if ffprobe fails.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(file_path),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        return float(result.stdout.strip())
+    except Exception:
+        return default
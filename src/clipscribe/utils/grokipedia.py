@@ -88,9 +88,9 @@ def update_entity_grokipedia_links(db_path: Path):
     # Get entities to check (no link yet, or link older than 7 days)
     cursor.execute(
         """
-        SELECT id, name, type
+        SELECT id, name, entity_type
         FROM entities
-        WHERE type IN ('PERSON', 'ORG', 'GPE', 'NORP', 'EVENT', 'WORK_OF_ART')
+        WHERE entity_type IN ('PERSON', 'ORG', 'GPE', 'NORP', 'EVENT', 'WORK_OF_ART')
         AND (
             grokipedia_url IS NULL
             OR grokipedia_verified_at IS NULL
@@ -156,4 +156,4 @@ if __name__ == "__main__":
     if db_path.exists():
         update_entity_grokipedia_links(db_path)
     else:
-        print("Database not found. Run load_validated_entities.py first.")
+        print("Database not found. Run `clipscribe db load` first.")
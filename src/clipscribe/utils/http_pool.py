@@ -0,0 +1,353 @@
+"""
+Process-wide pooled HTTP clients.
+
+Every outbound API caller (Grok, Mistral/Voxtral, Modal helpers, exporters)
+used to build its own client per call or per file, paying DNS + TCP + TLS
+setup on the hot path. ``HTTPClientRegistry`` hands out one keep-alive
+client per host (per event loop for async clients) with HTTP/2 when the
+``h2`` package is installed, and records pool metrics: requests, new vs
+reused connections, and connect/TLS handshake time.
+
+Limits are configurable via environment variables:
+- CLIPSCRIBE_HTTP_MAX_CONNECTIONS (default 100)
+- CLIPSCRIBE_HTTP_MAX_KEEPALIVE (default 20)
+- CLIPSCRIBE_HTTP_KEEPALIVE_EXPIRY seconds (default 30)
+- CLIPSCRIBE_HTTP2 (default 1; set 0 to force HTTP/1.1)
+
+Clients are shared: callers pass auth headers and timeouts per request and
+must not close them.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolLimits:
+    """Connection pool limits shared by all registry clients."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolLimits":
+        return cls(
+            max_connections=int(os.getenv("CLIPSCRIBE_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("CLIPSCRIBE_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("CLIPSCRIBE_HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("CLIPSCRIBE_HTTP2", "1").lower() not in ("0", "false", "no"),
+        )
+
+
+@dataclass
+class PoolMetrics:
+    """Connection pool metrics for a single host."""
+
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    connect_seconds: float = 0.0  # DNS + TCP connect
+    tls_seconds: float = 0.0
+    http2_requests: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, new_connection: bool, connect: float, tls: float, http2: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if new_connection:
+                self.new_connections += 1
+                self.connect_seconds += connect
+                self.tls_seconds += tls
+            else:
+                self.reused_connections += 1
+            if http2:
+                self.http2_requests += 1
+
+    @property
+    def reuse_rate(self) -> float:
+        return self.reused_connections / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        handshakes = self.new_connections or 1
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_rate": round(self.reuse_rate, 3),
+            "avg_connect_ms": round(self.connect_seconds / handshakes * 1000, 2),
+            "avg_tls_ms": round(self.tls_seconds / handshakes * 1000, 2),
+            "http2_requests": self.http2_requests,
+        }
+
+
+class _RequestTrace:
+    """httpcore trace callback collecting connection events for one request."""
+
+    def __init__(self):
+        self.started: Dict[str, float] = {}
+        self.durations: Dict[str, float] = {}
+        self.http2 = False
+
+    def _handle(self, event_name: str) -> None:
+        if event_name.startswith("http2."):
+            self.http2 = True
+        for phase in ("connect_tcp", "start_tls"):
+            if event_name == f"connection.{phase}.started":
+                self.started[phase] = time.perf_counter()
+            elif event_name in (f"connection.{phase}.complete", f"connection.{phase}.failed"):
+                if phase in self.started:
+                    self.durations[phase] = time.perf_counter() - self.started[phase]
+
+
+class _AsyncRequestTrace(_RequestTrace):
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._handle(event_name)
+
+
+class _SyncRequestTrace(_RequestTrace):
+    def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._handle(event_name)
+
+
+def _host_key(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    if not parts.scheme or not parts.hostname:
+        raise ValueError(f"Expected an absolute URL, got: {base_url!r}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return f"{parts.scheme}://{parts.hostname}:{port}"
+
+
+class HTTPClientRegistry:
+    """Registry of shared keep-alive HTTP clients, one per host."""
+
+    def __init__(self, limits: Optional[PoolLimits] = None):
+        self.limits = limits or PoolLimits.from_env()
+        self.http2_available = importlib.util.find_spec("h2") is not None
+        self._async_clients: Dict[Tuple[str, int], Tuple[Any, Any]] = {}
+        self._sync_clients: Dict[str, Any] = {}
+        self._aiohttp_sessions: Dict[Tuple[str, int], Tuple[Any, Any]] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _metrics_for(self, host: str) -> PoolMetrics:
+        with self._lock:
+            if host not in self._metrics:
+                self._metrics[host] = PoolMetrics()
+            return self._metrics[host]
+
+    def _httpx_kwargs(self, timeout: float) -> Dict[str, Any]:
+        import httpx
+
+        return {
+            "timeout": timeout,
+            "limits": httpx.Limits(
+                max_connections=self.limits.max_connections,
+                max_keepalive_connections=self.limits.max_keepalive_connections,
+                keepalive_expiry=self.limits.keepalive_expiry,
+            ),
+            "http2": self.limits.http2 and self.http2_available,
+        }
+
+    def _prune_closed_loops(self, clients: Dict[Tuple[str, int], Tuple[Any, Any]]) -> None:
+        for key in [k for k, (loop, _) in clients.items() if loop.is_closed()]:
+            del clients[key]
+
+    def get_async_client(self, base_url: str, timeout: float = 60.0):
+        """Get the shared ``httpx.AsyncClient`` for a host on the running event loop.
+
+        Args:
+            base_url: Any URL on the target host
+            timeout: Default timeout (callers may override per request)
+
+        Returns:
+            Shared httpx.AsyncClient (do not close)
+        """
+        import httpx
+
+        host = _host_key(base_url)
+        loop = asyncio.get_running_loop()
+        key = (host, id(loop))
+        entry = self._async_clients.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        self._prune_closed_loops(self._async_clients)
+        metrics = self._metrics_for(host)
+
+        async def on_request(request: httpx.Request) -> None:
+            request.extensions["trace"] = _AsyncRequestTrace()
+
+        async def on_response(response: httpx.Response) -> None:
+            trace = response.request.extensions.get("trace")
+            if isinstance(trace, _RequestTrace):
+                metrics.record(
+                    new_connection="connect_tcp" in trace.started,
+                    connect=trace.durations.get("connect_tcp", 0.0),
+                    tls=trace.durations.get("start_tls", 0.0),
+                    http2=trace.http2 or response.http_version == "HTTP/2",
+                )
+
+        client = httpx.AsyncClient(
+            **self._httpx_kwargs(timeout),
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+        self._async_clients[key] = (loop, client)
+        logger.debug(f"Created pooled async HTTP client for {host}")
+        return client
+
+    def get_sync_client(self, base_url: str, timeout: float = 60.0):
+        """Get the shared (thread-safe) ``httpx.Client`` for a host.
+
+        Args:
+            base_url: Any URL on the target host
+            timeout: Default timeout (callers may override per request)
+
+        Returns:
+            Shared httpx.Client (do not close)
+        """
+        import httpx
+
+        host = _host_key(base_url)
+        with self._lock:
+            client = self._sync_clients.get(host)
+            if client is not None and not client.is_closed:
+                return client
+
+            metrics = self._metrics.setdefault(host, PoolMetrics())
+
+            def on_request(request: httpx.Request) -> None:
+                request.extensions["trace"] = _SyncRequestTrace()
+
+            def on_response(response: httpx.Response) -> None:
+                trace = response.request.extensions.get("trace")
+                if isinstance(trace, _RequestTrace):
+                    metrics.record(
+                        new_connection="connect_tcp" in trace.started,
+                        connect=trace.durations.get("connect_tcp", 0.0),
+                        tls=trace.durations.get("start_tls", 0.0),
+                        http2=trace.http2 or response.http_version == "HTTP/2",
+                    )
+
+            client = httpx.Client(
+                **self._httpx_kwargs(timeout),
+                event_hooks={"request": [on_request], "response": [on_response]},
+            )
+            self._sync_clients[host] = client
+            logger.debug(f"Created pooled sync HTTP client for {host}")
+            return client
+
+    def get_aiohttp_session(self, base_url: str):
+        """Get the shared ``aiohttp.ClientSession`` for a host on the running event loop.
+
+        Args:
+            base_url: Any URL on the target host
+
+        Returns:
+            Shared aiohttp.ClientSession (do not close)
+        """
+        import aiohttp
+
+        host = _host_key(base_url)
+        loop = asyncio.get_running_loop()
+        key = (host, id(loop))
+        entry = self._aiohttp_sessions.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            return entry[1]
+
+        self._prune_closed_loops(self._aiohttp_sessions)
+        metrics = self._metrics_for(host)
+
+        async def on_request_start(session, ctx, params):
+            ctx.new_connection = False
+            ctx.connect_seconds = 0.0
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.new_connection = True
+            ctx.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            ctx.connect_seconds = time.perf_counter() - ctx.connect_started
+
+        async def on_request_end(session, ctx, params):
+            # aiohttp reports TCP + TLS setup as a single connection phase
+            metrics.record(
+                new_connection=ctx.new_connection,
+                connect=ctx.connect_seconds,
+                tls=0.0,
+                http2=False,
+            )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_request_end.append(on_request_end)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limits.max_connections,
+            limit_per_host=self.limits.max_keepalive_connections,
+            keepalive_timeout=self.limits.keepalive_expiry,
+            ttl_dns_cache=300,
+        )
+        session = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+        self._aiohttp_sessions[key] = (loop, session)
+        logger.debug(f"Created pooled aiohttp session for {host}")
+        return session
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Pool metrics per host."""
+        with self._lock:
+            return {host: metrics.to_dict() for host, metrics in self._metrics.items()}
+
+    def get_host_metrics(self, base_url: str) -> Dict[str, Any]:
+        """Pool metrics for the host of ``base_url`` (empty if never used)."""
+        with self._lock:
+            metrics = self._metrics.get(_host_key(base_url))
+            return metrics.to_dict() if metrics else {}
+
+    async def aclose(self) -> None:
+        """Close all clients owned by the running event loop (e.g. on app shutdown)."""
+        loop = asyncio.get_running_loop()
+        for clients in (self._async_clients, self._aiohttp_sessions):
+            for key in [k for k, (owner, _) in clients.items() if owner is loop]:
+                _, client = clients.pop(key)
+                if hasattr(client, "aclose"):
+                    await client.aclose()
+                else:
+                    await client.close()
+        self.close()
+
+    def close(self) -> None:
+        """Close shared sync clients."""
+        with self._lock:
+            for client in self._sync_clients.values():
+                client.close()
+            self._sync_clients.clear()
+
+
+# Global registry instance
+_global_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_registry() -> HTTPClientRegistry:
+    """
+    Get the process-wide HTTP client registry.
+
+    Returns:
+        Global HTTPClientRegistry instance
+    """
+    global _global_registry
+    if _global_registry is None:
+        _global_registry = HTTPClientRegistry()
+    return _global_registry
@@ -0,0 +1,142 @@
+"""
+Incremental parsing of streamed (or truncated) JSON model output.
+
+Extraction responses look like ``{"entities": [{...}, ...], "relationships": [...]}``.
+``JSONArrayStreamParser`` is fed text as it arrives and emits every object
+inside a top-level array as soon as its closing brace is seen, so callers can
+use entities before the completion finishes. The same parser salvages every
+complete object from a response cut off at ``max_tokens``.
+
+Examples:
+    >>> parser = JSONArrayStreamParser()
+    >>> list(parser.feed('{"entities": [{"name": "A"}, {"na'))
+    [('entities', {'name': 'A'})]
+    >>> salvage_json('{"entities": [{"name": "A"}], "relationships": [{"subj')
+    {'entities': [{'name': 'A'}], 'relationships': []}
+    >>> salvage_json("I cannot help with that")
+    Traceback (most recent call last):
+    ...
+    json.decoder.JSONDecodeError: Expecting value: line 1 column 1 (char 0)
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayStreamParser:
+    """Emit objects from the top-level arrays of a JSON object as they complete."""
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._key_chars: List[str] = []
+        self._last_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._current: Optional[List[str]] = None  # characters of the open array item
+        self.objects: Dict[str, List[Dict[str, Any]]] = {}
+
+    def feed(self, chunk: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Feed the next piece of text.
+
+        Args:
+            chunk: Next piece of the streamed response
+
+        Yields:
+            (array key, object) for each object completed by this chunk
+        """
+        for char in chunk:
+            if self._current is not None:
+                self._current.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._last_key = "".join(self._key_chars)
+                elif self._stack == ["{"]:
+                    self._key_chars.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._key_chars = []
+            elif char in "{[":
+                if char == "[" and self._stack == ["{"]:
+                    self._array_key = self._last_key
+                    self.objects.setdefault(self._array_key or "", [])
+                elif char == "{" and self._stack == ["{", "["]:
+                    self._current = ["{"]
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._stack == ["{", "["] and self._current is not None:
+                    item = self._decode("".join(self._current))
+                    self._current = None
+                    if item is not None and self._array_key is not None:
+                        self.objects[self._array_key].append(item)
+                        yield self._array_key, item
+                elif char == "]" and self._stack == ["{"]:
+                    self._array_key = None
+
+    @staticmethod
+    def _decode(fragment: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(fragment)
+        except json.JSONDecodeError:
+            return None
+        return item if isinstance(item, dict) else None
+
+
+def salvage_json(
+    text: str, array_keys: Tuple[str, ...] = (), truncated: bool = False
+) -> Dict[str, Any]:
+    """
+    Parse model JSON output, recovering complete array items if it was truncated.
+
+    Salvage only applies when the reply was cut off (``truncated``) or at
+    least one complete array item was recovered; anything else is a bad
+    reply, and the decode error is raised so callers can retry.
+
+    Args:
+        text: Complete or truncated JSON object text
+        array_keys: Keys to always include (as empty lists) in a salvaged result
+        truncated: Whether the reply stopped at ``max_tokens`` (``finish_reason == "length"``)
+
+    Returns:
+        The parsed object, or a dict of the complete objects found per top-level array
+
+    Raises:
+        json.JSONDecodeError: If the text is not a JSON object and nothing can be salvaged
+    """
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError as e:
+        error = e
+    else:
+        if isinstance(parsed, dict):
+            return parsed
+        error = json.JSONDecodeError("Expected a JSON object", text, 0)
+
+    parser = JSONArrayStreamParser()
+    for _ in parser.feed(text):
+        pass
+    if not truncated and not any(items for key, items in parser.objects.items() if key):
+        raise error
+
+    salvaged: Dict[str, Any] = {key: [] for key in array_keys}
+    salvaged.update({key: items for key, items in parser.objects.items() if key})
+    logger.warning(
+        "Salvaged truncated JSON response: "
+        + ", ".join(f"{len(items)} {key}" for key, items in salvaged.items())
+    )
+    return salvaged
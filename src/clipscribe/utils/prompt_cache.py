@@ -4,6 +4,10 @@ Grok Prompt Caching Utility
 Manages prompt caching for cost optimization with xAI Grok API.
 Automatic caching introduced in May 2025 reduces input token costs by 50%
 for repeated prompt prefixes >1024 tokens.
+
+Cache performance is tracked overall and per call site (chunk extraction,
+provider extraction, speaker identification, fact checking) so prompt
+layout regressions show up as a falling cached-token ratio for one caller.
 """
 
 import logging
@@ -11,6 +15,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List
 
+from .token_counter import get_token_counter
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +28,7 @@ class CacheStats:
     misses: int = 0
     total_savings: float = 0.0
     cached_tokens: int = 0
+    prompt_tokens: int = 0  # Input tokens including cached ones
     total_tokens: int = 0
     last_updated: datetime = field(default_factory=datetime.now)
 
@@ -37,6 +44,41 @@ class CacheStats:
         total = self.hits + self.misses
         return (self.total_savings / total) if total > 0 else 0.0
 
+    @property
+    def cached_token_ratio(self) -> float:
+        """Fraction of input tokens served from the prompt cache."""
+        return (self.cached_tokens / self.prompt_tokens) if self.prompt_tokens > 0 else 0.0
+
+
+def normalize_usage(usage: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Normalize a Grok ``usage`` block into ClipScribe usage stats.
+
+    xAI reports cached tokens OpenAI-style under
+    ``prompt_tokens_details.cached_tokens`` (included in ``prompt_tokens``);
+    older responses used a top-level ``cached_tokens``.
+
+    Args:
+        usage: ``usage`` dict from a chat completion response
+
+    Returns:
+        Dict with input_tokens (non-cached), output_tokens, cached_tokens, total_tokens
+    """
+    details = usage.get("prompt_tokens_details") or {}
+    prompt_tokens = usage.get("prompt_tokens", 0)
+    if "cached_tokens" in details:
+        cached_tokens = details.get("cached_tokens") or 0
+        input_tokens = max(0, prompt_tokens - cached_tokens)
+    else:
+        cached_tokens = usage.get("cached_tokens", 0)
+        input_tokens = prompt_tokens
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": usage.get("completion_tokens", 0),
+        "cached_tokens": cached_tokens,
+        "total_tokens": usage.get("total_tokens", 0),
+    }
+
 
 class GrokPromptCache:
     """
@@ -54,6 +96,7 @@ class GrokPromptCache:
     def __init__(self):
         """Initialize prompt cache manager."""
         self.stats = CacheStats()
+        self.by_call_site: Dict[str, CacheStats] = {}
         self._cache_threshold = 1024  # Minimum tokens for caching
 
         logger.info("GrokPromptCache initialized (automatic caching via xAI)")
@@ -90,7 +133,10 @@ class GrokPromptCache:
             return [{"role": "user", "content": combined}]
 
     def record_api_response(
-        self, usage_stats: Dict[str, int], cost_breakdown: Dict[str, float]
+        self,
+        usage_stats: Dict[str, int],
+        cost_breakdown: Dict[str, float],
+        call_site: str = "default",
     ) -> None:
         """
         Record cache performance from API response.
@@ -98,23 +144,55 @@ class GrokPromptCache:
         Args:
             usage_stats: Token usage from response (includes cached_tokens)
             cost_breakdown: Cost breakdown (includes cache_savings)
+            call_site: Caller name used to break stats out (e.g. "chunk_extraction")
         """
+        if usage_stats.get("coalesced"):
+            # Shared response of a concurrent identical request; already recorded
+            return
+
         cached_tokens = usage_stats.get("cached_tokens", 0)
+        prompt_tokens = usage_stats.get("input_tokens", 0) + cached_tokens
         total_tokens = usage_stats.get("total_tokens", 0)
         cache_savings = cost_breakdown.get("cache_savings", 0.0)
 
+        if call_site not in self.by_call_site:
+            self.by_call_site[call_site] = CacheStats()
+
         # Record cache hit or miss
+        for stats in (self.stats, self.by_call_site[call_site]):
+            if cached_tokens > 0:
+                stats.hits += 1
+                stats.cached_tokens += cached_tokens
+                stats.total_savings += cache_savings
+            else:
+                stats.misses += 1
+            stats.prompt_tokens += prompt_tokens
+            stats.total_tokens += total_tokens
+            stats.last_updated = datetime.now()
+
         if cached_tokens > 0:
-            self.stats.hits += 1
-            self.stats.cached_tokens += cached_tokens
-            self.stats.total_savings += cache_savings
-            logger.debug(f"Cache HIT: {cached_tokens} tokens cached, ${cache_savings:.4f} saved")
+            logger.debug(
+                f"Cache HIT ({call_site}): {cached_tokens} tokens cached, "
+                f"${cache_savings:.4f} saved"
+            )
         else:
-            self.stats.misses += 1
-            logger.debug("Cache MISS: No cached tokens")
+            logger.debug(f"Cache MISS ({call_site}): No cached tokens")
 
-        self.stats.total_tokens += total_tokens
-        self.stats.last_updated = datetime.now()
+    def record_usage(
+        self, usage: Dict[str, Any], call_site: str, model: str = "grok-4-1-fast-reasoning"
+    ) -> None:
+        """
+        Record cache performance from a raw response ``usage`` block.
+
+        Args:
+            usage: ``usage`` dict from a chat completion response
+            call_site: Caller name used to break stats out
+            model: Model used (for savings estimate)
+        """
+        usage_stats = normalize_usage(usage)
+        cached_tokens = usage_stats["cached_tokens"]
+        savings = self.estimate_cache_savings(cached_tokens, cached_tokens > 0, model)
+        self.record_api_response(usage_stats, {"cache_savings": savings}, call_site=call_site)
 
     def estimate_cache_savings(
         self, input_tokens: int, cache_hit: bool, model: str = "grok-4-1-fast-reasoning"
@@ -166,8 +244,7 @@ class GrokPromptCache:
         Returns:
             True if caching is recommended
         """
-        # Rough estimate: 4 characters per token
-        estimated_tokens = len(system_prompt) // 4
+        estimated_tokens = get_token_counter().count(system_prompt)
 
         return estimated_tokens >= self._cache_threshold
 
@@ -186,13 +263,26 @@ class GrokPromptCache:
             "total_savings_usd": round(self.stats.total_savings, 4),
             "avg_savings_per_request_usd": round(self.stats.avg_savings_per_request, 4),
             "cached_tokens_total": self.stats.cached_tokens,
+            "cached_token_ratio": round(self.stats.cached_token_ratio, 3),
             "total_tokens_processed": self.stats.total_tokens,
             "last_updated": self.stats.last_updated.isoformat(),
+            "by_call_site": {
+                call_site: {
+                    "requests": stats.hits + stats.misses,
+                    "hit_rate_percent": round(stats.hit_rate, 2),
+                    "cached_token_ratio": round(stats.cached_token_ratio, 3),
+                    "cached_tokens": stats.cached_tokens,
+                    "prompt_tokens": stats.prompt_tokens,
+                    "total_savings_usd": round(stats.total_savings, 4),
+                }
+                for call_site, stats in self.by_call_site.items()
+            },
         }
 
     def reset_stats(self) -> None:
         """Reset cache statistics."""
         self.stats = CacheStats()
+        self.by_call_site = {}
         logger.info("Cache statistics reset")
 
     def log_stats(self) -> None:
@@ -203,6 +293,11 @@ class GrokPromptCache:
             f"({summary['hit_rate_percent']}%), "
             f"${summary['total_savings_usd']:.4f} saved"
         )
+        for call_site, stats in summary["by_call_site"].items():
+            logger.info(
+                f"  {call_site}: {stats['requests']} requests, "
+                f"{stats['cached_token_ratio']:.0%} of input tokens cached"
+            )
 
 
 # Global cache instance
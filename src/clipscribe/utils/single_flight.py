@@ -0,0 +1,105 @@
+"""
+Single-flight coalescing for identical in-flight async calls.
+
+When several coroutines ask for the same thing at the same time (re-submitted
+files, overlapping chunks, repeated fact checks for one entity) only the
+first caller runs the work; the others await its result. Followers receive a
+deep copy so no caller can mutate another caller's response.
+
+Examples:
+    >>> group = SingleFlight()
+    >>> result, shared = await group.do(payload_hash, lambda: client.post(...))
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+def canonical_hash(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serialisable parts (dict key order is ignored)."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SingleFlightStats:
+    """Coalescing counters."""
+
+    executed: int = 0
+    coalesced: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.executed + self.coalesced
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesce_rate": round(self.coalesced / total, 3) if total else 0.0,
+        }
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.followers = 0
+        self.snapshot: Any = _MISSING
+
+
+class SingleFlight:
+    """Group of in-flight calls keyed by caller-supplied hashes."""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = SingleFlightStats()
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run ``fn`` unless an identical call (same ``key``) is already in flight.
+
+        The shared call keeps running if the caller that started it is
+        cancelled, so followers still get a result.
+
+        Args:
+            key: Canonical hash identifying the call
+            fn: Zero-argument coroutine factory doing the work
+
+        Returns:
+            Tuple of (result, shared): ``shared`` is True when this caller
+            joined another caller's request and got a deep copy of its result
+        """
+        loop = asyncio.get_running_loop()
+        flight: Optional[_Flight] = self._flights.get(key)
+        if flight is not None and flight.task.get_loop() is loop:
+            flight.followers += 1
+            self.stats.coalesced += 1
+            await asyncio.shield(flight.task)
+            return copy.deepcopy(flight.snapshot), True
+
+        task = asyncio.ensure_future(fn())
+        flight = _Flight(task)
+        self._flights[key] = flight
+        self.stats.executed += 1
+
+        def finish(done: "asyncio.Task[Any]") -> None:
+            # Registered before any awaiter, so the snapshot exists before
+            # followers resume and before the leader can mutate the result.
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if done.cancelled():
+                return
+            error = done.exception()  # marks the exception as retrieved
+            if error is None and flight.followers:
+                flight.snapshot = copy.deepcopy(done.result())
+
+        task.add_done_callback(finish)
+        return await asyncio.shield(task), False
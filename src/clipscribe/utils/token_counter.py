@@ -0,0 +1,256 @@
+"""
+Token counting for Grok prompts, chunking and cost estimates.
+
+Uses a local BPE tokenizer (``tiktoken``'s ``o200k_base``, the closest public
+encoding to the Grok family) when the ``tokens`` extra is installed
+(``poetry install -E tokens``). Without it, or if the encoding cannot be
+loaded, counts fall back to a word/punctuation heuristic that is much closer
+than ``len(text) // 4`` for transcripts. Per-text counts are memoised, so
+re-counting the segments of a long transcript (chunk packing, cost
+estimates, pre-flight checks) is a dictionary lookup.
+
+Examples:
+    >>> counter = get_token_counter()
+    >>> counter.count("Hello world")
+    2
+    >>> chunks = counter.split_text(transcript, max_tokens=500, overlap_tokens=50)
+    >>> counter.fits_context("grok-4-1-fast-reasoning", prompt_tokens=120_000, max_output_tokens=4096)
+    True
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "o200k_base"
+
+# Context windows (tokens) per model, from https://docs.x.ai/docs/models
+MODEL_CONTEXT_LIMITS: Dict[str, int] = {
+    "grok-4-1-fast-reasoning": 2_000_000,
+    "grok-4-1-fast-non-reasoning": 2_000_000,
+    "grok-4-1-fast": 2_000_000,
+    "grok-4-fast-reasoning": 2_000_000,
+    "grok-4-fast-non-reasoning": 2_000_000,
+    "grok-4": 256_000,
+    "grok-4-0709": 256_000,
+    "grok-3": 131_072,
+    "grok-3-mini": 131_072,
+}
+DEFAULT_CONTEXT_LIMIT = 131_072
+
+# Chat formatting overhead (role markers etc.) per message and per reply
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+_HEURISTIC_PIECES = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\S+\s*")
+
+
+def _heuristic_count(text: str) -> int:
+    """Approximate BPE token count: one per word/punctuation, plus one per 6 extra chars."""
+    return sum(1 + (len(piece) - 1) // 6 for piece in _HEURISTIC_PIECES.findall(text))
+
+
+class TokenCounter:
+    """Memoising token counter with model context limits and chunk packing."""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING, cache_size: int = 100_000):
+        """
+        Initialize the counter.
+
+        Args:
+            encoding_name: tiktoken encoding used when the ``tokens`` extra is installed
+            cache_size: Max memoised texts (least recently used are evicted)
+        """
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._chars_seen = 0
+        self._tokens_seen = 0
+
+        try:
+            import tiktoken
+
+            self._encoding = tiktoken.get_encoding(encoding_name)
+            self.backend = f"tiktoken:{encoding_name}"
+        except Exception as e:  # ImportError, or encoding download failure offline
+            logger.debug(f"tiktoken unavailable ({e}); using heuristic token counts")
+            self._encoding = None
+            self.backend = "heuristic"
+
+    def _encode_count(self, texts: Sequence[str]) -> List[int]:
+        if self._encoding is None:
+            return [_heuristic_count(text) for text in texts]
+        return [len(ids) for ids in self._encoding.encode_ordinary_batch(list(texts))]
+
+    def count_many(self, texts: Iterable[str]) -> List[int]:
+        """
+        Count tokens for many texts, tokenizing only those not seen before.
+
+        Args:
+            texts: Texts (e.g. transcript segments)
+
+        Returns:
+            Token count per text, in order
+        """
+        texts = list(texts)
+        counts: List[Optional[int]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                cached = self._cache.get(text)
+                if cached is None:
+                    missing.setdefault(text, []).append(i)
+                else:
+                    self._cache.move_to_end(text)
+                    counts[i] = cached
+
+        if missing:
+            unique = list(missing)
+            fresh = self._encode_count(unique)
+            with self._lock:
+                for text, count in zip(unique, fresh):
+                    self._cache[text] = count
+                    self._chars_seen += len(text)
+                    self._tokens_seen += count
+                    for i in missing[text]:
+                        counts[i] = count
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return counts  # type: ignore[return-value]
+
+    def count(self, text: str) -> int:
+        """Count tokens in ``text``."""
+        if not text:
+            return 0
+        return self.count_many([text])[0]
+
+    def count_messages(self, messages: Sequence[Dict[str, str]]) -> int:
+        """Count prompt tokens for chat messages, including formatting overhead."""
+        contents = [
+            message["content"] if isinstance(message.get("content"), str) else ""
+            for message in messages
+        ]
+        return (
+            sum(self.count_many(contents)) + TOKENS_PER_MESSAGE * len(messages) + TOKENS_PER_REPLY
+        )
+
+    @property
+    def chars_per_token(self) -> float:
+        """Observed characters per token (4.0 until some text has been counted)."""
+        if self._tokens_seen < 1000:
+            return 4.0
+        return self._chars_seen / self._tokens_seen
+
+    def estimate_from_chars(self, char_count: int) -> int:
+        """Estimate tokens for text of ``char_count`` characters using the observed ratio."""
+        return int(char_count / self.chars_per_token)
+
+    @staticmethod
+    def context_limit(model: str) -> int:
+        """Context window (tokens) for ``model``."""
+        return MODEL_CONTEXT_LIMITS.get(model, DEFAULT_CONTEXT_LIMIT)
+
+    def fits_context(self, model: str, prompt_tokens: int, max_output_tokens: int = 0) -> bool:
+        """Whether a prompt plus the requested output fits the model's context window."""
+        return prompt_tokens + max_output_tokens <= self.context_limit(model)
+
+    def pack(
+        self, texts: Sequence[str], max_tokens: int, overlap_tokens: int = 0
+    ) -> List[Tuple[int, int]]:
+        """
+        Greedily pack consecutive texts into chunks of at most ``max_tokens``.
+
+        A text larger than ``max_tokens`` on its own becomes a single chunk.
+        Each chunk after the first starts with trailing texts of the previous
+        chunk totalling at most ``overlap_tokens``.
+
+        Args:
+            texts: Ordered pieces (segments or sentences)
+            max_tokens: Token budget per chunk
+            overlap_tokens: Token budget for context repeated from the previous chunk
+
+        Returns:
+            List of (start, end) index ranges into ``texts`` (end exclusive)
+        """
+        counts = self.count_many(texts)
+        ranges: List[Tuple[int, int]] = []
+        start = 0
+        while start < len(texts):
+            end = start
+            total = 0
+            while end < len(texts) and (end == start or total + counts[end] <= max_tokens):
+                total += counts[end]
+                end += 1
+            ranges.append((start, end))
+            if end >= len(texts):
+                break
+
+            next_start = end
+            overlap = 0
+            while next_start - 1 > start and overlap + counts[next_start - 1] <= overlap_tokens:
+                next_start -= 1
+                overlap += counts[next_start]
+            start = next_start
+        return ranges
+
+    def split_text(self, text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+        """
+        Split ``text`` at sentence boundaries into chunks of at most ``max_tokens``.
+
+        Sentences longer than ``max_tokens`` are split on word boundaries.
+        Chunks are slices of ``text``, so newlines and paragraph breaks inside
+        a chunk are kept.
+
+        Args:
+            text: Text to split
+            max_tokens: Token budget per chunk
+            overlap_tokens: Token budget repeated from the end of the previous chunk
+
+        Returns:
+            List of chunk strings
+        """
+        if not text.strip():
+            return []
+        if self.count(text) <= max_tokens:
+            return [text]
+
+        # (start, end) offsets of sentences, each with its trailing whitespace
+        bounds = [0, *(match.end() for match in _SENTENCE_END.finditer(text)), len(text)]
+        spans: List[Tuple[int, int]] = []
+        for sentence_start, sentence_end in zip(bounds, bounds[1:]):
+            if self.count(text[sentence_start:sentence_end]) <= max_tokens:
+                spans.append((sentence_start, sentence_end))
+                continue
+            words = [match.span() for match in _WORD.finditer(text, sentence_start, sentence_end)]
+            for start, end in self.pack([text[a:b] for a, b in words], max_tokens):
+                spans.append((words[start][0], words[end - 1][1]))
+
+        pieces = [text[a:b] for a, b in spans]
+        return [
+            text[spans[start][0] : spans[end - 1][1]].strip()
+            for start, end in self.pack(pieces, max_tokens, overlap_tokens)
+        ]
+
+
+# Global counter instance (memoised counts are shared process-wide)
+_global_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    Get the process-wide token counter.
+
+    Returns:
+        Global TokenCounter instance
+    """
+    global _global_counter
+    if _global_counter is None:
+        _global_counter = TokenCounter()
+    return _global_counter
@@ -61,7 +61,7 @@ async def test_entity_database_populated():
     assert count >= 287, f"Expected at least 287 entities, found {count}"
 
     # Verify structure
-    cursor.execute("SELECT name, type, confidence, evidence FROM entities LIMIT 1")
+    cursor.execute("SELECT name, entity_type, confidence, evidence FROM entities LIMIT 1")
     row = cursor.fetchone()
 
     assert row is not None, "No entities found"
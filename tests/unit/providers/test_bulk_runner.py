@@ -0,0 +1,136 @@
+"""Unit tests for BulkRunner."""
+
+import asyncio
+from typing import Dict, Optional
+
+import pytest
+
+from clipscribe.providers.base import (
+    IntelligenceProvider,
+    IntelligenceResult,
+    ProcessingError,
+    TranscriptionProvider,
+    TranscriptResult,
+)
+from clipscribe.providers.bulk import BulkItem, BulkItemStatus, BulkRunner
+
+
+class FakeTranscriber(TranscriptionProvider):
+    """Transcriber that sleeps instead of transcribing and tracks concurrency."""
+
+    def __init__(self, name: str = "fake-asr", fail_on: Optional[str] = None):
+        self._name = name
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def supports_diarization(self) -> bool:
+        return True
+
+    async def transcribe(self, audio_path, language=None, diarize=True) -> TranscriptResult:
+        self.started.append(audio_path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if audio_path == self.fail_on:
+                raise ProcessingError("boom")
+            return TranscriptResult(
+                segments=[],
+                language="en",
+                duration=1.0,
+                provider=self.name,
+                model="fake",
+                cost=self.estimate_cost(60),
+            )
+        finally:
+            self.in_flight -= 1
+
+    def estimate_cost(self, duration_seconds: float) -> float:
+        return duration_seconds / 60 * 0.01
+
+    def validate_config(self) -> bool:
+        return True
+
+
+class FakeExtractor(IntelligenceProvider):
+    """Extractor returning an empty result."""
+
+    @property
+    def name(self) -> str:
+        return "fake-llm"
+
+    async def extract(self, transcript, metadata: Optional[Dict] = None) -> IntelligenceResult:
+        return IntelligenceResult(
+            entities=[],
+            relationships=[],
+            topics=[],
+            key_moments=[],
+            sentiment={},
+            provider=self.name,
+            model="fake",
+            cost=0.001,
+        )
+
+    def estimate_cost(self, transcript_length: int) -> float:
+        return 0.001
+
+    def validate_config(self) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_bulk_runner_longest_job_first_and_concurrency():
+    """Test that items start longest-first and respect per-provider limits."""
+    transcriber = FakeTranscriber()
+    runner = BulkRunner(transcriber, FakeExtractor(), concurrency_limits={"fake-asr": 2})
+    items = [BulkItem("short.mp3", duration=60), BulkItem("long.mp3", duration=3600)]
+    items += [BulkItem(f"mid{i}.mp3", duration=600) for i in range(4)]
+
+    results = await runner.run_all(items)
+
+    assert len(results) == 6
+    assert all(r.status == BulkItemStatus.COMPLETED for r in results)
+    assert transcriber.started[0] == "long.mp3"
+    assert transcriber.started[-1] == "short.mp3"
+    assert transcriber.max_in_flight == 2
+    assert all(r.total_seconds > 0 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_bulk_runner_isolates_failures():
+    """Test that one failing item does not affect the others."""
+    transcriber = FakeTranscriber(fail_on="bad.mp3")
+    runner = BulkRunner(transcriber, FakeExtractor())
+    items = [BulkItem("good.mp3", duration=60), BulkItem("bad.mp3", duration=60)]
+
+    results = {r.item.audio_path: r async for r in runner.run(items)}
+
+    assert results["good.mp3"].succeeded
+    assert results["bad.mp3"].status == BulkItemStatus.FAILED
+    assert "boom" in results["bad.mp3"].error
+    assert results["bad.mp3"].intelligence is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_runner_cost_ceiling_skips_items():
+    """Test that items exceeding the global cost ceiling are skipped."""
+    transcriber = FakeTranscriber()
+    # Each 10-minute item reserves $0.101 up front; the ceiling fits only two.
+    runner = BulkRunner(
+        transcriber, FakeExtractor(), concurrency_limits={"fake-asr": 4}, max_total_cost=0.25
+    )
+    items = [BulkItem(f"item{i}.mp3", duration=600) for i in range(4)]
+
+    results = await runner.run_all(items)
+
+    statuses = [r.status for r in results]
+    assert statuses.count(BulkItemStatus.COMPLETED) == 2
+    assert statuses.count(BulkItemStatus.SKIPPED) == 2
+    assert runner.spent_cost <= 0.25
@@ -0,0 +1,98 @@
+"""Unit tests for the routing transcription provider."""
+
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from clipscribe.providers.base import ProcessingError, TranscriptionProvider, TranscriptResult
+from clipscribe.providers.transcription import router
+from clipscribe.providers.transcription.router import RoutingPolicy, RoutingTranscriptionProvider
+
+
+class FakeBackend(TranscriptionProvider):
+    """Backend with configurable cost, diarization support and failure."""
+
+    def __init__(self, name: str, cost_per_min: float, diarization: bool, fail: bool = False):
+        self._name = name
+        self.cost_per_min = cost_per_min
+        self.diarization = diarization
+        self.fail = fail
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def supports_diarization(self) -> bool:
+        return self.diarization
+
+    async def transcribe(self, audio_path, language: Optional[str] = None, diarize=True):
+        self.calls += 1
+        if self.fail:
+            raise ProcessingError(f"{self._name} down")
+        return TranscriptResult(
+            segments=[], language="en", duration=60.0, provider=self._name, model="fake"
+        )
+
+    def estimate_cost(self, duration_seconds: float) -> float:
+        return duration_seconds / 60 * self.cost_per_min
+
+    def validate_config(self) -> bool:
+        return True
+
+
+@pytest.fixture(autouse=True)
+def reset_backend_stats():
+    """Isolate the process-wide moving averages between tests."""
+    router._backend_stats.clear()
+    yield
+    router._backend_stats.clear()
+
+
+@pytest.fixture
+def backends():
+    return {
+        "whisperx-local": FakeBackend("whisperx-local", 0.0, diarization=True),
+        "whisperx-modal": FakeBackend("whisperx-modal", 0.02, diarization=True),
+        "voxtral": FakeBackend("voxtral", 0.001, diarization=False),
+    }
+
+
+def test_short_clip_goes_local(backends):
+    """Test that a short clip is routed to the free local backend."""
+    provider = RoutingTranscriptionProvider(backends=backends)
+    decision = provider.choose_backend(duration=120, diarize=True)
+    assert decision.backend == "whisperx-local"
+
+
+def test_long_multispeaker_file_goes_to_gpu(backends):
+    """Test that a long diarized file misses the local SLA and goes to Modal."""
+    provider = RoutingTranscriptionProvider(backends=backends)
+    decision = provider.choose_backend(duration=4 * 3600, diarize=True)
+    assert decision.backend == "whisperx-modal"
+    # Voxtral cannot diarize, so it is never a candidate
+    assert all(c["backend"] != "voxtral" for c in decision.candidates)
+
+
+def test_local_queue_depth_diverts_to_gpu(backends):
+    """Test that a busy local CPU pushes even short clips elsewhere."""
+    provider = RoutingTranscriptionProvider(backends=backends, policy=RoutingPolicy())
+    router.get_backend_stats("whisperx-local").in_flight = 2
+    decision = provider.choose_backend(duration=120, diarize=True)
+    assert decision.backend == "whisperx-modal"
+
+
+@pytest.mark.asyncio
+async def test_failure_falls_back_and_updates_error_rate(backends):
+    """Test that a failing backend is recorded and the next candidate is used."""
+    backends["whisperx-local"].fail = True
+    provider = RoutingTranscriptionProvider(backends=backends)
+
+    with patch.object(router, "get_media_duration", return_value=120.0):
+        result = await provider.transcribe("clip.mp3", diarize=True)
+
+    assert result.provider == "whisperx-modal"
+    assert result.metadata["routing"]["reason"] == "fallback"
+    assert router.get_backend_stats("whisperx-local").error_rate > 0
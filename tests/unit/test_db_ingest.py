@@ -0,0 +1,101 @@
+"""Unit tests for transactional bulk ingestion into the local database."""
+
+import json
+import sqlite3
+
+import pytest
+
+from clipscribe.database.backfill import backfill_outputs
+from clipscribe.database.db_manager import ClipScribeDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ClipScribeDatabase(str(tmp_path / "clipscribe.db"))
+    yield database
+    database.close()
+
+
+def _count(db, table, video_id):
+    return db.conn.execute(
+        f"SELECT COUNT(*) FROM {table} WHERE video_id = ?", (video_id,)
+    ).fetchone()[0]
+
+
+def test_ingest_video_writes_everything_and_replaces_on_reprocess(db):
+    """Test one call writes video, entities, relationships and topics, and re-ingest replaces."""
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    db.ingest_video(
+        "v1",
+        "https://x/1",
+        "One",
+        0.02,
+        entities=[{"name": "NASA", "type": "ORG"}, {"name": "Artemis", "type": "PRODUCT"}],
+        relationships=[{"subject": "NASA", "predicate": "launched", "object": "Artemis"}],
+        topics=[{"name": "Space", "relevance": 0.9}],
+        channel="Science",
+    )
+    video = db.get_video("v1")
+    assert (video["entity_count"], video["relationship_count"], video["channel"]) == (
+        2,
+        1,
+        "Science",
+    )
+    rel = db.conn.execute("SELECT * FROM relationships WHERE video_id = 'v1'").fetchone()
+    assert (rel["source_entity"], rel["relationship_type"], rel["target_entity"]) == (
+        "NASA",
+        "launched",
+        "Artemis",
+    )
+
+    db.ingest_video("v1", "https://x/1", "One", 0.02, entities=[{"name": "ESA"}], relationships=[])
+    assert (_count(db, "entities", "v1"), _count(db, "relationships", "v1")) == (1, 0)
+    assert _count(db, "topics", "v1") == 0
+
+
+def test_ingest_videos_rolls_back_whole_batch(db):
+    """Test a failing record leaves no partial writes."""
+    records = [
+        {"video_id": "ok", "url": "u", "title": "t", "entities": [{"name": "A"}]},
+        {"video_id": None, "url": "u", "title": "t"},  # violates NOT NULL
+    ]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.ingest_videos(records)
+    assert db.get_video("ok") is None
+    assert _count(db, "entities", "ok") == 0
+
+
+def test_backfill_loads_output_directories(db, tmp_path):
+    """Test backfill reads transcript.json files and skips unreadable ones."""
+    root = tmp_path / "output"
+    for i in range(5):
+        run = root / f"20250101_12000{i}_clip{i}"
+        run.mkdir(parents=True)
+        (run / "transcript.json").write_text(
+            json.dumps(
+                {
+                    "transcript": {"duration": 60, "metadata": {}},
+                    "intelligence": {
+                        "entities": [{"name": f"Entity {i}", "type": "ORG"}],
+                        "relationships": [],
+                        "topics": [{"name": "Topic", "relevance": 0.5}],
+                    },
+                    "file_metadata": {
+                        "filename": f"clip{i}.mp3",
+                        "processed_at": f"20250101_12000{i}",
+                        "total_cost": 0.01,
+                    },
+                }
+            )
+        )
+    broken = root / "broken"
+    broken.mkdir()
+    (broken / "transcript.json").write_text("{not json")
+
+    stats = backfill_outputs(db, root, batch_size=2)
+    assert (stats.directories, stats.videos, stats.skipped, stats.rows) == (6, 5, 1, 15)
+    video = db.get_video("20250101_120003_clip3")
+    assert video["title"] == "clip3"
+    assert video["processed_at"] == "2025-01-01 12:00:03"
+    assert db.search_entities("entity")[0]["name"].startswith("Entity")
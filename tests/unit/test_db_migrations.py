@@ -0,0 +1,229 @@
+"""Unit tests for schema migrations and the unified output loader."""
+
+import json
+import sqlite3
+
+import pytest
+
+from clipscribe.database.backfill import GCSOutputSource, load_outputs, open_source
+from clipscribe.database.db_manager import ClipScribeDatabase
+from clipscribe.database.migrations import SCHEMA_VERSION
+from clipscribe.database.records import entity_id
+from clipscribe.database.trigram import rebuild_trigram_index
+
+
+def _validation_output(i):
+    return {
+        "entities": [
+            {"name": f"Person {i}", "type": "PERSON", "confidence": 0.9},
+            {"name": "NASA", "type": "ORG", "evidence": "said NASA"},
+            {"name": "nasa", "type": "ORG"},
+        ],
+        "relationships": [{"source": f"Person {i}", "type": "works_at", "target": "NASA"}],
+        "topics": [{"name": "Space", "relevance": 0.7}, "Budget"],
+    }
+
+
+class _Blob:
+    def __init__(self, name, data):
+        self.name, self.data = name, data
+
+    def download_as_bytes(self):
+        return self.data
+
+
+class _Bucket:
+    """In-memory stand-in for a ``google.cloud.storage`` bucket."""
+
+    name = "validation"
+
+    def __init__(self, blobs):
+        self.blobs = blobs
+
+    def list_blobs(self, prefix=""):
+        return [_Blob(n, d) for n, d in self.blobs.items() if n.startswith(prefix)]
+
+    def blob(self, name):
+        return _Blob(name, self.blobs[name])
+
+
+class _Client:
+    def __init__(self, blobs):
+        self._bucket = _Bucket(blobs)
+
+    def bucket(self, name):
+        return self._bucket
+
+
+@pytest.fixture
+def gcs():
+    blobs = {
+        f"grok4_results/V-{i}//transcript.json": json.dumps(_validation_output(i)).encode()
+        for i in range(4)
+    }
+    blobs["grok4_results/V-9//transcript.json"] = b"{truncated"
+    blobs["grok4_results/V-0//notes.txt"] = b"not an output"
+    return _Client(blobs)
+
+
+def test_gcs_load_is_idempotent(tmp_path, gcs):
+    """Test loading from a GCS stand-in twice keeps one row per stable id."""
+    source = GCSOutputSource("gs://validation/grok4_results/", client=gcs)
+    with ClipScribeDatabase(str(tmp_path / "station10.db")) as db:
+        first = load_outputs(db, source, batch_size=3, read_workers=4)
+        assert (first.directories, first.videos, first.skipped) == (5, 4, 1)
+
+        ids = {r[0] for r in db.conn.execute("SELECT stable_id FROM entities")}
+        load_outputs(db, source, batch_size=3, read_workers=4)
+        assert {r[0] for r in db.conn.execute("SELECT stable_id FROM entities")} == ids
+
+        # "NASA" and "nasa" merge within a video
+        assert len(ids) == 8
+        nasa = db.conn.execute(
+            "SELECT * FROM entities WHERE stable_id = ?", (entity_id("V-2", "NASA", "ORG"),)
+        ).fetchone()
+        assert (nasa["mention_count"], nasa["evidence"]) == (2, "said NASA")
+        assert db.conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0] == 8
+        assert db.conn.execute("SELECT COUNT(*) FROM relationships").fetchone()[0] == 4
+        assert db.get_video("V-3")["output_path"] == (
+            "gs://validation/grok4_results/V-3//transcript.json"
+        )
+        assert db.verify_rollups() == []
+
+
+def test_open_source_picks_backend(tmp_path, gcs):
+    """Test gs:// URIs open a GCS source and paths a local one."""
+    assert isinstance(open_source("gs://validation/x/", client=gcs), GCSOutputSource)
+    assert open_source(str(tmp_path)).keys() == []
+
+
+def test_migrates_legacy_api_database(tmp_path):
+    """Test a pre-versioning station10.db (uuid ids, type, video_title) is rebuilt."""
+    path = tmp_path / "station10.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE entities (
+            id TEXT PRIMARY KEY, video_id TEXT NOT NULL, video_title TEXT,
+            name TEXT NOT NULL, type TEXT NOT NULL, confidence REAL NOT NULL,
+            evidence TEXT, timestamp REAL, mention_count INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX idx_video_id ON entities(video_id);
+        CREATE TABLE topics (
+            id TEXT PRIMARY KEY, video_id TEXT NOT NULL, video_title TEXT,
+            name TEXT NOT NULL, relevance REAL NOT NULL, time_range TEXT,
+            schema_type TEXT DEFAULT 'Event', schema_subtype TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE VIRTUAL TABLE entities_fts USING fts5(name, content='entities');
+        INSERT INTO entities VALUES
+            ('a1', 'P-2', 'All-In Podcast', 'NASA', 'ORG', 0.9, NULL, 12.0, 1, NULL),
+            ('a2', 'P-2', 'All-In Podcast', 'NASA', 'ORG', 0.8, NULL, 3.0, 1, NULL),
+            ('a3', 'P-1', 'MTG Interview', 'MTG', 'PERSON', 1.0, 'x', NULL, 1, NULL);
+        INSERT INTO topics VALUES
+            ('b1', 'P-2', 'All-In Podcast', 'Tariffs', 0.9, NULL, 'Event',
+             'PoliticalEvent', NULL);
+        """
+    )
+    conn.close()
+
+    with ClipScribeDatabase(str(path)) as db:
+        assert db.schema_version == SCHEMA_VERSION
+        rows = db.conn.execute(
+            "SELECT name, mention_count, timestamp FROM entities ORDER BY name"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [("MTG", 1, None), ("NASA", 2, 3.0)]
+        assert db.get_video("P-2")["title"] == "All-In Podcast"
+        topic = db.conn.execute("SELECT * FROM topics").fetchone()
+        assert (topic["name"], topic["schema_subtype"]) == ("Tariffs", "PoliticalEvent")
+        assert db.search_entities("nasa")[0]["video_id"] == "P-2"
+
+    # Reopening an up-to-date database is a no-op
+    with ClipScribeDatabase(str(path)) as db:
+        assert db.conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 2
+
+
+def test_migrates_legacy_local_database(tmp_path):
+    """Test a pre-versioning clipscribe.db keeps its videos and gains stable ids."""
+    path = tmp_path / "clipscribe.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE videos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT UNIQUE NOT NULL,
+            url TEXT NOT NULL, title TEXT, channel TEXT, duration INTEGER,
+            processing_cost REAL, entity_count INTEGER, relationship_count INTEGER,
+            output_path TEXT, processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE entities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT NOT NULL,
+            name TEXT NOT NULL, entity_type TEXT, mention_count INTEGER DEFAULT 1,
+            confidence REAL
+        );
+        CREATE TABLE relationships (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT NOT NULL,
+            source_entity TEXT NOT NULL, target_entity TEXT NOT NULL,
+            relationship_type TEXT, evidence TEXT
+        );
+        CREATE INDEX idx_entities_name ON entities(name);
+        INSERT INTO videos (video_id, url, title, processing_cost)
+            VALUES ('v1', 'https://x/1', 'One', 0.02);
+        INSERT INTO entities (video_id, name, entity_type, mention_count, confidence)
+            VALUES ('v1', 'NASA', 'ORG', 3, NULL);
+        INSERT INTO relationships (video_id, source_entity, target_entity, relationship_type)
+            VALUES ('v1', 'NASA', 'Artemis', 'launched');
+        """
+    )
+    conn.close()
+
+    with ClipScribeDatabase(str(path)) as db:
+        entity = db.conn.execute("SELECT * FROM entities").fetchone()
+        assert entity["stable_id"] == entity_id("v1", "NASA", "ORG")
+        assert (entity["mention_count"], entity["confidence"]) == (3, 1.0)
+        assert db.conn.execute("SELECT stable_id FROM relationships").fetchone()[0]
+        assert db.get_video("v1")["processing_cost"] == 0.02
+
+        # Re-ingesting the same video updates the migrated rows in place
+        db.ingest_video("v1", "https://x/1", "One", 0.02, [{"name": "NASA", "type": "ORG"}], [])
+        assert db.conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 1
+        assert db.verify_rollups() == []
+
+
+def test_refuses_newer_schema(tmp_path):
+    """Test a database from a newer release is not opened."""
+    path = tmp_path / "clipscribe.db"
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    conn.close()
+    with pytest.raises(RuntimeError, match="newer than supported"):
+        ClipScribeDatabase(str(path))
+
+
+def test_migrates_aliases_to_per_video_rows(tmp_path):
+    """Test version 2 aliases are credited to the videos with that name and stay indexed."""
+    path = tmp_path / "clipscribe.db"
+    with ClipScribeDatabase(str(path)) as db:
+        db.ingest_video("v1", "u", "t", 0.0, [{"name": "Volodymyr Zelenskyy"}], [])
+        db.conn.executescript(
+            """
+            DROP TABLE entity_aliases;
+            CREATE TABLE entity_aliases (
+                name TEXT NOT NULL, alias TEXT NOT NULL, PRIMARY KEY (name, alias)
+            ) WITHOUT ROWID;
+            INSERT INTO entity_aliases VALUES ('Volodymyr Zelenskyy', 'Зеленський');
+            PRAGMA user_version = 2;
+            """
+        )
+
+    with ClipScribeDatabase(str(path)) as db:
+        assert db.schema_version == SCHEMA_VERSION
+        rows = db.conn.execute("SELECT video_id, name, alias FROM entity_aliases").fetchall()
+        assert [tuple(r) for r in rows] == [("v1", "Volodymyr Zelenskyy", "Зеленський")]
+        rebuild_trigram_index(db.conn)
+        assert db.search_entities("Зеленский", fuzzy=True)[0]["video_id"] == "v1"
+
+        # The alias triggers follow the rebuilt table
+        db.ingest_video("v1", "u", "t", 0.0, [{"name": "Volodymyr Zelenskyy"}], [])
+        assert db.conn.execute("SELECT COUNT(*) FROM entity_aliases").fetchone()[0] == 0
+        assert db.search_entities("Зеленский", fuzzy=True) == []
@@ -0,0 +1,71 @@
+"""Unit tests for pooled, read-only database access in the search routers."""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from clipscribe.api import entity_search, topic_search
+from clipscribe.api.db_pool import ReadOnlyConnectionPool, close_db_pools
+
+
+@pytest.fixture
+def station_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "station10.db"
+    monkeypatch.setattr(entity_search, "DB_PATH", db_path)
+    monkeypatch.setattr(topic_search, "DB_PATH", db_path)
+    entity_search.init_database()
+    topic_search.init_database()
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO entities (stable_id, video_id, name, entity_type, confidence) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            ("e1", "v1", "Donald Trump", "PERSON", 0.95),
+            ("e2", "v1", "Trump Tower", "FAC", 0.9),
+            ("e3", "v2", "Pentagon", "ORG", 0.99),
+        ],
+    )
+    conn.execute(
+        "INSERT INTO topics (stable_id, video_id, name, relevance) "
+        "VALUES ('t1', 'v1', 'Ceasefire talks', 0.8)"
+    )
+    conn.commit()
+    conn.close()
+    yield db_path
+    close_db_pools()
+
+
+@pytest.mark.asyncio
+async def test_search_routes_run_concurrently_on_pool(station_db):
+    """Test concurrent searches return correct results through the shared pool."""
+    assert sqlite3.connect(station_db).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    responses = await asyncio.gather(
+        *[
+            entity_search.search_entities(entity_search.EntitySearchRequest(query="trump"))
+            for _ in range(20)
+        ],
+        topic_search.search_topics(topic_search.TopicSearchRequest(query="ceasefire")),
+    )
+    for response in responses[:-1]:
+        assert {e.name for e in response.entities} == {"Donald Trump", "Trump Tower"}
+    assert [t.name for t in responses[-1].topics] == ["Ceasefire talks"]
+    assert await entity_search.get_entity_types() == ["FAC", "ORG", "PERSON"]
+    assert [e.name for e in await entity_search.get_video_entities("v2")] == ["Pentagon"]
+
+
+@pytest.mark.asyncio
+async def test_pool_connections_are_read_only_and_off_loop(station_db):
+    """Test queries run on worker threads and cannot write."""
+    pool = ReadOnlyConnectionPool(station_db, size=2)
+    try:
+        thread_name = await pool.run(lambda conn: threading.current_thread().name)
+        assert thread_name.startswith("sqlite-read")
+        with pytest.raises(sqlite3.OperationalError):
+            await pool.fetchall("DELETE FROM entities")
+        assert await pool.has_table("entities_fts")
+    finally:
+        pool.close()
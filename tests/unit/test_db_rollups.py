@@ -0,0 +1,100 @@
+"""Unit tests for the trigger-maintained stats rollups."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from clipscribe.database.db_manager import ClipScribeDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ClipScribeDatabase(str(tmp_path / "clipscribe.db"))
+    yield database
+    database.close()
+
+
+def _aggregate_cost_stats(db, days):
+    """The pre-rollup full-table query, for comparison."""
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    row = db.conn.execute(
+        """
+        SELECT COUNT(*) as video_count, SUM(processing_cost) as total_cost,
+               AVG(processing_cost) as avg_cost_per_video, MIN(processing_cost) as min_cost,
+               MAX(processing_cost) as max_cost, SUM(entity_count) as total_entities,
+               AVG(entity_count) as avg_entities_per_video
+        FROM videos WHERE processed_at >= ?
+        """,
+        (cutoff,),
+    ).fetchone()
+    return dict(row)
+
+
+def _ingest(db, video_id, cost, entities, days_ago):
+    processed_at = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M:%S")
+    db.ingest_video(
+        video_id,
+        f"https://x/{video_id}",
+        video_id,
+        cost,
+        entities=[{"name": name, "type": kind} for name, kind in entities],
+        relationships=[],
+        processed_at=processed_at,
+    )
+
+
+def test_rollups_track_ingest_replace_and_delete(db):
+    """Test stats from rollups match full aggregates through inserts, re-ingests and deletes."""
+    _ingest(db, "v1", 0.10, [("NASA", "ORG"), ("Mars", "LOC")], days_ago=1)
+    _ingest(db, "v2", 0.30, [("NASA", "ORG")], days_ago=1)
+    _ingest(db, "v3", 0.05, [("Artemis", "PRODUCT")], days_ago=5)
+    _ingest(db, "v4", 0.50, [("Old", "ORG")], days_ago=40)
+    # Reprocess v2 cheaper, then drop v3 entirely
+    _ingest(db, "v2", 0.20, [("NASA", "ORG"), ("SpaceX", "ORG")], days_ago=1)
+    with db.conn:
+        db.conn.execute("DELETE FROM entities WHERE video_id = 'v3'")
+        db.conn.execute("DELETE FROM videos WHERE video_id = 'v3'")
+
+    assert db.verify_rollups() == []
+    stats = db.get_cost_stats(days=30)
+    expected = _aggregate_cost_stats(db, days=30)
+    assert stats["video_count"] == expected["video_count"] == 2
+    for key in ("total_cost", "avg_cost_per_video", "min_cost", "max_cost"):
+        assert stats[key] == pytest.approx(expected[key])
+    assert stats["max_cost"] == pytest.approx(0.20)
+
+    daily = db.get_daily_costs(days=30)
+    assert [(d["video_count"], d["entities_extracted"]) for d in daily] == [(2, 4)]
+
+    assert db.get_entity_stats() == {
+        "unique_entities": 4,
+        "total_mentions": 5,
+        "entity_types": 2,
+        "videos_with_entities": 3,
+    }
+
+
+def test_verify_detects_and_rebuild_repairs_drift(db):
+    """Test writes that bypass the triggers are reported and fixed by a rebuild."""
+    _ingest(db, "v1", 0.10, [("NASA", "ORG")], days_ago=0)
+    db.conn.execute("DROP TRIGGER rollup_entities_ai")
+    db.conn.execute(
+        "INSERT INTO entities (stable_id, video_id, name, entity_type) "
+        "VALUES ('esa', 'v1', 'ESA', 'ORG')"
+    )
+    db.conn.commit()
+
+    problems = db.verify_rollups()
+    assert any("rollup_entity_names['ESA']" in p for p in problems)
+
+    db.rebuild_rollups()
+    assert db.verify_rollups() == []
+    assert db.get_entity_stats()["unique_entities"] == 2
+
+
+def test_add_video_upserts_in_place(db):
+    """Test re-recording a video keeps its row id and the rollups exact."""
+    first = db.add_video("v1", "https://x/1", "One", 0.1, 3, 1, "out/1")
+    assert db.add_video("v1", "https://x/1", "One", 0.2, 4, 1, "out/1") == first
+    assert db.verify_rollups() == []
+    assert db.get_cost_stats(days=1)["total_cost"] == pytest.approx(0.2)
@@ -0,0 +1,163 @@
+"""Unit tests for the trigger-maintained entity co-occurrence graph."""
+
+import pytest
+
+from clipscribe.api import entity_graph
+from clipscribe.api.db_pool import close_db_pools
+from clipscribe.database.cooccurrence import rebuild_cooccurrence_index
+from clipscribe.database.db_manager import ClipScribeDatabase
+
+VIDEOS = {
+    "v1": ["NASA", "SpaceX", "Artemis"],
+    "v2": ["nasa", "SpaceX", "ESA"],
+    "v3": ["NASA", "SpaceX", "Roscosmos"],
+    "v4": ["Roscosmos", "Kremlin"],
+}
+
+
+def _ingest(db, video_id, names, relationships=()):
+    db.ingest_video(
+        video_id,
+        f"https://x/{video_id}",
+        video_id.upper(),
+        0.1,
+        [{"name": name} for name in names],
+        list(relationships),
+    )
+
+
+def _graph(db):
+    """Edges and predicates keyed by canonical names, for comparing states."""
+    edges = db.conn.execute(
+        """
+        SELECT s.key, t.key, e.videos FROM graph_edges e
+        JOIN graph_nodes s ON s.id = e.source JOIN graph_nodes t ON t.id = e.target
+        """
+    )
+    predicates = db.conn.execute(
+        """
+        SELECT s.key, t.key, p.predicate, p.relationships FROM graph_predicates p
+        JOIN graph_nodes s ON s.id = p.source JOIN graph_nodes t ON t.id = p.target
+        """
+    )
+    nodes = db.conn.execute("SELECT key, name, videos FROM graph_nodes WHERE videos > 0")
+    return sorted(map(tuple, edges)), sorted(map(tuple, predicates)), sorted(map(tuple, nodes))
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ClipScribeDatabase(str(tmp_path / "clipscribe.db"))
+    for video_id, names in VIDEOS.items():
+        _ingest(database, video_id, names)
+    _ingest(
+        database,
+        "v1",
+        VIDEOS["v1"],
+        [{"source": "NASA", "type": "launched", "target": "Artemis"}],
+    )
+    yield database
+    database.close()
+
+
+def test_neighbors_rank_by_shared_videos(db):
+    """Test casing merges nodes, neighbours rank by shared videos, and predicates attach."""
+    top = db.get_entity_neighbors("Nasa")
+    assert [(n["name"], n["videos"]) for n in top] == [
+        ("SpaceX", 3),
+        ("Artemis", 1),
+        ("ESA", 1),
+        ("Roscosmos", 1),
+    ]
+    artemis = top[1]
+    assert (artemis["predicates"], artemis["inverse_predicates"]) == (["launched"], [])
+    assert db.get_entity_neighbors("NASA", limit=1, min_videos=2)[0]["name"] == "SpaceX"
+    assert db.get_entity_neighbors("Unknown") == []
+
+
+def test_neighbor_predicates_load_in_one_query(db):
+    """Test predicates for every neighbour, both directions, come from a single query."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        top = db.get_entity_neighbors("Artemis")
+    finally:
+        db.conn.set_trace_callback(None)
+    nasa = next(n for n in top if n["name"] == "NASA")
+    assert (nasa["predicates"], nasa["inverse_predicates"]) == ([], ["launched"])
+    assert sum("graph_predicates" in sql for sql in statements) == 1
+
+
+def test_expand_and_shortest_path(db):
+    """Test 2-hop expansion reaches neighbours of neighbours and paths are fewest-hop."""
+    graph = db.expand_entity("Kremlin")
+    hops = {n["name"]: n["hops"] for n in graph["nodes"]}
+    assert hops["Kremlin"] == 0 and hops["Roscosmos"] == 1 and hops["SpaceX"] == 2
+    assert {"source": "Kremlin", "target": "Roscosmos", "videos": 1} in graph["edges"]
+
+    # SpaceX and Artemis are both NASA neighbours; their edge is listed once
+    pairs = [frozenset((e["source"], e["target"])) for e in db.expand_entity("NASA")["edges"]]
+    assert frozenset(("SpaceX", "Artemis")) in pairs
+    assert len(pairs) == len(set(pairs))
+
+    path = [n["name"] for n in db.find_entity_path("ESA", "Kremlin")["nodes"]]
+    assert path[0] == "ESA" and path[1] in ("NASA", "SpaceX")
+    assert path[2:] == ["Roscosmos", "Kremlin"]
+    assert db.find_entity_path("ESA", "Kremlin", max_depth=2) is None
+    assert db.find_entity_path("NASA", "nasa")["edges"] == []
+
+    videos = db.get_cooccurrence_videos("NASA", "spacex")
+    assert sorted(v["video_id"] for v in videos) == ["v1", "v2", "v3"]
+
+
+def test_incremental_updates_match_rebuild(db):
+    """Test re-ingests and deletions keep the graph equal to a full rebuild."""
+    # Dropping SpaceX from v3 and the relationship from v1 decrements their counts
+    _ingest(db, "v3", ["NASA", "Roscosmos"])
+    _ingest(db, "v1", VIDEOS["v1"])
+    assert db.get_entity_neighbors("SpaceX")[0] == {
+        "name": "NASA",
+        "videos": 2,
+        "total_videos": 3,
+        "predicates": [],
+        "inverse_predicates": [],
+    }
+    assert db.conn.execute("SELECT COUNT(*) FROM graph_predicates").fetchone()[0] == 0
+
+    db.conn.execute("DELETE FROM entities WHERE video_id = 'v4'")
+    db.conn.commit()
+    assert db.find_entity_path("NASA", "Kremlin") is None
+
+    # A later, smaller spelling becomes the display name, as a rebuild would pick
+    _ingest(db, "v5", ["blue origin"])
+    _ingest(db, "v6", ["Blue Origin", "NASA"])
+    assert db.get_entity_neighbors("NASA")[-1]["name"] == "Blue Origin"
+
+    incremental = _graph(db)
+    rebuild_cooccurrence_index(db.conn)
+    assert _graph(db) == incremental
+
+
+@pytest.mark.asyncio
+async def test_api_graph_endpoints(tmp_path, monkeypatch):
+    """Test the neighbour and path endpoints read the shared database."""
+    db_path = tmp_path / "station10.db"
+    monkeypatch.setattr(entity_graph, "DB_PATH", db_path)
+    entity_graph.init_database()
+    with ClipScribeDatabase(str(db_path)) as db:
+        for video_id, names in VIDEOS.items():
+            _ingest(db, video_id, names)
+    try:
+        response = await entity_graph.get_neighbors(entity="SpaceX", limit=2, min_videos=1)
+        assert [n.name for n in response.neighbors] == ["NASA", "Artemis"]
+
+        path = await entity_graph.get_path(
+            source="Artemis", target="Kremlin", max_depth=4, min_videos=1
+        )
+        assert [n.hops for n in path.nodes] == [0, 1, 2, 3]
+        with pytest.raises(entity_graph.HTTPException) as excinfo:
+            await entity_graph.get_path(
+                source="Artemis", target="Kremlin", max_depth=2, min_videos=1
+            )
+        assert excinfo.value.status_code == 404
+    finally:
+        close_db_pools()
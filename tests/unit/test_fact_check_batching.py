@@ -0,0 +1,122 @@
+"""Unit tests for batched multi-entity fact-check prompts."""
+
+import json
+
+import pytest
+
+from clipscribe.intelligence.fact_checker import (
+    AdaptiveBatchSize,
+    FactCheckResult,
+    GrokFactChecker,
+)
+from clipscribe.schemas_grok import Entity, EntityType
+
+
+def _entity(name: str, entity_type: EntityType = EntityType.ORG) -> Entity:
+    return Entity(name=name, type=entity_type, confidence=0.5, evidence=f"about {name}")
+
+
+def _response(results, tool_sources=()) -> dict:
+    tool_calls = [
+        {"function": {"name": "web_search", "arguments": {"results": [{"url": url}]}}}
+        for url in tool_sources
+    ]
+    message = {"content": json.dumps({"results": results}), "tool_calls": tool_calls}
+    return {"choices": [{"message": message}]}
+
+
+def test_parse_batch_response_maps_results_by_index():
+    """Test that answers map back by index and missing/invalid ones become None."""
+    checker = GrokFactChecker(api_key="test")
+    entities = [_entity("Acme"), _entity("Globex"), _entity("Initech")]
+    response = _response(
+        [
+            {"index": 1, "verified": False, "sources": []},
+            {"index": 0, "verified": True, "sources": ["https://a.example"], "evidence": "ok"},
+            {"index": 7, "verified": True, "sources": ["https://bad.example"]},
+        ],
+        tool_sources=["https://a.example"],
+    )
+
+    acme, globex, initech = checker._parse_verification_response(entities, response)
+    assert acme.verified and acme.sources == ["https://a.example"]
+    assert acme.tool_used == "web_search"
+    assert acme.verification_confidence == pytest.approx(0.6)
+    assert acme.evidence == ["about Acme", "ok"]
+    assert not globex.verified
+    assert initech is None
+
+
+def test_batch_sources_must_come_from_tool_calls():
+    """Test a claimed source no tool call returned does not verify an entity."""
+    checker = GrokFactChecker(api_key="test")
+    entities = [_entity("Acme"), _entity("Globex")]
+    response = _response(
+        [
+            {"index": 0, "verified": True, "sources": ["https://made-up.example"]},
+            {"index": 1, "verified": True, "sources": ["https://g.example", "https://x.example"]},
+        ],
+        tool_sources=["https://g.example"],
+    )
+
+    acme, globex = checker._parse_verification_response(entities, response)
+    assert not acme.verified and acme.sources == []
+    assert globex.verified and globex.sources == ["https://g.example"]
+
+    # Without any tool call, no claimed source counts
+    claimed = _response([{"index": 0, "verified": True, "sources": ["https://a.example"]}])
+    assert not checker._parse_verification_response(entities[:1], claimed)[0].verified
+
+
+def test_adaptive_batch_size():
+    """Test additive growth on clean batches and halving on failures."""
+    size = AdaptiveBatchSize(size=8, max_size=10)
+    size.record(8, 0)
+    assert size.size == 9
+    size.record(9, 5)
+    assert size.size == 4
+    size.record(2, 0)  # a short batch says nothing about larger ones
+    assert size.size == 4
+
+
+@pytest.mark.asyncio
+async def test_batches_group_by_type_and_fall_back(monkeypatch):
+    """Test per-type batches and individual re-checks for unresolved entities."""
+    checker = GrokFactChecker(api_key="test", max_batch_size=3)
+    batches = []
+    singles = []
+
+    async def fake_batch(entities, context=""):
+        batches.append([e.name for e in entities])
+        content = _response(
+            [
+                {"index": i, "verified": True, "sources": ["https://x.example"]}
+                for i, e in enumerate(entities)
+                if e.name != "Unclear"
+            ],
+            tool_sources=["https://x.example"],
+        )
+        return checker._parse_verification_response(entities, content)
+
+    async def fake_single(entity, context="", auto_select_tool=True):
+        singles.append(entity.name)
+        return FactCheckResult(
+            entity_name=entity.name,
+            original_confidence=entity.confidence,
+            verified=False,
+            verification_confidence=entity.confidence,
+            sources=[],
+            evidence=[],
+            tool_used="none",
+        )
+
+    monkeypatch.setattr(checker, "fact_check_batch", fake_batch)
+    monkeypatch.setattr(checker, "fact_check_entity", fake_single)
+    entities = [_entity(n) for n in ["Acme", "Globex", "Unclear", "Initech"]]
+    entities += [_entity("Jane Doe", EntityType.PERSON), _entity("John Roe", EntityType.PERSON)]
+
+    results = await checker.fact_check_entities(entities)
+
+    assert batches == [["Acme", "Globex", "Unclear"], ["Jane Doe", "John Roe"]]
+    assert singles == ["Initech", "Unclear"]
+    assert [r.verified for r in results] == [True, True, False, False, True, True]
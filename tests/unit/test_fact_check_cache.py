@@ -0,0 +1,110 @@
+"""Unit tests for concurrent, deduplicated and cached fact checking."""
+
+import asyncio
+
+import pytest
+
+from clipscribe.intelligence.fact_check_cache import FactCheckCache, entity_cache_key
+from clipscribe.intelligence.fact_checker import FactCheckResult, GrokFactChecker
+from clipscribe.schemas_grok import Entity, EntityType
+
+
+def _entity(name: str, confidence: float = 0.5) -> Entity:
+    return Entity(name=name, type=EntityType.ORG, confidence=confidence, evidence=name)
+
+
+def test_entity_cache_key_folds_case_and_whitespace():
+    """Test that spelling variants of one entity share a key."""
+    assert entity_cache_key("  NVIDIA  Corp", EntityType.ORG) == entity_cache_key(
+        "nvidia corp", "ORG"
+    )
+    assert entity_cache_key("Apple", "ORG") != entity_cache_key("Apple", "PRODUCT")
+
+
+def test_cache_persists_and_expires(tmp_path):
+    """Test SQLite persistence across instances and TTL expiry."""
+    db_path = tmp_path / "fact_checks.db"
+    cache = FactCheckCache(db_path=db_path)
+    cache.set("ORG:nvidia", {"entity_name": "Nvidia", "verified": True})
+    cache.close()
+
+    reopened = FactCheckCache(db_path=db_path)
+    assert reopened.get("ORG:nvidia") == {"entity_name": "Nvidia", "verified": True}
+    assert reopened.stats.disk_hits == 1
+
+    expired = FactCheckCache(db_path=tmp_path / "expired.db", ttl_seconds=-1)
+    expired.set("ORG:nvidia", {"verified": True})
+    assert expired.get("ORG:nvidia") is None
+    assert expired.purge_expired() == 1
+
+
+@pytest.mark.asyncio
+async def test_fact_check_entities_dedups_caches_and_bounds_concurrency(monkeypatch):
+    """Test one call per distinct entity, at most max_concurrency at once, and cache reuse."""
+    checker = GrokFactChecker(
+        api_key="test", max_concurrency=2, cache=FactCheckCache(), enable_batching=False
+    )
+    calls = []
+    active = 0
+    peak = 0
+
+    async def fake_check(entity, context="", auto_select_tool=True):
+        nonlocal active, peak
+        calls.append(entity.name)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return FactCheckResult(
+            entity_name=entity.name,
+            original_confidence=entity.confidence,
+            verified=entity.name != "Failing",
+            verification_confidence=0.9,
+            sources=["https://example.com"],
+            evidence=[],
+            tool_used="web_search",
+            error="boom" if entity.name == "Failing" else None,
+            entity_type="ORG",
+        )
+
+    monkeypatch.setattr(checker, "fact_check_entity", fake_check)
+    entities = [_entity(n) for n in ["Acme", "ACME ", "Globex", "Initech", "Failing"]]
+    entities.append(_entity("Confident", confidence=0.95))
+
+    results = await checker.fact_check_entities(entities)
+    assert sorted(calls) == ["Acme", "Failing", "Globex", "Initech"]
+    assert [r.entity_name for r in results] == ["Acme", "Globex", "Initech", "Failing"]
+    assert peak == 2
+
+    # Second video: verified entities come from the cache, the failed one is retried
+    calls.clear()
+    await checker.fact_check_entities([_entity("acme"), _entity("Failing")])
+    assert calls == ["Failing"]
+
+
+@pytest.mark.asyncio
+async def test_incompatible_cached_rows_are_misses(monkeypatch):
+    """Test rows from other FactCheckResult versions are rebuilt or re-verified, never raised."""
+    cache = FactCheckCache()
+    checker = GrokFactChecker(api_key="test", cache=cache, enable_batching=False)
+    base = {
+        "entity_name": "Acme",
+        "original_confidence": 0.5,
+        "verified": True,
+        "verification_confidence": 0.6,
+        "sources": ["https://a.example"],
+        "evidence": [],
+        "tool_used": "web_search",
+    }
+    cache.set(entity_cache_key("Acme", "ORG"), {**base, "retired_field": 1})
+    cache.set(entity_cache_key("Globex", "ORG"), {"entity_name": "Globex"})
+    calls = []
+
+    async def fake_check(entity, context="", auto_select_tool=True):
+        calls.append(entity.name)
+        return FactCheckResult(**{**base, "entity_name": entity.name})
+
+    monkeypatch.setattr(checker, "fact_check_entity", fake_check)
+    results = await checker.fact_check_entities([_entity("Acme"), _entity("Globex")])
+    assert [r.entity_name for r in results] == ["Acme", "Globex"]
+    assert calls == ["Globex"]
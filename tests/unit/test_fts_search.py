@@ -0,0 +1,72 @@
+"""Unit tests for FTS5-backed entity and relationship search."""
+
+import pytest
+
+from clipscribe.database.db_manager import ClipScribeDatabase
+from clipscribe.database.fts import build_match_query
+
+
+def test_build_match_query_quotes_terms_and_phrases():
+    """Test prefix terms, exact phrases, column filters and operator escaping."""
+    assert build_match_query('"white house" bid') == '"white house" "bid"*'
+    assert build_match_query("al-Qaeda", prefix=False) == '"al Qaeda"'
+    assert build_match_query("NOT OR *") == '"NOT"* "OR"*'
+    assert build_match_query("Musk", columns=["a", "b"]) == '{a b} : ("Musk"*)'
+    assert build_match_query(" ?! ") is None
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ClipScribeDatabase(str(tmp_path / "clipscribe.db"))
+    if not database.fts_enabled:
+        pytest.skip("SQLite built without FTS5")
+    database.add_video("v1", "https://x/1", "One", 0.1, 3, 1, "out/1")
+    database.add_video("v2", "https://x/2", "Two", 0.1, 1, 0, "out/2")
+    database.add_entities(
+        "v1",
+        [
+            {"name": "Donald Trump", "type": "PERSON", "mention_count": 9},
+            {"name": "Trump Organization", "type": "ORG", "mention_count": 2},
+            {"name": "White House", "type": "FAC"},
+        ],
+    )
+    database.add_entities("v2", [{"name": "Trumpet Records", "type": "ORG"}])
+    database.add_relationships(
+        "v1",
+        [
+            {
+                "source": "Donald Trump",
+                "target": "White House",
+                "type": "visited",
+                "evidence": "he toured the residence",
+            }
+        ],
+    )
+    yield database
+    database.close()
+
+
+def test_entity_search_uses_prefix_phrase_and_triggers(db):
+    """Test prefix/phrase matching and that reprocessing keeps the index in sync."""
+    names = {row["name"] for row in db.search_entities("trump")}
+    assert names == {"Donald Trump", "Trump Organization", "Trumpet Records"}
+    assert [row["name"] for row in db.search_entities('"white house"')] == ["White House"]
+    assert db.search_entities('"house white"') == []
+
+    # Reprocessing v2 deletes its old rows; the delete trigger must drop them from the index
+    db.add_entities("v2", [{"name": "Brass Band", "type": "ORG"}])
+    assert {row["name"] for row in db.search_entities("trump")} == {
+        "Donald Trump",
+        "Trump Organization",
+    }
+    assert [row["name"] for row in db.search_entities("bra")] == ["Brass Band"]
+
+
+def test_relationship_search_matches_entities_not_evidence(db):
+    """Test relationship search is limited to source/target names."""
+    rows = db.search_relationships("white")
+    assert [(r["source_entity"], r["target_entity"]) for r in rows] == [
+        ("Donald Trump", "White House")
+    ]
+    assert db.search_relationships("residence") == []
+    assert db.search_relationships("trump", relationship_type="founded") == []
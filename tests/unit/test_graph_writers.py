@@ -0,0 +1,112 @@
+"""Unit tests for the networkx-free knowledge graph build and streaming writers."""
+
+import io
+import json
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+import pytest
+
+from clipscribe.retrievers.graph_writers import (
+    write_gexf,
+    write_graph_file,
+    write_graphml,
+    write_json,
+)
+from clipscribe.retrievers.knowledge_graph_builder import KnowledgeGraphBuilder
+
+
+@pytest.fixture
+def graph():
+    video = SimpleNamespace(
+        entities=[
+            SimpleNamespace(name="AT&T", type="ORGANIZATION", confidence=0.8, mention_count=3),
+            SimpleNamespace(name='Dwayne "The Rock" Johnson', type="PERSON"),
+            SimpleNamespace(name="AT&T", type="ORGANIZATION", confidence=0.95, mention_count=4),
+        ],
+        relationships=[
+            {"subject": 'Dwayne "The Rock" Johnson', "predicate": "endorses", "object": "AT&T"},
+            SimpleNamespace(subject="AT&T", predicate="owns", object="<WarnerMedia>"),
+            {"subject": "AT&T", "predicate": "sold", "object": "<WarnerMedia>"},
+            {"subject": "AT&T", "object": None},
+        ],
+    )
+    return KnowledgeGraphBuilder().build_knowledge_graph(video).knowledge_graph
+
+
+def test_build_merges_duplicates_like_a_digraph(graph):
+    """Test duplicate entities and edges update in place and endpoints become nodes."""
+    assert [n["id"] for n in graph["nodes"]] == [
+        "AT&T",
+        'Dwayne "The Rock" Johnson',
+        "<WarnerMedia>",
+    ]
+    assert (graph["nodes"][0]["confidence"], graph["nodes"][0]["mention_count"]) == (0.95, 4)
+    assert graph["nodes"][2]["type"] == "unknown"
+    # Edges are grouped by source node; the later AT&T -> WarnerMedia edge wins
+    assert [(e["source"], e["predicate"]) for e in graph["edges"]] == [
+        ("AT&T", "sold"),
+        ('Dwayne "The Rock" Johnson', "endorses"),
+    ]
+    assert (graph["node_count"], graph["edge_count"]) == (3, 2)
+
+
+def test_writers_produce_well_formed_documents(graph):
+    """Test GraphML round-trips through NetworkX and GEXF and JSON parse back."""
+    nx = pytest.importorskip("networkx")
+    graphml = io.StringIO()
+    write_graphml(graph, graphml)
+    G = nx.read_graphml(io.StringIO(graphml.getvalue()))
+    assert list(G.nodes) == [n["id"] for n in graph["nodes"]]
+    assert G.nodes["AT&T"]["mention_count"] == 4
+    assert G.edges['Dwayne "The Rock" Johnson', "AT&T"]["predicate"] == "endorses"
+
+    gexf = io.StringIO()
+    write_gexf(graph, gexf)
+    root = ET.fromstring(gexf.getvalue())
+    ns = {"g": "http://www.gexf.net/1.3"}
+    labels = [n.get("label") for n in root.iterfind(".//g:node", ns)]
+    assert labels == [n["id"] for n in graph["nodes"]]
+    assert len(root.findall(".//g:edge", ns)) == 2
+
+    text = io.StringIO()
+    write_json(graph, text)
+    assert json.loads(text.getvalue()) == graph
+    assert KnowledgeGraphBuilder().generate_graphml_content(graph) == graphml.getvalue()
+
+
+def test_failed_export_leaves_no_partial_file(graph, tmp_path):
+    """Test a record that fails mid-export leaves the previous file and no temporary file."""
+    path = tmp_path / "knowledge_graph.graphml"
+    write_graph_file(path, write_graphml, graph)
+    good = path.read_text(encoding="utf-8")
+
+    broken = dict(
+        graph, edges=graph["edges"] + [{"source": "A", "target": "B", "confidence": "high"}]
+    )
+    with pytest.raises(ValueError):
+        write_graph_file(path, write_graphml, broken)
+    assert path.read_text(encoding="utf-8") == good
+    assert [p.name for p in tmp_path.iterdir()] == ["knowledge_graph.graphml"]
+
+    fresh = tmp_path / "knowledge_graph.gexf"
+    with pytest.raises(ValueError):
+        write_graph_file(fresh, write_graphml, broken)
+    assert not fresh.exists()
+
+
+def test_building_and_exporting_do_not_import_networkx():
+    """Test NetworkX is only imported for analytics."""
+    code = (
+        "import sys, io\n"
+        "from types import SimpleNamespace as N\n"
+        "from clipscribe.retrievers.knowledge_graph_builder import KnowledgeGraphBuilder\n"
+        "from clipscribe.retrievers.graph_writers import write_gexf, write_graphml\n"
+        "video = N(entities=[N(name='A'), N(name='B')], relationships=[N(subject='A', object='B')])\n"
+        "graph = KnowledgeGraphBuilder().build_knowledge_graph(video).knowledge_graph\n"
+        "write_graphml(graph, io.StringIO()); write_gexf(graph, io.StringIO())\n"
+        "assert 'networkx' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,78 @@
+"""Unit tests for Grok request hedging."""
+
+import asyncio
+
+import pytest
+
+from clipscribe.retrievers.grok_hedging import HedgeBudget, LatencyTracker, RequestHedger
+
+
+def _warm(hedger: RequestHedger, seconds: float = 0.01, samples: int = 20) -> None:
+    for _ in range(samples):
+        hedger.tracker.record("grok-4", 2000, seconds)
+
+
+def test_threshold_needs_min_samples():
+    """Test that no hedge delay is reported until enough samples exist."""
+    tracker = LatencyTracker(min_samples=5)
+    for i in range(4):
+        tracker.record("grok-4", 2000, float(i))
+    assert tracker.threshold("grok-4", 2000) is None
+
+    tracker.record("grok-4", 2000, 10.0)
+    assert tracker.threshold("grok-4", 2000) == 10.0
+    # Different prompt-size bucket has its own history
+    assert tracker.threshold("grok-4", 64000) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    """Test that a duplicate fires after p90 and the slow primary is cancelled."""
+    hedger = RequestHedger(budget_per_minute=5)
+    _warm(hedger)
+    calls = []
+    cancelled = asyncio.Event()
+
+    async def call():
+        attempt = len(calls)
+        calls.append(attempt)
+        if attempt == 0:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "primary"
+        return "hedge"
+
+    result = await hedger.run("grok-4", 2000, call)
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    assert result == "hedge"
+    assert hedger.stats.hedges_issued == 1
+    assert hedger.stats.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_exhausted_waits_for_primary():
+    """Test that no duplicate is sent once the per-minute budget is spent."""
+    hedger = RequestHedger(budget_per_minute=0)
+    _warm(hedger)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert await hedger.run("grok-4", 2000, call) == "primary"
+    assert len(calls) == 1
+    assert hedger.stats.budget_denied == 1
+
+
+def test_hedge_budget_is_per_minute():
+    """Test the sliding budget."""
+    budget = HedgeBudget(per_minute=2)
+    assert budget.try_acquire()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
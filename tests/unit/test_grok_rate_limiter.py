@@ -0,0 +1,96 @@
+"""Unit tests for the Grok client-side rate limiter."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from clipscribe.retrievers import grok_rate_limiter
+from clipscribe.retrievers.grok_client import GrokAPIClient
+from clipscribe.retrievers.grok_rate_limiter import (
+    GrokRateLimiter,
+    TokenBucket,
+    parse_reset_duration,
+)
+
+
+def test_parse_reset_duration():
+    """Test the OpenAI-style reset formats."""
+    assert parse_reset_duration("1s") == 1.0
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("2.5") == 2.5
+    assert parse_reset_duration(None) is None
+
+
+def test_bucket_reservation_creates_wait():
+    """Test that reserving past capacity returns the refill wait."""
+    bucket = TokenBucket(per_minute=60)  # 1 token/s
+    now = bucket.updated
+    assert bucket.reserve(60, now=now) == 0.0
+    assert bucket.reserve(2, now=now) == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_headers_recalibrate_budget():
+    """Test that server-reported limits replace the configured defaults."""
+    limiter = GrokRateLimiter(requests_per_minute=1000, tokens_per_minute=10_000_000)
+    await limiter.acquire("grok-4", 100)
+    await limiter.update_from_headers(
+        "grok-4",
+        {
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1s",
+            "x-ratelimit-limit-tokens": "50000",
+        },
+    )
+    requests, tokens = limiter._buckets["grok-4"]
+    assert requests.capacity == 60
+    assert tokens.capacity == 50000
+    # Exhausted request quota: next reservation must wait about one reset period
+    assert requests.reserve(1) > 0.9
+
+
+class _RateLimitedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).calls += 1
+        if type(self).calls == 1:
+            body = b"slow down"
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+        else:
+            body = json.dumps({"choices": [], "usage": {"total_tokens": 10}}).encode()
+            self.send_response(200)
+            self.send_header("x-ratelimit-limit-requests", "100")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_client_honours_retry_after(monkeypatch):
+    """Test that a 429 pauses the model for Retry-After and then retries."""
+    monkeypatch.setattr(grok_rate_limiter, "_global_limiter", GrokRateLimiter())
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RateLimitedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = GrokAPIClient(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        response = await client.chat_completion([{"role": "user", "content": "hi"}])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response["usage"]["total_tokens"] == 10
+    stats = client.get_client_stats()["rate_limiter"]
+    assert stats["rate_limited_responses"] == 1
+    assert stats["wait_seconds"] >= 0.15
+    assert stats["models"]["grok-4-1-fast-reasoning"]["rpm"] == 100
@@ -0,0 +1,108 @@
+"""Unit tests for the shared HTTP client registry."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from clipscribe.retrievers import grok_rate_limiter
+from clipscribe.retrievers.grok_client import GrokAPIClient
+from clipscribe.retrievers.grok_rate_limiter import GrokRateLimiter
+from clipscribe.utils.http_pool import HTTPClientRegistry, PoolLimits
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Keep-alive capable HTTP server on localhost."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_client_is_shared_and_reuses_connections(local_server):
+    """Test one client per host and keep-alive reuse across requests."""
+    registry = HTTPClientRegistry(PoolLimits(http2=False))
+
+    async def run():
+        client = registry.get_async_client(local_server)
+        assert registry.get_async_client(f"{local_server}/other/path") is client
+        for _ in range(3):
+            response = await client.get(f"{local_server}/")
+            assert response.text == "ok"
+        await registry.aclose()
+
+    asyncio.run(run())
+
+    metrics = registry.get_metrics()[local_server]
+    assert metrics["requests"] == 3
+    assert metrics["new_connections"] == 1
+    assert metrics["reused_connections"] == 2
+
+
+def test_new_event_loop_gets_fresh_client(local_server):
+    """Test that clients bound to a closed loop are not handed out again."""
+    registry = HTTPClientRegistry(PoolLimits(http2=False))
+    seen = []
+
+    async def run():
+        client = registry.get_async_client(local_server)
+        seen.append(client)
+        await client.get(local_server)
+
+    asyncio.run(run())
+    asyncio.run(run())
+
+    assert seen[0] is not seen[1]
+    assert registry.get_metrics()[local_server]["requests"] == 2
+
+
+def test_sync_client_metrics(local_server):
+    """Test the shared sync client records pool metrics."""
+    registry = HTTPClientRegistry(PoolLimits(http2=False))
+    client = registry.get_sync_client(local_server)
+    client.get(local_server)
+    client.get(local_server)
+    registry.close()
+
+    metrics = registry.get_metrics()[local_server]
+    assert metrics["new_connections"] == 1
+    assert metrics["reuse_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_pooled_grok_requests_take_per_request_timeout(monkeypatch):
+    """Test a caller can outlast the shared client's default timeout for one request."""
+    monkeypatch.setattr(grok_rate_limiter, "_global_limiter", GrokRateLimiter())
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={"choices": [], "usage": {}})
+
+    pool = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(GrokAPIClient, "client", property(lambda self: pool))
+    client = GrokAPIClient(api_key="test")
+    messages = [{"role": "user", "content": "x"}]
+    await client.chat_completion(messages)
+    await client.chat_completion(messages, timeout=300)
+    await pool.aclose()
+
+    assert timeouts == [60, 300]
@@ -0,0 +1,124 @@
+"""Unit tests for HybridProcessor's Grok calls and background work."""
+
+from types import SimpleNamespace
+
+import pytest
+
+# The processors package imports the WhisperX transcriber
+pytest.importorskip("torch")
+
+from clipscribe.knowledge.ingestion_queue import KnowledgeIngestionQueue  # noqa: E402
+from clipscribe.processors.hybrid_processor import (  # noqa: E402
+    HybridProcessor,
+    SeamlessTranscriptAnalyzer,
+)
+from clipscribe.utils.prompt_cache import get_prompt_cache  # noqa: E402
+
+
+class _GrokClient:
+    """Stand-in for GrokAPIClient that records chat completions."""
+
+    def __init__(self, content="Summary text."):
+        self.content = content
+        self.calls = []
+
+    async def chat_completion(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"choices": [{"message": {"content": self.content}}]}
+
+    async def stream_json_objects(self, **kwargs):
+        self.calls.append(kwargs)
+        yield "entities", {"name": "NASA", "type": "ORGANIZATION"}
+        yield "relationships", {"subject": "NASA", "predicate": "runs", "object": "Artemis"}
+
+
+class _CollectionClient:
+    def __init__(self):
+        self.collection = []
+
+    async def upload_bytes(self, content, filename, purpose="assistants"):
+        return {"id": f"file-{filename}"}
+
+    async def add_files_to_collection(self, collection_id, file_ids):
+        self.collection.extend(file_ids)
+        return {}
+
+
+class _KnowledgeBase:
+    def __init__(self):
+        self.client = _CollectionClient()
+        self.collection_id = "col-1"
+        self.video_files = {}
+
+    def index_video_locally(self, video_id, transcript, intelligence):
+        pass
+
+    def serialize_video_document(self, video_id, transcript, intelligence):
+        return video_id.encode()
+
+
+@pytest.fixture
+def processor():
+    proc = HybridProcessor.__new__(HybridProcessor)
+    proc.grok_model = "grok-test"
+    proc.grok_client = _GrokClient()
+    return proc
+
+
+@pytest.mark.asyncio
+async def test_summary_uses_shared_grok_client(processor):
+    """Test the executive summary goes through the pooled Grok client."""
+    summary = await processor._generate_summary(
+        "transcript", [{"name": "NASA"}], [{"subject": "NASA", "predicate": "runs", "object": "X"}]
+    )
+    assert summary == "Summary text."
+    (call,) = processor.grok_client.calls
+    assert call["model"] == "grok-test"
+    assert "NASA runs X" in call["messages"][1]["content"]
+    assert not hasattr(SeamlessTranscriptAnalyzer, "_generate_summary")
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunk_extraction_collects_objects(processor):
+    """Test chunk extraction consumes the incremental parser when streaming is enabled."""
+    processor.settings = SimpleNamespace(
+        enable_grok_streaming=True, enable_grok_prompt_caching=False
+    )
+    processor.prompt_cache = get_prompt_cache()
+    result = await processor._extract_from_chunk("NASA runs Artemis.", {"title": "T"}, 1, 1)
+    assert result == {
+        "entities": [{"name": "NASA", "type": "ORGANIZATION"}],
+        "relationships": [{"subject": "NASA", "predicate": "runs", "object": "Artemis"}],
+    }
+    (call,) = processor.grok_client.calls
+    assert call["call_site"] == "chunk_extraction"
+
+
+@pytest.mark.asyncio
+async def test_context_exit_drains_knowledge_base_uploads(processor):
+    """Test a processed video is in the collection once the caller's ``async with`` ends."""
+
+    async def transcript(audio_path, metadata, force_reprocess):
+        return {"text": "NASA launched Artemis.", "cost": 0.01}
+
+    async def intelligence(text, metadata):
+        return {"entities": [], "relationships": [], "topics": []}
+
+    processor.settings = SimpleNamespace(auto_add_to_knowledge_base=True)
+    processor.voxtral_model = "voxtral-test"
+    processor._fact_checker_enabled = False
+    processor._knowledge_base_enabled = True
+    processor._get_transcript = transcript
+    processor._extract_intelligence = intelligence
+    processor.knowledge_base = _KnowledgeBase()
+    # A long window: without draining, the add would never run before exit
+    processor.ingestion_queue = KnowledgeIngestionQueue(
+        processor.knowledge_base, batch_size=16, batch_window=3600
+    )
+
+    async with processor:
+        await processor.process_video("a.mp3", {"video_id": "vid-1"})
+        assert processor.knowledge_base.client.collection == []
+
+    assert processor.knowledge_base.client.collection == ["file-vid-1.json"]
+    assert processor.knowledge_base.video_files == {"vid-1": "file-vid-1.json"}
@@ -0,0 +1,84 @@
+"""Unit tests for the background knowledge base ingestion queue."""
+
+import asyncio
+
+import pytest
+
+from clipscribe.knowledge.ingestion_queue import KnowledgeIngestionQueue
+
+
+class _FakeClient:
+    def __init__(self, failing_uploads=()):
+        self.failing_uploads = set(failing_uploads)
+        self.uploads = []
+        self.batches = []
+
+    async def upload_bytes(self, content, filename, purpose="assistants"):
+        await asyncio.sleep(0)
+        if filename in self.failing_uploads:
+            self.failing_uploads.discard(filename)  # fail once
+            raise RuntimeError("502 Bad Gateway")
+        self.uploads.append((filename, content))
+        return {"id": f"file-{filename}"}
+
+    async def add_files_to_collection(self, collection_id, file_ids):
+        self.batches.append(sorted(file_ids))
+        return {}
+
+
+class _FakeKnowledgeBase:
+    def __init__(self, client):
+        self.client = client
+        self.collection_id = None
+        self.video_files = {}
+        self.locally_indexed = []
+
+    async def initialize_collection(self):
+        self.collection_id = "col-1"
+        return self.collection_id
+
+    def index_video_locally(self, video_id, transcript, intelligence):
+        self.locally_indexed.append(video_id)
+
+    def serialize_video_document(self, video_id, transcript, intelligence):
+        return f'{{"video_id":"{video_id}"}}'.encode()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_immediately_and_batches_by_size():
+    """Test in-memory uploads and one collection add per full batch."""
+    client = _FakeClient()
+    kb = _FakeKnowledgeBase(client)
+    queue = KnowledgeIngestionQueue(kb, batch_size=2, batch_window=60)
+
+    for video_id in ("a", "b", "c", "d"):
+        queue.enqueue(video_id, "transcript", None)
+    assert queue.depth == 4
+    assert client.uploads == []  # nothing ran on the caller's path
+    assert kb.locally_indexed == ["a", "b", "c", "d"]
+
+    assert await queue.drain(timeout=5)
+    assert client.batches == [["file-a.json", "file-b.json"], ["file-c.json", "file-d.json"]]
+    assert kb.collection_id == "col-1"
+    assert kb.video_files["c"] == "file-c.json"
+    assert queue.get_stats()["queue_depth"] == 0
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_time_window_flush_and_retry():
+    """Test that a partial batch flushes after the window and failed uploads are retried."""
+    client = _FakeClient(failing_uploads={"b.json"})
+    kb = _FakeKnowledgeBase(client)
+    queue = KnowledgeIngestionQueue(kb, batch_size=10, batch_window=0.05, retry_backoff=0.01)
+
+    queue.enqueue("a", "transcript", None)
+    queue.enqueue("b", "transcript", None)
+    await asyncio.sleep(0.3)
+
+    assert sorted(f for batch in client.batches for f in batch) == ["file-a.json", "file-b.json"]
+    stats = queue.get_stats()
+    assert stats["retries"] == 1
+    assert stats["indexed"] == 2
+    assert stats["failed"] == 0
+    await queue.close()
@@ -0,0 +1,150 @@
+"""Unit tests for incremental JSON parsing of streamed Grok responses."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from clipscribe.retrievers import grok_client, grok_rate_limiter
+from clipscribe.retrievers.grok_client import GrokAPIClient
+from clipscribe.retrievers.grok_rate_limiter import GrokRateLimiter
+from clipscribe.utils.json_stream import JSONArrayStreamParser, salvage_json
+
+RESPONSE = json.dumps(
+    {
+        "entities": [
+            {"name": 'Quote "}" Inc', "type": "ORG", "evidence": ["a", {"nested": 1}]},
+            {"name": "Jane Doe", "type": "PERSON"},
+        ],
+        "relationships": [{"subject": "Jane Doe", "predicate": "works_at", "object": "Quote"}],
+        "topics": ["news"],
+    }
+)
+
+
+def test_parser_yields_objects_as_they_close():
+    """Test that objects are emitted once complete, regardless of chunk boundaries."""
+    parser = JSONArrayStreamParser()
+    seen = []
+    for i in range(0, len(RESPONSE), 7):
+        seen.extend(parser.feed(RESPONSE[i : i + 7]))
+
+    assert [key for key, _ in seen] == ["entities", "entities", "relationships"]
+    assert seen[0][1]["name"] == 'Quote "}" Inc'
+    assert seen[0][1]["evidence"][1] == {"nested": 1}
+    assert parser.objects["topics"] == []
+
+
+def test_salvage_truncated_response():
+    """Test that a response cut off mid-object keeps every complete object."""
+    truncated = RESPONSE[: RESPONSE.index("relationships") + 30]
+    result = salvage_json(truncated, ("entities", "relationships"))
+
+    assert [e["name"] for e in result["entities"]] == ['Quote "}" Inc', "Jane Doe"]
+    assert result["relationships"] == []
+    assert salvage_json(RESPONSE)["topics"] == ["news"]
+
+
+def test_salvage_raises_on_unrecoverable_reply():
+    """Test garbled replies raise so callers retry, unless the reply hit max_tokens."""
+    for reply in ("Sorry, I can't help with that.", '{"entities": [{"na', "[1, 2]"):
+        with pytest.raises(json.JSONDecodeError):
+            salvage_json(reply, ("entities", "relationships"))
+
+    cut_off = salvage_json('{"entities": [{"na', ("entities", "relationships"), truncated=True)
+    assert cut_off == {"entities": [], "relationships": []}
+
+
+class _StreamingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @staticmethod
+    def body() -> str:
+        events = [
+            {"id": "c1", "choices": [{"delta": {"content": RESPONSE[i : i + 20]}}]}
+            for i in range(0, len(RESPONSE), 20)
+        ]
+        events.append({"id": "c1", "choices": [{"delta": {}, "finish_reason": "stop"}]})
+        events.append({"id": "c1", "choices": [], "usage": {"total_tokens": 42}})
+        body = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+        return body + "data: [DONE]\n\n"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert payload["stream"] is True
+        body = self.body().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_client_streams_and_assembles(monkeypatch):
+    """Test SSE streaming: per-object yields and the assembled chat_completion response."""
+    monkeypatch.setattr(grok_rate_limiter, "_global_limiter", GrokRateLimiter())
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = GrokAPIClient(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}/v1")
+        messages = [{"role": "user", "content": "extract"}]
+        items = [item async for item in client.stream_json_objects(messages)]
+        response = await client.chat_completion(messages, stream=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [key for key, _ in items] == ["entities", "entities", "relationships"]
+    assert response["choices"][0]["message"]["content"] == RESPONSE
+    assert response["choices"][0]["finish_reason"] == "stop"
+    assert response["usage"]["total_tokens"] == 42
+
+
+@pytest.mark.asyncio
+async def test_stream_retries_connection_errors_before_first_event(monkeypatch):
+    """Test the streaming path retries a failed connect with backoff, like _make_request."""
+    monkeypatch.setattr(grok_rate_limiter, "_global_limiter", GrokRateLimiter())
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, text=_StreamingHandler.body())
+
+    pool = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    delays = []
+
+    async def no_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(GrokAPIClient, "client", property(lambda self: pool))
+    monkeypatch.setattr(grok_client.asyncio, "sleep", no_sleep)
+    client = GrokAPIClient(api_key="test")
+    items = [item async for item in client.stream_json_objects([{"role": "user", "content": "x"}])]
+    await pool.aclose()
+
+    assert len(attempts) == 2 and delays == [1]
+    assert [key for key, _ in items] == ["entities", "entities", "relationships"]
+
+
+@pytest.mark.asyncio
+async def test_stream_json_objects_raises_on_unparseable_reply(monkeypatch):
+    """Test a streamed reply with no items that is not JSON raises, as salvage_json does."""
+    monkeypatch.setattr(grok_rate_limiter, "_global_limiter", GrokRateLimiter())
+    reply = {"choices": [{"delta": {"content": "Sorry, no."}, "finish_reason": "stop"}]}
+    body = f"data: {json.dumps(reply)}\n\ndata: [DONE]\n\n"
+    pool = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda r: httpx.Response(200, text=body))
+    )
+    monkeypatch.setattr(GrokAPIClient, "client", property(lambda self: pool))
+    client = GrokAPIClient(api_key="test")
+    with pytest.raises(json.JSONDecodeError):
+        [item async for item in client.stream_json_objects([{"role": "user", "content": "x"}])]
+    await pool.aclose()
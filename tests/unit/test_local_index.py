@@ -0,0 +1,125 @@
+"""Unit tests for the local knowledge base search index."""
+
+import pytest
+
+from clipscribe.knowledge.collection_manager import VideoKnowledgeBase
+from clipscribe.knowledge.local_index import LocalSearchIndex
+
+
+def _document(video_id, title, transcript, entities=(), published_at="2025-06-01"):
+    return {
+        "video_id": video_id,
+        "metadata": {"title": title, "channel": "News", "published_at": published_at},
+        "transcript": transcript,
+        "entities": [
+            {"name": name, "type": etype, "confidence": 0.9, "evidence": f"{name} said"}
+            for name, etype in entities
+        ],
+        "relationships": [],
+        "topics": [],
+        "summary": "",
+    }
+
+
+def _corpus():
+    return [
+        _document(
+            "v1",
+            "Drone strikes in Yemen",
+            "The Pentagon confirmed drone strikes. Drone operators briefed Congress.",
+            [("Pentagon", "ORG"), ("Lloyd Austin", "PERSON")],
+        ),
+        _document(
+            "v2",
+            "Budget hearing",
+            "Lloyd Austin testified about the budget and mentioned a drone program once.",
+            [("Lloyd Austin", "PERSON")],
+            published_at="2024-01-01",
+        ),
+        _document("v3", "Cooking show", "Today we bake bread.", [("Julia", "PERSON")]),
+    ]
+
+
+def test_bm25_ranks_filters_and_persists(tmp_path):
+    """Test BM25 ordering, metadata filters, snippets and reload from SQLite."""
+    index = LocalSearchIndex(db_path=tmp_path / "kb.db")
+    for document in _corpus():
+        index.add_document(document)
+
+    hits = index.search("drone strikes", top_k=5)
+    assert [h.video_id for h in hits] == ["v1", "v2"]
+    assert "drone strikes" in hits[0].snippet.lower()
+
+    assert [h.video_id for h in index.search("drone", filters={"min_date": "2025-01-01"})] == ["v1"]
+    assert [h.video_id for h in index.search("drone", filters={"entity_types": ["ORG"]})] == ["v1"]
+    index.close()
+
+    reopened = LocalSearchIndex(db_path=tmp_path / "kb.db")
+    assert len(reopened) == 3
+    assert reopened.search("bread")[0].video_id == "v3"
+    assert reopened.remove_document("v3")
+    assert reopened.search("bread") == []
+
+
+def test_vector_search_fuses_with_bm25():
+    """Test the embedding tier finds documents with no lexical overlap."""
+    pytest.importorskip("numpy")
+
+    def embed(texts):
+        # Toy embedding: "military" for defence words, "food" for cooking words
+        return [
+            [
+                float(any(w in t.lower() for w in ("drone", "pentagon", "military"))),
+                float(any(w in t.lower() for w in ("bake", "cooking", "food"))),
+            ]
+            for t in texts
+        ]
+
+    index = LocalSearchIndex(embedding_fn=embed, ivf_min_documents=2, ivf_probes=2)
+    for document in _corpus():
+        index.add_document(document)
+
+    assert index.search("food", mode="bm25") == []
+    assert index.search("food", mode="vector", top_k=1)[0].video_id == "v3"
+    assert index.search("military", top_k=1)[0].video_id == "v1"
+
+
+@pytest.mark.asyncio
+async def test_knowledge_base_answers_locally_and_falls_back_on_request():
+    """Test entity lookups stay local and the remote collection is only hit when asked."""
+    kb = VideoKnowledgeBase(api_key="test", collection_id="col-1")
+    remote_queries = []
+
+    async def fake_search_collection(collection_id, query, top_k):
+        remote_queries.append(query)
+        return {"results": [{"metadata": {"video_id": "remote", "title": "R"}, "score": 1.0}]}
+
+    kb.client.search_collection = fake_search_collection
+    for document in _corpus():
+        kb.local_index.add_document(document)
+
+    refs = await kb.cross_reference_entity("lloyd  austin")
+    assert sorted(r.video_id for r in refs) == ["v1", "v2"]
+    both = await kb.find_entity_cooccurrences("Pentagon", "Lloyd Austin")
+    assert [r.video_id for r in both] == ["v1"]
+    assert (await kb.search_knowledge_base("budget"))[0].video_id == "v2"
+
+    assert await kb.search_knowledge_base("quantum") == []
+    assert remote_queries == []
+    fallback = await kb.search_knowledge_base("quantum", remote_fallback=True)
+    assert [r.video_id for r in fallback] == ["remote"]
+    assert remote_queries == ["quantum"]
+
+
+@pytest.mark.asyncio
+async def test_knowledge_base_without_local_documents_searches_remote():
+    """Test a collection with nothing indexed locally is still searched remotely by default."""
+    kb = VideoKnowledgeBase(api_key="test", collection_id="col-1")
+
+    async def fake_search_collection(collection_id, query, top_k):
+        return {"results": [{"metadata": {"video_id": "remote", "title": "R"}, "score": 1.0}]}
+
+    kb.client.search_collection = fake_search_collection
+    assert [r.video_id for r in await kb.search_knowledge_base("quantum")] == ["remote"]
+    assert [r.video_id for r in await kb.cross_reference_entity("NASA")] == ["remote"]
+    assert await kb.search_knowledge_base("quantum", remote_fallback=False) == []
@@ -0,0 +1,72 @@
+"""Unit tests for prompt-cache stats and cache-friendly prompt layout."""
+
+from clipscribe.prompts.intelligence_extraction import (
+    build_chunk_extraction_messages,
+    build_intelligence_extraction_messages,
+)
+from clipscribe.utils.prompt_cache import GrokPromptCache, normalize_usage
+
+
+def test_normalize_usage_reads_prompt_tokens_details():
+    """Test OpenAI-style cached token reporting (cached tokens are part of prompt_tokens)."""
+    usage = normalize_usage(
+        {
+            "prompt_tokens": 3000,
+            "completion_tokens": 200,
+            "total_tokens": 3200,
+            "prompt_tokens_details": {"cached_tokens": 2048},
+        }
+    )
+    assert usage["cached_tokens"] == 2048
+    assert usage["input_tokens"] == 952
+
+    legacy = normalize_usage({"prompt_tokens": 1000, "cached_tokens": 200})
+    assert legacy == {
+        "input_tokens": 1000,
+        "output_tokens": 0,
+        "cached_tokens": 200,
+        "total_tokens": 0,
+    }
+
+
+def test_stats_are_broken_out_by_call_site():
+    """Test per-call-site cached-token ratios."""
+    cache = GrokPromptCache()
+    cache.record_usage(
+        {"prompt_tokens": 4000, "prompt_tokens_details": {"cached_tokens": 3000}},
+        "chunk_extraction",
+    )
+    cache.record_usage({"prompt_tokens": 1000}, "speaker_identification")
+
+    summary = cache.get_stats_summary()
+    assert summary["total_requests"] == 2
+    assert summary["by_call_site"]["chunk_extraction"]["cached_token_ratio"] == 0.75
+    assert summary["by_call_site"]["speaker_identification"]["hit_rate_percent"] == 0.0
+    assert summary["cached_token_ratio"] == 0.6
+
+    cache.reset_stats()
+    assert cache.get_stats_summary()["by_call_site"] == {}
+
+
+def test_chunk_prompts_share_a_stable_prefix():
+    """Test that only the suffix of chunk prompts varies across chunks and videos."""
+    video_a = {"title": "Budget hearing", "channel": "C-SPAN"}
+    video_b = {"title": "Podcast", "channel": "Someone"}
+    first = build_chunk_extraction_messages("chunk one text", video_a, 1, 3)
+    second = build_chunk_extraction_messages("chunk two text", video_a, 2, 3)
+    other = build_chunk_extraction_messages("other text", video_b, 1, 1)
+
+    assert first[0] == second[0] == other[0]
+    assert "1/3" not in first[0]["content"]
+    # Chunks of one video share the context block at the start of the user message
+    prefix = first[1]["content"].split("TRANSCRIPT:")[0]
+    assert second[1]["content"].startswith(prefix)
+    assert first[1]["content"].endswith("(chunk 1/3)")
+
+
+def test_full_extraction_system_prompt_is_video_independent():
+    """Test that video metadata stays out of the extraction system prompt."""
+    a = build_intelligence_extraction_messages("text a", {"title": "A", "duration": 60})
+    b = build_intelligence_extraction_messages("text b", {"title": "B", "duration": 600})
+    assert a[0] == b[0]
+    assert "Title: A" in a[1]["content"]
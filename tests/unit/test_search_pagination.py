@@ -0,0 +1,106 @@
+"""Unit tests for keyset-paginated and streamed search results."""
+
+import json
+import sqlite3
+from functools import partial
+
+import pytest
+from fastapi import HTTPException
+
+from clipscribe.api import entity_search, topic_search
+from clipscribe.api.db_pool import close_db_pools
+from clipscribe.api.pagination import iter_rows, keyset_condition
+
+
+@pytest.fixture
+def station_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "station10.db"
+    monkeypatch.setattr(entity_search, "DB_PATH", db_path)
+    monkeypatch.setattr(topic_search, "DB_PATH", db_path)
+    entity_search.init_database()
+    topic_search.init_database()
+
+    conn = sqlite3.connect(db_path)
+    # Repeated confidence/mention_count values so pages split inside ties
+    conn.executemany(
+        "INSERT INTO entities (stable_id, video_id, name, entity_type, confidence, mention_count) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (f"e{i:02d}", f"v{i % 3}", f"Entity {i}", "PERSON" if i % 2 else "ORG", 0.9, i % 4)
+            for i in range(25)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO topics (stable_id, video_id, name, relevance) VALUES (?, ?, ?, ?)",
+        [(f"t{i:02d}", "v1", f"Topic {i}", 0.5 + (i % 3) / 10) for i in range(7)],
+    )
+    conn.commit()
+    conn.close()
+    yield db_path
+    close_db_pools()
+
+
+def test_keyset_condition_mixes_directions():
+    """Test descending keys seek with < and ascending keys with >."""
+    condition, params = keyset_condition([("a", True), ("b", True), ("id", False)], [1, 2, "x"])
+    assert condition == "(a < ?) OR (a = ? AND b < ?) OR (a = ? AND b = ? AND id > ?)"
+    assert params == [1, 1, 2, 1, 2, "x"]
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_results_once_in_order(station_db):
+    """Test following next_cursor returns the unpaged result, without overlap."""
+    full = await entity_search.search_entities(entity_search.EntitySearchRequest(limit=1000))
+    assert full.next_cursor is None
+
+    seen, cursor = [], None
+    while True:
+        page = await entity_search.search_entities(
+            entity_search.EntitySearchRequest(limit=4, cursor=cursor)
+        )
+        seen.extend(e.id for e in page.entities)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [e.id for e in full.entities]
+    assert len(set(seen)) == 25
+
+    topics = await topic_search.search_topics(topic_search.TopicSearchRequest(limit=5))
+    rest = await topic_search.search_topics(
+        topic_search.TopicSearchRequest(limit=5, cursor=topics.next_cursor)
+    )
+    assert len(topics.topics) + len(rest.topics) == 7
+    assert rest.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_rejected_for_other_filters(station_db):
+    """Test a cursor only resumes the search it was issued for."""
+    page = await entity_search.search_entities(entity_search.EntitySearchRequest(limit=2))
+
+    with pytest.raises(HTTPException) as excinfo:
+        await entity_search.search_entities(
+            entity_search.EntitySearchRequest(entity_type="ORG", cursor=page.next_cursor)
+        )
+    assert excinfo.value.status_code == 400
+
+    with pytest.raises(HTTPException):
+        await entity_search.search_entities(
+            entity_search.EntitySearchRequest(cursor="not-a-cursor")
+        )
+
+
+@pytest.mark.asyncio
+async def test_export_streams_every_match_as_ndjson(station_db, monkeypatch):
+    """Test the export walks all keyset pages and emits one JSON object per line."""
+    # Small pages so the export needs several round-trips
+    monkeypatch.setattr(entity_search, "iter_rows", partial(iter_rows, page_size=3))
+
+    response = await entity_search.export_entities(
+        entity_search.EntitySearchRequest(entity_type="PERSON", limit=1)
+    )
+    assert response.media_type == "application/x-ndjson"
+    lines = [line async for line in response.body_iterator]
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 12
+    assert {r["type"] for r in records} == {"PERSON"}
@@ -0,0 +1,76 @@
+"""Unit tests for the time-indexed transcript segment store."""
+
+import pytest
+
+from clipscribe.api import segment_search
+from clipscribe.api.db_pool import close_db_pools
+from clipscribe.database.db_manager import ClipScribeDatabase
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.5, "speaker": "SPEAKER_00", "text": "Welcome to the briefing."},
+    {
+        "start": 4.5,
+        "end": 9.0,
+        "speaker": "SPEAKER_01",
+        "text": "The ceasefire talks resume today.",
+    },
+    {"start_time": 9.0, "end_time": 15.0, "text": "Officials expect a budget vote."},
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ClipScribeDatabase(str(tmp_path / "clipscribe.db"))
+    database.ingest_video("v1", "https://x/1", "One", 0.01, [], [], segments=SEGMENTS)
+    database.add_segments("v2", [{"start": 3.0, "end": 6.0, "text": "Ceasefire collapsed."}])
+    yield database
+    database.close()
+
+
+def test_interval_lookups_within_and_across_videos(db):
+    """Test range and point queries agree whether served by the R-tree or the B-tree."""
+    assert db.rtree_enabled
+
+    across = db.get_segments_between(5.0, 8.0)
+    assert [(s["video_id"], s["start_time"]) for s in across] == [("v1", 4.5), ("v2", 3.0)]
+    assert [s["text"] for s in db.get_segments_between(5.0, 8.0, video_id="v1")] == [
+        "The ceasefire talks resume today."
+    ]
+    # Boundaries are inclusive: at 9.0 one segment ends and the next starts
+    assert [s["start_time"] for s in db.get_segments_at(9.0, video_id="v1")] == [4.5, 9.0]
+    assert [s["video_id"] for s in db.get_segments_between(0, 100, speaker="SPEAKER_01")] == ["v1"]
+
+    db.rtree_enabled = False
+    assert [(s["video_id"], s["start_time"]) for s in db.get_segments_between(5.0, 8.0)] == [
+        ("v1", 4.5),
+        ("v2", 3.0),
+    ]
+
+
+def test_text_search_and_reingest(db):
+    """Test FTS over segment text with a time window, and that re-ingest replaces segments."""
+    assert {s["video_id"] for s in db.search_segments("ceasefire")} == {"v1", "v2"}
+    assert [s["video_id"] for s in db.search_segments("ceasefire", end=4.0)] == ["v2"]
+
+    db.ingest_video("v1", "https://x/1", "One", 0.01, [], [], segments=SEGMENTS[:1])
+    assert db.search_segments("ceasefire", video_id="v1") == []
+    # Omitting segments leaves the stored ones alone
+    db.ingest_video("v1", "https://x/1", "One", 0.01, [], [])
+    assert len(db.get_segments_between(0, 100, video_id="v1")) == 1
+
+
+@pytest.mark.asyncio
+async def test_segment_routes(db, monkeypatch):
+    """Test the API routes answer from the pooled read connections."""
+    monkeypatch.setattr(segment_search, "DB_PATH", db.db_path)
+    try:
+        assert segment_search.init_database()
+        response = await segment_search.get_segments_at(t=5.0, video_id=None, limit=10)
+        assert [s.video_id for s in response.segments] == ["v1", "v2"]
+
+        response = await segment_search.search_segments(
+            segment_search.SegmentSearchRequest(query="budget")
+        )
+        assert [s.start_time for s in response.segments] == [9.0]
+    finally:
+        close_db_pools()
@@ -0,0 +1,72 @@
+"""Unit tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from clipscribe.utils.single_flight import SingleFlight, canonical_hash
+
+
+def test_canonical_hash_ignores_key_order():
+    """Test that equivalent payloads hash identically."""
+    assert canonical_hash({"a": 1, "b": [1, 2]}) == canonical_hash({"b": [1, 2], "a": 1})
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_share_one_execution():
+    """Test that concurrent callers with the same key run the work once."""
+    group = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"choices": ["answer"]}
+
+    results = await asyncio.gather(*(group.do("k", work) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(result == {"choices": ["answer"]} for result, _ in results)
+    # Followers get independent copies
+    results[1][0]["choices"].append("mutated")
+    assert results[2][0] == {"choices": ["answer"]}
+    assert group.stats.to_dict()["coalesced"] == 4
+    assert group.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_all_callers_and_are_not_cached():
+    """Test that a failure propagates to followers and the next call retries."""
+    group = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(group.do("k", fail), group.do("k", fail), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def succeed():
+        return "ok"
+
+    assert await group.do("k", succeed) == ("ok", False)
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_cancel_followers():
+    """Test that followers still get the result when the first caller is cancelled."""
+    group = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.create_task(group.do("k", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(group.do("k", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("done", True)
@@ -0,0 +1,51 @@
+"""Unit tests for the speaker identification excerpt sampler."""
+
+from clipscribe.intelligence.speaker_excerpts import SpeakerExcerptSampler, parse_turns
+from clipscribe.utils.token_counter import get_token_counter
+
+INTRO = """[SPEAKER_00]: Hey everyone, I'm Tim. Welcome to the show.
+[SPEAKER_01]: Thanks for having me, Tim.
+[SPEAKER_00]: So Congresswoman Greene, let's talk about the Epstein files.
+[SPEAKER_01]: Well, as a member of Congress, I've been pushing for transparency.
+"""
+
+
+def _filler(turns: int, offset: int = 0) -> str:
+    return "\n".join(
+        f"[SPEAKER_0{i % 2}]: We covered item {i + offset} on the agenda at some length."
+        for i in range(turns)
+    )
+
+
+def test_parse_turns_merges_consecutive_lines():
+    """Test that same-speaker lines and continuation lines form one turn."""
+    turns = parse_turns("[SPEAKER_00]: one\nSPEAKER_00: two\ncontinued\n[SPEAKER_01]: three")
+    assert [(t.speaker, t.text) for t in turns] == [
+        ("SPEAKER_00", "one two continued"),
+        ("SPEAKER_01", "three"),
+    ]
+
+
+def test_sampler_keeps_identifying_turns():
+    """Test that introductions and vocatives are kept, even late in a long video."""
+    transcript = _filler(400) + "\n" + INTRO + _filler(400, offset=400)
+    excerpt = SpeakerExcerptSampler(token_budget=500).sample(
+        transcript, ["SPEAKER_00", "SPEAKER_01"], {"title": "The Tim Dillon Show #465"}
+    )
+
+    assert "I'm Tim" in excerpt
+    assert "Thanks for having me, Tim." in excerpt
+    assert "Congresswoman Greene" in excerpt
+    assert "[...]" in excerpt
+
+
+def test_excerpt_size_is_constant_in_video_length():
+    """Test that a 10x longer transcript yields an excerpt within the same budget."""
+    sampler = SpeakerExcerptSampler(token_budget=400)
+    counter = get_token_counter()
+    short = counter.count(sampler.sample(INTRO + _filler(200), ["SPEAKER_00", "SPEAKER_01"]))
+    long = counter.count(sampler.sample(INTRO + _filler(2000), ["SPEAKER_00", "SPEAKER_01"]))
+
+    # Selected text stays within budget; only the [...] markers and labels add overhead
+    assert long <= 400 * 1.5
+    assert abs(long - short) < 100
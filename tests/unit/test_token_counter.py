@@ -0,0 +1,75 @@
+"""Unit tests for the token counting service."""
+
+import time
+
+from clipscribe.utils.token_counter import TokenCounter
+
+
+def _segments(count: int):
+    return [
+        f"Segment {i}: the speaker discusses procurement item {i % 97} in some detail."
+        for i in range(count)
+    ]
+
+
+def test_counts_are_memoised():
+    """Test that repeated texts are served from the cache."""
+    counter = TokenCounter()
+    first = counter.count("The quick brown fox jumps over the lazy dog.")
+    assert first > 0
+    assert "The quick brown fox jumps over the lazy dog." in counter._cache
+    assert counter.count("The quick brown fox jumps over the lazy dog.") == first
+    assert counter.count("") == 0
+
+
+def test_pack_respects_budget_and_overlap():
+    """Test that packed chunks fit the budget and repeat trailing context."""
+    counter = TokenCounter()
+    texts = _segments(50)
+    counts = counter.count_many(texts)
+    max_tokens = 5 * max(counts)
+    overlap = max(counts)
+
+    ranges = counter.pack(texts, max_tokens=max_tokens, overlap_tokens=overlap)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(texts)
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert sum(counts[start:end]) <= max_tokens
+        assert next_start < end  # overlap with previous chunk
+        assert sum(counts[next_start:end]) <= overlap
+
+
+def test_split_text_handles_oversized_sentences():
+    """Test that a single over-long sentence is still split within budget."""
+    counter = TokenCounter()
+    text = " ".join(["word"] * 300) + ". Short tail sentence."
+    chunks = counter.split_text(text, max_tokens=100)
+    assert len(chunks) >= 3
+    assert all(counter.count(chunk) <= 100 for chunk in chunks)
+
+
+def test_split_text_keeps_original_whitespace():
+    """Test that chunks are slices of the input, keeping line and paragraph breaks."""
+    counter = TokenCounter()
+    paragraph = "Speaker one opens the hearing.\nSpeaker two responds at length.\n\n"
+    text = paragraph * 40
+    chunks = counter.split_text(text, max_tokens=60, overlap_tokens=10)
+    assert len(chunks) > 1
+    assert all(chunk in text for chunk in chunks)
+    assert chunks[0].startswith(paragraph)
+
+
+def test_context_preflight():
+    """Test model context limits."""
+    counter = TokenCounter()
+    assert counter.fits_context("grok-4-1-fast-reasoning", 1_500_000, 4096)
+    assert not counter.fits_context("grok-4", 255_000, 4096)
+
+
+def test_four_hour_transcript_is_fast():
+    """Test counting every segment of a ~4 hour transcript well under a second."""
+    counter = TokenCounter()
+    segments = _segments(5000)
+    started = time.perf_counter()
+    counter.count_many(segments)
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,144 @@
+"""Unit tests for the trigram index behind fuzzy entity search."""
+
+import pytest
+
+from clipscribe.api import entity_search
+from clipscribe.api.db_pool import close_db_pools
+from clipscribe.database.db_manager import ClipScribeDatabase
+from clipscribe.database.trigram import (
+    MAX_CANDIDATES,
+    index_terms,
+    rebuild_trigram_index,
+    similarity,
+)
+
+
+def _index(db):
+    rows = db.conn.execute(
+        """
+        SELECT t.name, t.term, p.gram FROM trigram_terms t
+        JOIN trigram_postings p ON p.term_id = t.id AND p.gram_count = t.gram_count
+        """
+    )
+    return sorted(tuple(row) for row in rows)
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ClipScribeDatabase(str(tmp_path / "clipscribe.db"))
+    database.ingest_video(
+        "v1",
+        "https://x/1",
+        "One",
+        0.1,
+        [
+            {"name": "Volodymyr Zelenskyy", "type": "PERSON", "aliases": ["Зеленський"]},
+            {"name": "Donald Trump", "type": "PERSON", "mention_count": 4},
+            {"name": "Bank of America", "type": "ORG"},
+        ],
+        [],
+    )
+    database.ingest_video("v2", "https://x/2", "Two", 0.1, [{"name": "Zelensky"}], [])
+    yield database
+    database.close()
+
+
+def test_similarity_and_index_terms():
+    """Test folding, padding and the per-word terms of multi-word names."""
+    assert similarity("Zelensky", "ZELENSKÝ") == 1.0
+    assert similarity("Zelensky", "Zelenskyy") > similarity("Zelensky", "Zelenko") > 0
+    assert similarity("Zelensky", "Musk") == 0.0
+    assert index_terms("Bank of America", ["BofA"]) == {
+        "Bank of America",
+        "BofA",
+        "Bank",
+        "America",
+    }
+
+
+def test_fuzzy_search_tolerates_typos_and_aliases(db):
+    """Test misspellings, surnames alone and aliases find the canonical names."""
+    assert db.search_entities("Zelenski") == []
+
+    names = [r["name"] for r in db.search_entities("Zelenski", fuzzy=True)]
+    assert names[:2] == ["Zelensky", "Volodymyr Zelenskyy"]
+    top = db.search_entities("Donlad Trump", fuzzy=True)[0]
+    assert (top["name"], top["video_id"]) == ("Donald Trump", "v1")
+    assert 0 < top["similarity"] < 1
+    assert db.search_entities("Зеленский", fuzzy=True)[0]["name"] == "Volodymyr Zelenskyy"
+    assert db.search_entities("Zelenski", fuzzy=True, min_similarity=0.9) == []
+
+
+def test_index_follows_writes_and_matches_rebuild(db):
+    """Test removed names leave the index and incremental state equals a rebuild."""
+    db.ingest_video("v2", "https://x/2", "Two", 0.1, [{"name": "Elon Musk"}], [])
+    assert db.search_entities("Zelensky", fuzzy=True)[0]["video_id"] == "v1"
+    assert not db.conn.execute("SELECT 1 FROM trigram_terms WHERE name = 'Zelensky'").fetchone()
+    assert db.conn.execute("SELECT COUNT(*) FROM trigram_pending").fetchone()[0] == 0
+
+    incremental = _index(db)
+    rebuild_trigram_index(db.conn)
+    assert _index(db) == incremental
+
+
+def test_reload_drops_aliases_the_video_no_longer_reports(db):
+    """Test a reload deletes its stale alias rows while other videos keep theirs."""
+    db.ingest_video(
+        "v3", "u", "t", 0.0, [{"name": "Volodymyr Zelenskyy", "aliases": ["Зеленський"]}], []
+    )
+    db.ingest_video(
+        "v1", "https://x/1", "One", 0.1, [{"name": "Volodymyr Zelenskyy", "aliases": []}], []
+    )
+    assert [tuple(r) for r in db.conn.execute("SELECT video_id FROM entity_aliases")] == [("v3",)]
+    db.ingest_video("v3", "u", "t", 0.0, [{"name": "Volodymyr Zelenskyy"}], [])
+    assert db.conn.execute("SELECT COUNT(*) FROM entity_aliases").fetchone()[0] == 0
+    assert db.search_entities("Зеленский", fuzzy=True) == []
+
+
+@pytest.mark.asyncio
+async def test_api_fuzzy_search_pages_by_similarity(tmp_path, monkeypatch):
+    """Test fuzzy=true ranks by similarity and pages with cursors."""
+    db_path = tmp_path / "station10.db"
+    monkeypatch.setattr(entity_search, "DB_PATH", db_path)
+    entity_search.init_database()
+    with ClipScribeDatabase(str(db_path)) as db:
+        for i in range(3):
+            db.ingest_video(
+                f"v{i}",
+                "u",
+                "t",
+                0.0,
+                [{"name": "Zelenskyy"}, {"name": "Zelensky"}, {"name": "Pentagon"}],
+                [],
+            )
+    try:
+        request = entity_search.EntitySearchRequest(query="Zelenskiy", fuzzy=True, limit=4)
+        first = await entity_search.search_entities(request)
+        second = await entity_search.search_entities(
+            request.model_copy(update={"cursor": first.next_cursor})
+        )
+        assert [e.name for e in first.entities] == ["Zelensky"] * 3 + ["Zelenskyy"]
+        assert [e.name for e in second.entities] == ["Zelenskyy"] * 2
+        assert second.next_cursor is None
+    finally:
+        close_db_pools()
+
+
+@pytest.mark.asyncio
+async def test_api_fuzzy_filters_apply_beyond_candidate_cap(tmp_path, monkeypatch):
+    """Test a filtered fuzzy search finds matches ranked below the first MAX_CANDIDATES names."""
+    db_path = tmp_path / "station10.db"
+    monkeypatch.setattr(entity_search, "DB_PATH", db_path)
+    entity_search.init_database()
+    people = [{"name": f"Zelensky{i:03d}", "type": "PERSON"} for i in range(MAX_CANDIDATES + 10)]
+    with ClipScribeDatabase(str(db_path)) as db:
+        db.ingest_video("v1", "u", "t", 0.0, people + [{"name": "Zelenskaya", "type": "ORG"}], [])
+    try:
+        request = entity_search.EntitySearchRequest(
+            query="Zelensky", fuzzy=True, entity_type="ORG", min_confidence=0.0
+        )
+        assert [e.name for e in (await entity_search.search_entities(request)).entities] == [
+            "Zelenskaya"
+        ]
+    finally:
+        close_db_pools()
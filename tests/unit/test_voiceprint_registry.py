@@ -0,0 +1,71 @@
+"""Unit tests for the cross-video voice-print registry."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from clipscribe.intelligence.speaker_identifier import SpeakerIdentifier, SpeakerIdentity
+from clipscribe.intelligence.voiceprint_registry import VoiceprintRegistry
+
+RNG = np.random.default_rng(7)
+HOST = RNG.normal(size=192)
+GUEST = RNG.normal(size=192)
+
+
+def _near(vector, noise=0.1):
+    return (vector + RNG.normal(scale=noise, size=vector.shape)).tolist()
+
+
+def test_match_persists_and_respects_channel(tmp_path):
+    """Test cosine matching, channel scoping and SQLite persistence."""
+    db_path = tmp_path / "voiceprints.db"
+    registry = VoiceprintRegistry(db_path=db_path)
+    registry.update("Tim Dillon", "The Tim Dillon Show", _near(HOST), role="Host")
+    registry.update("Tim Dillon", "The Tim Dillon Show", _near(HOST))
+    registry.close()
+
+    reopened = VoiceprintRegistry(db_path=db_path)
+    matches = reopened.match(
+        {"SPEAKER_00": _near(HOST), "SPEAKER_01": _near(GUEST)}, channel="The Tim Dillon Show"
+    )
+    assert list(matches) == ["SPEAKER_00"]
+    assert matches["SPEAKER_00"].name == "Tim Dillon"
+    assert matches["SPEAKER_00"].role == "Host"
+    assert matches["SPEAKER_00"].appearances == 2
+    assert reopened.match({"SPEAKER_00": _near(HOST)}, channel="Other Channel") == {}
+
+
+def test_each_voice_matches_one_speaker():
+    """Test that two diarized labels cannot both claim the same known voice."""
+    registry = VoiceprintRegistry()
+    registry.update("Tim Dillon", "show", _near(HOST))
+    matches = registry.match({"SPEAKER_00": _near(HOST, 0.05), "SPEAKER_01": _near(HOST, 0.3)})
+    assert list(matches) == ["SPEAKER_00"]
+
+
+@pytest.mark.asyncio
+async def test_known_voices_skip_grok(monkeypatch):
+    """Test that only unmatched speakers go to Grok and new IDs are remembered."""
+    monkeypatch.setenv("XAI_API_KEY", "test")
+    registry = VoiceprintRegistry()
+    registry.update("Tim Dillon", "show", _near(HOST), role="Host")
+    identifier = SpeakerIdentifier(voiceprint_registry=registry)
+    sent_to_grok = []
+
+    async def fake_grok(context, speakers):
+        sent_to_grok.extend(s["speaker"] for s in speakers)
+        return [SpeakerIdentity("SPEAKER_01", "Jane Guest", 0.9, "Guest", ["intro"])]
+
+    monkeypatch.setattr(identifier, "_identify_with_grok", fake_grok)
+    segments = [
+        {"speaker": "SPEAKER_00", "total_time": 100.0, "segments": 10, "embedding": _near(HOST)},
+        {"speaker": "SPEAKER_01", "total_time": 80.0, "segments": 8, "embedding": _near(GUEST)},
+    ]
+
+    identities = await identifier.identify_speakers(
+        "[SPEAKER_00]: hi\n[SPEAKER_01]: hello", segments, {"channel": "show"}
+    )
+
+    assert sent_to_grok == ["SPEAKER_01"]
+    assert [i.identified_name for i in identities] == ["Tim Dillon", "Jane Guest"]
+    assert "Jane Guest" in {name for name, _ in registry._keys}